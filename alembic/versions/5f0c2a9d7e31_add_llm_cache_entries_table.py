@@ -0,0 +1,84 @@
+"""add llm_cache_entries table
+
+Revision ID: 5f0c2a9d7e31
+Revises: ad42aea13565
+Create Date: 2025-06-10 09:12:44.118532+00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op  # pyright: ignore[reportUnknownMemberType]
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "5f0c2a9d7e31"
+down_revision: str | None = "ad42aea13565"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_cache_entries",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("namespace", sa.String(), nullable=False),
+        sa.Column("model_name", sa.String(), nullable=False),
+        sa.Column("value", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('UTC', CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "last_accessed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('UTC', CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_llm_cache_entries_cache_key"),
+        "llm_cache_entries",
+        ["cache_key"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_llm_cache_entries_namespace"),
+        "llm_cache_entries",
+        ["namespace"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_llm_cache_entries_created_at"),
+        "llm_cache_entries",
+        ["created_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_llm_cache_entries_last_accessed_at"),
+        "llm_cache_entries",
+        ["last_accessed_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_llm_cache_entries_last_accessed_at"), table_name="llm_cache_entries"
+    )
+    op.drop_index(
+        op.f("ix_llm_cache_entries_created_at"), table_name="llm_cache_entries"
+    )
+    op.drop_index(
+        op.f("ix_llm_cache_entries_namespace"), table_name="llm_cache_entries"
+    )
+    op.drop_index(
+        op.f("ix_llm_cache_entries_cache_key"), table_name="llm_cache_entries"
+    )
+    op.drop_table("llm_cache_entries")
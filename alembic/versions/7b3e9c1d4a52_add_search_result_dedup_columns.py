@@ -0,0 +1,52 @@
+"""add search_results minhash_signature and duplicate_of_id
+
+Revision ID: 7b3e9c1d4a52
+Revises: 5f0c2a9d7e31
+Create Date: 2025-06-16 10:41:07.502913+00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op  # pyright: ignore[reportUnknownMemberType]
+
+# revision identifiers, used by Alembic.
+revision: str = "7b3e9c1d4a52"
+down_revision: str | None = "5f0c2a9d7e31"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "search_results",
+        sa.Column("minhash_signature", sa.LargeBinary(), nullable=True),
+    )
+    op.add_column(
+        "search_results", sa.Column("duplicate_of_id", sa.Uuid(), nullable=True)
+    )
+    op.create_index(
+        op.f("ix_search_results_duplicate_of_id"),
+        "search_results",
+        ["duplicate_of_id"],
+        unique=False,
+    )
+    op.create_foreign_key(
+        "search_results_duplicate_of_id_fkey",
+        "search_results",
+        "search_results",
+        ["duplicate_of_id"],
+        ["id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "search_results_duplicate_of_id_fkey", "search_results", type_="foreignkey"
+    )
+    op.drop_index(
+        op.f("ix_search_results_duplicate_of_id"), table_name="search_results"
+    )
+    op.drop_column("search_results", "duplicate_of_id")
+    op.drop_column("search_results", "minhash_signature")
@@ -0,0 +1,41 @@
+"""add screen_abstract_results.reuse_key
+
+Revision ID: c4d81f0e6b29
+Revises: 7b3e9c1d4a52
+Create Date: 2025-06-18 14:02:51.337120+00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op  # pyright: ignore[reportUnknownMemberType]
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d81f0e6b29"
+down_revision: str | None = "7b3e9c1d4a52"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Existing results get no reuse_key, the prompt version they were made with
+    # isn't recorded.
+    op.add_column(
+        "screen_abstract_results",
+        sa.Column("reuse_key", sa.String(length=64), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_screen_abstract_results_reuse_key"),
+        "screen_abstract_results",
+        ["reuse_key"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_screen_abstract_results_reuse_key"),
+        table_name="screen_abstract_results",
+    )
+    op.drop_column("screen_abstract_results", "reuse_key")
@@ -0,0 +1,131 @@
+"""add screening_jobs table
+
+Revision ID: e2a9b7c43f18
+Revises: c4d81f0e6b29
+Create Date: 2025-06-24 10:41:07.552904+00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op  # pyright: ignore[reportUnknownMemberType]
+from loguru import logger
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a9b7c43f18"
+down_revision: str | None = "c4d81f0e6b29"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "screening_jobs",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('UTC', CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('UTC', CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+        sa.Column("review_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "kind",
+            postgresql.ENUM("abstract_screening", "benchmark", name="screeningjobkind"),
+            nullable=False,
+        ),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "queued",
+                "running",
+                "succeeded",
+                "failed",
+                "cancelled",
+                name="screeningjobstatus",
+            ),
+            nullable=False,
+        ),
+        sa.Column("params", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("total_items", sa.Integer(), nullable=False),
+        sa.Column("processed_items", sa.Integer(), nullable=False),
+        sa.Column("stats", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("worker_id", sa.String(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(["review_id"], ["systematic_reviews.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_screening_jobs_review_id"),
+        "screening_jobs",
+        ["review_id"],
+        unique=False,
+    )
+    # Workers claim the oldest queued job
+    op.create_index(
+        op.f("ix_screening_jobs_status_created_at"),
+        "screening_jobs",
+        ["status", "created_at"],
+        unique=False,
+    )
+    # A review has at most one queued or running job of each kind
+    op.create_index(
+        op.f("uq_screening_jobs_review_id_kind_active"),
+        "screening_jobs",
+        ["review_id", "kind"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+    # Requeued benchmark jobs skip stored items, keep one item per search result
+    # and run. Runs from before the constraint may have stored an item twice, the
+    # most recently created copy is kept (the highest id if created together).
+    deleted = op.get_bind().execute(
+        sa.text(
+            """
+            DELETE FROM benchmark_result_items AS a
+            USING benchmark_result_items AS b
+            WHERE a.benchmark_run_id = b.benchmark_run_id
+              AND a.search_result_id = b.search_result_id
+              AND (a.created_at, a.id) < (b.created_at, b.id)
+            """
+        )
+    )
+    if deleted.rowcount:
+        logger.warning(
+            f"Deleted {deleted.rowcount} duplicate benchmark_result_items, kept the latest item per benchmark run and search result"
+        )
+    op.create_unique_constraint(
+        "uq_benchmark_result_items_run_search_result",
+        "benchmark_result_items",
+        ["benchmark_run_id", "search_result_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_benchmark_result_items_run_search_result",
+        "benchmark_result_items",
+        type_="unique",
+    )
+    op.drop_index(
+        op.f("uq_screening_jobs_review_id_kind_active"), table_name="screening_jobs"
+    )
+    op.drop_index(
+        op.f("ix_screening_jobs_status_created_at"), table_name="screening_jobs"
+    )
+    op.drop_index(op.f("ix_screening_jobs_review_id"), table_name="screening_jobs")
+    op.drop_table("screening_jobs")
+    postgresql.ENUM(name="screeningjobstatus").drop(op.get_bind())
+    postgresql.ENUM(name="screeningjobkind").drop(op.get_bind())
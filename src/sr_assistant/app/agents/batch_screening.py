@@ -0,0 +1,535 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Offline bulk abstract screening through a provider batch API.
+
+Large reviews don't need interactive latency. Instead of invoking
+``screen_abstracts_chain`` per search result, the same reviewer prompts are
+serialized into one JSONL batch job (one request per search result and screening
+strategy), submitted, polled until done, and the structured outputs are parsed back
+into :class:`~sr_assistant.core.schemas.ScreeningResult` models. The OpenAI batch API
+runs at half the price and outside the interactive rate limits.
+
+Job clients implement :class:`BatchJobClient`:
+
+- :class:`OpenAIBatchJobClient`: the OpenAI ``/v1/batches`` API.
+- :class:`LocalBatchJobClient`: a file-based stand-in that answers requests with a
+  local ``responder`` callable when polled, so the whole pipeline runs offline.
+
+Persisting the results is the job of
+:meth:`sr_assistant.app.services.ScreeningService.perform_bulk_abstract_screening`.
+
+Examples:
+    >>> client = LocalBatchJobClient(
+    ...     tmp_path, responder=fake_chat_completion
+    ... )  # doctest: +SKIP
+    >>> job = client.submit(
+    ...     make_batch_requests(search_results, review)
+    ... )  # doctest: +SKIP
+    >>> job = client.wait(job.id, poll_interval=0)  # doctest: +SKIP
+    >>> parsed = parse_batch_results(
+    ...     client.results(job.id), review_id=review.id, job=job
+    ... )  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import time
+import typing as t
+import uuid
+from datetime import UTC, datetime
+from http import HTTPStatus
+from pathlib import Path
+
+from langchain_core.messages import convert_to_openai_messages
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+from sr_assistant.app.agents.screening_agents import (
+    comprehensive_reviewer_prompt,
+    conservative_reviewer_prompt,
+    llm1,
+    llm2,
+    make_screen_abstracts_chain_input,
+    openai_token_usage,
+)
+from sr_assistant.core.schemas import ScreeningResponse, ScreeningResult
+from sr_assistant.core.types import ScreeningStrategyType
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping, Sequence
+
+    import openai
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_openai.chat_models import ChatOpenAI
+
+    from sr_assistant.core import models
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+TERMINAL_BATCH_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+def strict_response_format(model: type[BaseModel]) -> dict[str, t.Any]:
+    """Strict ``json_schema`` response_format of a pydantic model.
+
+    The format ``llm.with_structured_output(model)`` sends: ChatOpenAI defaults to
+    ``method="json_schema"`` and the OpenAI SDK makes the model's JSON schema
+    strict, which is repeated here rather than imported from the SDK's internals.
+    Objects get ``additionalProperties: false`` and all their properties required,
+    ``None`` defaults are dropped and ``$ref``s with sibling keys are inlined.
+    """
+    schema = model.model_json_schema()
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "schema": _strict_json_schema(schema, schema),
+            "name": model.__name__,
+            "strict": True,
+        },
+    }
+
+
+def _strict_json_schema(
+    schema: dict[str, t.Any], root: dict[str, t.Any]
+) -> dict[str, t.Any]:
+    """Make ``schema`` strict in place, see :func:`strict_response_format`."""
+    properties = schema.get("properties", {})
+    items = schema.get("items")
+    for subschema in (
+        *schema.get("$defs", {}).values(),
+        *schema.get("definitions", {}).values(),
+        *properties.values(),
+        *([items] if isinstance(items, dict) else []),
+        *schema.get("anyOf", []),
+        *schema.get("allOf", []),
+    ):
+        _strict_json_schema(subschema, root)
+    if schema.get("type") == "object":
+        schema.setdefault("additionalProperties", False)
+    if "properties" in schema:
+        schema["required"] = list(properties)
+    if len(schema.get("allOf", [])) == 1:
+        schema.update(schema.pop("allOf")[0])
+    if "default" in schema and schema["default"] is None:
+        del schema["default"]
+    if (ref := schema.get("$ref")) and len(schema) > 1:
+        # Strict mode doesn't allow keys next to a $ref, they take precedence
+        resolved: t.Any = root
+        for key in ref.removeprefix("#/").split("/"):
+            resolved = resolved[key]
+        del schema["$ref"]
+        schema.update({**resolved, **schema})
+        return _strict_json_schema(schema, root)
+    return schema
+
+
+SCREENING_RESPONSE_FORMAT = strict_response_format(ScreeningResponse)
+"""The strict response_format the interactive reviewer chains send."""
+
+_STRATEGY_PROMPTS: dict[
+    ScreeningStrategyType, tuple[ChatPromptTemplate, ChatOpenAI]
+] = {
+    ScreeningStrategyType.CONSERVATIVE: (conservative_reviewer_prompt, llm1),
+    ScreeningStrategyType.COMPREHENSIVE: (comprehensive_reviewer_prompt, llm2),
+}
+
+
+class BatchScreeningError(Exception):
+    """Batch job failed, timed out, or returned an unusable result line."""
+
+
+class BatchJob(t.NamedTuple):
+    """Provider-agnostic batch job state."""
+
+    id: str
+    status: str
+    """Provider status, OpenAI vocabulary (validating, in_progress, completed, ...)."""
+    request_count: int = 0
+    completed_count: int = 0
+    failed_count: int = 0
+    created_at: datetime | None = None
+    metadata: dict[str, str] | None = None
+    """Metadata the job was submitted with."""
+
+    @property
+    def done(self) -> bool:
+        """Whether the job reached a terminal status."""
+        return self.status in TERMINAL_BATCH_STATUSES
+
+
+class BatchScreeningResults(t.NamedTuple):
+    """Parsed output of a screening batch job."""
+
+    results: list[ScreeningResult]
+    errors: dict[str, str]
+    """custom_id -> error message for requests without a usable response."""
+
+
+def make_custom_id(search_result_id: uuid.UUID, strategy: ScreeningStrategyType) -> str:
+    """Batch request id of one search result and screening strategy."""
+    return f"{search_result_id}:{strategy}"
+
+
+def parse_custom_id(custom_id: str) -> tuple[uuid.UUID, ScreeningStrategyType]:
+    """Inverse of :func:`make_custom_id`.
+
+    Raises:
+        BatchScreeningError: If ``custom_id`` wasn't made by :func:`make_custom_id`.
+    """
+    search_result_id, _, strategy = custom_id.partition(":")
+    try:
+        return uuid.UUID(search_result_id), ScreeningStrategyType(strategy)
+    except ValueError as exc:
+        msg = f"Invalid batch custom_id: {custom_id!r}"
+        raise BatchScreeningError(msg) from exc
+
+
+def make_batch_requests(
+    search_results: Sequence[models.SearchResult], review: models.SystematicReview
+) -> list[dict[str, t.Any]]:
+    """Serialize screening inputs into batch API request lines.
+
+    Each :func:`make_screen_abstracts_chain_input` item becomes one chat completion
+    request per screening strategy, with the same prompt, model, temperature and
+    strict JSON schema output as the interactive chain.
+
+    Args:
+        search_results (Sequence[models.SearchResult]): search results to screen.
+        review (models.SystematicReview): review the search results belong to.
+
+    Returns:
+        list[dict[str, Any]]: JSONL request lines, ``custom_id`` from
+            :func:`make_custom_id`.
+    """
+    chain_input = make_screen_abstracts_chain_input(list(search_results), review)
+    requests: list[dict[str, t.Any]] = []
+    for search_result, inputs in zip(
+        search_results, chain_input["inputs"], strict=True
+    ):
+        for strategy, (prompt, llm) in _STRATEGY_PROMPTS.items():
+            requests.append(
+                {
+                    "custom_id": make_custom_id(search_result.id, strategy),
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": {
+                        "model": llm.model_name,
+                        "temperature": llm.temperature,
+                        "messages": convert_to_openai_messages(
+                            prompt.format_messages(**inputs)
+                        ),
+                        "response_format": SCREENING_RESPONSE_FORMAT,
+                    },
+                }
+            )
+    logger.info(
+        f"Serialized {len(requests)} batch requests for {len(search_results)} search results"
+    )
+    return requests
+
+
+def parse_batch_result_line(
+    line: Mapping[str, t.Any], *, review_id: uuid.UUID, job: BatchJob
+) -> ScreeningResult:
+    """Parse one batch output line into a ScreeningResult.
+
+    Result ids are derived from the job and ``custom_id``, so ingesting the same job
+    twice yields the same ids. Both strategies of a search result share a trace id,
+    like in the interactive chain.
+
+    Raises:
+        BatchScreeningError: If the request failed, the model refused or the
+            response content isn't a valid ``ScreeningResponse``.
+    """
+    custom_id = str(line.get("custom_id"))
+    search_result_id, strategy = parse_custom_id(custom_id)
+    response = line.get("response") or {}
+    body = response.get("body") or {}
+    if line.get("error") or response.get("status_code") != HTTPStatus.OK:
+        msg = f"Batch request {custom_id} failed: {line.get('error') or body.get('error')!r}"
+        raise BatchScreeningError(msg)
+    try:
+        message = body["choices"][0]["message"]
+        if refusal := message.get("refusal"):
+            msg = f"Batch request {custom_id} refused: {refusal}"
+            raise BatchScreeningError(msg)
+        screening_response = ScreeningResponse.model_validate_json(message["content"])
+    except (KeyError, IndexError, TypeError, ValidationError) as exc:
+        msg = f"Unusable response for batch request {custom_id}: {exc}"
+        raise BatchScreeningError(msg) from exc
+
+    input_tokens, cached_input_tokens, output_tokens = openai_token_usage(
+        body.get("usage") or {}
+    )
+    end_time = (
+        datetime.fromtimestamp(body["created"], tz=UTC)
+        if body.get("created")
+        else datetime.now(tz=UTC)
+    )
+    return ScreeningResult(
+        id=uuid.uuid5(uuid.NAMESPACE_URL, f"batch:{job.id}:{custom_id}"),
+        trace_id=uuid.uuid5(uuid.NAMESPACE_URL, f"batch:{job.id}:{search_result_id}"),
+        review_id=review_id,
+        search_result_id=search_result_id,
+        start_time=job.created_at or end_time,
+        end_time=end_time,
+        model_name=body.get("model", "not_found"),
+        screening_strategy=strategy,
+        response_metadata={
+            "run_name": "screen_abstracts_batch_job",
+            "batch_job_id": job.id,
+            "batch_custom_id": custom_id,
+            "batch_request_id": response.get("request_id"),
+            "system_fingerprint": body.get("system_fingerprint"),
+            "token_usage": {
+                "input_tokens": input_tokens,
+                "cached_input_tokens": cached_input_tokens,
+                "uncached_input_tokens": input_tokens - cached_input_tokens,
+                "output_tokens": output_tokens,
+                "llm_calls": 1,
+            },
+            "llm_cache_hit": False,
+        },
+        **screening_response.model_dump(),
+    )
+
+
+def parse_batch_results(
+    lines: Iterable[Mapping[str, t.Any]], *, review_id: uuid.UUID, job: BatchJob
+) -> BatchScreeningResults:
+    """Parse all output lines of a screening batch job, collecting per-line errors."""
+    results: list[ScreeningResult] = []
+    errors: dict[str, str] = {}
+    for line in lines:
+        try:
+            results.append(parse_batch_result_line(line, review_id=review_id, job=job))
+        except BatchScreeningError as exc:
+            logger.warning(str(exc))
+            errors[str(line.get("custom_id"))] = str(exc)
+    return BatchScreeningResults(results=results, errors=errors)
+
+
+def _dump_jsonl(lines: Iterable[Mapping[str, t.Any]]) -> bytes:
+    return "".join(json.dumps(line) + "\n" for line in lines).encode()
+
+
+def _load_jsonl(text: str) -> list[dict[str, t.Any]]:
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+class BatchJobClient(abc.ABC):
+    """Submits JSONL batch jobs and fetches their results."""
+
+    @abc.abstractmethod
+    def submit(
+        self,
+        requests: Sequence[Mapping[str, t.Any]],
+        *,
+        metadata: Mapping[str, str] | None = None,
+    ) -> BatchJob:
+        """Upload ``requests`` and create a batch job."""
+
+    @abc.abstractmethod
+    def retrieve(self, job_id: str) -> BatchJob:
+        """Current state of a job."""
+
+    @abc.abstractmethod
+    def results(self, job_id: str) -> list[dict[str, t.Any]]:
+        """Output and error lines of a finished job."""
+
+    def wait(
+        self, job_id: str, *, poll_interval: float = 60.0, timeout: float | None = None
+    ) -> BatchJob:
+        """Poll until the job is done.
+
+        Args:
+            job_id (str): job to wait for.
+            poll_interval (float): seconds between polls.
+            timeout (float | None): give up after this many seconds, None to wait
+                for the provider's completion window.
+
+        Raises:
+            BatchScreeningError: On timeout, or if the job didn't complete.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.retrieve(job_id)
+            logger.debug(f"Batch job {job_id}: {job!r}")
+            if job.done:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                msg = f"Timed out waiting for batch job {job_id} ({job.status})"
+                raise BatchScreeningError(msg)
+            time.sleep(poll_interval)
+        if job.status != "completed":
+            msg = f"Batch job {job_id} ended with status {job.status!r}"
+            raise BatchScreeningError(msg)
+        return job
+
+
+class OpenAIBatchJobClient(BatchJobClient):
+    """OpenAI batch API client. Jobs complete within 24h at half the price."""
+
+    def __init__(self, client: openai.OpenAI | None = None) -> None:
+        """Initialize the client, creating an OpenAI client if none is given."""
+        if client is None:
+            import openai
+
+            from sr_assistant.app.config import get_settings
+
+            client = openai.OpenAI(
+                api_key=get_settings().OPENAI_API_KEY.get_secret_value()
+            )
+        self.client = client
+
+    @staticmethod
+    def _to_job(batch: t.Any) -> BatchJob:
+        counts = batch.request_counts
+        return BatchJob(
+            id=batch.id,
+            status=batch.status,
+            request_count=counts.total if counts else 0,
+            completed_count=counts.completed if counts else 0,
+            failed_count=counts.failed if counts else 0,
+            created_at=datetime.fromtimestamp(batch.created_at, tz=UTC),
+            metadata=dict(batch.metadata or {}),
+        )
+
+    @t.override
+    def submit(
+        self,
+        requests: Sequence[Mapping[str, t.Any]],
+        *,
+        metadata: Mapping[str, str] | None = None,
+    ) -> BatchJob:
+        input_file = self.client.files.create(
+            file=("screening_batch.jsonl", _dump_jsonl(requests)), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW,
+            metadata=dict(metadata or {}),
+        )
+        logger.info(f"Submitted OpenAI batch {batch.id} with {len(requests)} requests")
+        return self._to_job(batch)
+
+    @t.override
+    def retrieve(self, job_id: str) -> BatchJob:
+        return self._to_job(self.client.batches.retrieve(job_id))
+
+    @t.override
+    def results(self, job_id: str) -> list[dict[str, t.Any]]:
+        batch = self.client.batches.retrieve(job_id)
+        lines: list[dict[str, t.Any]] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                lines.extend(_load_jsonl(self.client.files.content(file_id).text))
+        return lines
+
+
+class LocalBatchJobClient(BatchJobClient):
+    """File-based stand-in for a provider batch API.
+
+    ``submit`` writes ``<directory>/<job_id>/input.jsonl``. The first ``retrieve``
+    answers every request body with ``responder`` and writes ``output.jsonl``, so a
+    job takes one poll to complete. Responder exceptions become error lines, like
+    failed requests of a real job.
+
+    Args:
+        directory (str | Path): where jobs are stored.
+        responder (Callable[[dict[str, Any]], dict[str, Any]]): returns a chat
+            completion response body for a request body.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        responder: Callable[[dict[str, t.Any]], dict[str, t.Any]],
+    ) -> None:
+        """Initialize the client with the directory jobs are kept in."""
+        self.directory = Path(directory)
+        self.responder = responder
+
+    def _job_dir(self, job_id: str) -> Path:
+        job_dir = self.directory / job_id
+        if not job_dir.is_dir():
+            msg = f"Unknown batch job: {job_id}"
+            raise BatchScreeningError(msg)
+        return job_dir
+
+    def _read_job(self, job_id: str) -> BatchJob:
+        state = json.loads((self._job_dir(job_id) / "job.json").read_text())
+        state["created_at"] = datetime.fromisoformat(state["created_at"])
+        return BatchJob(**state)
+
+    def _write_job(self, job: BatchJob) -> None:
+        state = job._asdict()
+        state["created_at"] = (job.created_at or datetime.now(tz=UTC)).isoformat()
+        (self.directory / job.id / "job.json").write_text(json.dumps(state))
+
+    @t.override
+    def submit(
+        self,
+        requests: Sequence[Mapping[str, t.Any]],
+        *,
+        metadata: Mapping[str, str] | None = None,
+    ) -> BatchJob:
+        job = BatchJob(
+            id=f"local_batch_{uuid.uuid4().hex}",
+            status="validating",
+            request_count=len(requests),
+            created_at=datetime.now(tz=UTC),
+            metadata=dict(metadata or {}),
+        )
+        job_dir = self.directory / job.id
+        job_dir.mkdir(parents=True)
+        (job_dir / "input.jsonl").write_bytes(_dump_jsonl(requests))
+        self._write_job(job)
+        return job
+
+    def _run(self, job: BatchJob) -> BatchJob:
+        job_dir = self._job_dir(job.id)
+        output: list[dict[str, t.Any]] = []
+        failed = 0
+        for request in _load_jsonl((job_dir / "input.jsonl").read_text()):
+            line: dict[str, t.Any] = {
+                "id": f"batch_req_{uuid.uuid4().hex}",
+                "custom_id": request["custom_id"],
+                "response": None,
+                "error": None,
+            }
+            try:
+                line["response"] = {
+                    "status_code": 200,
+                    "request_id": uuid.uuid4().hex,
+                    "body": self.responder(request["body"]),
+                }
+            except Exception as exc:
+                failed += 1
+                line["error"] = {"code": type(exc).__name__, "message": str(exc)}
+            output.append(line)
+        (job_dir / "output.jsonl").write_bytes(_dump_jsonl(output))
+        return job._replace(
+            status="completed",
+            completed_count=len(output) - failed,
+            failed_count=failed,
+        )
+
+    @t.override
+    def retrieve(self, job_id: str) -> BatchJob:
+        job = self._read_job(job_id)
+        if not job.done:
+            job = self._run(job)
+            self._write_job(job)
+        return job
+
+    @t.override
+    def results(self, job_id: str) -> list[dict[str, t.Any]]:
+        output = self._job_dir(job_id) / "output.jsonl"
+        if not output.exists():
+            return []
+        return _load_jsonl(output.read_text())
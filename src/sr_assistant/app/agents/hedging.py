@@ -0,0 +1,261 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Hedged requests for reviewer calls.
+
+A batch's tail latency is set by the odd call that hangs for a minute while the
+same request sent again would be answered in seconds. :func:`hedged` wraps a model
+runnable so that, when a :class:`Hedger` is passed in the run's ``configurable``
+(under :data:`HEDGER_KEY`) and the call is still running after the hedge delay, a
+duplicate is fired and whichever succeeds first wins. The other one is cancelled.
+
+- The hedge delay is the :attr:`HedgePolicy.percentile` of recent latencies
+  (:class:`LatencyWindow`, shared across runs), ``initial_delay`` until there are
+  ``min_samples`` of them.
+- A :class:`Hedger` is created per run and caps how many hedges it may fire
+  (``max_hedge_ratio`` of its calls, and ``max_hedges`` overall).
+- Hedge calls report to the hedger's own ``OpenAICallbackHandler`` so their cost
+  can be told apart from the primary calls, see :meth:`Hedger.stats`.
+
+Only async calls are hedged (see
+:class:`~sr_assistant.app.agents.screening_engine.ScreeningEngine`), sync calls and
+calls without a hedger run as is.
+
+Examples:
+    >>> model = hedged(
+    ...     rate_limited(llm.with_structured_output(Schema), limiter)
+    ... )  # doctest: +SKIP
+    >>> hedger = Hedger(HedgePolicy())  # doctest: +SKIP
+    >>> await chain.ainvoke(
+    ...     inputs, {"configurable": {HEDGER_KEY: hedger}}
+    ... )  # doctest: +SKIP
+    >>> hedger.stats()  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import threading
+import time
+import typing as t
+from collections import deque
+
+from langchain_community.callbacks.openai_info import OpenAICallbackHandler
+from langchain_core.callbacks import BaseCallbackManager
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.runnables.config import patch_config
+from loguru import logger
+
+if t.TYPE_CHECKING:
+    from langchain_core.runnables import Runnable
+
+HEDGER_KEY = "sra_hedger"
+"""``RunnableConfig["configurable"]`` key holding the run's :class:`Hedger`."""
+
+
+class HedgePolicy(t.NamedTuple):
+    """When to hedge and how much."""
+
+    percentile: float = 0.95
+    """Hedge calls still running after this percentile of recent latencies."""
+    min_samples: int = 20
+    """Latencies needed before the percentile is trusted."""
+    window: int = 500
+    """Number of recent latencies kept."""
+    initial_delay: float = 30.0
+    """Hedge delay in seconds until there are ``min_samples`` latencies."""
+    min_delay: float = 2.0
+    """Never hedge sooner than this many seconds."""
+    max_hedge_ratio: float = 0.1
+    """Maximum hedges per call of a run."""
+    max_hedges: int | None = None
+    """Maximum hedges per run, unlimited if None."""
+
+
+class HedgeStats(t.NamedTuple):
+    """Hedging summary of a run."""
+
+    calls: int
+    hedges: int
+    hedge_wins: int
+    hedge_tokens: int
+    hedge_cost: float
+    """USD cost of the hedge calls that completed, cancelled ones aren't reported."""
+
+
+class LatencyWindow:
+    """Thread-safe window of recent call latencies in seconds."""
+
+    def __init__(self, size: int = HedgePolicy().window) -> None:
+        """Initialize an empty window keeping the last ``size`` latencies."""
+        self._latencies: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of latencies in the window."""
+        return len(self._latencies)
+
+    def add(self, latency: float) -> None:
+        """Record the latency of a finished call."""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def quantile(self, q: float) -> float:
+        """Latency at quantile ``q`` (0-1) of the window.
+
+        Raises:
+            ValueError: If the window has fewer than 2 latencies.
+        """
+        with self._lock:
+            data = list(self._latencies)
+        if len(data) < 2:  # noqa: PLR2004
+            msg = f"Need at least 2 latencies, got {len(data)}"
+            raise ValueError(msg)
+        return statistics.quantiles(data, n=1000, method="inclusive")[
+            min(998, max(0, round(q * 1000) - 1))
+        ]
+
+
+class Hedger:
+    """Hedging state of one run.
+
+    Args:
+        policy (HedgePolicy): When to hedge and how much.
+        latencies (LatencyWindow | None): Recent latencies, pass the same window to
+            consecutive runs so the delay adapts across them.
+    """
+
+    def __init__(
+        self, policy: HedgePolicy, latencies: LatencyWindow | None = None
+    ) -> None:
+        """Initialize the hedger for a single run."""
+        self.policy = policy
+        self.latencies = (
+            latencies if latencies is not None else LatencyWindow(policy.window)
+        )
+        self.cost = OpenAICallbackHandler()
+        self._calls = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        """Seconds to wait for the primary call before hedging."""
+        if len(self.latencies) < self.policy.min_samples:
+            return self.policy.initial_delay
+        return max(
+            self.policy.min_delay, self.latencies.quantile(self.policy.percentile)
+        )
+
+    def start_call(self) -> None:
+        """Count a primary call."""
+        with self._lock:
+            self._calls += 1
+
+    def try_hedge(self) -> bool:
+        """Take a hedge from the run's budget, False if it's exhausted."""
+        with self._lock:
+            if (
+                self.policy.max_hedges is not None
+                and self._hedges >= self.policy.max_hedges
+            ):
+                return False
+            if self._hedges + 1 > self.policy.max_hedge_ratio * self._calls:
+                return False
+            self._hedges += 1
+            return True
+
+    def record_hedge_win(self) -> None:
+        """Count a hedge that finished before its primary call."""
+        with self._lock:
+            self._hedge_wins += 1
+
+    def hedge_config(self, config: RunnableConfig) -> RunnableConfig:
+        """Config for a hedge call, reporting its usage to :attr:`cost` as well."""
+        callbacks = config.get("callbacks")
+        if isinstance(callbacks, BaseCallbackManager):
+            callbacks = callbacks.copy()
+            callbacks.add_handler(self.cost, inherit=True)
+        else:
+            callbacks = [*(callbacks or []), self.cost]
+        return patch_config(config, callbacks=callbacks)
+
+    def stats(self) -> HedgeStats:
+        """Hedging summary of the run so far."""
+        with self._lock:
+            return HedgeStats(
+                calls=self._calls,
+                hedges=self._hedges,
+                hedge_wins=self._hedge_wins,
+                hedge_tokens=self.cost.total_tokens,
+                hedge_cost=self.cost.total_cost,
+            )
+
+
+async def _first_success[T](
+    primary: asyncio.Task[T], hedge: asyncio.Task[T]
+) -> tuple[asyncio.Task[T], asyncio.Task[T]]:
+    """Wait for the first of two tasks to succeed, return it and the other one."""
+    pending = {primary, hedge}
+    while True:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        succeeded = [task for task in done if task.exception() is None]
+        if succeeded or not pending:
+            # Both failed: raise the primary's error, it's the one callers expect
+            task = succeeded[0] if succeeded else primary
+            return task, hedge if task is primary else primary
+
+
+def hedged[Input, Output](runnable: Runnable[Input, Output]) -> Runnable[Input, Output]:
+    """Hedge a runnable's async calls when the run has a :class:`Hedger`.
+
+    Place inside ``with_retry_policy`` and outside ``rate_limited`` so every call,
+    hedges included, waits for a rate limiter slot.
+
+    Args:
+        runnable (Runnable): Model (or model with structured output) to wrap.
+
+    Returns:
+        Runnable: Runnable with the same input and output.
+    """
+
+    def _invoke(input_: Input, config: RunnableConfig) -> Output:
+        return runnable.invoke(input_, config)
+
+    async def _ainvoke(input_: Input, config: RunnableConfig) -> Output:
+        hedger = (config.get("configurable") or {}).get(HEDGER_KEY)
+        if not isinstance(hedger, Hedger):
+            return await runnable.ainvoke(input_, config)
+
+        hedger.start_call()
+        start = time.monotonic()
+        primary = asyncio.ensure_future(runnable.ainvoke(input_, config))
+        hedge: asyncio.Task[Output] | None = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedger.delay())
+            if done or not hedger.try_hedge():
+                output = await primary
+                hedger.latencies.add(time.monotonic() - start)
+                return output
+
+            logger.bind(run_name=config.get("run_name")).info(
+                f"Hedging call running for {time.monotonic() - start:.1f}s"
+            )
+            hedge = asyncio.ensure_future(
+                runnable.ainvoke(input_, hedger.hedge_config(config))
+            )
+            winner, loser = await _first_success(primary, hedge)
+            loser.cancel()
+            output = winner.result()
+            # Latency of the call that answered, the window tracks what callers see
+            hedger.latencies.add(time.monotonic() - start)
+            if winner is hedge:
+                hedger.record_hedge_win()
+            return output
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    return RunnableLambda(_invoke, afunc=_ainvoke, name="hedged")
@@ -0,0 +1,364 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Packed multi-abstract screening prompts (opt-in).
+
+Single-item screening sends the review protocol with every abstract. The protocol is
+served from the provider's prompt cache, but each call still pays a round trip, the
+per-request overhead and a rate limiter slot. Packed mode screens ``pack_size``
+abstracts per request instead: the system message is byte-identical to the
+single-item reviewer prompts (same persona, same :data:`review_protocol_prompt_text`),
+and the human turn lists the studies keyed by ``search_result_id``. The model
+answers with one :class:`~sr_assistant.core.schemas.PackedScreeningItem` per study.
+
+Every response is validated per item. Studies whose item is missing, duplicated,
+keyed by an unknown id or fails :class:`ScreeningResponse` validation, and all
+studies of a pack whose call failed, are re-screened with the single-item chain, so
+packed mode never yields fewer results than single-item mode.
+
+Packed calls bypass the LLM response cache: a pack's cache key would depend on which
+abstracts happen to share it. The single-item fallback is cached as usual.
+
+Packing may shift decisions compared to single-item screening, so compare the two
+on the benchmark page (``pack_size`` is recorded in the run's ``config_details``)
+before using it for real reviews.
+
+Examples:
+    >>> output = screen_abstracts_packed(
+    ...     batch, 0, review, pack_size=5
+    ... )  # doctest: +SKIP
+    >>> output.results[0].conservative_result.response_metadata["packed"]
+    True
+"""
+
+from __future__ import annotations
+
+import typing as t
+import uuid
+from copy import deepcopy
+from datetime import datetime, timezone
+
+from langchain_community.callbacks.manager import get_openai_callback
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig, RunnableParallel
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from loguru import logger
+from pydantic import ValidationError
+
+from sr_assistant.app.agents.rate_limit import rate_limited
+from sr_assistant.app.agents.retry_policy import with_retry_policy
+from sr_assistant.app.agents.screening_agents import (
+    BATCH_MAX_CONCURRENCY,
+    REVIEWER_MODEL_NAME,
+    ScreenAbstractResultTuple,
+    ScreenAbstractsBatchOutput,
+    comprehensive_reviewer_prompt_text,
+    conservative_reviewer_prompt_text,
+    llm1,
+    llm2,
+    openai_token_usage,
+    review_protocol_prompt_text,
+    reviewer_limiter,
+    screen_abstracts_batch_as_completed,
+    study_details_prompt_text,
+    to_screen_abstract_result_tuple,
+)
+from sr_assistant.core.schemas import (
+    PackedScreeningResponse,
+    ScreeningResponse,
+    ScreeningResult,
+)
+from sr_assistant.core.types import ScreeningStrategyType
+
+if t.TYPE_CHECKING:
+    from sr_assistant.core import models
+
+DEFAULT_PACK_SIZE = 5
+"""Abstracts per packed request."""
+
+PACKED_SCREENING_TOOL = convert_to_openai_tool(PackedScreeningResponse)["function"][
+    "name"
+]
+
+packed_study_details_prompt_text = """\
+This message contains {pack_size} studies instead of one. Assess each study \
+independently, exactly as if it were the only study in the message. Return exactly \
+one item per study, with the study's search_result_id copied verbatim.
+
+{studies}"""
+
+conservative_packed_prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            f"{conservative_reviewer_prompt_text}\n\n{review_protocol_prompt_text}",
+        ),
+        ("human", packed_study_details_prompt_text),
+    ]
+)
+
+comprehensive_packed_prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            f"{comprehensive_reviewer_prompt_text}\n\n{review_protocol_prompt_text}",
+        ),
+        ("human", packed_study_details_prompt_text),
+    ]
+)
+
+
+def _packed_reviewer(prompt: ChatPromptTemplate, llm: t.Any) -> t.Any:
+    # Raw AIMessage instead of with_structured_output(): a pydantic parser would
+    # reject the whole pack for one malformed item, we validate item by item.
+    model = llm.bind_tools(
+        [PackedScreeningResponse],
+        tool_choice=PACKED_SCREENING_TOOL,
+        parallel_tool_calls=False,
+    )
+    return with_retry_policy(prompt | rate_limited(model, reviewer_limiter))
+
+
+packed_screening_chain = RunnableParallel(
+    conservative=_packed_reviewer(conservative_packed_prompt, llm1),
+    comprehensive=_packed_reviewer(comprehensive_packed_prompt, llm2),
+)
+
+
+def format_packed_studies(pack: list[models.SearchResult]) -> str:
+    """Render the studies of a pack for the packed human turn.
+
+    Args:
+        pack (list[SearchResult]): Search results screened in one request.
+
+    Returns:
+        str: One :data:`study_details_prompt_text` block per study, each preceded by
+            its ``search_result_id``.
+    """
+    return "\n\n".join(
+        f"---\n\nsearch_result_id: {search_result.id}\n\n"
+        + study_details_prompt_text.format(
+            title=search_result.title or "",
+            year=search_result.year or "",
+            journal=search_result.journal or "",
+            abstract=search_result.abstract or "",
+        )
+        for search_result in pack
+    )
+
+
+def make_packed_chain_input(
+    pack: list[models.SearchResult], review: models.SystematicReview
+) -> dict[str, t.Any]:
+    """Create ``packed_screening_chain`` input for one pack.
+
+    Args:
+        pack (list[SearchResult]): Search results screened in one request.
+        review (SystematicReview): Review the search results belong to.
+
+    Returns:
+        dict[str, Any]: Prompt variables of the packed reviewer prompts.
+    """
+    return {
+        "background": review.background or "",
+        "research_question": review.research_question,
+        "inclusion_criteria": review.inclusion_criteria or "",
+        "exclusion_criteria": review.exclusion_criteria or "",
+        "pack_size": len(pack),
+        "studies": format_packed_studies(pack),
+    }
+
+
+def parse_packed_response(
+    message: AIMessage | t.Any, pack: list[models.SearchResult]
+) -> dict[uuid.UUID, ScreeningResponse]:
+    """Extract the valid per-study responses of one packed reviewer call.
+
+    Args:
+        message (AIMessage | Any): Reviewer output, or the exception it raised.
+        pack (list[SearchResult]): Search results of the pack.
+
+    Returns:
+        dict[uuid.UUID, ScreeningResponse]: Responses by search result id. Studies
+            without exactly one valid item are left out.
+    """
+    if not isinstance(message, AIMessage):
+        logger.warning(f"Packed reviewer call failed: {message!r}")
+        return {}
+    tool_call = next(
+        (tc for tc in message.tool_calls if tc["name"] == PACKED_SCREENING_TOOL), None
+    )
+    items = tool_call["args"].get("items") if tool_call else None
+    if not isinstance(items, list):
+        logger.warning(f"No packed screening items in response: {message!r}")
+        return {}
+
+    pack_ids = {str(search_result.id): search_result.id for search_result in pack}
+    responses: dict[uuid.UUID, ScreeningResponse] = {}
+    duplicates: set[uuid.UUID] = set()
+    for item in items:
+        if not isinstance(item, dict):
+            logger.warning(f"Malformed packed screening item: {item!r}")
+            continue
+        fields = dict(item)
+        search_result_id = pack_ids.get(str(fields.pop("search_result_id", "")))
+        if search_result_id is None:
+            logger.warning(f"Packed screening item for unknown study: {item!r}")
+            continue
+        if search_result_id in responses:
+            duplicates.add(search_result_id)
+            continue
+        try:
+            responses[search_result_id] = ScreeningResponse.model_validate(fields)
+        except ValidationError:
+            logger.warning(f"Invalid packed screening item: {item!r}")
+    for search_result_id in duplicates:
+        logger.warning(f"Duplicate packed screening items for {search_result_id}")
+        responses.pop(search_result_id, None)
+    return responses
+
+
+def _packed_screening_result(  # noqa: PLR0913
+    response: ScreeningResponse,
+    message: AIMessage,
+    *,
+    search_result: models.SearchResult,
+    strategy: ScreeningStrategyType,
+    trace_id: uuid.UUID,
+    pack_size: int,
+    start_time: datetime,
+    end_time: datetime,
+) -> ScreeningResult:
+    input_tokens, cached_input_tokens, output_tokens = openai_token_usage(
+        message.response_metadata.get("token_usage") or {}
+    )
+    return ScreeningResult(
+        trace_id=trace_id,
+        review_id=search_result.review_id,
+        search_result_id=search_result.id,
+        start_time=start_time,
+        end_time=end_time,
+        model_name=message.response_metadata.get("model_name", REVIEWER_MODEL_NAME),
+        screening_strategy=strategy,
+        response_metadata={
+            "run_name": "screen_abstracts_packed_chain",
+            "packed": True,
+            "pack_size": pack_size,
+            # Usage of the whole pack request, shared by every study in it
+            "pack_token_usage": {
+                "input_tokens": input_tokens,
+                "cached_input_tokens": cached_input_tokens,
+                "uncached_input_tokens": input_tokens - cached_input_tokens,
+                "output_tokens": output_tokens,
+                "llm_calls": 1,
+            },
+            "llm_cache_hit": False,
+        },
+        **response.model_dump(),
+    )
+
+
+def screen_abstracts_packed(
+    batch: list[models.SearchResult],
+    batch_idx: int,
+    review: models.SystematicReview,
+    *,
+    pack_size: int = DEFAULT_PACK_SIZE,
+    bypass_cache: bool = False,
+) -> ScreenAbstractsBatchOutput:
+    """Screen a batch with ``pack_size`` abstracts per reviewer request.
+
+    Drop-in for :func:`~sr_assistant.app.agents.screening_agents.screen_abstracts_batch`.
+    Studies the packed responses don't cover are re-screened with the single-item
+    chain (both reviewers), see module docstring.
+
+    Args:
+        batch (list[SearchResult]): list of search results to be screened
+        batch_idx (int): index of the batch
+        review (SystematicReview): systematic review associated with this batch
+        pack_size (int): Abstracts per packed request.
+        bypass_cache (bool): Skip LLM cache lookups in the single-item fallback.
+
+    Returns:
+        ScreenAbstractsBatchOutput: results in ``batch`` order and OpenAI cb for the
+            packed calls and the fallback.
+
+    Raises:
+        ValueError: If ``pack_size`` is less than 1.
+    """
+    if pack_size < 1:
+        msg = f"pack_size must be at least 1, got {pack_size}"
+        raise ValueError(msg)
+    batch_logger = logger.bind(batch_idx=batch_idx)
+    packs = [batch[i : i + pack_size] for i in range(0, len(batch), pack_size)]
+    trace_ids = [uuid.uuid4() for _ in packs]
+    configs = [
+        RunnableConfig(
+            run_name="screen_abstracts_packed_chain",
+            run_id=trace_id,
+            max_concurrency=BATCH_MAX_CONCURRENCY,
+            metadata={
+                "review_id": str(review.id),
+                "search_result_ids": [str(sr.id) for sr in pack],
+                "pack_size": len(pack),
+            },
+            tags=[
+                "sra:packed",
+                f"sra:review_id:{review.id}",
+                f"sra:screen_abstracts_packed_chain:i:{i}",
+            ],
+        )
+        for i, (pack, trace_id) in enumerate(zip(packs, trace_ids, strict=True))
+    ]
+    results: dict[uuid.UUID, ScreenAbstractResultTuple] = {}
+
+    with get_openai_callback() as cb_openai:
+        start_time = datetime.now(tz=timezone.utc)
+        outputs = packed_screening_chain.batch(
+            [make_packed_chain_input(pack, review) for pack in packs],
+            config=configs,
+            return_exceptions=True,
+        )
+        end_time = datetime.now(tz=timezone.utc)
+
+        for pack, trace_id, output in zip(packs, trace_ids, outputs, strict=True):
+            messages = output if isinstance(output, dict) else {}
+            responses = {
+                strategy: parse_packed_response(messages.get(strategy, output), pack)
+                for strategy in ScreeningStrategyType
+            }
+            for search_result in pack:
+                if not all(search_result.id in r for r in responses.values()):
+                    continue
+                results[search_result.id] = to_screen_abstract_result_tuple(
+                    search_result,
+                    {
+                        strategy: _packed_screening_result(
+                            responses[strategy][search_result.id],
+                            messages[strategy],
+                            search_result=search_result,
+                            strategy=strategy,
+                            trace_id=trace_id,
+                            pack_size=len(pack),
+                            start_time=start_time,
+                            end_time=end_time,
+                        )
+                        for strategy in ScreeningStrategyType
+                    },
+                    log=batch_logger,
+                )
+
+        fallback = [sr for sr in batch if sr.id not in results]
+        batch_logger.info(
+            f"Packed screening covered {len(results)}/{len(batch)}, {len(fallback)} to re-screen"
+        )
+        if fallback:
+            for result_tuple in screen_abstracts_batch_as_completed(
+                fallback, batch_idx, review, bypass_cache=bypass_cache
+            ):
+                results[result_tuple.search_result.id] = result_tuple
+
+    return ScreenAbstractsBatchOutput(
+        results=[results[sr.id] for sr in batch], cb=deepcopy(cb_openai)
+    )
@@ -0,0 +1,465 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Adaptive, rate-limit-aware concurrency control for LLM calls.
+
+Each provider/model pair gets its own :class:`AdaptiveConcurrencyLimiter` which
+caps the number of in-flight requests with additive-increase/multiplicative-decrease
+(AIMD):
+
+- every successful call adds ``increase_step / limit`` to the limit, i.e. roughly
+  one extra slot per "window" of successful calls,
+- a 429 (``openai.RateLimitError``, ``google.api_core.exceptions.ResourceExhausted``)
+  multiplies the limit by ``decrease_factor``. Only one decrease is applied per
+  ``cooldown`` seconds as a burst of in-flight requests tends to fail together,
+- while the latency EWMA is above ``latency_target`` or the
+  ``x-ratelimit-remaining-*`` response headers report less than ``headroom`` of the
+  quota left, the limit is not increased. Below ``headroom / 2`` it's decreased.
+
+The limiter is applied to a model runnable with :func:`rate_limited`, which
+acquires a slot around each call (including each ``with_retry`` attempt when
+wrapped inside it). LangChain drops the response headers of structured output
+(``response_format``) calls, so the OpenAI models get HTTP clients that pass them to
+the limiter, see :func:`rate_limit_http_clients`.
+
+Works for both sync (threads, e.g. ``Runnable.batch`` from Streamlit) and async
+callers (:class:`~sr_assistant.app.agents.screening_engine.ScreeningEngine`).
+
+APIs with a fixed requests per second quota instead (NCBI E-utilities) use a
+:class:`RequestRateLimiter`, which spaces request starts across threads.
+
+Examples:
+    >>> limiter = get_limiter("openai", "gpt-4o")  # doctest: +SKIP
+    >>> model = rate_limited(
+    ...     llm.with_structured_output(Schema), limiter
+    ... )  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import math
+import threading
+import time
+import typing as t
+from collections import deque
+from http import HTTPStatus
+
+from langchain_core.runnables import RunnableLambda
+from loguru import logger
+
+if t.TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    import httpx
+    from langchain_core.runnables import Runnable, RunnableConfig
+
+DEFAULT_INITIAL_LIMIT = 8
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 256
+
+
+class RateLimiterStats(t.NamedTuple):
+    """Point-in-time snapshot of a limiter's state.
+
+    Attributes:
+        provider (str): Provider name, e.g. "openai".
+        model (str): Model name.
+        limit (float): Current concurrency limit.
+        in_flight (int): Requests currently holding a slot.
+        successes (int): Total successful calls observed.
+        rate_limited (int): Total 429 errors observed.
+        decreases (int): Number of multiplicative decreases applied.
+        latency_ewma (float | None): Exponentially weighted mean latency in seconds.
+    """
+
+    provider: str
+    model: str
+    limit: float
+    in_flight: int
+    successes: int
+    rate_limited: int
+    decreases: int
+    latency_ewma: float | None
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limiter for a single provider/model.
+
+    Args:
+        provider (str): Provider name, used for logging.
+        model (str): Model name, used for logging.
+        initial_limit (float): Starting concurrency limit.
+        min_limit (float): Lower bound for the limit.
+        max_limit (float): Upper bound for the limit.
+        increase_step (float): Slots added per full window of successful calls.
+        decrease_factor (float): Multiplier applied to the limit on congestion.
+        cooldown (float): Minimum seconds between two decreases.
+        latency_target (float | None): Latency EWMA in seconds above which the limit
+            is held. None disables latency based control.
+        headroom (float): Fraction of the provider's remaining quota below which the
+            limit is held.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        provider: str,
+        model: str,
+        *,
+        initial_limit: float = DEFAULT_INITIAL_LIMIT,
+        min_limit: float = DEFAULT_MIN_LIMIT,
+        max_limit: float = DEFAULT_MAX_LIMIT,
+        increase_step: float = 1.0,
+        decrease_factor: float = 0.5,
+        cooldown: float = 5.0,
+        latency_target: float | None = None,
+        headroom: float = 0.1,
+    ) -> None:
+        """Initialize the limiter at ``initial_limit`` slots."""
+        if not 0 < min_limit <= initial_limit <= max_limit:
+            msg = f"Expected 0 < min_limit <= initial_limit <= max_limit, got {min_limit}, {initial_limit}, {max_limit}"
+            raise ValueError(msg)
+        if not 0 < decrease_factor < 1:
+            msg = f"decrease_factor must be in (0, 1), got {decrease_factor}"
+            raise ValueError(msg)
+        self.provider = provider
+        self.model = model
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.latency_target = latency_target
+        self.headroom = headroom
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._successes = 0
+        self._rate_limited = 0
+        self._decreases = 0
+        self._latency_ewma: float | None = None
+        self._last_decrease = -math.inf
+        self._quota_low = False
+        self._cond = threading.Condition()
+        self._async_waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = (
+            deque()
+        )
+        self._logger = logger.bind(provider=provider, model=model)
+
+    @property
+    def limit(self) -> float:
+        """Current concurrency limit."""
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently holding a slot."""
+        return self._in_flight
+
+    def stats(self) -> RateLimiterStats:
+        """Return a snapshot of the limiter state."""
+        with self._cond:
+            return RateLimiterStats(
+                provider=self.provider,
+                model=self.model,
+                limit=self._limit,
+                in_flight=self._in_flight,
+                successes=self._successes,
+                rate_limited=self._rate_limited,
+                decreases=self._decreases,
+                latency_ewma=self._latency_ewma,
+            )
+
+    def _slots(self) -> int:
+        return max(1, math.floor(self._limit))
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free without waiting.
+
+        Returns:
+            bool: True if a slot was taken and must be released with :meth:`release`.
+        """
+        with self._cond:
+            if self._in_flight < self._slots():
+                self._in_flight += 1
+                return True
+            return False
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Block the calling thread until a slot is free.
+
+        Args:
+            timeout (float | None): Maximum seconds to wait. None waits forever.
+
+        Returns:
+            bool: True if a slot was taken, False on timeout.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._in_flight < self._slots(), timeout=timeout
+            ):
+                return False
+            self._in_flight += 1
+            return True
+
+    async def aacquire(self) -> None:
+        """Wait on the running event loop until a slot is free."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._in_flight < self._slots():
+                    self._in_flight += 1
+                    return
+                waiter = (loop, asyncio.Event())
+                self._async_waiters.append(waiter)
+            try:
+                await waiter[1].wait()
+            except asyncio.CancelledError:
+                with self._cond:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+                    else:
+                        # Already woken, hand the wake-up on to the next waiter.
+                        self._wake(1)
+                raise
+
+    def release(self) -> None:
+        """Return a slot taken with :meth:`acquire`, :meth:`aacquire` or :meth:`try_acquire`."""
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._wake(1)
+
+    def _wake(self, n: int) -> None:
+        # Caller must hold self._cond. Waiters recheck for a free slot when woken.
+        self._cond.notify(n)
+        for _ in range(min(n, len(self._async_waiters))):
+            loop, event = self._async_waiters.popleft()
+            with contextlib.suppress(RuntimeError):  # loop already closed
+                loop.call_soon_threadsafe(event.set)
+
+    def on_success(self, latency: float) -> None:
+        """Record a successful call and additively increase the limit.
+
+        Args:
+            latency (float): Call duration in seconds.
+        """
+        with self._cond:
+            self._successes += 1
+            self._latency_ewma = (
+                latency
+                if self._latency_ewma is None
+                else 0.8 * self._latency_ewma + 0.2 * latency
+            )
+            if self._quota_low or (
+                self.latency_target is not None
+                and self._latency_ewma > self.latency_target
+            ):
+                return
+            old_slots = self._slots()
+            self._limit = min(
+                self.max_limit, self._limit + self.increase_step / self._limit
+            )
+            if self._slots() > old_slots:
+                self._wake(self._slots() - old_slots)
+
+    def on_rate_limited(self) -> None:
+        """Record a 429 response and multiplicatively decrease the limit."""
+        with self._cond:
+            self._rate_limited += 1
+            self._decrease("rate limited")
+
+    def observe_headers(self, headers: Mapping[str, t.Any]) -> None:
+        """Update quota state from ``x-ratelimit-*`` response headers.
+
+        Args:
+            headers (Mapping[str, t.Any]): HTTP response headers.
+        """
+        fractions: list[float] = []
+        for kind in ("requests", "tokens"):
+            remaining = _header_number(headers, f"x-ratelimit-remaining-{kind}")
+            limit = _header_number(headers, f"x-ratelimit-limit-{kind}")
+            if remaining is not None and limit:
+                fractions.append(remaining / limit)
+        if not fractions:
+            return
+        fraction = min(fractions)
+        with self._cond:
+            self._quota_low = fraction < self.headroom
+            if fraction < self.headroom / 2:
+                self._decrease(f"{fraction:.1%} of quota remaining")
+
+    def _decrease(self, reason: str) -> None:
+        # Caller must hold self._cond
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._decreases += 1
+        old = self._limit
+        self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+        self._logger.warning(
+            f"Decreasing concurrency limit {old:.1f} -> {self._limit:.1f}: {reason}"
+        )
+
+
+class RequestRateLimiter:
+    """Fixed rate limiter spacing request starts at least ``1 / rate`` seconds apart.
+
+    Thread-safe, requests from concurrent threads are queued in arrival order.
+
+    Args:
+        rate (float): Maximum requests per second.
+    """
+
+    def __init__(self, rate: float) -> None:
+        """Initialize the limiter at ``rate`` requests per second."""
+        if rate <= 0:
+            msg = f"rate must be positive, got {rate}"
+            raise ValueError(msg)
+        self.rate = rate
+        self._next_start = -math.inf
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block the calling thread until the next request may start.
+
+        Returns:
+            float: Seconds waited.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + 1 / self.rate
+        wait = start - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def _header_number(headers: Mapping[str, t.Any], name: str) -> float | None:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Whether an exception is a provider 429 / quota exhausted error.
+
+    Covers ``openai.RateLimitError`` (``status_code``) and
+    ``google.api_core.exceptions.ResourceExhausted`` (``code``) without importing
+    either SDK.
+    """
+    for attr in ("status_code", "code"):
+        if getattr(exc, attr, None) == HTTPStatus.TOO_MANY_REQUESTS:
+            return True
+    return type(exc).__name__ in {"RateLimitError", "ResourceExhausted"}
+
+
+_limiters: dict[tuple[str, str], AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(
+    provider: str, model: str, **kwargs: t.Any
+) -> AdaptiveConcurrencyLimiter:
+    """Return the process-wide limiter for a provider/model, creating it if needed.
+
+    Args:
+        provider (str): Provider name, e.g. "openai" or "google".
+        model (str): Model name.
+        **kwargs: Passed to :class:`AdaptiveConcurrencyLimiter` on creation only.
+
+    Returns:
+        AdaptiveConcurrencyLimiter: Shared limiter.
+    """
+    key = (provider, model)
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = AdaptiveConcurrencyLimiter(provider, model, **kwargs)
+        return _limiters[key]
+
+
+def rate_limited[Input, Output](
+    runnable: Runnable[Input, Output], limiter: AdaptiveConcurrencyLimiter
+) -> Runnable[Input, Output]:
+    """Gate a runnable's calls through a limiter.
+
+    Place inside ``.with_retry()`` so every attempt waits for a slot and 429s
+    shrink the limit before the next attempt.
+
+    Args:
+        runnable (Runnable): Model (or model with structured output) to wrap.
+        limiter (AdaptiveConcurrencyLimiter): Limiter for the model.
+
+    Returns:
+        Runnable: Runnable with the same input and output.
+    """
+
+    def _observe_error(exc: Exception) -> None:
+        if is_rate_limit_error(exc):
+            limiter.on_rate_limited()
+
+    def _invoke(input_: Input, config: RunnableConfig) -> Output:
+        limiter.acquire()
+        try:
+            start = time.monotonic()
+            output = runnable.invoke(input_, config)
+            limiter.on_success(time.monotonic() - start)
+            return output
+        except Exception as exc:
+            _observe_error(exc)
+            raise
+        finally:
+            limiter.release()
+
+    async def _ainvoke(input_: Input, config: RunnableConfig) -> Output:
+        await limiter.aacquire()
+        try:
+            start = time.monotonic()
+            output = await runnable.ainvoke(input_, config)
+            limiter.on_success(time.monotonic() - start)
+            return output
+        except Exception as exc:
+            _observe_error(exc)
+            raise
+        finally:
+            limiter.release()
+
+    return RunnableLambda(_invoke, afunc=_ainvoke, name=f"rate_limited:{limiter.model}")
+
+
+def rate_limit_http_clients(
+    limiter: AdaptiveConcurrencyLimiter, **client_kwargs: t.Any
+) -> tuple[httpx.Client, httpx.AsyncClient]:
+    """OpenAI SDK HTTP clients feeding ``x-ratelimit-*`` response headers to a limiter.
+
+    Pass them as ``ChatOpenAI(http_client=..., http_async_client=...)``. The headers
+    are read from every HTTP response, whether or not LangChain exposes them.
+
+    Args:
+        limiter (AdaptiveConcurrencyLimiter): Limiter to update.
+        **client_kwargs: Passed to both clients, e.g. ``transport``.
+
+    Returns:
+        tuple[httpx.Client, httpx.AsyncClient]: Sync and async client.
+    """
+    import openai
+
+    def _observe(response: httpx.Response) -> None:
+        limiter.observe_headers(response.headers)
+
+    async def _aobserve(response: httpx.Response) -> None:
+        limiter.observe_headers(response.headers)
+
+    return (
+        openai.DefaultHttpxClient(
+            event_hooks={"response": [_observe]}, **client_kwargs
+        ),
+        openai.DefaultAsyncHttpxClient(
+            event_hooks={"response": [_aobserve]}, **client_kwargs
+        ),
+    )
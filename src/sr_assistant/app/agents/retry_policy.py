@@ -0,0 +1,351 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Error-classifying retries for LLM chains.
+
+``Runnable.with_retry(retry_if_exception_type=(Exception,))`` retries everything the
+same way, so a prompt that's too long, a revoked API key or a response that doesn't
+match the schema is re-sent 5 times with exponential backoff. Here every failure is
+classified (:func:`classify_error`) and retried according to a :class:`RetryPolicy`:
+
+- ``transient`` (timeouts, connection errors, 5xx): retried with backoff,
+- ``rate_limit`` (429, quota): retried, the rate limiter shrinks concurrency,
+- ``permanent`` (4xx such as bad request/context length, auth, missing model,
+  programming errors): not retried,
+- ``output_parse`` (response doesn't validate against the schema): not re-called.
+  Models wrapped with :func:`structured_output_with_repair` already got a cheap
+  repair attempt that only sends the broken output back, not the whole prompt.
+
+Per-item retry information is recorded on the run tree: each retry attempt run is
+tagged ``retry:attempt:<n>`` (by LangChain) and ``retry:error_class:<class>`` of the
+failure that caused it, repair calls are tagged :data:`OUTPUT_REPAIR_TAG`.
+:func:`retry_stats` summarises these for a run, e.g. for ``response_metadata``.
+
+Examples:
+    >>> model = structured_output_with_repair(llm, Schema)  # doctest: +SKIP
+    >>> chain = with_retry_policy(
+    ...     prompt | rate_limited(model, limiter)
+    ... )  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+import json
+import typing as t
+from enum import StrEnum
+from http import HTTPStatus
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from langchain_core.runnables.config import patch_config
+from langchain_core.runnables.retry import RunnableRetry
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+from sr_assistant.app.agents.rate_limit import is_rate_limit_error
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.tracers.schemas import Run
+    from tenacity import RetryCallState
+
+OUTPUT_REPAIR_TAG = "sra:output_repair"
+"""Tag of the repair call runs made by :func:`structured_output_with_repair`."""
+
+ERROR_CLASS_TAG_PREFIX = "retry:error_class:"
+
+
+class ErrorClass(StrEnum):
+    """How a failed LLM call should be handled."""
+
+    TRANSIENT = "transient"
+    RATE_LIMIT = "rate_limit"
+    PERMANENT = "permanent"
+    OUTPUT_PARSE = "output_parse"
+
+
+_PERMANENT_ERROR_NAMES = frozenset(
+    {
+        # openai
+        "BadRequestError",
+        "AuthenticationError",
+        "PermissionDeniedError",
+        "NotFoundError",
+        "UnprocessableEntityError",
+        # google.api_core
+        "InvalidArgument",
+        "PermissionDenied",
+        "Unauthenticated",
+        "FailedPrecondition",
+        # langchain_google_genai, wraps InvalidArgument
+        "ChatGoogleGenerativeAIError",
+    }
+)
+_RETRYABLE_CLIENT_ERRORS = frozenset(
+    {HTTPStatus.REQUEST_TIMEOUT, HTTPStatus.CONFLICT, HTTPStatus.TOO_MANY_REQUESTS}
+)
+
+
+def classify_error(exc: BaseException) -> ErrorClass:
+    """Classify an LLM call failure.
+
+    Works on the OpenAI and Google SDK exceptions without importing either SDK, by
+    HTTP status (``status_code`` or ``code``) and exception name.
+
+    Args:
+        exc (BaseException): The exception raised by the call.
+
+    Returns:
+        ErrorClass: Class of the error, ``transient`` if unknown.
+    """
+    if is_rate_limit_error(exc):
+        return ErrorClass.RATE_LIMIT
+    if isinstance(exc, OutputParserException | ValidationError | json.JSONDecodeError):
+        return ErrorClass.OUTPUT_PARSE
+    for attr in ("status_code", "code"):
+        status = getattr(exc, attr, None)
+        if (
+            isinstance(status, int)
+            and HTTPStatus.BAD_REQUEST <= status < HTTPStatus.INTERNAL_SERVER_ERROR
+            and status not in _RETRYABLE_CLIENT_ERRORS
+        ):
+            return ErrorClass.PERMANENT
+    if type(exc).__name__ in _PERMANENT_ERROR_NAMES:
+        return ErrorClass.PERMANENT
+    if isinstance(exc, KeyError | TypeError | ValueError | NotImplementedError):
+        return ErrorClass.PERMANENT
+    return ErrorClass.TRANSIENT
+
+
+class RetryPolicy(t.NamedTuple):
+    """Maximum attempts (including the first call) per :class:`ErrorClass`."""
+
+    transient: int = 5
+    rate_limit: int = 8
+    permanent: int = 1
+    output_parse: int = 1
+
+    def max_attempts(self, error_class: ErrorClass) -> int:
+        """Maximum attempts for a class of error."""
+        return getattr(self, error_class.value)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+class PolicyRetry(RunnableRetry):  # type: ignore[type-arg]
+    """``RunnableRetry`` that stops according to a :class:`RetryPolicy`.
+
+    Batches are retried item by item (``RunnableRetry`` retries a batch's failures
+    together, stopping all of them at the first item's error class, and its
+    ``batch_as_completed`` skips the retries altogether).
+    """
+
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY
+
+    def _stop(self, retry_state: RetryCallState) -> bool:
+        outcome = retry_state.outcome
+        exc = outcome.exception() if outcome else None
+        if exc is None:
+            return True
+        error_class = classify_error(exc)
+        # RetryCallState is per call, carry the class to the next attempt's tags
+        retry_state.sra_error_class = error_class  # type: ignore[attr-defined]
+        stop = retry_state.attempt_number >= self.policy.max_attempts(error_class)
+        logger.bind(error_class=error_class, attempt=retry_state.attempt_number).log(
+            "ERROR" if stop else "WARNING",
+            f"{self.bound.get_name()} failed ({error_class}), "
+            + ("giving up" if stop else "retrying")
+            + f": {exc!r}",
+        )
+        return stop
+
+    @property
+    def _kwargs_retrying(self) -> dict[str, t.Any]:
+        return {**super()._kwargs_retrying, "stop": self._stop}
+
+    @t.override
+    def _patch_config(
+        self, config: RunnableConfig, run_manager: t.Any, retry_state: RetryCallState
+    ) -> RunnableConfig:
+        attempt = retry_state.attempt_number
+        callbacks = run_manager.get_child(
+            f"retry:attempt:{attempt}" if attempt > 1 else None
+        )
+        if error_class := getattr(retry_state, "sra_error_class", None):
+            callbacks.add_tags(
+                [f"{ERROR_CLASS_TAG_PREFIX}{error_class}"], inherit=False
+            )
+        return patch_config(config, callbacks=callbacks)
+
+    @t.override
+    def batch(
+        self,
+        inputs: list[t.Any],
+        config: RunnableConfig | list[RunnableConfig] | None = None,
+        *,
+        return_exceptions: bool = False,
+        **kwargs: t.Any,
+    ) -> list[t.Any]:
+        # Runnable.batch invokes each input on a thread, each with its own retries
+        return Runnable.batch(
+            self, inputs, config, return_exceptions=return_exceptions, **kwargs
+        )
+
+    @t.override
+    async def abatch(
+        self,
+        inputs: list[t.Any],
+        config: RunnableConfig | list[RunnableConfig] | None = None,
+        *,
+        return_exceptions: bool = False,
+        **kwargs: t.Any,
+    ) -> list[t.Any]:
+        return await Runnable.abatch(
+            self, inputs, config, return_exceptions=return_exceptions, **kwargs
+        )
+
+    @t.override
+    def batch_as_completed(
+        self,
+        inputs: Sequence[t.Any],
+        config: RunnableConfig | Sequence[RunnableConfig] | None = None,
+        *,
+        return_exceptions: bool = False,
+        **kwargs: t.Any,
+    ) -> Iterator[tuple[int, t.Any]]:
+        yield from Runnable.batch_as_completed(
+            self, inputs, config, return_exceptions=return_exceptions, **kwargs
+        )
+
+
+def with_retry_policy[Input, Output](
+    runnable: Runnable[Input, Output], policy: RetryPolicy = DEFAULT_RETRY_POLICY
+) -> Runnable[Input, Output]:
+    """Retry a runnable according to the class of each failure.
+
+    Replaces ``runnable.with_retry(retry_if_exception_type=(Exception,), ...)``.
+
+    Args:
+        runnable (Runnable): Chain or model to retry.
+        policy (RetryPolicy): Maximum attempts per error class.
+
+    Returns:
+        Runnable: Runnable with the same input and output.
+    """
+    return PolicyRetry(
+        bound=runnable,
+        kwargs={},
+        config={},
+        retry_exception_types=(Exception,),
+        wait_exponential_jitter=True,
+        max_attempt_number=max(policy),
+        policy=policy,
+    )
+
+
+REPAIR_PROMPT = """\
+Your previous answer could not be parsed into the required `{schema}` structure.
+
+Error:
+{error}
+
+Previous answer:
+{answer}
+
+Return the same answer again as a valid `{schema}`. Don't change its content beyond \
+what is needed to fix the error."""
+
+
+def _previous_answer(raw: t.Any) -> str:
+    if isinstance(raw, AIMessage) and raw.tool_calls:
+        return json.dumps([tc["args"] for tc in raw.tool_calls], default=str)
+    return str(getattr(raw, "content", raw))
+
+
+def structured_output_with_repair(
+    llm: BaseChatModel, schema: type[BaseModel]
+) -> Runnable[t.Any, t.Any]:
+    """``llm.with_structured_output(schema)`` with a repair call on parse errors.
+
+    A response that doesn't validate is sent back to the same model with the
+    validation error, without the original prompt, instead of re-running the whole
+    call. If the repair fails as well an :class:`OutputParserException` is raised,
+    which :class:`RetryPolicy` doesn't re-call by default.
+
+    Args:
+        llm (BaseChatModel): Chat model.
+        schema (type[BaseModel]): Output schema.
+
+    Returns:
+        Runnable: Runnable returning ``schema`` instances.
+    """
+    structured = llm.with_structured_output(schema, include_raw=True)
+    repair = llm.with_structured_output(schema)
+
+    def _parse_or_repair(output: dict[str, t.Any], config: RunnableConfig) -> t.Any:
+        if isinstance(output.get("parsed"), schema):
+            return output["parsed"]
+        error = output.get("parsing_error") or "No structured output in response"
+        logger.warning(f"Repairing unparseable {schema.__name__} output: {error!r}")
+        prompt = REPAIR_PROMPT.format(
+            schema=schema.__name__,
+            error=error,
+            answer=_previous_answer(output.get("raw")),
+        )
+        try:
+            repaired = repair.invoke(
+                [HumanMessage(prompt)],
+                patch_config(
+                    config, callbacks=config.get("callbacks"), run_name="output_repair"
+                )
+                | {"tags": [*config.get("tags", []), OUTPUT_REPAIR_TAG]},
+            )
+        except Exception as exc:
+            msg = f"{schema.__name__} output repair failed: {exc!r}"
+            raise OutputParserException(msg) from exc
+        if not isinstance(repaired, schema):
+            msg = f"{schema.__name__} output repair returned {repaired!r}"
+            raise OutputParserException(msg)
+        return repaired
+
+    return structured | RunnableLambda(_parse_or_repair, name="parse_or_repair")
+
+
+def _iter_runs(run_obj: Run) -> Iterator[Run]:
+    yield run_obj
+    child_runs = getattr(run_obj, "child_runs", None)
+    if isinstance(child_runs, list):
+        for child in child_runs:
+            yield from _iter_runs(child)
+
+
+def retry_stats(run_obj: Run) -> dict[str, t.Any]:
+    """Retries and output repairs below a run, e.g. one screening reviewer call.
+
+    Args:
+        run_obj (Run): Run to summarise.
+
+    Returns:
+        dict[str, Any]: ``retries`` (number of retry attempts), ``error_classes``
+            (class of each failure that was retried, in order) and ``output_repairs``.
+    """
+    error_classes: list[str] = []
+    output_repairs = 0
+    for run in _iter_runs(run_obj):
+        tags = run.tags or []
+        error_classes.extend(
+            tag.removeprefix(ERROR_CLASS_TAG_PREFIX)
+            for tag in tags
+            if tag.startswith(ERROR_CLASS_TAG_PREFIX)
+        )
+        if run.run_type == "chat_model" and OUTPUT_REPAIR_TAG in tags:
+            output_repairs += 1
+    return {
+        "retries": len(error_classes),
+        "error_classes": error_classes,
+        "output_repairs": output_repairs,
+    }
@@ -30,6 +30,9 @@ For this initial prototype, we'll stay within Streamlit and leverage LangChain
 runnables' parallel and batching capabilities, which use a threadpool executor
 under the hood.
 
+Outside of Streamlit, use :class:`sr_assistant.app.agents.screening_engine.ScreeningEngine`
+which runs the same chain on an asyncio event loop with bounded concurrency.
+
 ## TODO
 
 - Either move types here or from here to core.types/schemas. Not both.
@@ -37,6 +40,8 @@ under the hood.
 
 from __future__ import annotations
 
+import hashlib
+import json
 import typing as t
 import uuid
 from copy import deepcopy
@@ -44,15 +49,31 @@ from datetime import datetime, timezone
 
 import streamlit as st
 from langchain_community.callbacks.manager import get_openai_callback
+from langchain_core.callbacks import BaseCallbackHandler, BaseCallbackManager
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableConfig, RunnableParallel
+from langchain_core.runnables import RunnableConfig, RunnableLambda, RunnableParallel
+from langchain_core.runnables.config import patch_config
 from langchain_google_genai.chat_models import ChatGoogleGenerativeAI
 from langchain_openai.chat_models import ChatOpenAI
 from loguru import logger
 from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
 
 import sr_assistant.app.utils as ut
+from sr_assistant.app.agents.hedging import HedgeStats, hedged
+from sr_assistant.app.agents.rate_limit import (
+    get_limiter,
+    rate_limit_http_clients,
+    rate_limited,
+)
+from sr_assistant.app.agents.retry_policy import (
+    ERROR_CLASS_TAG_PREFIX,
+    OUTPUT_REPAIR_TAG,
+    classify_error,
+    structured_output_with_repair,
+    with_retry_policy,
+)
 from sr_assistant.app.config import get_settings
+from sr_assistant.app.llm_cache import BYPASS_CACHE_KEY, cached, get_llm_cache
 from sr_assistant.core import models, schemas
 from sr_assistant.core.schemas import (
     ResolverOutputSchema,
@@ -62,29 +83,47 @@ from sr_assistant.core.schemas import (
 from sr_assistant.core.types import ScreeningStrategyType
 
 if t.TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping, Sequence
+
     from langchain_community.callbacks.openai_info import OpenAICallbackHandler
+    from langchain_core.callbacks import (
+        AsyncCallbackManagerForChainRun,
+        CallbackManagerForChainRun,
+    )
+    from langchain_core.outputs import LLMResult
+    from langchain_core.runnables import Runnable
     from langchain_core.tracers.schemas import Run
 
 REVIEWER_MODEL_NAME = "gpt-4o"
 RESOLVER_MODEL_NAME = "gemini-2.5-pro-preview-05-06"
+RESOLVER_TIMEOUT = 300.0
+"""Deadline in seconds per resolver request, timeouts are retried as transient."""
+BATCH_MAX_CONCURRENCY = 32
+"""Thread pool size of a screening ``.batch()``, reviewer_limiter paces calls within it."""
+
+# Reviewer and resolver calls are paced independently, see rate_limit module.
+reviewer_limiter = get_limiter("openai", REVIEWER_MODEL_NAME, latency_target=30.0)
+resolver_limiter = get_limiter("google", RESOLVER_MODEL_NAME, latency_target=180.0)
+
 # NOTE: IMPORTANT - the order of with_structured_output and with_retry matters.
-#       with_structured_output must be before with_retry.
-resolver_model = (
-    ChatGoogleGenerativeAI(
-        model=RESOLVER_MODEL_NAME,
-        temperature=0,
-        max_tokens=None,
-        # thinking_budget=24576,  # TODO: This is a langchain-google-genai v2.1.4 featere, but we can't upgrade due to LangChain minor version upgrade breaking the way on_end listener works (its modifications to RunTree are not present in chain output in later versions. We will file a bug report for this as it's an undocumented breaking change.) For now we've pinned LangChain and Pydantic versions to known working versions. We may need to refactor screening logic later on, for now we stick with this setup. Gemini uses thinking by default, without a budget, how deeply it thinks is dependent on the prompt, so it must encourage deep analysis!)  # noqa: W505
-        timeout=None,
-        max_retries=5,
-        api_key=get_settings().GOOGLE_API_KEY,
-        convert_system_message_to_human=True,  # Gemini doesn't support system messages
-    )
-    .with_structured_output(ResolverOutputSchema)
-    .with_retry(
-        stop_after_attempt=5,
-        wait_exponential_jitter=True,
-        retry_if_exception_type=(Exception,),
+#       with_structured_output must be before with_retry (here with_retry_policy).
+resolver_model = with_retry_policy(
+    rate_limited(
+        structured_output_with_repair(
+            ChatGoogleGenerativeAI(
+                model=RESOLVER_MODEL_NAME,
+                temperature=0,
+                max_tokens=None,
+                # thinking_budget=24576,  # TODO: This is a langchain-google-genai v2.1.4 featere, but we can't upgrade due to LangChain minor version upgrade breaking the way on_end listener works (its modifications to RunTree are not present in chain output in later versions. We will file a bug report for this as it's an undocumented breaking change.) For now we've pinned LangChain and Pydantic versions to known working versions. We may need to refactor screening logic later on, for now we stick with this setup. Gemini uses thinking by default, without a budget, how deeply it thinks is dependent on the prompt, so it must encourage deep analysis!)  # noqa: W505
+                timeout=RESOLVER_TIMEOUT,
+                # Let 429s reach the limiter, with_retry_policy does the retrying.
+                max_retries=0,
+                api_key=get_settings().GOOGLE_API_KEY,
+                convert_system_message_to_human=True,  # Gemini doesn't support system messages
+            ),
+            ResolverOutputSchema,
+        ),
+        resolver_limiter,
     )
 )
 
@@ -642,6 +681,8 @@ class ScreeningError(BaseModel):
         search_result (SearchResult): Search result associated with this screening error
         error (t.Any): Error encountered during screening
         message (str | None): Human-readable error message. Default is None.
+        error_class (str | None): How the retry policy classified ``error``, set
+            automatically for exceptions.
     """
 
     search_result: models.SearchResult = Field(
@@ -651,9 +692,15 @@ class ScreeningError(BaseModel):
     message: str | None = Field(
         default=None, description="Human-readable error message"
     )
+    error_class: str | None = Field(
+        default=None,
+        description="retry_policy.ErrorClass of the error if it's an exception",
+    )
 
     @model_validator(mode="after")
     def _validate_error_and_message(self) -> t.Self:  # this is an instance method
+        if self.error_class is None and isinstance(self.error, BaseException):
+            self.error_class = classify_error(self.error)
         if isinstance(self.error, ScreeningResult) and self.message is None:
             msg = "ScreeningResult should always have a message"
             logger.warning(msg)
@@ -715,136 +762,295 @@ def chain_on_error_listener_cb(run_obj: Run) -> None:
             cb_cr_logger.error("Associated child run details: {cr!r}", cr=cr)
 
 
-@logger.catch(onerror=lambda exc: st.error(exc) if ut.in_streamlit() else None)  # pyright: ignore [reportArgumentType]
-def screen_abstracts_chain_on_end_cb(run_obj: Run) -> None:  # noqa: C901
-    """Listener for screening batch run on_end hook.
+def openai_token_usage(usage: Mapping[str, t.Any]) -> tuple[int, int, int]:
+    """Return ``(input_tokens, cached_input_tokens, output_tokens)`` of an OpenAI usage.
 
-    See `.with_listeners <https://python.langchain.com/api_reference/_modules/langchain_core/runnables/base.html#RunnableBinding.with_listeners>`_
+    Args:
+        usage (Mapping[str, Any]): ``usage`` of a chat completion response.
+    """
+    details = usage.get("prompt_tokens_details") or {}
+    return (
+        int(usage.get("prompt_tokens") or 0),
+        int(details.get("cached_tokens") or 0),
+        int(usage.get("completion_tokens") or 0),
+    )
 
-    Modifications to the `Run`|`RunTree` persist and no need to return anything. It's a
-    Pydantic v1 model.
 
-    Todo:
-        - More metadata extraction
+def _llm_token_usage(
+    llm_output: t.Any, generations: Sequence[Sequence[t.Any]]
+) -> tuple[int, int, int]:
+    """Return ``(input_tokens, cached_input_tokens, output_tokens)`` of an LLM result.
+
+    ``generations`` may hold ``ChatGeneration`` objects or their serialized dicts as
+    found in ``Run.outputs``.
     """
-    cr_logger = logger.bind(run_id=run_obj.id, run_name=run_obj.name)
-    cr_logger.debug(f"screen_abstracts_chain_on_end_cb got RunTree: {run_obj!r}")
-    if not run_obj.outputs:
-        cr_logger.warning(f"No outputs for run: {run_obj!r}")
-        return
-    # Each child run is one screening chain invocation within RunnableParallel. This
-    # parent RunTree is the RunnableParallel itself.
-    for cr in run_obj.child_runs:
-        cr_logger = logger.bind(
-            run_id=cr.id,
-            run_name=cr.name,
-            parent_run_id=run_obj.id,
-            parent_run_name=run_obj.name,
+    llm_output = llm_output or {}
+    token_usage = (
+        llm_output.get("token_usage") if isinstance(llm_output, dict) else None
+    )
+    if isinstance(token_usage, dict) and token_usage:
+        return openai_token_usage(token_usage)
+    input_tokens = cached_tokens = output_tokens = 0
+    for generation in generations[0] if generations else []:
+        message = (
+            generation.get("message")
+            if isinstance(generation, dict)
+            else getattr(generation, "message", None)
         )
-        cr_logger.debug(f"screen_abstracts_chain_on_end_cb got child run: {cr!r}")
-        if cr.outputs is None:
-            cr_logger.warning(f"No outputs for child run: {cr!r}")
-            continue
-        # Can't pass the strategy in the invocation metadata as its parallel.
-        # So run tags populated by LC/LS is the only way to get it. `map:key:...` is
-        # a kwarg key in RunnableParallel input dict.
-        output_key: ScreeningStrategyType
-        if isinstance(cr.tags, list):
-            maybe_output_key = next(
-                (
-                    t.removeprefix("map:key:")
-                    for t in cr.tags
-                    if t.startswith("map:key:")
-                ),
-                None,
+        usage = getattr(message, "usage_metadata", None)
+        if usage is None and isinstance(message, dict):
+            usage = message.get("usage_metadata") or message.get("kwargs", {}).get(
+                "usage_metadata"
             )
-            if maybe_output_key in ScreeningStrategyType:
-                output_key = ScreeningStrategyType(maybe_output_key)
-                cr_logger.debug(f"Output key for run: {cr.id!r} is {output_key}")
-            else:
-                cr_logger.error("Unknown output key for run")
-                continue
-        else:
-            cr_logger.error(f"No tags for run: {cr.id!r}, tags: {cr.tags!r}")
-            continue
-        orig_resp_model = cr.outputs.get("output")
-        if not isinstance(orig_resp_model, ScreeningResponse):
-            # We simply return the output as is and let caller make it a ScreeningError
-            cr_logger.error(f"Unknown response type: {orig_resp_model!r}")
-            continue
-        review_id = cr.metadata.get("review_id")
-        if not review_id:
-            cr_logger.error(f"Missing review_id in metadata: {cr.metadata!r}")
+        if not isinstance(usage, dict):
             continue
-        review_id = uuid.UUID(review_id)
-        search_result_id = cr.metadata.get("search_result_id")
-        if not search_result_id:
-            cr_logger.error(f"Missing search_result_id in metadata: {cr.metadata!r}")
-            continue
-        search_result_id = uuid.UUID(search_result_id)
-        result_id = cr.id
-        trace_id = cr.trace_id  # this is shared between invocations with same input
-        inputs = cr.inputs
-        start_time = cr.start_time
-        end_time = cr.end_time
-        if not end_time:
-            cr_logger.warning("No end time for run: {cr!r}, setting to now")
-            end_time = datetime.now(tz=timezone.utc)
-        resp_metadata = {}  # FIXME: these don't work
-        invocation_params = {}
-        for ccr in cr.child_runs:
-            # TODO: parse model_id from openai metadata
-            if ccr.run_type == "chat_model":
-                resp_metadata = ccr.extra.get("metadata", {})
-                if not resp_metadata:
-                    cr_logger.warning(
-                        "No response metadata for chat_model child child run: {ccr!r}",
-                        ccr=ccr,
-                    )
-                invocation_params = ccr.extra.get("invocation_params", {})
-                if not invocation_params:
-                    cr_logger.warning(
-                        "No invocation_params for chat_model child child run:  {ccr!r}",
-                        ccr=ccr,
-                    )
-                cr_logger.debug(f"chat_model child child run: {ccr!r}")
-        model_name = resp_metadata.get(
-            "ls_model_name", invocation_params.get("model_name", "not_found")
+        input_tokens += int(usage.get("input_tokens") or 0)
+        cached_tokens += int(
+            (usage.get("input_token_details") or {}).get("cache_read") or 0
         )
-        screening_result = ScreeningResult(
-            id=result_id,
-            trace_id=trace_id,  # this is shared between invocations with same input
-            review_id=review_id,
-            search_result_id=search_result_id,
+        output_tokens += int(usage.get("output_tokens") or 0)
+    return input_tokens, cached_tokens, output_tokens
+
+
+_MODEL_PARAM_KEYS = ("model_name", "model", "temperature", "_type")
+"""``invocation_params`` kept in ``response_metadata``, tools/schemas are left out."""
+
+
+class ScreeningCallCollector(BaseCallbackHandler):
+    """Callback handler collecting the metadata of one reviewer call.
+
+    Attached by :func:`with_screening_result` to a single reviewer invocation, it
+    keeps running totals as callbacks arrive instead of the whole run tree a
+    ``with_listeners`` tracer would build: the model's identifying params, token
+    usage, retries and output repairs. Prompts and messages are never stored.
+    """
+
+    run_inline = True  # No thread pool hop from async runs, the methods are cheap
+
+    def __init__(self) -> None:
+        self.model_metadata: dict[str, t.Any] = {}
+        self.input_tokens = 0
+        self.cached_input_tokens = 0
+        self.output_tokens = 0
+        self.llm_calls = 0
+        self.error_classes: list[str] = []
+        self.output_repairs = 0
+
+    def _record_retry(self, tags: list[str] | None) -> None:
+        self.error_classes.extend(
+            tag.removeprefix(ERROR_CLASS_TAG_PREFIX)
+            for tag in tags or []
+            if tag.startswith(ERROR_CLASS_TAG_PREFIX)
+        )
+
+    @t.override
+    def on_chain_start(
+        self,
+        serialized: dict[str, t.Any],
+        inputs: dict[str, t.Any],
+        *,
+        tags: list[str] | None = None,
+        **kwargs: t.Any,
+    ) -> None:
+        self._record_retry(tags)
+
+    @t.override
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, t.Any],
+        messages: list[list[t.Any]],
+        *,
+        tags: list[str] | None = None,
+        metadata: dict[str, t.Any] | None = None,
+        **kwargs: t.Any,
+    ) -> None:
+        self.llm_calls += 1
+        self._record_retry(tags)
+        if OUTPUT_REPAIR_TAG in (tags or []):
+            self.output_repairs += 1
+        elif not self.model_metadata:
+            invocation_params = kwargs.get("invocation_params") or {}
+            self.model_metadata = {
+                **{k: v for k, v in (metadata or {}).items() if k.startswith("ls_")},
+                **{
+                    k: invocation_params[k]
+                    for k in _MODEL_PARAM_KEYS
+                    if k in invocation_params
+                },
+            }
+
+    @t.override
+    def on_llm_end(self, response: LLMResult, **kwargs: t.Any) -> None:
+        input_tokens, cached_tokens, output_tokens = _llm_token_usage(
+            response.llm_output, response.generations
+        )
+        self.input_tokens += input_tokens
+        self.cached_input_tokens += cached_tokens
+        self.output_tokens += output_tokens
+
+    @property
+    def model_name(self) -> str | None:
+        """Name of the model called, None if no call was made."""
+        return self.model_metadata.get(
+            "ls_model_name", self.model_metadata.get("model_name")
+        )
+
+    def token_usage(self) -> dict[str, int]:
+        """Input, cached and uncached input, output tokens and number of LLM calls.
+
+        Cached input tokens are the ones the provider served from its prompt cache,
+        see ``review_protocol_prompt_text``. All zero on an LLM response cache hit.
+        """
+        return {
+            "input_tokens": self.input_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+            "uncached_input_tokens": self.input_tokens - self.cached_input_tokens,
+            "output_tokens": self.output_tokens,
+            "llm_calls": self.llm_calls,
+        }
+
+    def retry_stats(self) -> dict[str, t.Any]:
+        """Retries in the shape of :func:`retry_policy.retry_stats`."""
+        return {
+            "retries": len(self.error_classes),
+            "error_classes": list(self.error_classes),
+            "output_repairs": self.output_repairs,
+        }
+
+
+def _with_collector(
+    config: RunnableConfig, collector: ScreeningCallCollector
+) -> RunnableConfig:
+    callbacks = config.get("callbacks")
+    if isinstance(callbacks, BaseCallbackManager):
+        callbacks = callbacks.copy()
+        callbacks.add_handler(collector, inherit=True)
+    else:
+        callbacks = [*(callbacks or []), collector]
+    return patch_config(config, callbacks=callbacks)
+
+
+def with_screening_result(
+    runnable: Runnable[t.Any, t.Any],
+    strategy: ScreeningStrategyType,
+    *,
+    model_name: str = REVIEWER_MODEL_NAME,
+) -> Runnable[t.Any, ScreeningResult | t.Any]:
+    """Turn a reviewer's ``ScreeningResponse`` into a :class:`ScreeningResult`.
+
+    Everything the result needs is captured while the call runs: the result id is
+    this run's id, the trace id its parent's (the ``RunnableParallel`` of both
+    reviewers), timings are measured here and model, token usage and retries come
+    from a :class:`ScreeningCallCollector`.
+    ``review_id`` and ``search_result_id`` are read from the config metadata set by
+    :func:`make_screen_abstracts_chain_input`.
+
+    Outputs other than ``ScreeningResponse`` are passed through for
+    :func:`to_screen_abstract_result_tuple` to turn into a :class:`ScreeningError`.
+
+    Args:
+        runnable (Runnable): Reviewer chain returning ``ScreeningResponse``.
+        strategy (ScreeningStrategyType): Strategy of the reviewer.
+        model_name (str): Model name recorded when no model was called, i.e. the
+            response came from the LLM cache.
+
+    Returns:
+        Runnable: Runnable with the same input, returning ``ScreeningResult``.
+    """
+    strategy_tag = f"sra:screening_strategy:{strategy}"
+
+    def _inner_config(
+        config: RunnableConfig, collector: ScreeningCallCollector
+    ) -> RunnableConfig:
+        inner = _with_collector(config, collector)
+        return inner | {
+            "tags": [*inner.get("tags", []), strategy_tag],
+            "metadata": {**inner.get("metadata", {}), "screening_strategy": strategy},
+        }
+
+    def _to_result(
+        output: t.Any,
+        collector: ScreeningCallCollector,
+        run_manager: CallbackManagerForChainRun | AsyncCallbackManagerForChainRun,
+        config: RunnableConfig,
+        start_time: datetime,
+    ) -> ScreeningResult | t.Any:
+        result_logger = logger.bind(run_id=run_manager.run_id, strategy=strategy)
+        if not isinstance(output, ScreeningResponse):
+            result_logger.error(f"Unknown response type: {type(output)!r}")
+            return output
+        metadata = config.get("metadata", {})
+        return ScreeningResult(
+            id=run_manager.run_id,
+            # Shared by both reviewers of the same search result
+            trace_id=run_manager.parent_run_id or run_manager.run_id,
+            review_id=uuid.UUID(metadata["review_id"]),
+            search_result_id=uuid.UUID(metadata["search_result_id"]),
             start_time=start_time,
-            end_time=end_time,
-            model_name=model_name,
-            screening_strategy=output_key,
-            response_metadata=dict(
-                inputs=inputs,
-                run_name=run_obj.name,
-                **resp_metadata,
-                **invocation_params,
-            ),
-            **orig_resp_model.model_dump(),
+            end_time=datetime.now(tz=timezone.utc),
+            model_name=collector.model_name or model_name,
+            screening_strategy=strategy,
+            response_metadata={
+                **collector.model_metadata,
+                "token_usage": collector.token_usage(),
+                "llm_cache_hit": collector.llm_calls == 0,
+                "retry": collector.retry_stats(),
+            },
+            **output.model_dump(),
         )
-        cr.metadata["screening_strategy"] = output_key
 
-        strategy_tag = f"sra:screening_strategy:{output_key}"
-        cr.tags.append(strategy_tag)
-        if run_obj.tags and strategy_tag not in run_obj.tags:
-            run_obj.tags.append(strategy_tag)
+    def _invoke(
+        input_: t.Any,
+        config: RunnableConfig,
+        run_manager: CallbackManagerForChainRun,
+    ) -> ScreeningResult | t.Any:
+        start_time = datetime.now(tz=timezone.utc)
+        collector = ScreeningCallCollector()
+        output = runnable.invoke(input_, _inner_config(config, collector))
+        return _to_result(output, collector, run_manager, config, start_time)
 
-        if output_key not in run_obj.outputs:
-            logger.warning(
-                f"Missing output key: {output_key!r} in {run_obj.outputs!r}, assigning as new key ..."
-            )
-        run_obj.outputs[output_key] = screening_result
+    async def _ainvoke(
+        input_: t.Any,
+        config: RunnableConfig,
+        run_manager: AsyncCallbackManagerForChainRun,
+    ) -> ScreeningResult | t.Any:
+        start_time = datetime.now(tz=timezone.utc)
+        collector = ScreeningCallCollector()
+        output = await runnable.ainvoke(input_, _inner_config(config, collector))
+        return _to_result(output, collector, run_manager, config, start_time)
+
+    return RunnableLambda(_invoke, afunc=_ainvoke, name=f"screening_result:{strategy}")
+
+
+def criteria_fingerprint(review: models.SystematicReview) -> str:
+    """Hash of the review fields the screening prompts are rendered with.
+
+    Changes whenever the background, research question or criteria are edited, so
+    anything derived from the rendered prompts can be cached per criteria version.
+
+    Args:
+        review (SystematicReview): The review.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    payload = json.dumps(
+        [
+            review.background or "",
+            review.research_question or "",
+            review.inclusion_criteria or "",
+            review.exclusion_criteria or "",
+        ]
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
 
 
 @logger.catch(onerror=lambda exc: st.error(exc) if ut.in_streamlit() else None)  # pyright: ignore [reportArgumentType]
 def make_screen_abstracts_chain_input(
-    search_results_batch: list[models.SearchResult], review: models.SystematicReview
+    search_results_batch: list[models.SearchResult],
+    review: models.SystematicReview,
+    *,
+    bypass_cache: bool = False,
 ) -> ScreenAbstractsChainBatchInputDict:
     """Create input for a batch to be passed to abstracts screening chain.
 
@@ -860,6 +1066,7 @@ def make_screen_abstracts_chain_input(
     Args:
         search_results_batch (list[models.SearchResult]): list of search results to be screened
         review (models.SystematicReview): systematic review associated with these search results
+        bypass_cache (bool): Skip LLM cache lookups, fresh responses are still cached.
 
     Returns:
         ScreenAbstractsChainBatchInputDict: dict of list of prompt inputs and list of RunnableConfigs.
@@ -874,10 +1081,12 @@ def make_screen_abstracts_chain_input(
         configs.append(
             RunnableConfig(
                 run_name="screen_abstracts_chain",
+                max_concurrency=BATCH_MAX_CONCURRENCY,
                 metadata={
                     "review_id": str(review.id),
                     "search_result_id": str(search_result.id),
                 },
+                configurable={BYPASS_CACHE_KEY: bypass_cache},
                 tags=[
                     "sra:prototype",
                     "sra:streamlit",
@@ -902,9 +1111,6 @@ def make_screen_abstracts_chain_input(
                 ).model_dump()
             )
         )
-        logger.info(
-            f"Created chain input for search result {i}: config: {configs[-1]!r}, input: {chain_inputs[-1]!r}"
-        )
     return ScreenAbstractsChainBatchInputDict(inputs=chain_inputs, config=configs)
 
 
@@ -993,7 +1199,11 @@ Maintain awareness that excluding a relevant paper (false negative) is more prob
 Your comprehensive approach should capture potentially relevant studies that might be missed by more restrictive screening. Focus on maximizing sensitivity while maintaining analytical rigor."""
 
 
-task_prompt_text = """\
+# Everything review-level lives in the system message so the prompt prefix is
+# byte-identical for every abstract of a review and the provider's prompt cache can
+# serve it. Only the study details in the human turn change per call. Keep anything
+# per-study out of this text or every call becomes a cache miss.
+review_protocol_prompt_text = """\
 # Review protocol outputs
 
 ## Background to review:
@@ -1008,12 +1218,16 @@ task_prompt_text = """\
 ## Exclusion Criteria:
 {exclusion_criteria}
 
-Please assess the following abstract for inclusion in the systematic review:
+# Task
+
+You will be given the details of one study per message. Assess its abstract for \
+inclusion in the systematic review.
 
 Your rationale must explicitly connect abstract content to specific criteria. \
 For uncertain decisions, clearly state what additional information would be needed \
-to make a confident decision.
+to make a confident decision."""
 
+study_details_prompt_text = """\
 # Study details:
 
 ## Title:
@@ -1029,38 +1243,87 @@ to make a confident decision.
 {abstract}"""
 
 conservative_reviewer_prompt = ChatPromptTemplate.from_messages(
-    [("system", conservative_reviewer_prompt_text), ("human", task_prompt_text)]
+    [
+        (
+            "system",
+            f"{conservative_reviewer_prompt_text}\n\n{review_protocol_prompt_text}",
+        ),
+        ("human", study_details_prompt_text),
+    ]
 )
 
 comprehensive_reviewer_prompt = ChatPromptTemplate.from_messages(
-    [("system", comprehensive_reviewer_prompt_text), ("human", task_prompt_text)]
+    [
+        (
+            "system",
+            f"{comprehensive_reviewer_prompt_text}\n\n{review_protocol_prompt_text}",
+        ),
+        ("human", study_details_prompt_text),
+    ]
 )
 
 # TODO: probably no need for two of these, can reuse one
-llm1 = ChatOpenAI(model=REVIEWER_MODEL_NAME, temperature=0)
-llm2 = ChatOpenAI(model=REVIEWER_MODEL_NAME, temperature=0)
+# max_retries=0: let 429s reach the limiter, the chain's with_retry does the retrying.
+reviewer_http_client, reviewer_http_async_client = rate_limit_http_clients(
+    reviewer_limiter
+)
+llm1 = ChatOpenAI(
+    model=REVIEWER_MODEL_NAME,
+    temperature=0,
+    max_retries=0,
+    http_client=reviewer_http_client,
+    http_async_client=reviewer_http_async_client,
+)
+llm2 = ChatOpenAI(
+    model=REVIEWER_MODEL_NAME,
+    temperature=0,
+    max_retries=0,
+    http_client=reviewer_http_client,
+    http_async_client=reviewer_http_async_client,
+)
 
-# These return Pydantic models
-llm1_with_structured_output = llm1.with_structured_output(schemas.ScreeningResponse)
-llm2_with_structured_output = llm2.with_structured_output(schemas.ScreeningResponse)
+# These return Pydantic models. Hedged when the run has a Hedger, see hedging module.
+llm1_with_structured_output = hedged(
+    rate_limited(
+        structured_output_with_repair(llm1, schemas.ScreeningResponse),
+        reviewer_limiter,
+    )
+)
+llm2_with_structured_output = hedged(
+    rate_limited(
+        structured_output_with_repair(llm2, schemas.ScreeningResponse),
+        reviewer_limiter,
+    )
+)
 
+# Cache hits skip the model (and its retries) entirely, see llm_cache module.
 screen_abstracts_chain = RunnableParallel(
-    conservative=(
-        conservative_reviewer_prompt | llm1_with_structured_output
-    ).with_retry(
-        stop_after_attempt=5,
-        wait_exponential_jitter=True,
-        retry_if_exception_type=(Exception,),
+    conservative=with_screening_result(
+        cached(
+            with_retry_policy(
+                conservative_reviewer_prompt | llm1_with_structured_output
+            ),
+            namespace=f"screening:{ScreeningStrategyType.CONSERVATIVE}",
+            prompt=conservative_reviewer_prompt,
+            model_name=REVIEWER_MODEL_NAME,
+            temperature=llm1.temperature,
+            output_type=schemas.ScreeningResponse,
+        ),
+        ScreeningStrategyType.CONSERVATIVE,
     ),
-    comprehensive=(
-        comprehensive_reviewer_prompt | llm2_with_structured_output
-    ).with_retry(
-        stop_after_attempt=5,
-        wait_exponential_jitter=True,
-        retry_if_exception_type=(Exception,),
+    comprehensive=with_screening_result(
+        cached(
+            with_retry_policy(
+                comprehensive_reviewer_prompt | llm2_with_structured_output
+            ),
+            namespace=f"screening:{ScreeningStrategyType.COMPREHENSIVE}",
+            prompt=comprehensive_reviewer_prompt,
+            model_name=REVIEWER_MODEL_NAME,
+            temperature=llm2.temperature,
+            output_type=schemas.ScreeningResponse,
+        ),
+        ScreeningStrategyType.COMPREHENSIVE,
     ),
-).with_listeners(
-    on_end=screen_abstracts_chain_on_end_cb, on_error=chain_on_error_listener_cb
 )  # .with_types(
 #        output_type=ScreenAbstractsChainOutputDict # pyright: ignore [reportArgumentType]
 # )
@@ -1074,6 +1337,8 @@ class ScreenAbstractsBatchOutput(t.NamedTuple):
     Attributes:
         results (list[ScreenAbstractResultTuple]): list of screening results
         cb (OpenAICallbackHandler): callback handler
+        hedge_stats (HedgeStats | None): hedging summary of the batch, None if
+            hedging is off
 
     Note:
         cb fields:
@@ -1089,11 +1354,70 @@ class ScreenAbstractsBatchOutput(t.NamedTuple):
 
     results: list[ScreenAbstractResultTuple]
     cb: OpenAICallbackHandler
+    hedge_stats: HedgeStats | None = None
+
+
+def to_screen_abstract_result_tuple(
+    search_result: models.SearchResult,
+    parallel_invocation: ScreenAbstractsChainOutputDict | t.Any,
+    *,
+    log: t.Any = logger,
+) -> ScreenAbstractResultTuple:
+    """Convert one ``screen_abstracts_chain`` output into a result tuple.
+
+    Anything that isn't a :class:`ScreeningResult` (an exception, a raw
+    ``ScreeningResponse`` if the listener failed, etc.) is wrapped in a
+    :class:`ScreeningError`. Sets ``search_result.conservative_result_id`` and
+    ``search_result.comprehensive_result_id`` for successful results.
+
+    Args:
+        search_result (SearchResult): The screened search result.
+        parallel_invocation (ScreenAbstractsChainOutputDict | t.Any): Chain output
+            for ``search_result``, or the exception raised while producing it.
+        log (t.Any): Logger to report reviewer errors with. Defaults to ``logger``.
+
+    Returns:
+        ScreenAbstractResultTuple: Search result with both reviewers' results.
+    """
+    if isinstance(parallel_invocation, dict):
+        conservative = parallel_invocation.get(
+            ScreeningStrategyType.CONSERVATIVE, parallel_invocation
+        )
+        comprehensive = parallel_invocation.get(
+            ScreeningStrategyType.COMPREHENSIVE, parallel_invocation
+        )
+    else:
+        conservative = parallel_invocation
+        comprehensive = parallel_invocation
+
+    if not isinstance(conservative, ScreeningResult):
+        conservative = ScreeningError(search_result=search_result, error=conservative)
+        log.error(f"Conservative reviewer error: {conservative!r}")
+    else:
+        search_result.conservative_result_id = conservative.id
+
+    if not isinstance(comprehensive, ScreeningResult):
+        comprehensive = ScreeningError(
+            search_result=search_result, error=comprehensive
+        )
+        log.error(f"Comprehensive reviewer error: {comprehensive!r}")
+    else:
+        search_result.comprehensive_result_id = comprehensive.id
+
+    return ScreenAbstractResultTuple(
+        search_result=search_result,
+        conservative_result=conservative,
+        comprehensive_result=comprehensive,
+    )
 
 
 @logger.catch(onerror=lambda exc: st.error(exc) if ut.in_streamlit() else None)  # pyright: ignore [reportArgumentType]
 def screen_abstracts_batch(
-    batch: list[models.SearchResult], batch_idx: int, review: models.SystematicReview
+    batch: list[models.SearchResult],
+    batch_idx: int,
+    review: models.SystematicReview,
+    *,
+    bypass_cache: bool = False,
 ) -> ScreenAbstractsBatchOutput | None:
     """Invoke screen_abstracts_chain on a batch of PubMed results.
 
@@ -1107,6 +1431,7 @@ def screen_abstracts_batch(
         batch (list[SearchResult]): list of search results to be screened
         batch_idx (int): index of the batch
         review (SystematicReview): systematic review associated with this batch
+        bypass_cache (bool): Skip LLM cache lookups for runs that must be fresh.
 
     Returns:
         tuple[list[ScreenAbstractResultTuple], OpenAICallbackHandler]:
@@ -1114,7 +1439,9 @@ def screen_abstracts_batch(
             None if an uncaught exception occured (check the logs).
     """
     batch_logger = logger.bind(batch_idx=batch_idx)
-    chain_inputs = make_screen_abstracts_chain_input(batch, review)
+    chain_inputs = make_screen_abstracts_chain_input(
+        batch, review, bypass_cache=bypass_cache
+    )
     chain_outputs: list[ScreenAbstractResultTuple] = []
 
     with get_openai_callback() as cb_openai:
@@ -1126,41 +1453,16 @@ def screen_abstracts_batch(
             )  # Use globally defined chain
 
             # Ensure results are correctly formed into ScreenAbstractResultTuple
-            # The on_end listener (screen_abstracts_chain_on_end_cb) is supposed to populate
+            # with_screening_result has turned each response into a ScreeningResult
             for i, parallel_invocation in enumerate(res):
-                search_result = batch[i]
-                conservative = parallel_invocation.get(
-                    ScreeningStrategyType.CONSERVATIVE, parallel_invocation
-                )
-                comprehensive = parallel_invocation.get(
-                    ScreeningStrategyType.COMPREHENSIVE, parallel_invocation
-                )
-
-                if not isinstance(conservative, ScreeningResult):
-                    conservative = ScreeningError(
-                        search_result=search_result, error=conservative
-                    )
-                    batch_logger.error(f"Conservative reviewer error: {conservative!r}")
-                else:
-                    search_result.conservative_result_id = conservative.id
-
-                if not isinstance(comprehensive, ScreeningResult):
-                    comprehensive = ScreeningError(
-                        search_result=search_result, error=comprehensive
-                    )
-                    batch_logger.error(
-                        f"Comprehensive reviewer error: {comprehensive!r}"
+                chain_outputs.append(
+                    to_screen_abstract_result_tuple(
+                        batch[i], parallel_invocation, log=batch_logger
                     )
-                else:
-                    search_result.comprehensive_result_id = comprehensive.id
-
-                res_tuple = ScreenAbstractResultTuple(
-                    search_result=search_result,
-                    conservative_result=conservative,
-                    comprehensive_result=comprehensive,
                 )
-                chain_outputs.append(res_tuple)
 
+            if llm_cache := get_llm_cache():
+                batch_logger.info(f"LLM cache stats: {llm_cache.stats()!r}")
             return ScreenAbstractsBatchOutput(
                 results=chain_outputs, cb=deepcopy(cb_openai)
             )
@@ -1169,88 +1471,52 @@ def screen_abstracts_batch(
             return None
 
 
-# TODO: update
-# @logger.catch(onerror=lambda exc: st.error(exc) if ut.in_streamlit() else None) # pyright: ignore [reportArgumentType]
-# async def ascreen_abstracts_batch(batch: list[models.PubMedResult], batch_idx: int) -> ScreenAbstractsBatchOutput | None:
-#    """Invoke screen_abstracts_chain on a batch of PubMed results.
-#
-#    Results and errors are also written to ``st.session_state.screen_abstracts_results``
-#    and ``st.session_state.screen_abstracts_errors``.
-#
-#    Caller should set ``st.session_state.screen_abstracts_batch_idx`` though it will
-#    be set if missing.
-#
-#    Args:
-#        batch (list[models.PubMedResult]): list of pubmed results to be screened
-#        batch_idx (int): index of the batch
-#
-#    Returns:
-#        tuple[list[ScreenAbstractResultTuple], OpenAICallbackHandler]:
-#            list of screened pubmed results and OpenAI cb for the batch run.
-#            None if an uncaught exception occured (check the logs).
-#    """
-#    ut.init_state_key("screen_abstracts_batch_idx", batch_idx)
-#    ut.init_state_key("screen_abstracts_results", [])
-#    ut.init_state_key("screen_abstracts_errors", [])
-#    ut.init_state_key("screen_abstracts_chain", screen_abstracts_chain)
-#    #ut.init_state_key("screen_abstracts_total_tokens", 0)
-#    #ut.init_state_key("screen_abstracts_successful_requests", 0)
-#    #ut.init_state_key("screen_abstracts_total_cost", 0.0)
-#
-#    batch_logger = logger.bind(batch_idx=batch_idx)
-#    chain_inputs = make_screen_abstracts_chain_input(batch)
-#    chain_outputs: list[ScreenAbstractResultTuple] = []
-#
-#    with get_openai_callback() as cb:
-#        res =  await st.session_state.screen_abstracts_chain.abatch(**chain_inputs)
-#    if len(res) != len(batch):
-#        pad_size = len(batch) - len(res)
-#        res += [None] * pad_size
-#        batch_logger.warning(f"screen_abstracts_chain returned {len(res)} results, expected {len(batch)}")
-#    for i, parallel_invocation in enumerate(res):
-#        if isinstance(parallel_invocation, dict):
-#            conservative = parallel_invocation.get(ScreeningStrategyType.CONSERVATIVE, parallel_invocation)
-#            comprehensive = parallel_invocation.get(ScreeningStrategyType.COMPREHENSIVE, parallel_invocation)
-#        else:
-#            conservative = parallel_invocation
-#            comprehensive = parallel_invocation
-#        if not isinstance(conservative, ScreeningResult):
-#            conservative = ScreeningError(
-#                search_result=batch[i],
-#                error=conservative,
-#            )
-#            if ut.is_streamlit():
-#                st.session_state.screen_abstracts_errors.append(conservative)
-#            batch_logger.warning(f"Conservative reviewer error: {conservative!r}")
-#        else:
-#            if ut.is_streamlit():
-#                st.session_state.screen_abstracts_results.append(conservative)
-#
-#        if not isinstance(comprehensive, ScreeningResult):
-#            comprehensive = ScreeningError(
-#                search_result=batch[i],
-#                error=comprehensive,
-#            )
-#            if ut.is_streamlit():
-#                st.session_state.screen_abstracts_errors.append(comprehensive)
-#            batch_logger.warning(f"Comprehensive reviewer error: {comprehensive!r}")
-#        else:
-#            if ut.is_streamlit():
-#                st.session_state.screen_abstracts_results.append(comprehensive)
-#
-#        res_tuple = ScreenAbstractResultTuple(
-#            search_result=batch[i],
-#            conservative_result=conservative,
-#            comprehensive_result=comprehensive,
-#        )
-#        chain_outputs.append(res_tuple)
-#    return ScreenAbstractsBatchOutput(
-#        results=chain_outputs,
-#        cb=cb,
-#    )
+def screen_abstracts_batch_as_completed(
+    batch: list[models.SearchResult],
+    batch_idx: int,
+    review: models.SystematicReview,
+    *,
+    bypass_cache: bool = False,
+) -> Iterator[ScreenAbstractResultTuple]:
+    """Streaming variant of :func:`screen_abstracts_batch`.
 
+    Yields each search result's tuple as soon as both its reviewers finish, in
+    completion order, so one slow or retrying call doesn't hold back the rest of the
+    batch. Per-item failures are yielded as :class:`ScreeningError` results.
 
-resolver_chain = resolver_prompt | resolver_model
+    Args:
+        batch (list[SearchResult]): list of search results to be screened
+        batch_idx (int): index of the batch
+        review (SystematicReview): systematic review associated with this batch
+        bypass_cache (bool): Skip LLM cache lookups for runs that must be fresh.
+
+    Yields:
+        ScreenAbstractResultTuple: screened search result with both reviewers' results.
+    """
+    batch_logger = logger.bind(batch_idx=batch_idx)
+    chain_inputs = make_screen_abstracts_chain_input(
+        batch, review, bypass_cache=bypass_cache
+    )
+    for i, parallel_invocation in screen_abstracts_chain.batch_as_completed(
+        chain_inputs["inputs"],  # type: ignore
+        config=chain_inputs["config"],
+        return_exceptions=True,
+    ):
+        yield to_screen_abstract_result_tuple(
+            batch[i], parallel_invocation, log=batch_logger
+        )
+    if llm_cache := get_llm_cache():
+        batch_logger.info(f"LLM cache stats: {llm_cache.stats()!r}")
+
+
+resolver_chain = cached(
+    resolver_prompt | resolver_model,
+    namespace="resolver",
+    prompt=resolver_prompt,
+    model_name=RESOLVER_MODEL_NAME,
+    temperature=0,
+    output_type=ResolverOutputSchema,
+)
 
 
 @logger.catch(
@@ -1265,6 +1531,8 @@ def invoke_resolver_chain(
     conservative_result: schemas.ScreeningResult,
     comprehensive_result: schemas.ScreeningResult,
     run_config: RunnableConfig | None = None,
+    *,
+    bypass_cache: bool = False,
 ) -> ResolverOutputSchema | None:
     """Invokes the resolver_chain with the given inputs and configuration.
 
@@ -1274,6 +1542,7 @@ def invoke_resolver_chain(
         conservative_result: The screening result from the conservative reviewer.
         comprehensive_result: The screening result from the comprehensive reviewer.
         run_config: Optional LangChain RunnableConfig for the invocation.
+        bypass_cache: Skip the LLM cache lookup for runs that must be fresh.
 
     Returns:
         ResolverOutputSchema if successful, None otherwise (error will be logged by @logger.catch).
@@ -1286,6 +1555,13 @@ def invoke_resolver_chain(
     )
     chain_input_dict = chain_input_model.model_dump()
 
+    if bypass_cache:
+        run_config = RunnableConfig(**(run_config or {}))
+        run_config["configurable"] = {
+            **run_config.get("configurable", {}),
+            BYPASS_CACHE_KEY: True,
+        }
+
     logger.info(f"Invoking resolver chain for SearchResult ID: {search_result.id!r}")
     try:
         response = resolver_chain.invoke(chain_input_dict, config=run_config)
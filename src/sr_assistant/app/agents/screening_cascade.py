@@ -0,0 +1,255 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Confidence-based model cascade for abstract screening.
+
+A cheaper model triages every abstract first with the conservative reviewer prompt.
+Decisions it makes with high enough confidence are accepted as they are; anything
+below the thresholds, ``uncertain`` or failed is escalated to the full dual-reviewer
+``screen_abstracts_chain``.
+
+Thresholds are set per review in ``SystematicReview.review_metadata["screening_cascade"]``
+(see :class:`CascadeConfig`), with separate thresholds for include and exclude so a
+review can demand more certainty before the cheap model is allowed to exclude.
+
+Accepted triage decisions fill both reviewer slots of the result tuple so the rest
+of the app (persistence, resolver, benchmark metrics) works unchanged: the
+conservative result is the triage response, the comprehensive result a copy with its
+own id. Both are marked with ``response_metadata["cascade"]["stage"] == "accepted"``
+and ``model_name`` is the triage model. Escalated results record the triage decision
+under ``response_metadata["cascade"]["triage"]``.
+
+Examples:
+    >>> cascade = CascadeConfig.from_review(review)  # doctest: +SKIP
+    >>> for res in screen_abstracts_cascade_as_completed(
+    ...     batch, 0, review, cascade=cascade
+    ... ):
+    ...     print(res.conservative_result.response_metadata["cascade"]["stage"])
+"""
+
+from __future__ import annotations
+
+import functools
+import typing as t
+import uuid
+
+from langchain_core.runnables import RunnableParallel
+from langchain_openai.chat_models import ChatOpenAI
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from sr_assistant.app.agents.rate_limit import (
+    get_limiter,
+    rate_limit_http_clients,
+    rate_limited,
+)
+from sr_assistant.app.agents.retry_policy import (
+    structured_output_with_repair,
+    with_retry_policy,
+)
+from sr_assistant.app.agents.screening_agents import (
+    ScreenAbstractResultTuple,
+    conservative_reviewer_prompt,
+    make_screen_abstracts_chain_input,
+    screen_abstracts_batch_as_completed,
+    to_screen_abstract_result_tuple,
+    with_screening_result,
+)
+from sr_assistant.app.llm_cache import cached, get_llm_cache
+from sr_assistant.core import schemas
+from sr_assistant.core.schemas import ScreeningResult
+from sr_assistant.core.types import ScreeningDecisionType, ScreeningStrategyType
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from langchain_core.runnables import Runnable
+
+    from sr_assistant.core import models
+
+CASCADE_METADATA_KEY = "screening_cascade"
+"""``SystematicReview.review_metadata`` key holding the review's :class:`CascadeConfig`."""
+
+TRIAGE_MODEL_NAME = "gpt-4o-mini"
+
+
+class CascadeConfig(BaseModel):
+    """Per-review model cascade settings."""
+
+    enabled: bool = False
+    """Triage with ``model_name`` before the dual-reviewer chain."""
+
+    model_name: str = TRIAGE_MODEL_NAME
+    """OpenAI model screening first."""
+
+    include_threshold: float = Field(default=0.9, ge=0.0, le=1.0)
+    """Minimum confidence to accept a triage 'include' without escalation."""
+
+    exclude_threshold: float = Field(default=0.95, ge=0.0, le=1.0)
+    """Minimum confidence to accept a triage 'exclude' without escalation."""
+
+    @classmethod
+    def from_review(cls, review: models.SystematicReview) -> t.Self:
+        """Read the cascade settings of a review, defaults if it has none."""
+        return cls.model_validate(
+            (review.review_metadata or {}).get(CASCADE_METADATA_KEY) or {}
+        )
+
+    def accepts(self, response: schemas.ScreeningResponse) -> bool:
+        """Whether a triage response is confident enough to skip escalation."""
+        if response.decision == ScreeningDecisionType.INCLUDE:
+            return response.confidence_score >= self.include_threshold
+        if response.decision == ScreeningDecisionType.EXCLUDE:
+            return response.confidence_score >= self.exclude_threshold
+        return False
+
+
+@functools.cache
+def get_triage_chain(model_name: str) -> Runnable[t.Any, t.Any]:
+    """Build (once per model) the triage chain.
+
+    Same prompt, retries, LLM cache and listener as the conservative reviewer of
+    ``screen_abstracts_chain``, so outputs are :class:`ScreeningResult` objects keyed
+    ``conservative``.
+
+    Args:
+        model_name (str): OpenAI model to triage with.
+
+    Returns:
+        Runnable: Chain taking ``screen_abstracts_chain`` inputs.
+    """
+    limiter = get_limiter("openai", model_name, latency_target=30.0)
+    http_client, http_async_client = rate_limit_http_clients(limiter)
+    llm = ChatOpenAI(
+        model=model_name,
+        temperature=0,
+        max_retries=0,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
+    return RunnableParallel(
+        conservative=with_screening_result(
+            cached(
+                with_retry_policy(
+                    conservative_reviewer_prompt
+                    | rate_limited(
+                        structured_output_with_repair(llm, schemas.ScreeningResponse),
+                        limiter,
+                    )
+                ),
+                namespace=f"screening_triage:{model_name}",
+                prompt=conservative_reviewer_prompt,
+                model_name=model_name,
+                temperature=llm.temperature,
+                output_type=schemas.ScreeningResponse,
+            ),
+            ScreeningStrategyType.CONSERVATIVE,
+            model_name=model_name,
+        )
+    )
+
+
+def _accepted_result_tuple(
+    search_result: models.SearchResult, triage: ScreeningResult, cascade: CascadeConfig
+) -> ScreenAbstractResultTuple:
+    metadata = {"stage": "accepted", **cascade.model_dump()}
+    triage.model_name = cascade.model_name
+    triage.response_metadata["cascade"] = metadata
+    comprehensive = triage.model_copy(
+        update={
+            "id": uuid.uuid4(),
+            "screening_strategy": ScreeningStrategyType.COMPREHENSIVE,
+            "response_metadata": {
+                **triage.response_metadata,
+                "cascade": {**metadata, "copy_of": str(triage.id)},
+            },
+        }
+    )
+    return to_screen_abstract_result_tuple(
+        search_result,
+        {
+            ScreeningStrategyType.CONSERVATIVE: triage,
+            ScreeningStrategyType.COMPREHENSIVE: comprehensive,
+        },
+    )
+
+
+def screen_abstracts_cascade_as_completed(
+    batch: list[models.SearchResult],
+    batch_idx: int,
+    review: models.SystematicReview,
+    *,
+    cascade: CascadeConfig,
+    bypass_cache: bool = False,
+) -> Iterator[ScreenAbstractResultTuple]:
+    """Triage a batch with the cascade model, escalate what it isn't sure about.
+
+    Accepted items are yielded as soon as their triage call finishes, escalated items
+    once both full reviewers finish.
+
+    Args:
+        batch (list[SearchResult]): list of search results to be screened
+        batch_idx (int): index of the batch
+        review (SystematicReview): systematic review associated with this batch
+        cascade (CascadeConfig): Triage model and thresholds.
+        bypass_cache (bool): Skip LLM cache lookups for runs that must be fresh.
+
+    Yields:
+        ScreenAbstractResultTuple: one per search result in ``batch``.
+    """
+    batch_logger = logger.bind(batch_idx=batch_idx)
+    chain_inputs = make_screen_abstracts_chain_input(
+        batch, review, bypass_cache=bypass_cache
+    )
+    escalated: dict[uuid.UUID, dict[str, t.Any]] = {}
+    for i, output in get_triage_chain(cascade.model_name).batch_as_completed(
+        chain_inputs["inputs"],  # type: ignore
+        config=chain_inputs["config"],
+        return_exceptions=True,
+    ):
+        search_result = batch[i]
+        triage = (
+            output.get(ScreeningStrategyType.CONSERVATIVE)
+            if isinstance(output, dict)
+            else output
+        )
+        if isinstance(triage, ScreeningResult) and cascade.accepts(triage):
+            yield _accepted_result_tuple(search_result, triage, cascade)
+            continue
+        if isinstance(triage, ScreeningResult):
+            escalated[search_result.id] = {
+                "decision": str(triage.decision),
+                "confidence_score": triage.confidence_score,
+                "result_id": str(triage.id),
+            }
+        else:
+            batch_logger.warning(
+                f"Triage failed for SearchResult {search_result.id}: {triage!r}"
+            )
+            escalated[search_result.id] = {"error": repr(triage)}
+
+    batch_logger.info(
+        f"Cascade accepted {len(batch) - len(escalated)}/{len(batch)} triage decisions"
+    )
+    if llm_cache := get_llm_cache():
+        batch_logger.info(f"LLM cache stats: {llm_cache.stats()!r}")
+    if not escalated:
+        return
+    for result_tuple in screen_abstracts_batch_as_completed(
+        [sr for sr in batch if sr.id in escalated],
+        batch_idx,
+        review,
+        bypass_cache=bypass_cache,
+    ):
+        metadata = {
+            "stage": "escalated",
+            "triage": escalated[result_tuple.search_result.id],
+            **cascade.model_dump(),
+        }
+        for result in (
+            result_tuple.conservative_result,
+            result_tuple.comprehensive_result,
+        ):
+            if isinstance(result, ScreeningResult):
+                result.response_metadata["cascade"] = metadata
+        yield result_tuple
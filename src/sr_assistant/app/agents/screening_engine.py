@@ -0,0 +1,379 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Asyncio abstract screening engine.
+
+The synchronous :func:`~sr_assistant.app.agents.screening_agents.screen_abstracts_batch`
+is limited by the thread pool LangChain's ``Runnable.batch`` happens to use. The
+:class:`ScreeningEngine` here drives ``screen_abstracts_chain.ainvoke`` directly on the
+event loop instead, so a single worker process can keep hundreds of conservative and
+comprehensive reviewer calls in flight.
+
+- Concurrency is bounded by an :class:`asyncio.Semaphore` shared by every call made
+  through the same engine (``max_concurrency`` search results, i.e. twice as many
+  model calls as both reviewers run in parallel per search result).
+- Each search result is screened in its own task which can be cancelled by
+  ``search_result_id`` without affecting the rest of the batch. Cancelled and failed
+  items come back as :class:`~sr_assistant.app.agents.screening_agents.ScreeningError`.
+- With ``hedging`` set, reviewer calls that run past a percentile of the engine's
+  recent latencies are hedged, see :mod:`~sr_assistant.app.agents.hedging`. Each
+  call to :meth:`ScreeningEngine.ascreen` / :meth:`ScreeningEngine.astream` gets its
+  own hedge budget, :meth:`ScreeningEngine.ascreen_batch` returns its summary.
+  Runs share the engine, so nothing about a single run is kept on it.
+- Nothing here touches Streamlit, callers decide what to do with the results.
+
+Examples:
+    >>> engine = ScreeningEngine(max_concurrency=100)  # doctest: +SKIP
+    >>> results = await engine.ascreen(search_results, review)  # doctest: +SKIP
+    >>> async for res in engine.astream(search_results, review):  # doctest: +SKIP
+    ...     print(res.search_result.id)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import typing as t
+from copy import deepcopy
+
+from langchain_community.callbacks.manager import get_openai_callback
+from langchain_core.runnables.config import patch_config
+from loguru import logger
+
+from sr_assistant.app.agents.hedging import (
+    HEDGER_KEY,
+    HedgePolicy,
+    Hedger,
+    HedgeStats,
+    LatencyWindow,
+)
+from sr_assistant.app.agents.screening_agents import (
+    ScreenAbstractResultTuple,
+    ScreenAbstractsBatchOutput,
+    ScreeningError,
+    make_screen_abstracts_chain_input,
+    screen_abstracts_chain,
+    to_screen_abstract_result_tuple,
+)
+from sr_assistant.app.config import get_settings
+
+if t.TYPE_CHECKING:
+    import uuid
+    from collections.abc import AsyncIterator, Sequence
+
+    from langchain_core.runnables import Runnable, RunnableConfig
+
+    from sr_assistant.app.agents.screening_agents import ScreenAbstractsChainInputDict
+    from sr_assistant.core import models
+
+DEFAULT_MAX_CONCURRENCY = 100
+"""Default number of search results screened concurrently per engine."""
+
+
+class ScreeningEngine:
+    """Bounded-concurrency async runner for ``screen_abstracts_chain``.
+
+    Args:
+        chain (Runnable | None): Chain to invoke per search result. Must accept the
+            ``ScreenAbstractsChainInputDict`` prompt variables and return the
+            ``RunnableParallel`` output dict. Defaults to ``screen_abstracts_chain``.
+        max_concurrency (int): Maximum number of search results being screened at
+            once across all calls on this engine. Defaults to
+            ``DEFAULT_MAX_CONCURRENCY``.
+        bypass_cache (bool): Skip LLM cache lookups for runs that must be fresh.
+        hedging (HedgePolicy | None): Hedge slow reviewer calls according to this
+            policy. Off if None.
+    """
+
+    def __init__(
+        self,
+        chain: Runnable[t.Any, t.Any] | None = None,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        bypass_cache: bool = False,
+        hedging: HedgePolicy | None = None,
+    ) -> None:
+        """Initialize the engine, the semaphore is created on first use."""
+        if max_concurrency < 1:
+            msg = f"max_concurrency must be >= 1, got {max_concurrency}"
+            raise ValueError(msg)
+        self.chain = chain if chain is not None else screen_abstracts_chain
+        self.max_concurrency = max_concurrency
+        self.bypass_cache = bypass_cache
+        self.hedging = hedging
+        self.latencies = LatencyWindow(hedging.window) if hedging is not None else None
+        self._tasks: dict[uuid.UUID, asyncio.Task[ScreenAbstractResultTuple]] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def in_flight(self) -> int:
+        """Number of search results currently scheduled or being screened."""
+        return len(self._tasks)
+
+    def cancel(self, search_result_id: uuid.UUID) -> bool:
+        """Cancel screening of a single search result.
+
+        Args:
+            search_result_id (uuid.UUID): ID of the search result to cancel.
+
+        Returns:
+            bool: True if a pending task was found and cancelled.
+        """
+        task = self._tasks.get(search_result_id)
+        if task is None or task.done():
+            return False
+        logger.info(f"Cancelling screening of search result {search_result_id}")
+        return task.cancel()
+
+    def cancel_all(self) -> int:
+        """Cancel all in-flight screening tasks.
+
+        Returns:
+            int: Number of tasks cancelled.
+        """
+        return sum(
+            self.cancel(search_result_id) for search_result_id in list(self._tasks)
+        )
+
+    async def ascreen(
+        self,
+        search_results: Sequence[models.SearchResult],
+        review: models.SystematicReview,
+    ) -> list[ScreenAbstractResultTuple]:
+        """Screen search results concurrently.
+
+        Args:
+            search_results (Sequence[SearchResult]): Search results to screen.
+            review (SystematicReview): Review the search results belong to.
+
+        Returns:
+            list[ScreenAbstractResultTuple]: One tuple per search result, in input
+                order. Failed or cancelled items hold ``ScreeningError`` results.
+        """
+        results, _ = await self._ascreen(search_results, review)
+        return results
+
+    async def _ascreen(
+        self,
+        search_results: Sequence[models.SearchResult],
+        review: models.SystematicReview,
+    ) -> tuple[list[ScreenAbstractResultTuple], HedgeStats | None]:
+        """Screen search results, also returning the run's hedging summary."""
+        tasks, hedger = self._spawn(search_results, review)
+        if not tasks:
+            return [], None
+        try:
+            await asyncio.wait(tasks)
+        finally:
+            # Only reached with pending tasks if we ourselves were cancelled.
+            for task in tasks:
+                task.cancel()
+        results = [
+            self._task_result(sr, task)
+            for sr, task in zip(search_results, tasks, strict=True)
+        ]
+        return results, hedger.stats() if hedger is not None else None
+
+    async def astream(
+        self,
+        search_results: Sequence[models.SearchResult],
+        review: models.SystematicReview,
+    ) -> AsyncIterator[ScreenAbstractResultTuple]:
+        """Screen search results concurrently, yielding results as they complete.
+
+        Args:
+            search_results (Sequence[SearchResult]): Search results to screen.
+            review (SystematicReview): Review the search results belong to.
+
+        Yields:
+            ScreenAbstractResultTuple: Results in completion order.
+        """
+        tasks, _ = self._spawn(search_results, review)
+        task_to_sr = dict(zip(tasks, search_results, strict=True))
+        pending: set[asyncio.Task[ScreenAbstractResultTuple]] = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield self._task_result(task_to_sr[task], task)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def ascreen_batch(
+        self,
+        batch: Sequence[models.SearchResult],
+        batch_idx: int,
+        review: models.SystematicReview,
+    ) -> ScreenAbstractsBatchOutput:
+        """Screen a batch and collect OpenAI usage for it.
+
+        Async counterpart of ``screen_abstracts_batch``.
+
+        Args:
+            batch (Sequence[SearchResult]): Search results to screen.
+            batch_idx (int): Index of the batch, used for logging.
+            review (SystematicReview): Review the search results belong to.
+
+        Returns:
+            ScreenAbstractsBatchOutput: Results in input order, the callback
+                handler with token usage and cost for the batch, and the batch's
+                hedging summary.
+        """
+        logger.bind(batch_idx=batch_idx).debug(
+            f"Screening batch of {len(batch)} search results"
+        )
+        with get_openai_callback() as cb_openai:
+            results, stats = await self._ascreen(batch, review)
+        if stats and stats.hedges:
+            logger.bind(batch_idx=batch_idx, **stats._asdict()).info(
+                f"Hedged {stats.hedges}/{stats.calls} reviewer calls, {stats.hedge_wins}"
+                + f" hedges won, ${stats.hedge_cost:.4f} hedge cost"
+            )
+        return ScreenAbstractsBatchOutput(
+            results=results, cb=deepcopy(cb_openai), hedge_stats=stats
+        )
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # asyncio primitives bind to the loop they're first used in, recreate if the
+        # engine is reused from another loop (e.g. consecutive asyncio.run() calls).
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def _spawn(
+        self,
+        search_results: Sequence[models.SearchResult],
+        review: models.SystematicReview,
+    ) -> tuple[list[asyncio.Task[ScreenAbstractResultTuple]], Hedger | None]:
+        """Start a task per search result, with the run's own Hedger if hedging."""
+        if not search_results:
+            return [], None
+        chain_inputs = make_screen_abstracts_chain_input(
+            list(search_results), review, bypass_cache=self.bypass_cache
+        )
+        if chain_inputs is None:
+            msg = "Failed to create screen_abstracts_chain inputs, check the logs"
+            raise RuntimeError(msg)
+        configs = chain_inputs["config"]
+        hedger = None
+        if self.hedging is not None:
+            hedger = Hedger(self.hedging, self.latencies)
+            configs = [self._with_hedger(config, hedger) for config in configs]
+        tasks: list[asyncio.Task[ScreenAbstractResultTuple]] = []
+        for search_result, chain_input, config in zip(
+            search_results, chain_inputs["inputs"], configs, strict=True
+        ):
+            task = asyncio.create_task(
+                self._screen_one(search_result, chain_input, config),
+                name=f"screen_abstract:{search_result.id}",
+            )
+            self._tasks[search_result.id] = task
+            task.add_done_callback(
+                lambda done, sr_id=search_result.id: self._forget(sr_id, done)
+            )
+            tasks.append(task)
+        return tasks, hedger
+
+    @staticmethod
+    def _with_hedger(config: RunnableConfig, hedger: Hedger) -> RunnableConfig:
+        return patch_config(
+            config, configurable={**config.get("configurable", {}), HEDGER_KEY: hedger}
+        )
+
+    def _forget(self, search_result_id: uuid.UUID, task: asyncio.Task[t.Any]) -> None:
+        if self._tasks.get(search_result_id) is task:
+            del self._tasks[search_result_id]
+
+    async def _screen_one(
+        self,
+        search_result: models.SearchResult,
+        chain_input: ScreenAbstractsChainInputDict,
+        config: RunnableConfig,
+    ) -> ScreenAbstractResultTuple:
+        item_logger = logger.bind(search_result_id=search_result.id)
+        async with self._get_semaphore():
+            try:
+                output: t.Any = await self.chain.ainvoke(chain_input, config=config)
+            except Exception as exc:
+                item_logger.exception("screen_abstracts_chain failed")
+                output = exc
+        return to_screen_abstract_result_tuple(search_result, output, log=item_logger)
+
+    @staticmethod
+    def _task_result(
+        search_result: models.SearchResult,
+        task: asyncio.Task[ScreenAbstractResultTuple],
+    ) -> ScreenAbstractResultTuple:
+        if task.cancelled():
+            error = ScreeningError(
+                search_result=search_result,
+                error=asyncio.CancelledError(),
+                message="Screening cancelled",
+            )
+            return ScreenAbstractResultTuple(
+                search_result=search_result,
+                conservative_result=error,
+                comprehensive_result=error,
+            )
+        if (exc := task.exception()) is not None:
+            return to_screen_abstract_result_tuple(search_result, exc)
+        return task.result()
+
+
+_default_engine: ScreeningEngine | None = None
+
+
+def default_hedge_policy() -> HedgePolicy | None:
+    """Hedge policy from the ``SCREENING_HEDGING*`` settings, None if disabled."""
+    settings = get_settings()
+    if not settings.SCREENING_HEDGING:
+        return None
+    return HedgePolicy(max_hedge_ratio=settings.SCREENING_HEDGE_MAX_RATIO)
+
+
+def get_screening_engine() -> ScreeningEngine:
+    """Return the process-wide default :class:`ScreeningEngine`.
+
+    Hedging follows :func:`default_hedge_policy`.
+    """
+    global _default_engine  # noqa: PLW0603
+    if _default_engine is None:
+        _default_engine = ScreeningEngine(hedging=default_hedge_policy())
+    return _default_engine
+
+
+async def ascreen_abstracts_batch(
+    batch: list[models.SearchResult],
+    batch_idx: int,
+    review: models.SystematicReview,
+    *,
+    engine: ScreeningEngine | None = None,
+) -> ScreenAbstractsBatchOutput | None:
+    """Async version of ``screen_abstracts_batch``.
+
+    Args:
+        batch (list[SearchResult]): list of search results to be screened
+        batch_idx (int): index of the batch
+        review (SystematicReview): systematic review associated with this batch
+        engine (ScreeningEngine | None): Engine to use. Defaults to the shared engine
+            from :func:`get_screening_engine`.
+
+    Returns:
+        ScreenAbstractsBatchOutput | None: Screened search results and OpenAI cb for
+            the batch run. None if an unexpected exception occured (check the logs).
+    """
+    engine = engine or get_screening_engine()
+    try:
+        return await engine.ascreen_batch(batch, batch_idx, review)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.bind(batch_idx=batch_idx).exception(
+            "Exception occurred during ascreen_abstracts_batch"
+        )
+        return None
@@ -0,0 +1,449 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Pre-flight token, cost and wall-time estimate of a screening run.
+
+:func:`estimate_screening_run` estimates screening a review's search results before
+anything is sent to a provider, so the run mode can be chosen up front: interactive
+(:attr:`ScreeningRunEstimate.total_cost`), batch API
+(:attr:`ScreeningRunEstimate.batch_cost`) or model cascade
+(:meth:`ScreeningRunEstimate.cascade_cost`).
+
+- Input tokens are counted on the reviewer prompts as they are rendered for the run.
+  The system prompt (criteria) is counted once per strategy, the study details of
+  the whole corpus in one vectorized ``tiktoken`` batch. Without a ``tiktoken``
+  encoding (e.g. offline) tokens are estimated as characters / 4.
+- Counts are cached per review criteria version (:func:`criteria_fingerprint`) and
+  corpus, re-estimating an unchanged review is free.
+- Output tokens can't be counted ahead, they're averages
+  (:data:`REVIEWER_OUTPUT_TOKENS`, :data:`RESOLVER_OUTPUT_TOKENS`).
+- Resolver volume is the search result count times the historical conflict rate,
+  see ``BenchmarkResultItemRepository.get_conflict_stats``.
+- Wall time assumes the reviewer and resolver limiters' current concurrency and
+  latency (their EWMA, or a default before the first call).
+
+Examples:
+    >>> estimate = ScreeningService().estimate_screening_run(rid)  # doctest: +SKIP
+    >>> estimate.total_cost, estimate.batch_cost  # doctest: +SKIP
+    >>> estimate.cascade_cost(escalation_rate=0.3)  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import math
+import os
+import threading
+import typing as t
+from collections import OrderedDict
+
+import numpy as np
+import tiktoken
+from langchain_community.callbacks.openai_info import (
+    TokenType,
+    get_openai_token_cost_for_model,
+)
+from loguru import logger
+
+from sr_assistant.app.agents.batch_screening import SCREENING_RESPONSE_FORMAT
+from sr_assistant.app.agents.screening_agents import (
+    RESOLVER_MODEL_NAME,
+    REVIEWER_MODEL_NAME,
+    comprehensive_reviewer_prompt,
+    conservative_reviewer_prompt,
+    criteria_fingerprint,
+    resolver_limiter,
+    resolver_prompt,
+    reviewer_limiter,
+    study_details_prompt_text,
+)
+from sr_assistant.app.agents.screening_cascade import TRIAGE_MODEL_NAME
+from sr_assistant.core.types import ScreeningStrategyType
+
+if t.TYPE_CHECKING:
+    import uuid
+    from collections.abc import Sequence
+
+    from langchain_core.prompts import ChatPromptTemplate
+
+    from sr_assistant.app.agents.rate_limit import AdaptiveConcurrencyLimiter
+    from sr_assistant.core import models
+
+REVIEWER_OUTPUT_TOKENS = 350
+"""Average completion tokens of a reviewer's ``ScreeningResponse``."""
+RESOLVER_OUTPUT_TOKENS = 2000
+"""Average completion tokens of a resolver call, including thinking."""
+DEFAULT_CONFLICT_RATE = 0.2
+"""Share of search results sent to the resolver when there's no history."""
+DEFAULT_REVIEWER_LATENCY = 8.0
+"""Seconds per reviewer call before the limiter has measured any."""
+DEFAULT_RESOLVER_LATENCY = 60.0
+"""Seconds per resolver call before the limiter has measured any."""
+MESSAGE_OVERHEAD_TOKENS = 4
+"""Tokens the chat format adds per message."""
+PROMPT_CACHE_MIN_TOKENS = 1024
+"""OpenAI caches prompt prefixes from this length on, in 128 token increments."""
+BATCH_API_DISCOUNT = 0.5
+"""Batch API price relative to interactive calls."""
+RESOLVER_PRICE_PER_1M_TOKENS = (1.25, 10.0)
+"""USD per 1M input and output tokens of the resolver model (prompts <= 200k)."""
+
+_PROFILE_CACHE_SIZE = 32
+
+
+class StrategyEstimate(t.NamedTuple):
+    """Estimated calls, tokens and cost of one reviewer strategy."""
+
+    strategy: ScreeningStrategyType
+    calls: int
+    input_tokens: int
+    cached_input_tokens: int
+    """Part of ``input_tokens`` expected to be served from the provider prompt cache."""
+    output_tokens: int
+    cost: float
+
+
+class ScreeningRunEstimate(t.NamedTuple):
+    """Estimate of screening a review's search results.
+
+    Costs are USD, wall times seconds.
+    """
+
+    review_id: uuid.UUID
+    search_results: int
+    criteria_fingerprint: str
+    token_counter: str
+    """``tiktoken:<encoding>`` or ``chars/4`` if no encoding could be loaded."""
+    strategies: tuple[StrategyEstimate, ...]
+    conflict_rate: float
+    conflict_rate_samples: int
+    """Benchmark items the conflict rate is based on, 0 if it's the default."""
+    resolver_calls: int
+    resolver_input_tokens: int
+    resolver_output_tokens: int
+    resolver_cost: float
+    reviewer_wall_time: float
+    resolver_wall_time: float
+    wall_time: float
+
+    @property
+    def reviewer_cost(self) -> float:
+        """Cost of both reviewers."""
+        return sum(s.cost for s in self.strategies)
+
+    @property
+    def total_cost(self) -> float:
+        """Cost of an interactive run, resolver included."""
+        return self.reviewer_cost + self.resolver_cost
+
+    @property
+    def batch_cost(self) -> float:
+        """Cost with the reviewers on the batch API, resolver included."""
+        return self.reviewer_cost * BATCH_API_DISCOUNT + self.resolver_cost
+
+    def cascade_cost(
+        self, escalation_rate: float, triage_model: str = TRIAGE_MODEL_NAME
+    ) -> float:
+        """Cost with a model cascade escalating ``escalation_rate`` of the items.
+
+        Args:
+            escalation_rate (float): Share of items (0-1) the triage model isn't
+                confident about, screened again by both reviewers.
+            triage_model (str): OpenAI model of the triage pass.
+
+        Returns:
+            float: Cost of triage, escalated reviews and their resolver calls.
+        """
+        conservative = next(
+            s
+            for s in self.strategies
+            if s.strategy == ScreeningStrategyType.CONSERVATIVE
+        )
+        triage = _openai_cost(
+            triage_model,
+            conservative.input_tokens,
+            conservative.cached_input_tokens,
+            conservative.output_tokens,
+        )
+        return triage + escalation_rate * self.total_cost
+
+
+class _TokenProfile(t.NamedTuple):
+    """Token counts of a review's prompts, cached per criteria version and corpus."""
+
+    counter: str
+    system_tokens: dict[ScreeningStrategyType, int]
+    study_tokens: np.ndarray
+    resolver_static_tokens: int
+
+
+class TokenCounter:
+    """Vectorized token counting with a characters / 4 fallback.
+
+    Args:
+        model_name (str): OpenAI model whose ``tiktoken`` encoding to use.
+    """
+
+    def __init__(self, model_name: str) -> None:
+        """Initialize the counter with the tokenizer of ``model_name``."""
+        try:
+            self.encoding: tiktoken.Encoding | None = tiktoken.encoding_for_model(
+                model_name
+            )
+        except Exception as exc:
+            # Unknown model, or the encoding file can't be downloaded
+            logger.warning(
+                f"No tiktoken encoding for {model_name}, estimating chars/4: {exc!r}"
+            )
+            self.encoding = None
+
+    @property
+    def name(self) -> str:
+        """How tokens are counted."""
+        return f"tiktoken:{self.encoding.name}" if self.encoding else "chars/4"
+
+    def count(self, texts: Sequence[str]) -> np.ndarray:
+        """Tokens of each text.
+
+        Args:
+            texts (Sequence[str]): Texts to count.
+
+        Returns:
+            np.ndarray: int64 token count per text.
+        """
+        if not texts:
+            return np.zeros(0, dtype=np.int64)
+        if self.encoding is None:
+            lengths = np.char.str_len(np.asarray(texts, dtype=np.str_))
+            return np.ceil(lengths / 4).astype(np.int64)
+        encoded = self.encoding.encode_ordinary_batch(
+            list(texts), num_threads=os.cpu_count() or 1
+        )
+        return np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+
+
+@functools.cache
+def get_token_counter(model_name: str = REVIEWER_MODEL_NAME) -> TokenCounter:
+    """Shared :class:`TokenCounter` of a model."""
+    return TokenCounter(model_name)
+
+
+_profile_cache: OrderedDict[tuple[str, str], _TokenProfile] = OrderedDict()
+_profile_lock = threading.Lock()
+
+
+def _study_texts(search_results: Sequence[models.SearchResult]) -> list[str]:
+    return [
+        study_details_prompt_text.format(
+            title=sr.title or "",
+            year=sr.year or "",
+            journal=sr.journal or "",
+            abstract=sr.abstract or "",
+        )
+        for sr in search_results
+    ]
+
+
+def _system_text(prompt: ChatPromptTemplate, review: models.SystematicReview) -> str:
+    return (
+        prompt.messages[0]
+        .format(  # pyright: ignore [reportAttributeAccessIssue]
+            background=review.background or "",
+            research_question=review.research_question or "",
+            inclusion_criteria=review.inclusion_criteria or "",
+            exclusion_criteria=review.exclusion_criteria or "",
+        )
+        .content
+    )
+
+
+def _criteria_text(review: models.SystematicReview) -> str:
+    return "\n".join(
+        [
+            review.background or "",
+            review.research_question or "",
+            review.inclusion_criteria or "",
+            review.exclusion_criteria or "",
+        ]
+    )
+
+
+def _resolver_static_text() -> str:
+    messages = resolver_prompt.format_messages(
+        **dict.fromkeys(resolver_prompt.input_variables, "")
+    )
+    return "\n".join(str(m.content) for m in messages)
+
+
+def _token_profile(
+    review: models.SystematicReview,
+    search_results: Sequence[models.SearchResult],
+    counter: TokenCounter,
+) -> _TokenProfile:
+    studies = _study_texts(search_results)
+    corpus_key = hashlib.sha256("\0".join(studies).encode()).hexdigest()
+    key = (f"{counter.name}:{criteria_fingerprint(review)}", corpus_key)
+    with _profile_lock:
+        if (profile := _profile_cache.get(key)) is not None:
+            _profile_cache.move_to_end(key)
+            return profile
+
+    # The reviewers' strict JSON schema response_format counts as prompt tokens
+    schema_tokens = int(counter.count([str(SCREENING_RESPONSE_FORMAT)])[0])
+    strategies = {
+        ScreeningStrategyType.CONSERVATIVE: conservative_reviewer_prompt,
+        ScreeningStrategyType.COMPREHENSIVE: comprehensive_reviewer_prompt,
+    }
+    system_counts = counter.count(
+        [_system_text(prompt, review) for prompt in strategies.values()]
+    )
+    criteria_tokens = int(counter.count([_criteria_text(review)])[0])
+    profile = _TokenProfile(
+        counter=counter.name,
+        system_tokens={
+            strategy: int(n) + schema_tokens + MESSAGE_OVERHEAD_TOKENS
+            for strategy, n in zip(strategies, system_counts, strict=True)
+        },
+        study_tokens=counter.count(studies) + MESSAGE_OVERHEAD_TOKENS,
+        resolver_static_tokens=int(counter.count([_resolver_static_text()])[0])
+        + criteria_tokens,
+    )
+    with _profile_lock:
+        _profile_cache[key] = profile
+        while len(_profile_cache) > _PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+    return profile
+
+
+def _openai_cost(
+    model_name: str, input_tokens: int, cached_input_tokens: int, output_tokens: int
+) -> float:
+    return (
+        get_openai_token_cost_for_model(
+            model_name, input_tokens - cached_input_tokens, token_type=TokenType.PROMPT
+        )
+        + get_openai_token_cost_for_model(
+            model_name, cached_input_tokens, token_type=TokenType.PROMPT_CACHED
+        )
+        + get_openai_token_cost_for_model(
+            model_name, output_tokens, token_type=TokenType.COMPLETION
+        )
+    )
+
+
+def _wall_time(
+    calls: int, limiter: AdaptiveConcurrencyLimiter, default: float
+) -> float:
+    if not calls:
+        return 0.0
+    stats = limiter.stats()
+    latency = stats.latency_ewma or default
+    return math.ceil(calls / max(1.0, stats.limit)) * latency
+
+
+def estimate_screening_run(
+    review: models.SystematicReview,
+    search_results: Sequence[models.SearchResult],
+    *,
+    conflict_stats: tuple[int, int] | None = None,
+    counter: TokenCounter | None = None,
+) -> ScreeningRunEstimate:
+    """Estimate tokens, cost and wall time of screening search results.
+
+    Args:
+        review (SystematicReview): Review the search results belong to.
+        search_results (Sequence[SearchResult]): Search results to screen.
+        conflict_stats (tuple[int, int] | None): ``(conflicts, samples)`` of past
+            screenings, :data:`DEFAULT_CONFLICT_RATE` if None or no samples.
+        counter (TokenCounter | None): Token counter, defaults to the reviewer
+            model's.
+
+    Returns:
+        ScreeningRunEstimate: The estimate.
+    """
+    counter = counter or get_token_counter(REVIEWER_MODEL_NAME)
+    profile = _token_profile(review, search_results, counter)
+    n = len(search_results)
+    study_tokens = int(profile.study_tokens.sum())
+
+    strategies: list[StrategyEstimate] = []
+    for strategy, system_tokens in profile.system_tokens.items():
+        input_tokens = n * system_tokens + study_tokens
+        # The system prompt and schema are a shared prefix, cached after the first call
+        cached_prefix = (
+            system_tokens // 128 * 128
+            if system_tokens >= PROMPT_CACHE_MIN_TOKENS
+            else 0
+        )
+        cached_input_tokens = cached_prefix * max(0, n - 1)
+        output_tokens = n * REVIEWER_OUTPUT_TOKENS
+        strategies.append(
+            StrategyEstimate(
+                strategy=strategy,
+                calls=n,
+                input_tokens=input_tokens,
+                cached_input_tokens=cached_input_tokens,
+                output_tokens=output_tokens,
+                cost=_openai_cost(
+                    REVIEWER_MODEL_NAME,
+                    input_tokens,
+                    cached_input_tokens,
+                    output_tokens,
+                ),
+            )
+        )
+
+    conflicts, samples = conflict_stats or (0, 0)
+    conflict_rate = conflicts / samples if samples else DEFAULT_CONFLICT_RATE
+    resolver_calls = round(n * conflict_rate)
+    # Mean study size of the corpus, conflicts can't be predicted per item
+    mean_study_tokens = study_tokens / n if n else 0.0
+    resolver_input_tokens = round(
+        resolver_calls
+        * (
+            profile.resolver_static_tokens
+            + mean_study_tokens
+            + 2 * REVIEWER_OUTPUT_TOKENS
+        )
+    )
+    resolver_output_tokens = resolver_calls * RESOLVER_OUTPUT_TOKENS
+    input_price, output_price = RESOLVER_PRICE_PER_1M_TOKENS
+    resolver_cost = (
+        resolver_input_tokens * input_price + resolver_output_tokens * output_price
+    ) / 1e6
+
+    reviewer_wall_time = _wall_time(2 * n, reviewer_limiter, DEFAULT_REVIEWER_LATENCY)
+    resolver_wall_time = _wall_time(
+        resolver_calls, resolver_limiter, DEFAULT_RESOLVER_LATENCY
+    )
+    # Resolver calls run behind screening, only the last ones add to the run time
+    wall_time = (
+        max(reviewer_wall_time, resolver_wall_time)
+        + (resolver_limiter.stats().latency_ewma or DEFAULT_RESOLVER_LATENCY)
+        if resolver_calls
+        else reviewer_wall_time
+    )
+
+    estimate = ScreeningRunEstimate(
+        review_id=review.id,
+        search_results=n,
+        criteria_fingerprint=criteria_fingerprint(review),
+        token_counter=profile.counter,
+        strategies=tuple(strategies),
+        conflict_rate=conflict_rate,
+        conflict_rate_samples=samples,
+        resolver_calls=resolver_calls,
+        resolver_input_tokens=resolver_input_tokens,
+        resolver_output_tokens=resolver_output_tokens,
+        resolver_cost=resolver_cost,
+        reviewer_wall_time=reviewer_wall_time,
+        resolver_wall_time=resolver_wall_time,
+        wall_time=wall_time,
+    )
+    logger.bind(review_id=review.id).info(
+        f"Screening estimate for {n} search results: ${estimate.total_cost:.2f}"
+        + f" (batch ${estimate.batch_cost:.2f}), ~{wall_time / 60:.0f} min,"
+        + f" {resolver_calls} resolver calls, {RESOLVER_MODEL_NAME} resolver"
+    )
+    return estimate
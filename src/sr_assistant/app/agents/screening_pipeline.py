@@ -0,0 +1,188 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Pipelined screen → resolve execution.
+
+Running the resolver only after a whole batch has been screened makes the wall time
+of a batch the *sum* of screening and resolution. :func:`screen_and_resolve_as_completed`
+instead hands each conflict to the resolver as soon as both reviewers of that search
+result have finished (see :func:`needs_resolver`), so Gemini resolution of item ``i``
+overlaps ``gpt-4o`` screening of the items still in flight and the wall time is close
+to ``max(screen, resolve)``.
+
+Resolver calls run on a small thread pool and are paced by the resolver rate limiter
+like any other ``invoke_resolver_chain`` call.
+
+Examples:
+    >>> for res in screen_and_resolve_as_completed(batch, 0, review):  # doctest: +SKIP
+    ...     print(res.search_result.id, res.resolver_needed, res.resolver_result)
+"""
+
+from __future__ import annotations
+
+import typing as t
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from loguru import logger
+
+from sr_assistant.app.agents.packed_screening import screen_abstracts_packed
+from sr_assistant.app.agents.screening_agents import (
+    ScreenAbstractResultTuple,
+    ScreeningError,
+    invoke_resolver_chain,
+    screen_abstracts_batch_as_completed,
+)
+from sr_assistant.app.agents.screening_cascade import (
+    CascadeConfig,
+    screen_abstracts_cascade_as_completed,
+)
+from sr_assistant.core.schemas import ResolverOutputSchema, ScreeningResult
+from sr_assistant.core.types import ScreeningDecisionType
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from sr_assistant.core import models
+
+RESOLVER_CONFIDENCE_THRESHOLD = 0.7
+"""Agreeing reviewers below this confidence are still sent to the resolver."""
+
+DEFAULT_RESOLVER_WORKERS = 8
+"""Resolver calls in flight while screening continues."""
+
+
+class ScreenResolveResultTuple(t.NamedTuple):
+    """Screening result tuple plus the resolver's output, if it was needed."""
+
+    search_result: models.SearchResult
+    conservative_result: ScreeningResult | ScreeningError
+    comprehensive_result: ScreeningResult | ScreeningError
+    resolver_needed: bool = False
+    resolver_result: ResolverOutputSchema | None = None
+    """None if not needed or if the resolver failed (logged by ``invoke_resolver_chain``)."""
+
+
+def needs_resolver(
+    conservative_result: ScreeningResult, comprehensive_result: ScreeningResult
+) -> bool:
+    """Determine if resolver is needed based on conservative and comprehensive results."""
+    # Check for disagreement between conservative and comprehensive
+    if conservative_result.decision != comprehensive_result.decision:
+        return True
+
+    # Check if both are uncertain
+    if (
+        conservative_result.decision == ScreeningDecisionType.UNCERTAIN
+        and comprehensive_result.decision == ScreeningDecisionType.UNCERTAIN
+    ):
+        return True
+
+    # Check for low confidence even with agreement
+    min_confidence = min(
+        conservative_result.confidence_score, comprehensive_result.confidence_score
+    )
+    return min_confidence < RESOLVER_CONFIDENCE_THRESHOLD
+
+
+def screen_and_resolve_as_completed(  # noqa: PLR0913
+    batch: list[models.SearchResult],
+    batch_idx: int,
+    review: models.SystematicReview,
+    *,
+    bypass_cache: bool = False,
+    max_resolver_workers: int = DEFAULT_RESOLVER_WORKERS,
+    pack_size: int = 1,
+    cascade: CascadeConfig | None = None,
+) -> Iterator[ScreenResolveResultTuple]:
+    """Screen a batch and resolve its conflicts while screening is still running.
+
+    Results are yielded in completion order: items that don't need the resolver
+    right after screening, conflicts once their resolver call returns. Items with a
+    reviewer error are never sent to the resolver.
+
+    With ``pack_size`` above 1 the batch is screened with packed prompts (see
+    :mod:`~sr_assistant.app.agents.packed_screening`), which returns the whole batch
+    at once, so resolution starts only after screening. With an enabled ``cascade``
+    a cheaper model triages first (see
+    :mod:`~sr_assistant.app.agents.screening_cascade`).
+
+    Args:
+        batch (list[SearchResult]): list of search results to be screened
+        batch_idx (int): index of the batch
+        review (SystematicReview): systematic review associated with this batch
+        bypass_cache (bool): Skip LLM cache lookups for runs that must be fresh.
+        max_resolver_workers (int): Resolver calls in flight at once.
+        pack_size (int): Abstracts per reviewer request, 1 for single-item screening.
+        cascade (CascadeConfig | None): Model cascade settings, ``None`` to screen
+            everything with both reviewers.
+
+    Yields:
+        ScreenResolveResultTuple: one per search result in ``batch``.
+
+    Raises:
+        ValueError: If both packed prompts and the cascade are requested.
+    """
+    if pack_size > 1 and cascade and cascade.enabled:
+        msg = "Packed prompts and the model cascade can't be combined"
+        raise ValueError(msg)
+    batch_logger = logger.bind(batch_idx=batch_idx)
+    pending: dict[Future[ResolverOutputSchema | None], ScreenResolveResultTuple] = {}
+
+    def _resolved(
+        future: Future[ResolverOutputSchema | None],
+    ) -> ScreenResolveResultTuple:
+        result = pending.pop(future)
+        try:
+            return result._replace(resolver_result=future.result())
+        except Exception:
+            batch_logger.exception(
+                f"Resolver failed for SearchResult {result.search_result.id}"
+            )
+            return result
+
+    with ThreadPoolExecutor(
+        max_workers=max_resolver_workers, thread_name_prefix="resolver"
+    ) as executor:
+        screened: Iterable[ScreenAbstractResultTuple]
+        if pack_size > 1:
+            screened = screen_abstracts_packed(
+                batch, batch_idx, review, pack_size=pack_size, bypass_cache=bypass_cache
+            ).results
+        elif cascade and cascade.enabled:
+            screened = screen_abstracts_cascade_as_completed(
+                batch, batch_idx, review, cascade=cascade, bypass_cache=bypass_cache
+            )
+        else:
+            screened = screen_abstracts_batch_as_completed(
+                batch, batch_idx, review, bypass_cache=bypass_cache
+            )
+        for result_tuple in screened:
+            conservative = result_tuple.conservative_result
+            comprehensive = result_tuple.comprehensive_result
+            result = ScreenResolveResultTuple(*result_tuple)
+            if (
+                isinstance(conservative, ScreeningResult)
+                and isinstance(comprehensive, ScreeningResult)
+                and needs_resolver(conservative, comprehensive)
+            ):
+                batch_logger.debug(
+                    f"Sending SearchResult {result.search_result.id} to resolver"
+                )
+                future = executor.submit(
+                    invoke_resolver_chain,
+                    search_result=result.search_result,
+                    review=review,
+                    conservative_result=conservative,
+                    comprehensive_result=comprehensive,
+                    bypass_cache=bypass_cache,
+                )
+                pending[future] = result._replace(resolver_needed=True)
+            else:
+                yield result
+            for future in [f for f in pending if f.done()]:
+                yield _resolved(future)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield _resolved(future)
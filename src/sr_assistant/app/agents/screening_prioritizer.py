@@ -0,0 +1,285 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Screening prioritization with a local TF-IDF ranker.
+
+Relevant studies are a small share of a search, so screening them first lets a
+partial run (or a user watching the stream) see most of the includes early.
+:class:`ScreeningPrioritizer` orders a review's search results by how likely they
+are to be included, without any LLM calls:
+
+- Titles, abstracts and keywords are hashed into a sparse term count matrix
+  (``HashingVectorizer``), so search results added to the review later are appended
+  as new rows without refitting a vocabulary. TF-IDF weights are recomputed from the
+  counts when the matrix changes.
+- Before there are decisions, search results are scored by cosine similarity to the
+  review's research question and inclusion criteria.
+- Screening decisions (:func:`relevance_label`) train an ``SGDClassifier``
+  incrementally with ``partial_fit``, only rows labelled since the last update are
+  fit. Once both classes have :data:`MIN_CLASS_LABELS` labels its include
+  probability is blended in, taking over fully at :data:`MODEL_RAMP_LABELS` labels.
+
+Prioritizers are cached per review (:func:`get_prioritizer`) and rebuilt when the
+review's criteria change, see
+:func:`~sr_assistant.app.agents.screening_agents.criteria_fingerprint`.
+
+Examples:
+    >>> prioritizer = get_prioritizer(review)  # doctest: +SKIP
+    >>> prioritizer.observe({sr.id: True})  # doctest: +SKIP
+    >>> ranked = prioritizer.rank(search_results)  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+import threading
+import typing as t
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+from loguru import logger
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.linear_model import SGDClassifier
+
+from sr_assistant.app.agents.screening_agents import (
+    ScreeningError,
+    criteria_fingerprint,
+)
+from sr_assistant.core.types import ScreeningDecisionType
+
+if t.TYPE_CHECKING:
+    import uuid
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from sr_assistant.app.agents.screening_agents import ScreenAbstractResultTuple
+    from sr_assistant.core import models
+
+N_FEATURES = 2**18
+"""Hashed feature space size of the term count matrix."""
+MIN_CLASS_LABELS = 3
+"""Labels needed of both classes before the classifier is used."""
+MODEL_RAMP_LABELS = 50
+"""Labels at which the classifier's score replaces the criteria similarity."""
+PRIORITIZATION_CHUNK_SIZE = 50
+"""Search results screened between re-rankings of a streamed run."""
+
+_CACHE_SIZE = 16
+
+
+def relevance_label(decisions: Iterable[ScreeningDecisionType | None]) -> bool | None:
+    """Whether a search result's screening decisions make it relevant.
+
+    Any include or uncertain decision counts as relevant, it would be read in full.
+
+    Args:
+        decisions (Iterable[ScreeningDecisionType | None]): Final decision, or the
+            reviewers' decisions. None entries (not screened) are ignored.
+
+    Returns:
+        bool | None: The label, None if there are no decisions.
+    """
+    known = [d for d in decisions if d is not None]
+    if not known:
+        return None
+    return any(d != ScreeningDecisionType.EXCLUDE for d in known)
+
+
+def result_tuple_label(result_tuple: ScreenAbstractResultTuple) -> bool | None:
+    """:func:`relevance_label` of a screened search result's reviewer results."""
+    return relevance_label(
+        None if isinstance(result, ScreeningError) else result.decision
+        for result in (
+            result_tuple.conservative_result,
+            result_tuple.comprehensive_result,
+        )
+    )
+
+
+def _document(search_result: models.SearchResult) -> str:
+    return "\n".join(
+        [
+            search_result.title or "",
+            search_result.abstract or "",
+            " ".join(search_result.keywords or []),
+        ]
+    )
+
+
+class ScreeningPrioritizer:
+    """Relevance ranking of one review's search results.
+
+    Thread-safe, the service shares one instance per review between runs.
+
+    Args:
+        review (SystematicReview): Review whose research question and inclusion
+            criteria are the cold-start query.
+    """
+
+    def __init__(self, review: models.SystematicReview) -> None:
+        """Initialize the prioritizer with the review's criteria."""
+        self.review_id = review.id
+        self.criteria_fingerprint = criteria_fingerprint(review)
+        self._vectorizer = HashingVectorizer(
+            n_features=N_FEATURES,
+            ngram_range=(1, 2),
+            stop_words="english",
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float32,
+        )
+        self._query = self._vectorizer.transform(
+            [f"{review.research_question or ''}\n{review.inclusion_criteria or ''}"]
+        )
+        self._counts = sp.csr_matrix((0, N_FEATURES), dtype=np.float32)
+        self._tfidf: sp.csr_matrix | None = None
+        self._query_tfidf: sp.csr_matrix | None = None
+        self._rows: dict[uuid.UUID, int] = {}
+        self._labels: dict[uuid.UUID, bool] = {}
+        self._model = SGDClassifier(loss="log_loss", alpha=1e-4, random_state=0)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Number of search results in the matrix."""
+        return len(self._rows)
+
+    @property
+    def labels(self) -> int:
+        """Number of labelled search results."""
+        return len(self._labels)
+
+    @property
+    def model_weight(self) -> float:
+        """Share (0-1) of the score coming from the classifier."""
+        with self._lock:
+            includes = sum(self._labels.values())
+            excludes = len(self._labels) - includes
+            if min(includes, excludes) < MIN_CLASS_LABELS:
+                return 0.0
+            return min(1.0, len(self._labels) / MODEL_RAMP_LABELS)
+
+    def add(self, search_results: Iterable[models.SearchResult]) -> int:
+        """Append search results not in the matrix yet.
+
+        Args:
+            search_results (Iterable[SearchResult]): The review's search results.
+
+        Returns:
+            int: Number of rows added.
+        """
+        with self._lock:
+            new = list(
+                {sr.id: sr for sr in search_results if sr.id not in self._rows}.values()
+            )
+            if not new:
+                return 0
+            for sr in new:
+                self._rows[sr.id] = len(self._rows)
+            self._counts = sp.vstack(
+                [self._counts, self._vectorizer.transform(map(_document, new))],
+                format="csr",
+            )
+            self._tfidf = self._query_tfidf = None
+            return len(new)
+
+    def _weights(self) -> tuple[sp.csr_matrix, sp.csr_matrix]:
+        """TF-IDF rows and query, l2 normalized, refit after :meth:`add`."""
+        if self._tfidf is None or self._query_tfidf is None:
+            transformer = TfidfTransformer(sublinear_tf=True).fit(self._counts)
+            self._tfidf = transformer.transform(self._counts).astype(np.float32)
+            self._query_tfidf = transformer.transform(self._query).astype(np.float32)
+        return self._tfidf, self._query_tfidf
+
+    def observe(self, labels: Mapping[uuid.UUID, bool]) -> int:
+        """Train on new or changed labels.
+
+        Labels of search results that aren't in the matrix are ignored, :meth:`add`
+        them first.
+
+        Args:
+            labels (Mapping[uuid.UUID, bool]): Relevance label by search result ID,
+                see :func:`relevance_label`.
+
+        Returns:
+            int: Number of labels the classifier was updated with.
+        """
+        with self._lock:
+            new = {
+                sr_id: label
+                for sr_id, label in labels.items()
+                if sr_id in self._rows and self._labels.get(sr_id) != label
+            }
+            if not new:
+                return 0
+            self._labels.update(new)
+            tfidf, _ = self._weights()
+            y = np.fromiter(new.values(), dtype=np.int8, count=len(new))
+            # Includes are rare, weigh both classes by their share of all labels
+            includes = sum(self._labels.values())
+            class_weight = {
+                1: len(self._labels) / (2 * max(1, includes)),
+                0: len(self._labels) / (2 * max(1, len(self._labels) - includes)),
+            }
+            self._model.partial_fit(
+                tfidf[[self._rows[sr_id] for sr_id in new]],
+                y,
+                classes=np.array([0, 1]),
+                sample_weight=np.array([class_weight[label] for label in y]),
+            )
+            logger.debug(
+                f"Prioritizer for review {self.review_id} trained on {len(new)} labels, {len(self._labels)} total"
+            )
+            return len(new)
+
+    def scores(self, search_results: Sequence[models.SearchResult]) -> np.ndarray:
+        """Relevance score (0-1) of each search result, higher is screened first.
+
+        Search results not in the matrix yet are added.
+
+        Args:
+            search_results (Sequence[SearchResult]): Search results to score.
+
+        Returns:
+            np.ndarray: float score per search result.
+        """
+        if not search_results:
+            return np.zeros(0)
+        with self._lock:
+            self.add(search_results)
+            tfidf, query = self._weights()
+            x = tfidf[[self._rows[sr.id] for sr in search_results]]
+            similarity = (x @ query.T).toarray().ravel()
+            if (top := similarity.max()) > 0:
+                similarity /= top
+            weight = self.model_weight
+            if not weight:
+                return similarity
+            proba = self._model.predict_proba(x)[:, 1]
+            return (1 - weight) * similarity + weight * proba
+
+    def rank(
+        self, search_results: Sequence[models.SearchResult]
+    ) -> list[models.SearchResult]:
+        """Search results ordered most likely relevant first, ties keep their order."""
+        order = np.argsort(-self.scores(search_results), kind="stable")
+        return [search_results[i] for i in order]
+
+
+_prioritizers: OrderedDict[uuid.UUID, ScreeningPrioritizer] = OrderedDict()
+_prioritizers_lock = threading.Lock()
+
+
+def get_prioritizer(review: models.SystematicReview) -> ScreeningPrioritizer:
+    """Cached :class:`ScreeningPrioritizer` of a review.
+
+    A new one is created if the review's criteria changed since the cached one was.
+    """
+    fingerprint = criteria_fingerprint(review)
+    with _prioritizers_lock:
+        prioritizer = _prioritizers.get(review.id)
+        if prioritizer is None or prioritizer.criteria_fingerprint != fingerprint:
+            prioritizer = ScreeningPrioritizer(review)
+            _prioritizers[review.id] = prioritizer
+        _prioritizers.move_to_end(review.id)
+        while len(_prioritizers) > _CACHE_SIZE:
+            _prioritizers.popitem(last=False)
+        return prioritizer
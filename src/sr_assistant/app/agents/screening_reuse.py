@@ -0,0 +1,163 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Reuse of screening decisions across reviews.
+
+Update reviews and sibling reviews often screen the same articles against the same
+criteria. A reviewer's decision only depends on the article, the review fields the
+prompt is rendered with, the prompt templates and the model, so a decision made in
+one review can be cloned into another instead of calling the LLM again.
+
+- :func:`reuse_key` hashes the article (DOI, else PMID, see :func:`article_key`),
+  the review's :func:`~sr_assistant.app.agents.screening_agents.criteria_fingerprint`,
+  the strategy's :func:`prompt_version` and the model name. It's stored on
+  ``ScreenAbstractResult.reuse_key`` (indexed), one lookup per item finds a match.
+- :func:`clone_screening_result` copies a matching result into the current review,
+  with its provenance in ``response_metadata["reused_from"]``.
+
+Examples:
+    >>> key = reuse_key(  # doctest: +SKIP
+    ...     search_result, criteria_fingerprint(review), strategy, "gpt-4o"
+    ... )
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import re
+import typing as t
+import uuid
+from datetime import UTC, datetime
+
+from sr_assistant.app.agents.screening_agents import (
+    comprehensive_reviewer_prompt,
+    conservative_reviewer_prompt,
+)
+from sr_assistant.app.llm_cache import prompt_fingerprint
+from sr_assistant.core import schemas
+from sr_assistant.core.types import ScreeningStrategyType, SearchDatabaseSource
+
+if t.TYPE_CHECKING:
+    from sr_assistant.core import models
+
+REUSE_KEY_VERSION = 1
+"""Bump to stop reusing all existing results, e.g. when the key derivation changes."""
+REUSED_FROM_KEY = "reused_from"
+"""``response_metadata`` key holding the provenance of a cloned result."""
+
+_DOI_PREFIX_RE = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+
+
+def article_key(search_result: models.SearchResult) -> str | None:
+    """Identifier of the article across reviews and databases.
+
+    Args:
+        search_result (SearchResult): Search result of the article.
+
+    Returns:
+        str | None: ``doi:<doi>`` (lowercase, without resolver prefix), else
+            ``pmid:<pmid>`` for PubMed records. None if it has neither.
+    """
+    if search_result.doi and (doi := _DOI_PREFIX_RE.sub("", search_result.doi.strip())):
+        return f"doi:{doi.lower()}"
+    if (
+        search_result.source_db == SearchDatabaseSource.PUBMED
+        and search_result.source_id
+    ):
+        return f"pmid:{search_result.source_id.strip()}"
+    return None
+
+
+@functools.cache
+def prompt_version(strategy: ScreeningStrategyType) -> str:
+    """Short hash of a reviewer strategy's prompt templates."""
+    prompt = (
+        conservative_reviewer_prompt
+        if strategy == ScreeningStrategyType.CONSERVATIVE
+        else comprehensive_reviewer_prompt
+    )
+    return hashlib.sha256(json.dumps(prompt_fingerprint(prompt)).encode()).hexdigest()[
+        :16
+    ]
+
+
+def reuse_key(
+    search_result: models.SearchResult,
+    criteria_fingerprint: str,
+    strategy: ScreeningStrategyType,
+    model_name: str,
+) -> str | None:
+    """Key under which a reviewer's decision on an article can be reused.
+
+    Args:
+        search_result (SearchResult): Screened search result.
+        criteria_fingerprint (str): The review's criteria fingerprint.
+        strategy (ScreeningStrategyType): Reviewer strategy.
+        model_name (str): Model that made the decision.
+
+    Returns:
+        str | None: Hex SHA-256 digest, None if the article can't be identified.
+    """
+    article = article_key(search_result)
+    if article is None:
+        return None
+    payload = json.dumps(
+        [
+            REUSE_KEY_VERSION,
+            article,
+            criteria_fingerprint,
+            str(strategy),
+            prompt_version(strategy),
+            model_name,
+        ]
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def clone_screening_result(
+    source: models.ScreenAbstractResult,
+    *,
+    review_id: uuid.UUID,
+    search_result_id: uuid.UUID,
+    trace_id: uuid.UUID,
+) -> schemas.ScreeningResult:
+    """Copy of a persisted screening result for another review's search result.
+
+    Args:
+        source (ScreenAbstractResult): Result with a matching reuse key.
+        review_id (uuid.UUID): Review the copy is for.
+        search_result_id (uuid.UUID): Search result the copy is for.
+        trace_id (uuid.UUID): Shared by both reviewers' copies of a search result.
+
+    Returns:
+        ScreeningResult: Result with a new ID and the source's decision.
+    """
+    now = datetime.now(UTC)
+    return schemas.ScreeningResult(
+        id=uuid.uuid4(),
+        review_id=review_id,
+        search_result_id=search_result_id,
+        trace_id=trace_id,
+        model_name=source.model_name,
+        screening_strategy=source.screening_strategy,
+        decision=source.decision,
+        confidence_score=source.confidence_score,
+        rationale=source.rationale,
+        extracted_quotes=list(source.extracted_quotes or []) or None,
+        exclusion_reason_categories=(
+            schemas.ExclusionReasons.model_validate(source.exclusion_reason_categories)
+            if source.exclusion_reason_categories
+            else None
+        ),
+        start_time=now,
+        end_time=now,
+        response_metadata={
+            REUSED_FROM_KEY: {
+                "screen_abstract_result_id": str(source.id),
+                "review_id": str(source.review_id),
+                "reuse_key": source.reuse_key,
+            }
+        },
+    )
@@ -97,6 +97,23 @@ class Settings(BaseSettings):
 
     log_level: LogLevel = Field(default=LogLevel.DEBUG)
 
+    LLM_CACHE_BACKEND: t.Literal["postgres", "sqlite", "disabled"] = Field(
+        default="postgres",
+        description="Where screening/resolver LLM responses are cached. sqlite is a local tier for workers.",
+    )
+    """From SRA_LLM_CACHE_BACKEND env var."""
+    LLM_CACHE_PATH: str = Field(default=".cache/llm_cache.sqlite3")
+    """SQLite cache file, only used with the sqlite backend. From SRA_LLM_CACHE_PATH env var."""
+    LLM_CACHE_TTL_SECONDS: int | None = Field(default=60 * 60 * 24 * 30)
+    """Cache entries older than this are treated as misses and evicted. None to keep forever."""
+    LLM_CACHE_MAX_ENTRIES: int | None = Field(default=500_000)
+    """Least recently used entries above this count are evicted. None for unbounded."""
+
+    SCREENING_HEDGING: bool = Field(default=True)
+    """Hedge slow async reviewer calls. From SRA_SCREENING_HEDGING env var."""
+    SCREENING_HEDGE_MAX_RATIO: float = Field(default=0.1, ge=0.0, le=1.0)
+    """Maximum hedges per reviewer call of a screening run."""
+
     env: t.Literal["local", "test", "prototype"] = Field(
         default="prototype",
         validation_alias="environment",
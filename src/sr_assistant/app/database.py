@@ -2,6 +2,12 @@
 
 See `async SQLAlchemy <https://docs.sqlalchemy.org/en/20/orm/extensions/asyncio.html>`_
 
+Pooled asyncio connections belong to the event loop that opened them, so
+``async_engine`` and ``asession_factory`` are used on one long-lived loop in a
+background thread (:func:`get_event_loop`). Sync code, e.g. a Streamlit script
+thread, runs coroutines on it with :func:`run_async`, and concurrent coroutines share
+the pool and the loop's LLM and database I/O.
+
 .. code-block:: python
 
     # refresh a collection
@@ -9,12 +15,13 @@ See `async SQLAlchemy <https://docs.sqlalchemy.org/en/20/orm/extensions/asyncio.
     await async_session.refresh(a_obj, ["bs"])
 """
 
+import asyncio
+import threading
 import typing as t
 
 import streamlit as st
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
 from sqlmodel import create_engine
 from sqlmodel.ext.asyncio.session import AsyncSession as AsyncSQLModelSession
 from sqlmodel.orm.session import Session as SQLModelSession
@@ -95,14 +102,16 @@ asession_factory = async_sessionmaker(
     bind=async_engine,
     expire_on_commit=False,
     class_=AsyncSQLModelSession,
-    sync_session_class=session_factory,
-    # https://docs.sqlalchemy.org/en/20/orm/extensions/asyncio.html#using-multiple-asyncio-event-loops
-    poolclass=NullPool,
+    sync_session_class=SQLModelSession,
 )
 """`async_sessionmaker` context manager for async sessions.
 
 Usage: ``async with asession_factory.begin() as session:`` to auto-commit and rollback
 on exit.
+
+Sessions share ``async_engine``'s pool, use them on the :func:`get_event_loop` loop.
+``session.run_sync(fn, ...)`` calls ``fn`` with a sync ``SQLModelSession`` whose
+queries are awaited on the loop, sync repositories work with it unchanged.
 """
 
 if ut.in_streamlit() and "asession_factory" not in st.session_state:
@@ -110,6 +119,59 @@ if ut.in_streamlit() and "asession_factory" not in st.session_state:
 """Session state is thread-safe (RLock) and can be shared across pools if you've the ctx holding it."""
 
 
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """The application event loop, started in a daemon thread on first use.
+
+    See `using multiple asyncio event loops
+    <https://docs.sqlalchemy.org/en/20/orm/extensions/asyncio.html#using-multiple-asyncio-event-loops>`_
+    for why there's one.
+    """
+    global _loop  # noqa: PLW0603
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="sra-event-loop", daemon=True
+            ).start()
+        return _loop
+
+
+def run_async[T](coro: t.Coroutine[t.Any, t.Any, T]) -> T:
+    """Run a coroutine on the application event loop and wait for its result.
+
+    Args:
+        coro (Coroutine): E.g. ``service.aperform_batch_abstract_screening(...)``.
+
+    Returns:
+        T: The coroutine's result, its exception is raised. If the wait is
+            interrupted the coroutine is cancelled.
+
+    Raises:
+        RuntimeError: If called from the application event loop, which would wait on
+            itself. ``await`` the coroutine there.
+    """
+    loop = get_event_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        msg = "run_async() called from the application event loop, await instead"
+        raise RuntimeError(msg)
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result()
+    except BaseException:
+        # e.g. a Streamlit rerun stopping the script thread
+        future.cancel()
+        raise
+
+
 async def acreate_tables() -> None:
     async with async_engine.begin() as conn:
         await conn.run_sync(SQLModelBase.metadata.create_all)
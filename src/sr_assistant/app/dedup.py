@@ -0,0 +1,257 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Near-duplicate detection of search results with MinHash and LSH.
+
+The same paper is often ingested more than once: PubMed and Scopus both return it,
+the record differs slightly between databases (punctuation, abstract headings,
+truncated titles) and the exact ``source_id``/DOI checks don't catch it. Screening
+every copy pays for the same LLM calls several times.
+
+- :func:`minhash_signature` hashes the word shingles of a search result's
+  normalized title and abstract into a :data:`NUM_PERM` value MinHash signature.
+  Signatures are stored on ``SearchResult.minhash_signature`` so later runs only
+  hash new search results. Search results without an abstract or with fewer than
+  :data:`MIN_SHINGLES` shingles aren't signed: editorials, errata or conference
+  "Poster session" entries share their few words and would all look alike.
+- :class:`LSHIndex` buckets signatures by :data:`LSH_BANDS` bands, search results
+  sharing a band are candidates. Candidates are verified by their estimated Jaccard
+  similarity (:data:`DUPLICATE_THRESHOLD`).
+- :func:`cluster_duplicates` joins verified pairs into clusters, never two search
+  results with different DOIs. The first search result of a cluster in the given
+  order is its representative, the others point at it with
+  ``SearchResult.duplicate_of_id``.
+
+Only representatives are screened, their decisions are fanned out to the rest of
+the cluster, see ``ScreeningService.stream_batch_abstract_screening``.
+
+Examples:
+    >>> signatures = {sr.id: minhash_signature(sr) for sr in results}  # doctest: +SKIP
+    >>> clusters = cluster_duplicates(signatures)  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+import re
+import typing as t
+import unicodedata
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+if t.TYPE_CHECKING:
+    import uuid
+    from collections.abc import Mapping
+
+    from sr_assistant.core import models
+
+NUM_PERM = 128
+"""Hash functions per MinHash signature."""
+LSH_BANDS = 32
+"""LSH bands, with ``NUM_PERM // LSH_BANDS`` rows each.
+
+32 bands of 4 rows make pairs with a Jaccard similarity of 0.6 candidates ~99% of
+the time, and pairs at 0.2 about 5% of the time.
+"""
+DUPLICATE_THRESHOLD = 0.8
+"""Estimated Jaccard similarity from which candidates are duplicates."""
+SHINGLE_SIZE = 3
+"""Words per shingle."""
+MIN_SHINGLES = 20
+"""Shingles a search result needs to be signed, about a title and a short abstract."""
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Fixed seed, stored signatures must stay comparable across processes and releases
+_PERMUTATIONS = np.random.default_rng(1).integers(
+    1, int(_MERSENNE_PRIME), size=(2, NUM_PERM), dtype=np.uint64
+)
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+class DuplicateCluster(t.NamedTuple):
+    """Near-duplicate search results, screened once."""
+
+    representative_id: uuid.UUID
+    duplicate_ids: tuple[uuid.UUID, ...]
+    """The other search results of the cluster."""
+
+
+def normalize_text(*parts: str | None) -> list[str]:
+    """Lowercased, accent-stripped words of the text parts."""
+    text = unicodedata.normalize("NFKD", " ".join(p for p in parts if p))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _WORD_RE.findall(text.casefold())
+
+
+def shingles(search_result: models.SearchResult) -> set[str] | None:
+    """Word shingles of a search result's title and abstract.
+
+    Returns:
+        set[str] | None: The shingles, None if the search result has no abstract or
+            fewer than :data:`MIN_SHINGLES` of them.
+    """
+    if not normalize_text(search_result.abstract):
+        return None
+    words = normalize_text(search_result.title, search_result.abstract)
+    shingle_set = {
+        " ".join(words[i : i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+    return shingle_set if len(shingle_set) >= MIN_SHINGLES else None
+
+
+def minhash_signature(search_result: models.SearchResult) -> np.ndarray | None:
+    """MinHash signature of a search result's title and abstract.
+
+    Args:
+        search_result (SearchResult): Search result to hash.
+
+    Returns:
+        np.ndarray | None: ``NUM_PERM`` uint32 values, None if there's too little
+            text to tell the search result apart, see :func:`shingles`.
+    """
+    if (shingle_set := shingles(search_result)) is None:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(s.encode()) for s in shingle_set),
+        dtype=np.uint64,
+        count=len(shingle_set),
+    )
+    a, b = _PERMUTATIONS
+    # Universal hashing, products wrap around in uint64 like reference MinHash
+    permuted = (hashes[:, None] * a + b) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def signature_to_bytes(signature: np.ndarray) -> bytes:
+    """Serialize a signature for ``SearchResult.minhash_signature``."""
+    return signature.astype("<u4").tobytes()
+
+
+def signature_from_bytes(data: bytes) -> np.ndarray:
+    """Deserialize a stored signature."""
+    return np.frombuffer(data, dtype="<u4").astype(np.uint32)
+
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    """Jaccard similarity estimated from two signatures."""
+    return float(np.mean(a == b))
+
+
+class LSHIndex:
+    """Banded locality-sensitive hashing index of MinHash signatures.
+
+    Args:
+        bands (int): Number of bands, must divide the signature length.
+    """
+
+    def __init__(self, bands: int = LSH_BANDS) -> None:
+        """Initialize an empty index with ``bands`` LSH bands."""
+        if NUM_PERM % bands:
+            msg = f"{bands} bands don't divide {NUM_PERM} permutations"
+            raise ValueError(msg)
+        self.bands = bands
+        self.signatures: dict[uuid.UUID, np.ndarray] = {}
+        self._buckets: list[defaultdict[bytes, list[uuid.UUID]]] = [
+            defaultdict(list) for _ in range(bands)
+        ]
+
+    def __len__(self) -> int:
+        """Number of indexed signatures."""
+        return len(self.signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [band.tobytes() for band in np.split(signature, self.bands)]
+
+    def add(self, key: uuid.UUID, signature: np.ndarray) -> None:
+        """Index a signature, re-adding a key is a no-op."""
+        if key in self.signatures:
+            return
+        self.signatures[key] = signature
+        for bucket, band_key in zip(
+            self._buckets, self._band_keys(signature), strict=True
+        ):
+            bucket[band_key].append(key)
+
+    def candidates(self, signature: np.ndarray) -> set[uuid.UUID]:
+        """Keys sharing at least one band with the signature."""
+        return {
+            key
+            for bucket, band_key in zip(
+                self._buckets, self._band_keys(signature), strict=True
+            )
+            for key in bucket.get(band_key, ())
+        }
+
+    def query(
+        self, signature: np.ndarray, threshold: float = DUPLICATE_THRESHOLD
+    ) -> list[uuid.UUID]:
+        """Indexed keys whose estimated Jaccard similarity is at least ``threshold``."""
+        return [
+            key
+            for key in self.candidates(signature)
+            if jaccard(signature, self.signatures[key]) >= threshold
+        ]
+
+
+def cluster_duplicates(
+    signatures: Mapping[uuid.UUID, np.ndarray],
+    threshold: float = DUPLICATE_THRESHOLD,
+    *,
+    dois: Mapping[uuid.UUID, str | None] | None = None,
+) -> list[DuplicateCluster]:
+    """Cluster near-duplicate signatures.
+
+    Clusters are the connected components of the verified LSH pairs, except that
+    two clusters aren't joined if they'd contain different DOIs. Singletons aren't
+    returned.
+
+    Args:
+        signatures (Mapping[uuid.UUID, np.ndarray]): Signature by search result ID,
+            in order of preference for the representative.
+        threshold (float): Estimated Jaccard similarity from which two search results
+            are duplicates.
+        dois (Mapping[uuid.UUID, str | None] | None): DOI by search result ID, if
+            known. Compared case-insensitively.
+
+    Returns:
+        list[DuplicateCluster]: Clusters in order of their representatives.
+    """
+    order = {key: i for i, key in enumerate(signatures)}
+    parent = {key: key for key in signatures}
+    # DOI of each cluster by its root, None while it has none
+    cluster_doi = {
+        key: doi.strip().lower() if (doi := (dois or {}).get(key)) else None
+        for key in signatures
+    }
+
+    def _find(key: uuid.UUID) -> uuid.UUID:
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    index = LSHIndex()
+    for key, signature in signatures.items():
+        # Most preferred first, it gets search results matching several DOIs
+        for other in sorted(index.query(signature, threshold), key=order.__getitem__):
+            first, second = sorted((_find(key), _find(other)), key=order.__getitem__)
+            if first == second:
+                continue
+            first_doi, second_doi = cluster_doi[first], cluster_doi[second]
+            if first_doi and second_doi and first_doi != second_doi:
+                continue
+            parent[second] = first
+            cluster_doi[first] = first_doi or second_doi
+        index.add(key, signature)
+
+    members: defaultdict[uuid.UUID, list[uuid.UUID]] = defaultdict(list)
+    for key in signatures:
+        members[_find(key)].append(key)
+    return [
+        DuplicateCluster(representative_id=root, duplicate_ids=tuple(keys[1:]))
+        for root, keys in members.items()
+        if len(keys) > 1
+    ]
@@ -0,0 +1,585 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Persistent, content-addressed cache for structured LLM outputs.
+
+Reruns of a benchmark or re-screening the same search results would otherwise pay
+for identical ``gpt-4o``/Gemini calls. Entries are keyed by a SHA-256 hash of
+everything the output depends on:
+
+- the prompt template (all message templates, so prompt edits invalidate the cache),
+- the model name and temperature,
+- the prompt input variables, i.e. the review background, research question and
+  criteria plus the study title, year, journal and abstract (and, for the resolver,
+  the reviewers' outputs).
+
+Two backends are provided:
+
+- :class:`PostgresLLMCache`: the ``llm_cache_entries`` table, shared by all app
+  instances.
+- :class:`SQLiteLLMCache`: a local file, for workers that shouldn't round-trip to
+  Postgres (or don't have it).
+
+Both evict entries older than ``ttl`` and, once over ``max_entries``, the least
+recently used ones. Cache failures are logged and treated as misses, they never fail
+the LLM call.
+
+Use :func:`cached` to put a cache in front of a ``prompt | model`` runnable. Pass
+``{"configurable": {BYPASS_CACHE_KEY: True}}`` in the invocation config (or
+``bypass_cache=True`` to the screening/resolver helpers) for runs that must be
+fresh; fresh outputs are still written to the cache.
+
+Examples:
+    >>> chain = cached(  # doctest: +SKIP
+    ...     prompt | llm.with_structured_output(Schema),
+    ...     namespace="screening:conservative",
+    ...     prompt=prompt,
+    ...     model_name="gpt-4o",
+    ...     temperature=0,
+    ...     output_type=Schema,
+    ... )
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import typing as t
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from langchain_core.runnables import RunnableLambda
+from loguru import logger
+from pydantic import BaseModel
+
+from sr_assistant.app.config import get_settings
+from sr_assistant.app.database import session_factory
+from sr_assistant.core.repositories import LLMCacheEntryRepository, RepositoryError
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.runnables import Runnable, RunnableConfig
+    from sqlalchemy.orm import sessionmaker
+    from sqlmodel import Session
+
+BYPASS_CACHE_KEY = "bypass_llm_cache"
+"""``RunnableConfig["configurable"]`` key that skips cache lookups when True."""
+
+CACHE_KEY_VERSION = 2
+"""Bump to invalidate all entries, e.g. when the key derivation changes."""
+
+EVICT_EVERY_N_WRITES = 500
+"""How often (in writes) backends run TTL/LRU eviction."""
+
+
+class LLMCacheStats(t.NamedTuple):
+    """Cache counters since process start.
+
+    Attributes:
+        hits (int): Lookups served from the cache.
+        misses (int): Lookups that had to call the model.
+        bypassed (int): Lookups skipped due to the bypass flag.
+        writes (int): Entries written.
+        evictions (int): Entries evicted (TTL or LRU).
+        errors (int): Backend errors, counted as misses.
+    """
+
+    hits: int
+    misses: int
+    bypassed: int
+    writes: int
+    evictions: int
+    errors: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Hits divided by lookups, 0.0 if there were no lookups."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LLMCache(abc.ABC):
+    """Cache backend interface with shared counters and eviction scheduling.
+
+    Args:
+        ttl (timedelta | None): Entries older than this are misses. None keeps forever.
+        max_entries (int | None): LRU bound. None for unbounded.
+    """
+
+    def __init__(
+        self, *, ttl: timedelta | None = None, max_entries: int | None = None
+    ) -> None:
+        """Initialize the cache with its eviction settings."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bypassed = 0
+        self._writes = 0
+        self._evictions = 0
+        self._errors = 0
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> dict[str, t.Any] | None: ...
+
+    @abc.abstractmethod
+    def _set(
+        self, key: str, *, namespace: str, model_name: str, value: dict[str, t.Any]
+    ) -> None: ...
+
+    @abc.abstractmethod
+    def _evict(self) -> int: ...
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Delete all entries."""
+
+    def lookup(self, key: str) -> dict[str, t.Any] | None:
+        """Return the cached value for ``key``, or None on miss or backend error."""
+        try:
+            value = self._get(key)
+        except Exception:
+            logger.opt(exception=True).warning(f"LLM cache lookup failed for {key}")
+            with self._lock:
+                self._errors += 1
+                self._misses += 1
+            return None
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def update(
+        self, key: str, *, namespace: str, model_name: str, value: dict[str, t.Any]
+    ) -> None:
+        """Store ``value`` under ``key``, evicting every ``EVICT_EVERY_N_WRITES`` writes."""
+        try:
+            self._set(key, namespace=namespace, model_name=model_name, value=value)
+        except Exception:
+            logger.opt(exception=True).warning(f"LLM cache write failed for {key}")
+            with self._lock:
+                self._errors += 1
+            return
+        with self._lock:
+            self._writes += 1
+            run_eviction = self._writes % EVICT_EVERY_N_WRITES == 0
+        if run_eviction:
+            self.evict()
+
+    def evict(self) -> int:
+        """Run TTL and LRU eviction now.
+
+        Returns:
+            int: Number of evicted entries.
+        """
+        try:
+            evicted = self._evict()
+        except Exception:
+            logger.opt(exception=True).warning("LLM cache eviction failed")
+            with self._lock:
+                self._errors += 1
+            return 0
+        with self._lock:
+            self._evictions += evicted
+        if evicted:
+            logger.info(f"Evicted {evicted} LLM cache entries")
+        return evicted
+
+    def record_bypass(self) -> None:
+        """Count a lookup skipped because of the bypass flag."""
+        with self._lock:
+            self._bypassed += 1
+
+    def stats(self) -> LLMCacheStats:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return LLMCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                bypassed=self._bypassed,
+                writes=self._writes,
+                evictions=self._evictions,
+                errors=self._errors,
+            )
+
+
+class SQLiteLLMCache(LLMCache):
+    """Local SQLite file cache tier.
+
+    Args:
+        path (str | Path): Database file, created with its parent directory if
+            missing. ``":memory:"`` for a process-local cache.
+        ttl (timedelta | None): See :class:`LLMCache`.
+        max_entries (int | None): See :class:`LLMCache`.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        ttl: timedelta | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        """Initialize the cache, creating the database file and table if needed."""
+        super().__init__(ttl=ttl, max_entries=max_entries)
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None
+        )
+        with self._db_lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache_entries (
+                    cache_key TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    last_accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS ix_llm_cache_entries_last_accessed_at
+                ON llm_cache_entries (last_accessed_at)
+                """
+            )
+
+    def _get(self, key: str) -> dict[str, t.Any] | None:
+        now = time.time()
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache_entries WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl is not None and created_at < now - self.ttl.total_seconds():
+                return None
+            self._conn.execute(
+                """
+                UPDATE llm_cache_entries
+                SET hit_count = hit_count + 1, last_accessed_at = ?
+                WHERE cache_key = ?
+                """,
+                (now, key),
+            )
+        return json.loads(value)
+
+    def _set(
+        self, key: str, *, namespace: str, model_name: str, value: dict[str, t.Any]
+    ) -> None:
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_cache_entries (
+                    cache_key, namespace, model_name, value, hit_count, created_at,
+                    last_accessed_at
+                )
+                VALUES (?, ?, ?, ?, 0, ?, ?)
+                """,
+                (key, namespace, model_name, json.dumps(value), now, now),
+            )
+
+    def _evict(self) -> int:
+        deleted = 0
+        with self._db_lock:
+            if self.ttl is not None:
+                deleted += self._conn.execute(
+                    "DELETE FROM llm_cache_entries WHERE created_at < ?",
+                    (time.time() - self.ttl.total_seconds(),),
+                ).rowcount
+            if self.max_entries is not None:
+                deleted += self._conn.execute(
+                    """
+                    DELETE FROM llm_cache_entries WHERE last_accessed_at <= (
+                        SELECT last_accessed_at FROM llm_cache_entries
+                        ORDER BY last_accessed_at DESC LIMIT 1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                ).rowcount
+        return deleted
+
+    def clear(self) -> None:
+        """Delete all entries."""
+        with self._db_lock:
+            self._conn.execute("DELETE FROM llm_cache_entries")
+
+
+class PostgresLLMCache(LLMCache):
+    """Cache in the ``llm_cache_entries`` table.
+
+    Args:
+        factory (sessionmaker[Session]): Session factory. Defaults to the app's.
+        ttl (timedelta | None): See :class:`LLMCache`.
+        max_entries (int | None): See :class:`LLMCache`.
+    """
+
+    def __init__(
+        self,
+        factory: sessionmaker[Session] = session_factory,
+        *,
+        ttl: timedelta | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        """Initialize the cache with a session factory."""
+        super().__init__(ttl=ttl, max_entries=max_entries)
+        self.session_factory = factory
+        self.repo = LLMCacheEntryRepository()
+
+    def _get(self, key: str) -> dict[str, t.Any] | None:
+        with self.session_factory.begin() as session:
+            entry = self.repo.get_by_key(session, key)
+            if entry is None:
+                return None
+            if (
+                self.ttl is not None
+                and entry.created_at is not None
+                and entry.created_at < datetime.now(UTC) - self.ttl
+            ):
+                return None
+            self.repo.touch(session, key)
+            return dict(entry.value)
+
+    def _set(
+        self, key: str, *, namespace: str, model_name: str, value: dict[str, t.Any]
+    ) -> None:
+        with self.session_factory.begin() as session:
+            self.repo.upsert(
+                session,
+                cache_key=key,
+                namespace=namespace,
+                model_name=model_name,
+                value=value,
+            )
+
+    def _evict(self) -> int:
+        with self.session_factory.begin() as session:
+            return self.repo.evict(
+                session,
+                max_entries=self.max_entries,
+                expired_before=(
+                    datetime.now(UTC) - self.ttl if self.ttl is not None else None
+                ),
+            )
+
+    def clear(self) -> None:
+        """Delete all entries."""
+        with self.session_factory.begin() as session:
+            try:
+                session.execute(self.repo.model_cls.__table__.delete())  # pyright: ignore
+            except Exception as exc:
+                msg = f"Failed to clear llm_cache_entries: {exc}"
+                raise RepositoryError(msg) from exc
+
+
+def prompt_fingerprint(prompt: ChatPromptTemplate) -> list[tuple[str, str]]:
+    """Message types and template strings of a chat prompt, in order."""
+    fingerprint: list[tuple[str, str]] = []
+    for message in prompt.messages:
+        template = getattr(getattr(message, "prompt", None), "template", None)
+        fingerprint.append(
+            (
+                type(message).__name__,
+                template if template is not None else repr(message),
+            )
+        )
+    return fingerprint
+
+
+def make_cache_key(  # noqa: PLR0913
+    *,
+    namespace: str,
+    prompt: ChatPromptTemplate,
+    model_name: str,
+    temperature: float | None,
+    schema: type[BaseModel],
+    inputs: Mapping[str, t.Any],
+) -> str:
+    """Content hash of everything a structured LLM output depends on.
+
+    Args:
+        namespace (str): Chain namespace, keeps e.g. reviewer strategies apart.
+        prompt (ChatPromptTemplate): Prompt template.
+        model_name (str): Model name.
+        temperature (float | None): Sampling temperature.
+        schema (type[BaseModel]): Structured output type. Its JSON schema is part of
+            the key so field and description changes don't serve stale outputs.
+        inputs (Mapping[str, t.Any]): Prompt input variables.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    payload = {
+        "v": CACHE_KEY_VERSION,
+        "namespace": namespace,
+        "prompt": prompt_fingerprint(prompt),
+        "model": model_name,
+        "temperature": temperature,
+        "schema": schema.model_json_schema(),
+        "inputs": dict(inputs),
+    }
+    canonical = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def is_cache_bypassed(config: RunnableConfig | None) -> bool:
+    """Whether the invocation config asks to skip cache lookups."""
+    if not config:
+        return False
+    return bool((config.get("configurable") or {}).get(BYPASS_CACHE_KEY, False))
+
+
+_llm_cache: LLMCache | None = None
+_llm_cache_initialized = False
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache | None:
+    """Return the process-wide cache configured by ``Settings.LLM_CACHE_*``.
+
+    Returns:
+        LLMCache | None: None if the cache is disabled.
+    """
+    global _llm_cache, _llm_cache_initialized  # noqa: PLW0603
+    with _llm_cache_lock:
+        if _llm_cache_initialized:
+            return _llm_cache
+        settings = get_settings()
+        ttl = (
+            timedelta(seconds=settings.LLM_CACHE_TTL_SECONDS)
+            if settings.LLM_CACHE_TTL_SECONDS is not None
+            else None
+        )
+        match settings.LLM_CACHE_BACKEND:
+            case "postgres":
+                _llm_cache = PostgresLLMCache(
+                    ttl=ttl, max_entries=settings.LLM_CACHE_MAX_ENTRIES
+                )
+            case "sqlite":
+                _llm_cache = SQLiteLLMCache(
+                    settings.LLM_CACHE_PATH,
+                    ttl=ttl,
+                    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                )
+            case "disabled":
+                _llm_cache = None
+        _llm_cache_initialized = True
+        logger.info(f"LLM cache backend: {settings.LLM_CACHE_BACKEND}")
+        return _llm_cache
+
+
+def cached[OutputT: BaseModel](  # noqa: C901, PLR0913
+    runnable: Runnable[dict[str, t.Any], OutputT],
+    *,
+    namespace: str,
+    prompt: ChatPromptTemplate,
+    model_name: str,
+    temperature: float | None,
+    output_type: type[OutputT],
+    cache: LLMCache | Callable[[], LLMCache | None] = get_llm_cache,
+) -> Runnable[dict[str, t.Any], OutputT]:
+    """Put an LLM cache in front of a ``prompt | structured model`` runnable.
+
+    Only outputs of ``output_type`` are cached, anything else (e.g. a raw message
+    from a failed parse) is passed through uncached.
+
+    Args:
+        runnable (Runnable): Runnable taking prompt input variables.
+        namespace (str): Cache namespace, e.g. ``screening:conservative``.
+        prompt (ChatPromptTemplate): The runnable's prompt, part of the cache key.
+        model_name (str): The runnable's model, part of the cache key.
+        temperature (float | None): The model's temperature, part of the cache key.
+        output_type (type[BaseModel]): Structured output type to (de)serialize, its
+            schema is part of the cache key.
+        cache (LLMCache | Callable[[], LLMCache | None]): Cache or a callable
+            returning one (resolved on each call, so backends are only created
+            when first used). Defaults to :func:`get_llm_cache`.
+
+    Returns:
+        Runnable: Runnable with the same input and output.
+    """
+
+    def _resolve_cache() -> LLMCache | None:
+        return cache if isinstance(cache, LLMCache) else cache()
+
+    def _key(input_: dict[str, t.Any]) -> str:
+        return make_cache_key(
+            namespace=namespace,
+            prompt=prompt,
+            model_name=model_name,
+            temperature=temperature,
+            schema=output_type,
+            inputs=input_,
+        )
+
+    def _lookup(
+        llm_cache: LLMCache, key: str, config: RunnableConfig
+    ) -> OutputT | None:
+        if is_cache_bypassed(config):
+            llm_cache.record_bypass()
+            return None
+        value = llm_cache.lookup(key)
+        if value is None:
+            return None
+        try:
+            return output_type.model_validate(value)
+        except Exception:
+            logger.opt(exception=True).warning(f"Invalid {namespace} cache entry {key}")
+            return None
+
+    def _store(llm_cache: LLMCache, key: str, output: OutputT) -> None:
+        if isinstance(output, output_type):
+            llm_cache.update(
+                key,
+                namespace=namespace,
+                model_name=model_name,
+                value=output.model_dump(mode="json"),
+            )
+
+    def _invoke(input_: dict[str, t.Any], config: RunnableConfig) -> OutputT:
+        llm_cache = _resolve_cache()
+        if llm_cache is None:
+            return runnable.invoke(input_, config)
+        key = _key(input_)
+        if (hit := _lookup(llm_cache, key, config)) is not None:
+            logger.debug(f"{namespace} cache hit: {key}")
+            return hit
+        output = runnable.invoke(input_, config)
+        _store(llm_cache, key, output)
+        return output
+
+    async def _ainvoke(input_: dict[str, t.Any], config: RunnableConfig) -> OutputT:
+        llm_cache = _resolve_cache()
+        if llm_cache is None:
+            return await runnable.ainvoke(input_, config)
+        key = _key(input_)
+        # Backends are sync (Postgres round-trip), keep them off the event loop.
+        if (
+            hit := await asyncio.to_thread(_lookup, llm_cache, key, config)
+        ) is not None:
+            logger.debug(f"{namespace} cache hit: {key}")
+            return hit
+        output = await runnable.ainvoke(input_, config)
+        await asyncio.to_thread(_store, llm_cache, key, output)
+        return output
+
+    return RunnableLambda(_invoke, afunc=_ainvoke, name=f"cached:{namespace}")
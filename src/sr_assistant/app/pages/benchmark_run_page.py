@@ -25,15 +25,26 @@ from sklearn.metrics import (
     recall_score,
 )
 
-from sr_assistant.app.agents.screening_agents import (
-    ScreeningError,
-    invoke_resolver_chain,
-    screen_abstracts_batch,
+from sr_assistant.app.agents.screening_agents import ScreeningError
+from sr_assistant.app.agents.screening_cascade import CascadeConfig
+from sr_assistant.app.agents.screening_pipeline import (
+    ScreenResolveResultTuple,
+    screen_and_resolve_as_completed,
 )
 from sr_assistant.app.database import session_factory
+from sr_assistant.app.services import (
+    BENCHMARK_BATCH_SIZE,
+    ScreeningJobActiveError,
+    ScreeningJobService,
+)
 from sr_assistant.benchmark.logic.metrics_calculator import (
     calculate_and_update_benchmark_metrics,
 )
+from sr_assistant.benchmark.logic.result_items import (
+    classify_decision,
+    determine_final_decision,
+    human_decision_of,
+)
 from sr_assistant.core import models, schemas
 from sr_assistant.core.repositories import (
     BenchmarkResultItemRepository,
@@ -41,7 +52,11 @@ from sr_assistant.core.repositories import (
     SearchResultRepository,
     SystematicReviewRepository,
 )
-from sr_assistant.core.types import ScreeningDecisionType
+from sr_assistant.core.types import (
+    ScreeningDecisionType,
+    ScreeningJobKind,
+    ScreeningJobStatus,
+)
 
 if t.TYPE_CHECKING:
     import collections.abc
@@ -56,74 +71,65 @@ except ImportError:
     # Fallback if not available - we'll implement a simplified version
 
 
-def _needs_resolver(
-    conservative_result: schemas.ScreeningResult,
-    comprehensive_result: schemas.ScreeningResult,
-) -> bool:
-    """Determine if resolver is needed based on conservative and comprehensive results."""
-    # Check for disagreement between conservative and comprehensive
-    if conservative_result.decision != comprehensive_result.decision:
-        return True
-
-    # Check if both are uncertain
-    if (
-        conservative_result.decision == ScreeningDecisionType.UNCERTAIN
-        and comprehensive_result.decision == ScreeningDecisionType.UNCERTAIN
-    ):
-        return True
-
-    # Check for low confidence even with agreement
-    min_confidence = min(
-        conservative_result.confidence_score, comprehensive_result.confidence_score
+def _benchmark_cascade_config() -> CascadeConfig:
+    """Model cascade settings chosen on this page for the benchmark run."""
+    return CascadeConfig(
+        enabled=st.session_state.get("benchmark_cascade_enabled", False),
+        model_name=st.session_state.get(
+            "benchmark_cascade_model", CascadeConfig().model_name
+        ),
+        include_threshold=st.session_state.get(
+            "benchmark_cascade_include_threshold", CascadeConfig().include_threshold
+        ),
+        exclude_threshold=st.session_state.get(
+            "benchmark_cascade_exclude_threshold", CascadeConfig().exclude_threshold
+        ),
     )
-    return min_confidence < 0.7
-
-
-def _determine_final_decision(
-    conservative_result: schemas.ScreeningResult,
-    comprehensive_result: schemas.ScreeningResult,
-    resolver_result: schemas.ScreeningResult | None,
-) -> ScreeningDecisionType:
-    """Determine final decision based on all screening results."""
-    # If resolver was invoked and gave a definitive decision, use it
-    if resolver_result and resolver_result.decision != ScreeningDecisionType.UNCERTAIN:
-        return resolver_result.decision
-
-    # If resolver was invoked but still uncertain, return uncertain
-    if resolver_result and resolver_result.decision == ScreeningDecisionType.UNCERTAIN:
-        return ScreeningDecisionType.UNCERTAIN
-
-    # If no resolver, check for agreement
-    if conservative_result.decision == comprehensive_result.decision:
-        return conservative_result.decision
-
-    # Disagreement without resolver - should not happen with proper _needs_resolver logic
-    logger.warning(
-        f"No resolver result but decisions disagree: conservative={conservative_result.decision}, comprehensive={comprehensive_result.decision}"
-    )
-    return ScreeningDecisionType.UNCERTAIN
-
-
-def _calculate_classification(
-    final_decision: ScreeningDecisionType, human_decision: bool | None
-) -> str:
-    """Calculate the classification (TP, FP, TN, FN) based on final decision vs human decision."""
-    if human_decision is None:
-        return "UNKNOWN"
 
-    # Convert final_decision to boolean for comparison
-    ai_include = final_decision == ScreeningDecisionType.INCLUDE
-    human_include = human_decision
 
-    if ai_include and human_include:
-        return "TP"  # True Positive
-    if not ai_include and not human_include:
-        return "TN"  # True Negative
-    if ai_include and not human_include:
-        return "FP"  # False Positive
-    if not ai_include and human_include:
-        return "FN"  # False Negative
-    return "UNKNOWN"
+def _benchmark_config_details() -> dict[str, t.Any]:
+    """``BenchmarkRun.config_details`` of a run with this page's settings."""
+    return {
+        "conservative_model": "gpt-4o",
+        "comprehensive_model": "gpt-4o",
+        "resolver_model": "gemini-2.5-pro-preview-05-06",
+        "batch_size": BENCHMARK_BATCH_SIZE,
+        "llm_cache_bypassed": st.session_state.get("benchmark_bypass_llm_cache", False),
+        "pack_size": st.session_state.get("benchmark_pack_size", 1),
+        "cascade": _benchmark_cascade_config().model_dump(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+@st.fragment(run_every=2)
+def _benchmark_job_progress(job_id: uuid.UUID) -> None:
+    """Poll a benchmark job queued on the screening worker."""
+    job = ScreeningJobService().get_job(job_id)
+    if job is None:
+        st.error(f"Screening job {job_id} not found.")
+        return
+    st.subheader(f"🛠️ Benchmark Job ({job.status})")
+    st.progress(job.processed_items / job.total_items if job.total_items else 0.0)
+    st.caption(
+        f"{job.processed_items}/{job.total_items} items, worker: {job.worker_id or 'waiting for a worker'}"
+    )
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Conflicts Detected", job.stats.get("conflicts_detected", 0))
+    col2.metric("Resolver Invocations", job.stats.get("resolver_invoked", 0))
+    col3.metric("Screening Errors", job.stats.get("screening_errors", 0))
+    if job.status in {ScreeningJobStatus.QUEUED, ScreeningJobStatus.RUNNING}:
+        if st.button("Cancel Benchmark Job"):
+            ScreeningJobService().cancel_job(job_id)
+        return
+    if job.status == ScreeningJobStatus.SUCCEEDED:
+        st.success(
+            f"Benchmark run `{job.params['benchmark_run_id']}` completed, see the past runs below."
+        )
+    elif job.error:
+        st.error(f"Benchmark job {job.status}: {job.error}")
+    if st.button("Dismiss"):
+        del st.session_state["benchmark_job_id"]
+        st.rerun()
 
 
 def calculate_metrics(
@@ -360,7 +366,58 @@ if st.session_state.benchmark_review and st.session_state.benchmark_search_resul
         f"{len(st.session_state.benchmark_search_results)} abstracts loaded for benchmark."
     )
 
-    if st.button("Run AI Screening on Benchmark", type="primary"):
+    st.checkbox(
+        "Bypass LLM response cache",
+        key="benchmark_bypass_llm_cache",
+        help="Call the models even if identical prompts were answered before. Fresh responses still update the cache.",
+    )
+
+    st.number_input(
+        "Abstracts per reviewer request",
+        min_value=1,
+        max_value=20,
+        value=1,
+        key="benchmark_pack_size",
+        help="1 screens one abstract per request. Higher values use packed prompts; compare the metrics against a single-item run before relying on them.",
+    )
+
+    review_cascade = CascadeConfig.from_review(review)
+    with st.expander("Model cascade", expanded=review_cascade.enabled):
+        st.checkbox(
+            "Triage with a cheaper model first",
+            value=review_cascade.enabled,
+            key="benchmark_cascade_enabled",
+            help="Confident triage decisions are accepted, the rest go to both reviewers. Defaults come from the review's settings.",
+        )
+        st.text_input(
+            "Triage model", value=review_cascade.model_name, key="benchmark_cascade_model"
+        )
+        st.slider(
+            "Accept 'include' at confidence ≥",
+            min_value=0.0,
+            max_value=1.0,
+            value=review_cascade.include_threshold,
+            step=0.01,
+            key="benchmark_cascade_include_threshold",
+        )
+        st.slider(
+            "Accept 'exclude' at confidence ≥",
+            min_value=0.0,
+            max_value=1.0,
+            value=review_cascade.exclude_threshold,
+            step=0.01,
+            key="benchmark_cascade_exclude_threshold",
+        )
+    cascade_conflict = (
+        st.session_state.get("benchmark_cascade_enabled", False)
+        and st.session_state.get("benchmark_pack_size", 1) > 1
+    )
+    if cascade_conflict:
+        st.warning("Packed prompts and the model cascade can't be combined.")
+
+    if st.button(
+        "Run AI Screening on Benchmark", type="primary", disabled=cascade_conflict
+    ):
         # Initialize benchmark execution in session state
         st.session_state.benchmark_running = True
         st.session_state.benchmark_progress = 0.0
@@ -380,6 +437,35 @@ if st.session_state.benchmark_review and st.session_state.benchmark_search_resul
         st.session_state.benchmark_phase = "creating_run"
         st.rerun()
 
+    if "benchmark_job_id" not in st.session_state:
+        # Queued in an earlier or another browser session
+        active_job = ScreeningJobService().get_active_job(
+            BENCHMARK_REVIEW_ID, ScreeningJobKind.BENCHMARK
+        )
+        if active_job is not None:
+            st.session_state.benchmark_job_id = active_job.id
+    if st.button(
+        "Queue on Screening Worker",
+        disabled=cascade_conflict or "benchmark_job_id" in st.session_state,
+        help="Run the benchmark in a worker process (`make worker`). It keeps running if this tab is closed.",
+    ):
+        try:
+            job = ScreeningJobService().enqueue_benchmark(
+                BENCHMARK_REVIEW_ID,
+                config_details=_benchmark_config_details(),
+                bypass_cache=st.session_state.get("benchmark_bypass_llm_cache", False),
+                pack_size=st.session_state.get("benchmark_pack_size", 1),
+                cascade=_benchmark_cascade_config(),
+            )
+        except ScreeningJobActiveError as e:
+            st.warning(str(e))
+        else:
+            st.session_state.benchmark_job_id = job.id
+            st.rerun()
+
+if "benchmark_job_id" in st.session_state:
+    _benchmark_job_progress(st.session_state.benchmark_job_id)
+
 # Handle benchmark execution phases
 if st.session_state.get("benchmark_running", False):
     st.subheader("🔄 Benchmark Execution in Progress")
@@ -1012,16 +1098,9 @@ if st.session_state.get("benchmark_running", False):
             try:
                 benchmark_run_repo = BenchmarkRunRepository()
 
-                config_details = {
-                    "conservative_model": "gpt-4o",
-                    "comprehensive_model": "gpt-4o",
-                    "resolver_model": "gemini-2.5-pro-preview-05-06",
-                    "batch_size": 10,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                }
-
                 benchmark_run = models.BenchmarkRun(
-                    review_id=BENCHMARK_REVIEW_ID, config_details=config_details
+                    review_id=BENCHMARK_REVIEW_ID,
+                    config_details=_benchmark_config_details(),
                 )
 
                 benchmark_run = benchmark_run_repo.add(session, benchmark_run)
@@ -1045,7 +1124,7 @@ if st.session_state.get("benchmark_running", False):
                 # Store search results and calculate batches
                 st.session_state.benchmark_search_results = list(search_results)
                 total_items = len(search_results)
-                batch_size = 10  # Consistent batch size
+                batch_size = BENCHMARK_BATCH_SIZE  # Consistent batch size
                 st.session_state.benchmark_total_batches = (
                     total_items + batch_size - 1
                 ) // batch_size
@@ -1068,7 +1147,7 @@ if st.session_state.get("benchmark_running", False):
         st.rerun()
 
     elif phase == "processing_batches":
-        BATCH_SIZE_CONFIG = 10  # True batch size for the agent
+        BATCH_SIZE_CONFIG = BENCHMARK_BATCH_SIZE  # True batch size for the agent
 
         total_items = len(st.session_state.benchmark_search_results)
         processed_items_count = st.session_state.benchmark_stats["total_processed"]
@@ -1092,23 +1171,33 @@ if st.session_state.get("benchmark_running", False):
 
                 # Update status to indicate AI batch screening is about to happen
                 st.session_state.benchmark_status = f"AI processing batch {agent_batch_idx + 1} (items {batch_start_idx + 1}-{batch_end_idx})..."
-                # Consider a spinner here if screen_abstracts_batch is very long, but avoid st.rerun()
-                # For now, we assume screen_abstracts_batch is reasonably fast or its internal calls are async if needed
 
                 if not st.session_state.benchmark_review:
                     st.error("Benchmark review not found in session state.")
                     st.session_state.benchmark_running = False
                     st.rerun()
 
-                # This is the single call to the agent for the batch of 10
-                batch_output = screen_abstracts_batch(
-                    batch=list(current_conceptual_batch_items),
-                    batch_idx=agent_batch_idx,
-                    review=st.session_state.benchmark_review,
-                )
-                st.session_state.current_batch_screening_results = (
-                    batch_output.results if batch_output else []
-                )
+                # Screen the batch of 10, conflicts are resolved while the rest of the
+                # batch is still being screened.
+                try:
+                    batch_output: list[ScreenResolveResultTuple] = list(
+                        screen_and_resolve_as_completed(
+                            batch=list(current_conceptual_batch_items),
+                            batch_idx=agent_batch_idx,
+                            review=st.session_state.benchmark_review,
+                            bypass_cache=st.session_state.get(
+                                "benchmark_bypass_llm_cache", False
+                            ),
+                            pack_size=st.session_state.get("benchmark_pack_size", 1),
+                            cascade=_benchmark_cascade_config(),
+                        )
+                    )
+                except Exception:
+                    logger.exception(
+                        f"Screening failed for batch {agent_batch_idx + 1}"
+                    )
+                    batch_output = []
+                st.session_state.current_batch_screening_results = batch_output
                 st.session_state.current_batch_item_offset = (
                     0  # Reset offset for the new batch results
                 )
@@ -1139,34 +1228,23 @@ if st.session_state.get("benchmark_running", False):
             item_offset = st.session_state.get("current_batch_item_offset", 0)
 
             if batch_results and item_offset < len(batch_results):
-                result_tuple = batch_results[item_offset]
+                result_tuple: ScreenResolveResultTuple = batch_results[item_offset]
                 actual_item_index_in_full_list = batch_start_idx + item_offset
-                current_item_for_display = st.session_state.benchmark_search_results[
-                    actual_item_index_in_full_list
-                ]
-
-                # Update status for the item being processed *after* its batch was screened by AI
-                st.session_state.benchmark_status = f"Processing & resolving item {actual_item_index_in_full_list + 1}/{total_items}: {current_item_for_display.title[:50]}..."
 
                 search_result = result_tuple.search_result
                 conservative_result = result_tuple.conservative_result
                 comprehensive_result = result_tuple.comprehensive_result
 
-                # Process AI logic without database session
-                needs_resolver = _needs_resolver(
-                    conservative_result, comprehensive_result
-                )
+                # Results come in completion order, so show the item's own title
+                st.session_state.benchmark_status = f"Processing item {actual_item_index_in_full_list + 1}/{total_items}: {(search_result.title or '')[:50]}..."
+
+                # Resolver already ran in the pipeline, only map its output here
                 resolver_result_obj = None
 
-                if needs_resolver:
+                if result_tuple.resolver_needed:
                     st.session_state.benchmark_stats["conflicts_detected"] += 1
                     try:
-                        resolver_output_schema = invoke_resolver_chain(
-                            search_result=search_result,
-                            conservative_result=conservative_result,
-                            comprehensive_result=comprehensive_result,
-                            review=st.session_state.benchmark_review,
-                        )
+                        resolver_output_schema = result_tuple.resolver_result
                         if resolver_output_schema:
                             resolver_result_obj = schemas.ScreeningResult(
                                 id=uuid.uuid4(),
@@ -1188,18 +1266,13 @@ if st.session_state.get("benchmark_running", False):
                         )
 
                 # Calculate final decision and classification
-                final_decision = _determine_final_decision(
-                    conservative_result, comprehensive_result, resolver_result_obj
-                )
-                human_decision_raw = search_result.source_metadata.get(
-                    "benchmark_human_decision"
-                )
-                human_decision = (
-                    human_decision_raw if isinstance(human_decision_raw, bool) else None
-                )
-                classification = _calculate_classification(
-                    final_decision, human_decision
+                final_decision = determine_final_decision(
+                    conservative_result.decision,
+                    comprehensive_result.decision,
+                    resolver_result_obj.decision if resolver_result_obj else None,
                 )
+                human_decision = human_decision_of(search_result)
+                classification = classify_decision(final_decision, human_decision)
 
                 # Now perform database operations in a short-lived session
                 db_success = False
@@ -1344,7 +1417,7 @@ if st.session_state.get("benchmark_running", False):
                 and processed_items_count < total_items
                 and st.session_state.get("current_batch_screening_results") is not None
             ):
-                # This case means screen_abstracts_batch was called, returned [], and we already handled advancing past it.
+                # This case means the screening pipeline was called, returned [], and we already handled advancing past it.
                 # We might get here if the previous rerun after handling empty batch_results leads here.
                 # Simply rerun to let the main logic decide to fetch the next batch or complete.
                 logger.info(
@@ -1528,11 +1601,15 @@ def load_benchmark_result_items_for_past_run(run_id: str) -> pd.DataFrame:
             if not result_items:
                 logger.warning(f"No result items found for run {run_id}")
                 return pd.DataFrame()
+            search_results = {
+                sr.id: sr
+                for sr in search_result_repo.get_many_by_ids(
+                    session, [item.search_result_id for item in result_items]
+                ).records
+            }
             data = []
             for item in result_items:
-                search_result = search_result_repo.get_by_id(
-                    session, item.search_result_id
-                )
+                search_result = search_results.get(item.search_result_id)
                 if search_result:
                     row = {
                         "Title": search_result.title[:100]
@@ -27,6 +27,10 @@ from sr_assistant.core.repositories import (
     SystematicReviewRepository,
 )
 from sr_assistant.core.schemas import ScreeningDecisionType
+from sr_assistant.core.types import ScreeningJobKind, ScreeningJobStatus
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterator
 
 
 def init_pubmed_repository() -> SearchResultRepository:
@@ -328,6 +332,60 @@ def render_progress_bar() -> None:
         )
 
 
+@st.fragment(run_every=2)
+def render_screening_job(job_id: uuid.UUID) -> None:
+    """Poll a screening job queued on the screening worker."""
+    job = services.ScreeningJobService().get_job(job_id)
+    if job is None:
+        st.error(f"Screening job {job_id} not found.")
+        return
+    st.progress(job.processed_items / job.total_items if job.total_items else 0.0)
+    st.markdown(
+        f"Screening job **{job.status}**: {job.processed_items}/{job.total_items} abstracts screened, "
+        + f"{job.stats.get('conflicts_detected', 0)} conflicts, {job.stats.get('resolved', 0)} resolved, "
+        + f"{job.stats.get('screening_errors', 0)} errors."
+    )
+    if job.status in {ScreeningJobStatus.QUEUED, ScreeningJobStatus.RUNNING}:
+        if st.button("Cancel Screening Job"):
+            services.ScreeningJobService().cancel_job(job_id)
+        return
+    if job.error:
+        st.error(job.error)
+    if st.button("Dismiss Screening Job"):
+        del st.session_state["screen_abstracts_job_id"]
+        st.rerun()
+
+
+def queue_screening_job(review: SystematicReview) -> None:
+    """Queue the review's search results on the screening worker, or poll its job.
+
+    A job still queued or running from an earlier browser session is picked up, a
+    review screens in one job at a time.
+    """
+    if "screen_abstracts_job_id" not in st.session_state:
+        active_job = services.ScreeningJobService().get_active_job(
+            review.id, ScreeningJobKind.ABSTRACT_SCREENING
+        )
+        if active_job is not None:
+            st.session_state.screen_abstracts_job_id = active_job.id
+    if st.button(
+        "Queue on Screening Worker",
+        disabled="screen_abstracts_job_id" in st.session_state
+        or not st.session_state.search_results,
+        help="Screen in a worker process (`make worker`), conflicts are resolved as they're found. It keeps running if this tab is closed.",
+    ):
+        try:
+            job = services.ScreeningJobService().enqueue_abstract_screening(
+                review.id, [sr.id for sr in st.session_state.search_results]
+            )
+        except services.ScreeningJobActiveError as e:
+            st.warning(str(e))
+        else:
+            st.session_state.screen_abstracts_job_id = job.id
+    if "screen_abstracts_job_id" in st.session_state:
+        render_screening_job(st.session_state.screen_abstracts_job_id)
+
+
 def init_screening_service() -> services.ScreeningService:
     if "screening_service" not in st.session_state:
         # Repositories are already initialized and available in session_state by this point usually
@@ -391,18 +449,7 @@ def screen_abstracts(  # noqa: C901
         )
 
         try:
-            # Call the service
-            # The service handles fetching fresh models by ID, persistence, and transactions.
-            service_results: list[ScreenAbstractResultTuple] = (
-                screening_service.perform_batch_abstract_screening(
-                    review_id=review.id, search_result_ids_to_screen=search_result_ids
-                )
-            )
-            logger.info(
-                f"ScreeningService returned {len(service_results)} result tuples."
-            )
-
-            # Reset counters before processing, as service might return partials or all
+            # Reset counters before processing, results are counted as they stream in
             st.session_state.screen_abstracts_included = 0
             st.session_state.screen_abstracts_excluded = 0
             st.session_state.screen_abstracts_uncertain = 0
@@ -413,6 +460,15 @@ def screen_abstracts(  # noqa: C901
             st.session_state.screen_abstracts_errors = []
             st.session_state.screen_abstracts_conflicts = []
 
+            # The service handles fetching fresh models by ID, persistence, and
+            # transactions. Each result is persisted and yielded as soon as both
+            # reviewers finish.
+            service_results: Iterator[ScreenAbstractResultTuple] = (
+                screening_service.stream_batch_abstract_screening(
+                    review_id=review.id, search_result_ids_to_screen=search_result_ids
+                )
+            )
+
             # Process results returned by the service
             for res_tuple in service_results:
                 # The search_result in res_tuple is the one processed by the agent.
@@ -472,6 +528,9 @@ def screen_abstracts(  # noqa: C901
                 st.session_state.screen_abstracts_screened += (
                     1  # Count as screened if we got a tuple for it
                 )
+                screening_status.text(
+                    f"Screened {st.session_state.screen_abstracts_screened}/{total_to_screen} abstracts..."
+                )
 
                 # Conflict detection
                 # A conflict occurs when:
@@ -688,6 +747,8 @@ def screen_abstracts_page(review_id: uuid.UUID | None = None) -> None:
         )
         st.session_state.screen_abstracts_done = True
 
+    queue_screening_job(review)
+
     # Display results table with filtering
     if (
         "screen_abstracts_done" in st.session_state
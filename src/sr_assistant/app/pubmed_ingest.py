@@ -0,0 +1,240 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Chunked PubMed retrieval with the E-utilities history server.
+
+Fetching every new PMID of a search with one ``efetch`` holds the whole XML response
+and its parsed tree in memory, which doesn't scale to searches with thousands of
+records. :class:`PubMedFetcher` splits the retrieval instead:
+
+- :meth:`PubMedFetcher.esearch` runs the search with ``usehistory=y``, NCBI keeps the
+  result set on its history server under a ``WebEnv``/``query_key``.
+- :meth:`PubMedFetcher.efetch_requests` plans one ``efetch`` per
+  :data:`EFETCH_CHUNK_SIZE` records. Result sets larger than a chunk are paged from
+  the history server with ``retstart``/``retmax``. If some PMIDs are already stored,
+  the new ones are ``epost``-ed to the same ``WebEnv`` first. Smaller sets are
+  fetched by ID.
+- :meth:`PubMedFetcher.iter_chunks` runs up to :data:`FETCH_CONCURRENCY` requests in
+  threads, each stream-parsing its response with
+  :func:`~sr_assistant.app.pubmed_xml.iter_pubmed_articles` and transforming the
+  articles as they're read, and yields the chunks in order.
+  The next request is only submitted when a chunk is consumed, so at most
+  ``concurrency + 1`` chunks are in memory however large the search is.
+
+All requests go through a process-wide :class:`RequestRateLimiter` at NCBI's quota of
+:data:`NCBI_RATE` requests per second, :data:`NCBI_RATE_WITH_API_KEY` with an API key.
+
+Examples:
+    >>> fetcher = PubMedFetcher(Entrez)  # doctest: +SKIP
+    >>> search = fetcher.esearch(
+    ...     "knee osteoarthritis", max_results=5000
+    ... )  # doctest: +SKIP
+    >>> requests = fetcher.efetch_requests(search, search.pmids)  # doctest: +SKIP
+    >>> for chunk in fetcher.iter_chunks(requests, transform):  # doctest: +SKIP
+    ...     store(chunk)
+"""
+
+from __future__ import annotations
+
+import itertools
+import typing as t
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+from Bio import Entrez
+from loguru import logger
+
+from sr_assistant.app.agents.rate_limit import RequestRateLimiter
+from sr_assistant.app.pubmed_xml import iter_pubmed_articles
+
+if t.TYPE_CHECKING:
+    import xml.etree.ElementTree as ET
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+    from concurrent.futures import Future
+
+EFETCH_CHUNK_SIZE = 200
+"""Records per ``efetch`` request."""
+FETCH_CONCURRENCY = 3
+"""``efetch`` requests in flight."""
+NCBI_RATE = 3.0
+"""E-utilities requests per second allowed without an API key."""
+NCBI_RATE_WITH_API_KEY = 10.0
+"""E-utilities requests per second allowed with an API key."""
+
+# NCBI's quota is per API key or IP, so the limiters are shared by all fetchers
+_limiters = {
+    False: RequestRateLimiter(NCBI_RATE),
+    True: RequestRateLimiter(NCBI_RATE_WITH_API_KEY),
+}
+
+
+def ncbi_rate_limiter(*, api_key: bool) -> RequestRateLimiter:
+    """Process-wide limiter of E-utilities requests."""
+    return _limiters[api_key]
+
+
+class PubMedSearch(t.NamedTuple):
+    """ESearch result, kept on the history server."""
+
+    pmids: list[str]
+    """PMIDs in relevance order, at most ``max_results``."""
+    webenv: str | None
+    query_key: str | None
+
+
+class PubMedFetcher:
+    """E-utilities client retrieving PubMed records in chunks.
+
+    Args:
+        entrez (t.Any): ``Bio.Entrez``, or a stand-in with its ``esearch``, ``epost``,
+            ``efetch`` and ``read`` functions. ``efetch`` responses are parsed
+            without ``read``. ``email`` and ``api_key`` must be set.
+        chunk_size (int): Records per ``efetch`` request.
+        concurrency (int): ``efetch`` requests in flight.
+        limiter (RequestRateLimiter | None): Limiter of all requests. Defaults to
+            :func:`ncbi_rate_limiter` for whether ``entrez.api_key`` is set.
+    """
+
+    def __init__(
+        self,
+        entrez: t.Any = Entrez,
+        *,
+        chunk_size: int = EFETCH_CHUNK_SIZE,
+        concurrency: int = FETCH_CONCURRENCY,
+        limiter: RequestRateLimiter | None = None,
+    ) -> None:
+        """Initialize the fetcher with NCBI credentials."""
+        if chunk_size < 1 or concurrency < 1:
+            msg = f"chunk_size and concurrency must be positive, got {chunk_size}, {concurrency}"
+            raise ValueError(msg)
+        self.entrez = entrez
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.limiter = limiter or ncbi_rate_limiter(
+            api_key=bool(getattr(entrez, "api_key", None))
+        )
+
+    def _read(self, utility: str, **params: t.Any) -> t.Any:
+        self.limiter.acquire()
+        handle = getattr(self.entrez, utility)(**params)
+        try:
+            return self.entrez.read(handle)
+        finally:
+            handle.close()
+
+    def esearch(self, query: str, max_results: int) -> PubMedSearch:
+        """Search PubMed, keeping the result set on the history server.
+
+        Args:
+            query (str): PubMed query.
+            max_results (int): Maximum number of PMIDs to return.
+
+        Returns:
+            PubMedSearch: PMIDs and history server location.
+        """
+        result = self._read(
+            "esearch",
+            db="pubmed",
+            term=query,
+            retmax=max_results,
+            sort="relevance",
+            usehistory="y",
+        )
+        if not isinstance(result, Mapping):
+            logger.error(f"Entrez.esearch returned unexpected type: {type(result)}")
+            return PubMedSearch(pmids=[], webenv=None, query_key=None)
+        return PubMedSearch(
+            pmids=[str(pmid) for pmid in result.get("IdList", [])],
+            webenv=result.get("WebEnv"),
+            query_key=result.get("QueryKey"),
+        )
+
+    def efetch_requests(
+        self, search: PubMedSearch, pmids: Sequence[str]
+    ) -> list[dict[str, t.Any]]:
+        """Plan the ``efetch`` requests of some of a search's PMIDs.
+
+        Args:
+            search (PubMedSearch): Search the PMIDs are from.
+            pmids (Sequence[str]): PMIDs to fetch, e.g. those not stored yet.
+
+        Returns:
+            list[dict[str, t.Any]]: ``efetch`` parameters per chunk, in PMID order.
+        """
+        n = len(pmids)
+        if n <= self.chunk_size or not search.webenv:
+            return [
+                {"id": list(pmids[start : start + self.chunk_size])}
+                for start in range(0, n, self.chunk_size)
+            ]
+        webenv, query_key = search.webenv, search.query_key
+        if list(pmids) != search.pmids:
+            posted = self._read("epost", db="pubmed", id=",".join(pmids), webenv=webenv)
+            webenv = posted.get("WebEnv", webenv)
+            query_key = posted["QueryKey"]
+        logger.debug(
+            f"Fetching {n} PubMed records from the history server in chunks of {self.chunk_size}"
+        )
+        return [
+            {
+                "webenv": webenv,
+                "query_key": query_key,
+                "retstart": start,
+                "retmax": min(self.chunk_size, n - start),
+            }
+            for start in range(0, n, self.chunk_size)
+        ]
+
+    def _fetch[T](
+        self, params: Mapping[str, t.Any], transform: Callable[[ET.Element], T | None]
+    ) -> list[T]:
+        self.limiter.acquire()
+        handle = self.entrez.efetch(db="pubmed", rettype="xml", retmode="xml", **params)
+        try:
+            return [
+                item
+                for article in iter_pubmed_articles(handle)
+                if (item := transform(article)) is not None
+            ]
+        finally:
+            handle.close()
+
+    def iter_chunks[T](
+        self,
+        requests: Iterable[Mapping[str, t.Any]],
+        transform: Callable[[ET.Element], T | None],
+    ) -> Iterator[list[T]]:
+        """Fetch chunks concurrently, yielding them in request order.
+
+        Args:
+            requests (Iterable[Mapping[str, t.Any]]): ``efetch`` parameters per chunk,
+                see :meth:`efetch_requests`.
+            transform (Callable[[ET.Element], T | None]): Applied to each
+                ``<PubmedArticle>`` in the fetching thread as it's parsed, e.g.
+                :func:`~sr_assistant.app.pubmed_xml.map_pubmed_article`. None drops
+                the article.
+
+        Yields:
+            list[T]: Transformed records of a chunk.
+
+        Raises:
+            Exception: Whatever a request or ``transform`` raised, once the chunks
+                before it are consumed. Closing the iterator cancels pending requests.
+        """
+        pool = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="pubmed-efetch"
+        )
+        remaining = iter(requests)
+        pending: deque[Future[list[T]]] = deque(
+            pool.submit(self._fetch, params, transform)
+            for params in itertools.islice(remaining, self.concurrency)
+        )
+        try:
+            while pending:
+                chunk = pending.popleft().result()
+                if (params := next(remaining, None)) is not None:
+                    pending.append(pool.submit(self._fetch, params, transform))
+                yield chunk
+        finally:
+            pool.shutdown(cancel_futures=True)
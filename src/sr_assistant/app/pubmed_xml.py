@@ -0,0 +1,275 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Streaming PubMed XML to ``SearchResult`` mapper.
+
+``Entrez.read`` builds a BioPython element tree of a whole efetch response,
+``SearchService._recursive_clean`` copies it into dicts and lists and the
+``_parse_pubmed_*`` helpers walk the copy again. This module maps efetch XML
+straight to :class:`~sr_assistant.core.models.SearchResult` instead:
+
+- :func:`iter_pubmed_articles` feeds a response to an ``ElementTree.XMLPullParser``
+  and yields one ``<PubmedArticle>`` element at a time, clearing each once consumed,
+  so only the articles of one :data:`READ_SIZE` block are alive.
+- :func:`pubmed_article_fields` takes the ``SearchResult`` field values from the
+  element with ``find``/``iterfind`` and converts it to ``raw_data``
+  (:func:`element_data`). :func:`map_pubmed_article` builds the model from them.
+
+``raw_data`` follows the layout of the cleaned ``Entrez.read`` output without its
+DTD: leaf elements (and text with inline markup) are their text, ``*List``
+elements, ``AbstractText`` and ``ELocationID`` are lists, other elements are dicts
+whose repeated children become lists. Absent optional elements aren't filled in
+with empty lists. Attributes are dropped, as they are when BioPython elements are
+serialized to JSON.
+
+Unlike the dict based helpers, identifiers are read from ``IdType``/``EIdType``
+attributes, so DOIs and PMC IDs of real responses are found.
+
+``tools/bench_pubmed_parser.py`` compares both paths on a recorded payload.
+
+Examples:
+    >>> with open("efetch.xml", "rb") as f:  # doctest: +SKIP
+    ...     results = [
+    ...         map_pubmed_article(a, review_id) for a in iter_pubmed_articles(f)
+    ...     ]
+"""
+
+from __future__ import annotations
+
+import re
+import typing as t
+import xml.etree.ElementTree as ET
+
+from loguru import logger
+
+from sr_assistant.core import models
+from sr_assistant.core.types import SearchDatabaseSource
+
+if t.TYPE_CHECKING:
+    import uuid
+    from collections.abc import Iterator
+
+    from pydantic import JsonValue
+
+ARTICLE_TAG = "PubmedArticle"
+READ_SIZE = 2**16
+"""Bytes read from the response per parser feed."""
+
+_RECORD_TAGS = frozenset({ARTICLE_TAG, "PubmedBookArticle"})
+_ALWAYS_LIST_TAGS = frozenset({"AbstractText", "ELocationID"})
+_INLINE_TAGS = frozenset({"b", "i", "u", "sub", "sup"})
+_YEAR_RE = re.compile(r"^(\d{4})")
+
+
+def _records(events: Iterator[tuple[str, t.Any]]) -> Iterator[ET.Element]:
+    for _, elem in events:
+        if elem.tag not in _RECORD_TAGS:
+            continue
+        if elem.tag == ARTICLE_TAG:
+            yield elem
+        # The root keeps an empty element per record, the subtree is freed
+        elem.clear()
+
+
+def iter_pubmed_articles(source: t.IO[bytes] | str) -> Iterator[ET.Element]:
+    """Stream the ``<PubmedArticle>`` elements of an efetch response.
+
+    An element is cleared once the next one is requested, copy what's needed
+    before. ``<PubmedBookArticle>`` records are skipped.
+
+    Args:
+        source (t.IO[bytes] | str): Binary file object or path of the XML.
+
+    Yields:
+        ET.Element: One article.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:  # noqa: PTH123
+            yield from iter_pubmed_articles(f)
+        return
+    # Trusted NCBI responses, expat doesn't resolve external entities. Fed in larger
+    # blocks than ET.iterparse and with end events only, per-element Python overhead
+    # is most of the parse time.
+    parser = ET.XMLPullParser(events=("end",))
+    while data := source.read(READ_SIZE):
+        parser.feed(data)
+        yield from _records(parser.read_events())
+    parser.close()
+    yield from _records(parser.read_events())
+
+
+def element_text(elem: ET.Element | None) -> str:
+    """Text of an element including inline markup such as ``<i>``, stripped."""
+    if elem is None:
+        return ""
+    if not len(elem):
+        return elem.text.strip() if elem.text else ""
+    return "".join(elem.itertext()).strip()
+
+
+def _is_text(elem: ET.Element) -> bool:
+    # Text with inline markup like <AbstractText>A <i>B</i> C</AbstractText>, other
+    # elements with children only have whitespace between them
+    text = elem.text
+    if text and not text.isspace():
+        return True
+    tag = elem[0].tag
+    return tag in _INLINE_TAGS or tag.endswith("}math")
+
+
+def element_data(elem: ET.Element) -> JsonValue:
+    """``raw_data`` value of an element, see the module docstring."""
+    if not len(elem):
+        return elem.text.strip() if elem.text else ""
+    if _is_text(elem):
+        return "".join(elem.itertext()).strip()
+    if elem.tag.endswith("List"):
+        return [element_data(child) for child in elem]
+    data: dict[str, JsonValue] = {}
+    lists: dict[str, list[JsonValue]] = {}
+    for child in elem:
+        tag = child.tag
+        if len(child):
+            value = element_data(child)
+        else:
+            value = child.text.strip() if child.text else ""
+        if tag in lists:
+            lists[tag].append(value)
+        elif tag in data:
+            lists[tag] = data[tag] = [data[tag], value]
+        elif tag in _ALWAYS_LIST_TAGS:
+            lists[tag] = data[tag] = [value]
+        else:
+            data[tag] = value
+    return data
+
+
+def _abstract(info: ET.Element) -> str | None:
+    parts: list[str] = []
+    for part in info.iterfind("Abstract/AbstractText"):
+        text = element_text(part)
+        label = part.get("Label")
+        if label and text and label.lower() != text.lower():
+            parts.append(f"{label.upper()}: {text}")
+        elif text:
+            parts.append(text)
+    return " ".join(parts) or None
+
+
+def _year(info: ET.Element) -> str | None:
+    pub_date = info.find("Journal/JournalIssue/PubDate")
+    if pub_date is None:
+        return None
+    if year := element_text(pub_date.find("Year")):
+        return year
+    # e.g. <MedlineDate>2023 Spring</MedlineDate>
+    match = _YEAR_RE.match(element_text(pub_date.find("MedlineDate")))
+    return match.group(1) if match else None
+
+
+def _authors(info: ET.Element) -> list[str] | None:
+    authors: list[str] = []
+    for author in info.iterfind("AuthorList/Author"):
+        last_name = element_text(author.find("LastName"))
+        fore_name = element_text(author.find("ForeName"))
+        initials = element_text(author.find("Initials"))
+        if fore_name and last_name:
+            authors.append(f"{fore_name} {last_name}")
+        elif last_name and initials:
+            authors.append(f"{last_name} {initials}")
+        elif name := last_name or element_text(author.find("CollectiveName")):
+            authors.append(name)
+        elif initials:
+            authors.append(initials)
+    return authors or None
+
+
+def pubmed_article_fields(article: ET.Element) -> dict[str, t.Any] | None:
+    """``SearchResult`` field values of a ``<PubmedArticle>`` element.
+
+    Args:
+        article (ET.Element): Article from :func:`iter_pubmed_articles`.
+
+    Returns:
+        dict[str, t.Any] | None: Field values except ``review_id``, None if the
+            article has no PMID or title.
+    """
+    citation = article.find("MedlineCitation")
+    pubmed_data = article.find("PubmedData")
+    pmid = element_text(article.find("MedlineCitation/PMID"))
+    info = article.find("MedlineCitation/Article")
+    title = element_text(info.find("ArticleTitle")) if info is not None else ""
+    if citation is None or info is None or not pmid or not title:
+        logger.warning(
+            f"Skipping record due to missing PMID or title after parsing. PMID: {pmid}, Title: {title}."
+        )
+        return None
+
+    ids: dict[str, str] = {}
+    if pubmed_data is not None:
+        for article_id in pubmed_data.iterfind("ArticleIdList/ArticleId"):
+            ids.setdefault(
+                article_id.get("IdType", "").lower(), element_text(article_id)
+            )
+    doi = ids.get("doi") or next(
+        (
+            element_text(location)
+            for location in info.iterfind("ELocationID")
+            if location.get("EIdType", "").lower() == "doi"
+        ),
+        None,
+    )
+    keywords = list(
+        dict.fromkeys(
+            text
+            for keyword in citation.iterfind("KeywordList/Keyword")
+            if (text := element_text(keyword))
+        )
+    )
+    raw_data = t.cast("dict[str, JsonValue]", element_data(article))
+    citation_data = t.cast("dict[str, JsonValue]", raw_data.get("MedlineCitation", {}))
+    return {
+        "source_db": SearchDatabaseSource.PUBMED,
+        "source_id": pmid,
+        "doi": doi or None,
+        "title": title,
+        "abstract": _abstract(info),
+        "journal": element_text(info.find("Journal/Title")) or None,
+        "year": _year(info),
+        "authors": _authors(info),
+        "keywords": keywords or None,
+        "raw_data": raw_data,
+        "source_metadata": {
+            "pmc": ids.get("pmc") or None,
+            "publication_status": element_text(
+                pubmed_data.find("PublicationStatus")
+                if pubmed_data is not None
+                else None
+            ),
+            "mesh_headings": citation_data.get("MeshHeadingList", []),
+        },
+    }
+
+
+def map_pubmed_article(
+    article: ET.Element, review_id: uuid.UUID
+) -> models.SearchResult | None:
+    """Map a ``<PubmedArticle>`` element to a search result.
+
+    Args:
+        article (ET.Element): Article from :func:`iter_pubmed_articles`.
+        review_id (uuid.UUID): Review the search result belongs to.
+
+    Returns:
+        SearchResult | None: Unsaved search result, None if the article has no PMID
+            or title or can't be mapped.
+    """
+    try:
+        fields = pubmed_article_fields(article)
+        if fields is None:
+            return None
+        return models.SearchResult(review_id=review_id, **fields)
+    except Exception as e:
+        pmid = element_text(article.find("MedlineCitation/PMID")) or "UNKNOWN"
+        logger.opt(exception=True).error(f"Error mapping PubMed article {pmid}: {e!r}")
+        return None
@@ -0,0 +1,313 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Paginated Scopus retrieval with the Scopus Search API.
+
+:class:`ScopusClient` streams the results of a Scopus search page by page, so a
+search with thousands of records can be stored as it's read:
+
+- :meth:`ScopusClient.search_page` requests one page of the ``STANDARD`` view.
+  Pages are chained with the ``cursor`` parameter, which isn't capped at 5,000
+  results like ``start`` is.
+- :meth:`ScopusClient.complete_entries` re-requests the entries of a page without
+  ``dc:description`` (the abstract) in the ``COMPLETE`` view, with one
+  ``EID(...) OR ...`` query per page rather than one request per record.
+- :meth:`ScopusClient.iter_pages` walks the cursor in a thread while up to
+  :data:`SCOPUS_CONCURRENCY` earlier pages are completed and transformed in
+  others, and yields the pages in order. A cursor only names the page after the
+  one just read, so pages are requested one after another, the per-page work and
+  the caller's storing of the previous page overlap with it. At most
+  ``concurrency + 1`` pages are in memory however large the search is.
+
+All requests go through a process-wide :class:`RequestRateLimiter` at Elsevier's
+quota of :data:`SCOPUS_RATE` requests per second. Throttled (429) and 5xx responses
+are retried up to :data:`SCOPUS_MAX_RETRIES` times, after ``Retry-After`` if sent.
+
+Plain ``requests`` is used rather than ``elsapy``, whose client spaces all requests
+a second apart and isn't safe to share between threads.
+
+Examples:
+    >>> client = ScopusClient(api_key)  # doctest: +SKIP
+    >>> for page in client.iter_pages(
+    ...     "TITLE-ABS-KEY(knee osteoarthritis)", 5000, transform
+    ... ):  # doctest: +SKIP
+    ...     store(page)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import typing as t
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+from sr_assistant.app.agents.rate_limit import RequestRateLimiter
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Mapping, Sequence
+    from concurrent.futures import Future
+
+SCOPUS_SEARCH_URL = "https://api.elsevier.com/content/search/scopus"
+SCOPUS_PAGE_SIZE = 25
+"""Entries per page, the maximum of the ``COMPLETE`` view."""
+SCOPUS_CONCURRENCY = 3
+"""Pages completed and transformed concurrently."""
+SCOPUS_RATE = 9.0
+"""Scopus Search API requests per second allowed per API key."""
+SCOPUS_MAX_RETRIES = 3
+"""Retries of a throttled or failed request."""
+SCOPUS_RETRY_BACKOFF = 1.0
+"""Seconds before the first retry without ``Retry-After``, doubled per retry."""
+
+_limiters: dict[str, RequestRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def scopus_rate_limiter(api_key: str) -> RequestRateLimiter:
+    """Process-wide limiter of Scopus requests made with an API key."""
+    with _limiters_lock:
+        if api_key not in _limiters:
+            _limiters[api_key] = RequestRateLimiter(SCOPUS_RATE)
+        return _limiters[api_key]
+
+
+class ScopusError(Exception):
+    """Scopus API request failed."""
+
+
+class ScopusPage(t.NamedTuple):
+    """One page of a Scopus search."""
+
+    entries: list[dict[str, t.Any]]
+    total_results: int
+    """Results of the whole search."""
+    next_cursor: str | None
+    """Cursor of the following page, None on the last page."""
+
+
+class ScopusClient:
+    """Scopus Search API client retrieving results page by page.
+
+    Args:
+        api_key (str): Elsevier API key, sent as ``X-ELS-APIKey``.
+        inst_token (str | None): Institutional token, sent as ``X-ELS-Insttoken``.
+        base_url (str): Scopus Search API URL, e.g. of a stand-in server in tests.
+        page_size (int): Entries per page.
+        concurrency (int): Pages completed and transformed concurrently.
+        limiter (RequestRateLimiter | None): Limiter of all requests. Defaults to
+            :func:`scopus_rate_limiter` of the API key.
+        session (requests.Session | None): HTTP session, a new one by default.
+        timeout (float): Seconds to wait for a response.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        api_key: str,
+        *,
+        inst_token: str | None = None,
+        base_url: str = SCOPUS_SEARCH_URL,
+        page_size: int = SCOPUS_PAGE_SIZE,
+        concurrency: int = SCOPUS_CONCURRENCY,
+        limiter: RequestRateLimiter | None = None,
+        session: requests.Session | None = None,
+        timeout: float = 30.0,
+    ) -> None:
+        """Initialize the client with Scopus API credentials."""
+        if page_size < 1 or concurrency < 1:
+            msg = f"page_size and concurrency must be positive, got {page_size}, {concurrency}"
+            raise ValueError(msg)
+        self.base_url = base_url
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.limiter = limiter or scopus_rate_limiter(api_key)
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            # One connection per thread of iter_pages
+            adapter = HTTPAdapter(pool_maxsize=concurrency + 1)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        self.session.headers.update(
+            {"X-ELS-APIKey": api_key, "Accept": "application/json"}
+        )
+        if inst_token:
+            self.session.headers["X-ELS-Insttoken"] = inst_token
+
+    def _get(self, params: Mapping[str, t.Any]) -> dict[str, t.Any]:
+        for attempt in range(SCOPUS_MAX_RETRIES + 1):
+            self.limiter.acquire()
+            try:
+                response = self.session.get(
+                    self.base_url, params=params, timeout=self.timeout
+                )
+            except requests.RequestException as e:
+                if attempt == SCOPUS_MAX_RETRIES:
+                    msg = f"Scopus request failed: {e!r}"
+                    raise ScopusError(msg) from e
+                delay = SCOPUS_RETRY_BACKOFF * 2**attempt
+                logger.warning(f"Scopus request failed, retrying in {delay}s: {e!r}")
+                time.sleep(delay)
+                continue
+            status = response.status_code
+            retryable = (
+                status == HTTPStatus.TOO_MANY_REQUESTS
+                or status >= HTTPStatus.INTERNAL_SERVER_ERROR
+            )
+            if not retryable or attempt == SCOPUS_MAX_RETRIES:
+                break
+            try:
+                delay = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                delay = SCOPUS_RETRY_BACKOFF * 2**attempt
+            logger.warning(f"Scopus responded {status}, retrying in {delay}s")
+            time.sleep(delay)
+        if status != HTTPStatus.OK:
+            msg = f"Scopus responded {status}: {response.text[:500]}"
+            raise ScopusError(msg)
+        return response.json()
+
+    def search_page(
+        self,
+        query: str,
+        cursor: str = "*",
+        count: int | None = None,
+        *,
+        view: t.Literal["STANDARD", "COMPLETE"] = "STANDARD",
+    ) -> ScopusPage:
+        """Request one page of a search.
+
+        Args:
+            query (str): Scopus advanced search query.
+            cursor (str): ``*`` for the first page, then the previous page's
+                ``next_cursor``.
+            count (int | None): Entries to request, defaults to ``page_size``.
+            view (t.Literal["STANDARD", "COMPLETE"]): Fields returned per entry.
+
+        Returns:
+            ScopusPage: Entries, total results and the next cursor.
+
+        Raises:
+            ScopusError: If the request fails after retries.
+        """
+        data = self._get(
+            {
+                "query": query,
+                "cursor": cursor,
+                "count": count or self.page_size,
+                "view": view,
+            }
+        ).get("search-results", {})
+        # An empty result set has one entry with an error message
+        entries = [entry for entry in data.get("entry", []) if "error" not in entry]
+        next_cursor = data.get("cursor", {}).get("@next")
+        return ScopusPage(
+            entries=entries,
+            total_results=int(data.get("opensearch:totalResults") or 0),
+            next_cursor=next_cursor if entries and next_cursor != cursor else None,
+        )
+
+    def complete_entries(
+        self, entries: Sequence[dict[str, t.Any]]
+    ) -> list[dict[str, t.Any]]:
+        """Replace entries without an abstract with their ``COMPLETE`` view.
+
+        Args:
+            entries (Sequence[dict[str, t.Any]]): ``STANDARD`` view entries.
+
+        Returns:
+            list[dict[str, t.Any]]: The entries, in order. Entries the ``COMPLETE``
+                view doesn't return are kept as they were.
+        """
+        eids = [
+            entry["eid"]
+            for entry in entries
+            if not entry.get("dc:description") and entry.get("eid")
+        ]
+        if not eids:
+            return list(entries)
+        query = " OR ".join(f"EID({eid})" for eid in eids)
+        page = self.search_page(query, count=len(eids), view="COMPLETE")
+        complete = {entry.get("eid"): entry for entry in page.entries}
+        logger.debug(
+            f"Completed {len(complete)} of {len(eids)} Scopus entries without an abstract"
+        )
+        return [complete.get(entry.get("eid"), entry) for entry in entries]
+
+    def _complete_page[T](
+        self,
+        entries: Sequence[dict[str, t.Any]],
+        transform: Callable[[dict[str, t.Any]], T | None],
+    ) -> list[T]:
+        return [
+            item
+            for entry in self.complete_entries(entries)
+            if (item := transform(entry)) is not None
+        ]
+
+    def iter_pages[T](
+        self,
+        query: str,
+        max_results: int,
+        transform: Callable[[dict[str, t.Any]], T | None],
+    ) -> Iterator[list[T]]:
+        """Read a search page by page, yielding the transformed pages in order.
+
+        Args:
+            query (str): Scopus advanced search query.
+            max_results (int): Maximum number of entries to read.
+            transform (Callable[[dict[str, t.Any]], T | None]): Applied to each
+                completed entry in a worker thread. None drops the entry.
+
+        Yields:
+            list[T]: Transformed entries of a page.
+
+        Raises:
+            ScopusError: If a request fails, once the pages before it are consumed.
+                Closing the iterator cancels pending work.
+        """
+        pool = ThreadPoolExecutor(
+            max_workers=self.concurrency + 1, thread_name_prefix="scopus"
+        )
+        read = 0
+        next_page: Future[ScopusPage] | None = None
+        if max_results > 0:
+            next_page = pool.submit(
+                self.search_page, query, "*", min(self.page_size, max_results)
+            )
+        pending: deque[Future[list[T]]] = deque()
+        try:
+            while next_page is not None or pending:
+                # Walk the cursor until `concurrency` pages are being completed
+                while next_page is not None and len(pending) < self.concurrency:
+                    if pending and next_page.exception() is not None:
+                        break  # Raised once the pages before it are consumed
+                    page = next_page.result()
+                    if read == 0:
+                        logger.info(
+                            f"Scopus search found {page.total_results} results, reading up to {max_results}"
+                        )
+                    entries = page.entries[: max_results - read]
+                    read += len(entries)
+                    next_page = None
+                    if page.next_cursor and read < max_results:
+                        next_page = pool.submit(
+                            self.search_page,
+                            query,
+                            page.next_cursor,
+                            min(self.page_size, max_results - read),
+                        )
+                    if entries:
+                        pending.append(
+                            pool.submit(self._complete_page, entries, transform)
+                        )
+                if pending:
+                    yield pending.popleft().result()
+        finally:
+            pool.shutdown(cancel_futures=True)
@@ -6,34 +6,93 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import os  # Import os for getenv
 import re
 import typing as t
 import uuid
-from collections.abc import Mapping
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from copy import deepcopy
-from datetime import datetime
+from datetime import UTC, datetime
 
 # Import BioPython Entrez for PubMed API interaction
 # Assuming BioPython is installed and configured (email, api_key)
 from Bio import Entrez
 from loguru import logger
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import Session
 
+from sr_assistant.app.agents.batch_screening import (
+    BatchJob,
+    BatchJobClient,
+    OpenAIBatchJobClient,
+    make_batch_requests,
+    parse_batch_results,
+)
 from sr_assistant.app.agents.screening_agents import (
+    RESOLVER_MODEL_NAME,
+    REVIEWER_MODEL_NAME,
     ScreenAbstractResultTuple,
     ScreenAbstractsBatchOutput,
     ScreeningError,
+    criteria_fingerprint,
     screen_abstracts_batch,
+    screen_abstracts_batch_as_completed,
+)
+from sr_assistant.app.agents.screening_cascade import (
+    CascadeConfig,
+    screen_abstracts_cascade_as_completed,
+)
+from sr_assistant.app.agents.screening_engine import (
+    ScreeningEngine,
+    ascreen_abstracts_batch,
+    default_hedge_policy,
+    get_screening_engine,
+)
+from sr_assistant.app.agents.screening_estimate import (
+    ScreeningRunEstimate,
+    estimate_screening_run,
 )
-from sr_assistant.app.database import session_factory
-from sr_assistant.core import models, repositories, schemas
+from sr_assistant.app.agents.screening_prioritizer import (
+    PRIORITIZATION_CHUNK_SIZE,
+    ScreeningPrioritizer,
+    get_prioritizer,
+    relevance_label,
+    result_tuple_label,
+)
+from sr_assistant.app.agents.screening_reuse import clone_screening_result, reuse_key
+from sr_assistant.app.database import asession_factory, session_factory
+from sr_assistant.app.dedup import (
+    cluster_duplicates,
+    minhash_signature,
+    shingles,
+    signature_from_bytes,
+    signature_to_bytes,
+)
+from sr_assistant.app.pubmed_ingest import EFETCH_CHUNK_SIZE, PubMedFetcher
+from sr_assistant.app.pubmed_xml import map_pubmed_article
+from sr_assistant.app.scopus_ingest import SCOPUS_PAGE_SIZE, ScopusClient
+from sr_assistant.core import models, repositories, repositories_async, schemas
 from sr_assistant.core.repositories import RecordNotFoundError
-from sr_assistant.core.types import ScreeningStrategyType, SearchDatabaseSource
+from sr_assistant.core.types import (
+    ScreeningJobKind,
+    ScreeningJobStatus,
+    ScreeningStrategyType,
+    SearchDatabaseSource,
+)
 
 if t.TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Iterator, Mapping, Sequence
+
+    from pydantic import JsonValue
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from sqlmodel.ext.asyncio.session import AsyncSession
 
 
 # Define potential service-level errors
@@ -45,23 +104,154 @@ class RecordMappingError(ServiceError):
     """Error during mapping of external data (e.g., API record) to internal model."""
 
 
+class ScreeningJobActiveError(ServiceError):
+    """The review already has a queued or running job of the kind."""
+
+
+class DeduplicationSummary(t.NamedTuple):
+    """Outcome of near-duplicate detection over a review's search results."""
+
+    search_results: int
+    hashed: int
+    """Search results whose MinHash signature was computed in this run."""
+    clusters: int
+    duplicates: int
+    """Search results marked as a duplicate, screened through their representative."""
+    updated: int
+    """Search results whose duplicate mark or signature changed."""
+
+
+class _DuplicatePlan(t.NamedTuple):
+    """Search results to screen in place of the requested ones."""
+
+    to_screen: list[models.SearchResult]
+    duplicates: dict[uuid.UUID, list[models.SearchResult]]
+    """The review's duplicates of each search result in ``to_screen``."""
+    requested: set[uuid.UUID]
+
+
+ACTIVE_JOB_STATUSES = frozenset({ScreeningJobStatus.QUEUED, ScreeningJobStatus.RUNNING})
+"""Statuses of a job that isn't done, a review has one such job of each kind."""
+SCREENING_CHUNK_SIZE = 50
+"""Search results screened per transaction by ``perform_batch_abstract_screening``."""
+CHECKPOINT_METADATA_KEY = "screening_checkpoint"
+"""``review_metadata`` key of a review's :class:`ScreeningCheckpoint`."""
+
+
+class ScreeningCheckpoint(BaseModel):
+    """Progress of an unfinished batch screening run of a review."""
+
+    run_key: str
+    """Hash of the requested search result IDs, the same request resumes the run."""
+    completed: set[uuid.UUID] = Field(default_factory=set)
+    """Search results screened through both reviewers, in committed chunks."""
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    @staticmethod
+    def key_of(plan: _DuplicatePlan) -> str:
+        """Run key of a screening plan."""
+        return hashlib.sha256(
+            ",".join(sorted(str(sr_id) for sr_id in plan.requested)).encode()
+        ).hexdigest()
+
+    @classmethod
+    def from_review(cls, review: models.SystematicReview) -> t.Self | None:
+        """Read the checkpoint of a review, None if it has none."""
+        data = (review.review_metadata or {}).get(CHECKPOINT_METADATA_KEY)
+        return cls.model_validate(data) if data else None
+
+    @classmethod
+    def for_run(
+        cls, review: models.SystematicReview, plan: _DuplicatePlan, *, resume: bool
+    ) -> t.Self:
+        """The review's checkpoint if it's for the same run, else a new one."""
+        run_key = cls.key_of(plan)
+        checkpoint = cls.from_review(review) if resume else None
+        if checkpoint is None or checkpoint.run_key != run_key:
+            return cls(run_key=run_key)
+        return checkpoint
+
+
+class _ScreeningRun(t.NamedTuple):
+    """A batch screening run planned by ``ScreeningService._start_screening_run``."""
+
+    review: models.SystematicReview
+    plan: _DuplicatePlan
+    checkpoint: ScreeningCheckpoint
+    fingerprint: str
+    """Review criteria fingerprint of reused decisions."""
+    pending: list[models.SearchResult]
+    """Search results left to screen, in screening order."""
+    results: list[ScreenAbstractResultTuple]
+    """Result tuples of the requested search results so far."""
+    prioritizer: ScreeningPrioritizer | None = None
+    """Re-ranks the pending search results after each chunk, None unless prioritized."""
+
+
+class BulkScreeningSummary(t.NamedTuple):
+    """Outcome of ingesting a bulk screening batch job."""
+
+    job_id: str | None
+    """None if all decisions were reused and no job was submitted."""
+    ingested: int
+    """ScreenAbstractResult rows added."""
+    skipped: int
+    """Results already ingested from this job, or for unknown search results."""
+    errors: dict[str, str]
+    """Batch request custom_id -> error, for requests without a usable response."""
+
+
+BENCHMARK_BATCH_SIZE = 10
+"""Search results screened per batch of a benchmark job."""
+
+
+class AbstractScreeningJobParams(BaseModel):
+    """``params`` of an abstract screening job, see :class:`ScreeningJobService`."""
+
+    search_result_ids: list[uuid.UUID]
+    bypass_cache: bool = False
+    prioritize: bool = False
+    resolve_conflicts: bool = True
+    """Run the resolver on conflicts and store its decision as final."""
+
+
+class BenchmarkJobParams(BaseModel):
+    """``params`` of a benchmark job, see :class:`ScreeningJobService`."""
+
+    benchmark_run_id: uuid.UUID
+    batch_size: int = Field(default=BENCHMARK_BATCH_SIZE, ge=1)
+    bypass_cache: bool = False
+    pack_size: int = Field(default=1, ge=1)
+    cascade: CascadeConfig = Field(default_factory=CascadeConfig)
+
+
 class BaseService:
-    """Base service providing session management (sync)."""
+    """Base service providing session management (sync and async)."""
 
-    def __init__(self, factory: sessionmaker[Session] = session_factory):
+    def __init__(
+        self,
+        factory: sessionmaker[Session] = session_factory,
+        afactory: async_sessionmaker[AsyncSession] = asession_factory,
+    ) -> None:
+        """Initialize the service with sync and async session factories."""
         self.session_factory = factory
+        self.asession_factory = afactory
 
 
 class SearchService(BaseService):
-    """Service for managing SearchResult data (sync)."""
+    """Service for managing SearchResult data (sync, with async PubMed search)."""
 
     def __init__(
         self,
         factory: sessionmaker[Session] = session_factory,
         search_repo: repositories.SearchResultRepository | None = None,
+        afactory: async_sessionmaker[AsyncSession] = asession_factory,
     ):
-        super().__init__(factory)
+        super().__init__(factory, afactory)
         self.search_repo = search_repo or repositories.SearchResultRepository()
+        self.asearch_repo = repositories_async.AsyncSearchResultRepository(
+            self.search_repo
+        )
 
     # --- PubMed Data Cleaning and Parsing Helpers ---
     def _recursive_clean(self, data: t.Any) -> t.Any:
@@ -301,7 +491,12 @@ class SearchService(BaseService):
         review_id: uuid.UUID,
         api_record: dict[str, t.Any],  # Will receive a CLEANED dict
     ) -> models.SearchResult | None:
-        """Maps a CLEANED PubMed API record dictionary to a SearchResult model."""
+        """Maps a CLEANED PubMed API record dictionary to a SearchResult model.
+
+        Searches map efetch XML with
+        :func:`~sr_assistant.app.pubmed_xml.map_pubmed_article` instead, this is for
+        records already read with ``Entrez.read``.
+        """
         try:
             # The api_record is already cleaned by _recursive_clean
             pmid, doi, pmc = self._parse_pubmed_ids(api_record)
@@ -450,16 +645,54 @@ class SearchService(BaseService):
             )
             return None  # Return None on any mapping error
 
+    @staticmethod
+    def _pubmed_fetcher(chunk_size: int) -> PubMedFetcher:
+        """Configure Entrez from the NCBI_EMAIL/NCBI_API_KEY environment variables.
+
+        Raises:
+            ServiceError: If NCBI_EMAIL is not set.
+        """
+        entrez_email = os.getenv("NCBI_EMAIL")
+        entrez_api_key = os.getenv("NCBI_API_KEY")
+
+        if not entrez_email:
+            logger.error(
+                "NCBI_EMAIL environment variable not set. PubMed search cannot proceed."
+            )
+            msg = "NCBI_EMAIL environment variable not set."
+            raise ServiceError(msg)
+
+        Entrez.email = entrez_email
+        if entrez_api_key:
+            Entrez.api_key = entrez_api_key
+        else:
+            logger.warning("NCBI_API_KEY not set. PubMed searches may be rate-limited.")
+
+        return PubMedFetcher(Entrez, chunk_size=chunk_size)
+
     # --- Core Service Methods (Synchronous) ---
     def search_pubmed_and_store_results(
-        self, review_id: uuid.UUID, query: str, max_results: int = 100
+        self,
+        review_id: uuid.UUID,
+        query: str,
+        max_results: int = 100,
+        *,
+        chunk_size: int = EFETCH_CHUNK_SIZE,
     ) -> Sequence[schemas.SearchResultRead]:
         """Performs a PubMed search, maps results, stores them, and handles sessions.
 
+        New records are fetched in chunks with the E-utilities history server, see
+        :mod:`sr_assistant.app.pubmed_ingest`, and mapped while their XML is parsed,
+        see :mod:`sr_assistant.app.pubmed_xml`. Each chunk is stored in its
+        own transaction before later chunks are fetched, so a failed run keeps what it
+        stored and a rerun only fetches the rest. Chunks are upserted, records another
+        search stored in the meantime are skipped.
+
         Args:
             review_id: The ID of the review to associate results with.
             query: The search query string for PubMed.
             max_results: The maximum number of results to fetch and store.
+            chunk_size: Records per efetch request and transaction.
 
         Returns:
             A sequence of the added/stored SearchResult objects, converted to SearchResultRead schemas.
@@ -472,40 +705,11 @@ class SearchService(BaseService):
             f"Starting PubMed search for review {review_id!r} with query {query!r} (max: {max_results})"
         )
 
-        entrez_email = os.getenv("NCBI_EMAIL")
-        entrez_api_key = os.getenv("NCBI_API_KEY")
-
-        if not entrez_email:
-            logger.error(
-                "NCBI_EMAIL environment variable not set. PubMed search cannot proceed."
-            )
-            raise ServiceError("NCBI_EMAIL environment variable not set.")
-
-        Entrez.email = entrez_email
-        if entrez_api_key:
-            Entrez.api_key = entrez_api_key
-        else:
-            logger.warning("NCBI_API_KEY not set. PubMed searches may be rate-limited.")
-
-        fetched_pmids: list[str] = []
-        new_pmids_to_fetch_details: list[str] = []
-        mapped_model_results: list[models.SearchResult] = []
-        added_search_result_models_for_conversion: list[models.SearchResult] = []
-
+        fetcher = self._pubmed_fetcher(chunk_size)
         try:
             logger.debug("Executing Entrez.esearch for PMIDs...")
-            handle = Entrez.esearch(
-                db="pubmed", term=query, retmax=max_results, sort="relevance"
-            )
-            search_results_raw = Entrez.read(handle)
-            handle.close()
-
-            if isinstance(search_results_raw, Mapping):
-                fetched_pmids = search_results_raw.get("IdList", [])
-            else:
-                logger.error(
-                    f"Entrez.esearch returned unexpected type: {type(search_results_raw)}"
-                )
+            search = fetcher.esearch(query, max_results)
+            fetched_pmids = search.pmids
 
             if not fetched_pmids:
                 logger.info("No PMIDs found by Entrez.esearch for query.")
@@ -515,7 +719,8 @@ class SearchService(BaseService):
                 f"Found {len(fetched_pmids)} PMIDs from PubMed initial search."
             )
 
-            # Check for existing PMIDs in the database for this review
+            # Only fetch PMIDs not stored for this review yet. Storing upserts, this
+            # saves the efetch requests, not the constraint check.
             with (
                 self.session_factory() as session
             ):  # Use a new session for this read operation
@@ -538,117 +743,201 @@ class SearchService(BaseService):
             logger.debug(
                 f"{len(new_pmids_to_fetch_details)} new PMIDs to fetch details for with Entrez.efetch..."
             )
-            handle = Entrez.efetch(
-                db="pubmed", id=new_pmids_to_fetch_details, rettype="xml", retmode="xml"
+            efetch_requests = fetcher.efetch_requests(
+                search, new_pmids_to_fetch_details
+            )
+        except Exception as e:
+            logger.opt(exception=True).error(
+                f"Error during PubMed API interaction or mapping for query '{query}': {e!r}"
+            )
+            raise ServiceError(
+                f"PubMed API interaction or mapping failed for query '{query}'."
+            ) from e
+
+        added: list[schemas.SearchResultRead] = []
+        with closing(
+            fetcher.iter_chunks(
+                efetch_requests,
+                functools.partial(map_pubmed_article, review_id=review_id),
+            )
+        ) as chunks:
+            while True:
+                try:
+                    chunk = next(chunks, None)
+                except Exception as e:
+                    logger.opt(exception=True).error(
+                        f"Error during PubMed API interaction or mapping for query '{query}': {e!r}"
+                    )
+                    msg = (
+                        f"PubMed API interaction or mapping failed for query '{query}'."
+                    )
+                    raise ServiceError(msg) from e
+                if chunk is None:
+                    break
+                if chunk:
+                    added.extend(self._store_search_results_chunk(review_id, chunk))
+
+        if not added:
+            logger.info(
+                f"No new results successfully mapped and stored from PubMed for review {review_id!r}."
+            )
+        else:
+            logger.info(
+                f"Stored {len(added)} new results from PubMed for review {review_id!r}"
             )
-            papers_raw_data = Entrez.read(handle)
-            handle.close()
+        return added
 
-            cleaned_papers_input = self._recursive_clean(papers_raw_data)
-            actual_articles_data: list[dict[str, t.Any]] = []
+    async def asearch_pubmed_and_store_results(
+        self,
+        review_id: uuid.UUID,
+        query: str,
+        max_results: int = 100,
+        *,
+        chunk_size: int = EFETCH_CHUNK_SIZE,
+    ) -> Sequence[schemas.SearchResultRead]:
+        """Async variant of :meth:`search_pubmed_and_store_results`.
 
-            if isinstance(cleaned_papers_input, list):
-                actual_articles_data = [
-                    item for item in cleaned_papers_input if isinstance(item, dict)
-                ]
-            elif isinstance(cleaned_papers_input, dict):
-                if "PubmedArticle" in cleaned_papers_input and isinstance(
-                    cleaned_papers_input["PubmedArticle"], list
-                ):
-                    actual_articles_data = [
-                        item
-                        for item in cleaned_papers_input["PubmedArticle"]
-                        if isinstance(item, dict)
-                    ]
-                elif "PubmedArticleSet" in cleaned_papers_input and isinstance(
-                    cleaned_papers_input["PubmedArticleSet"], list
-                ):
-                    actual_articles_data = [
-                        item
-                        for item in cleaned_papers_input["PubmedArticleSet"]
-                        if isinstance(item, dict)
-                    ]
-                else:
-                    actual_articles_data = [cleaned_papers_input]
-            else:
-                logger.warning(
-                    f"Unexpected data structure after cleaning PubMed efetch results: {type(cleaned_papers_input)}"
-                )
+        The E-utilities requests and XML parsing run in threads and the database is
+        used with ``asession_factory`` sessions, so the event loop keeps serving other
+        coroutines, e.g. screening calls, while a search is fetched and stored.
+        Chunks, transactions and skipped records are as in the sync method.
 
-            if not actual_articles_data:
-                logger.info(
-                    "No article data extracted after cleaning PubMed efetch results for new PMIDs."
-                )
+        Args:
+            review_id: The ID of the review to associate results with.
+            query: The search query string for PubMed.
+            max_results: The maximum number of results to fetch and store.
+            chunk_size: Records per efetch request and transaction.
+
+        Returns:
+            A sequence of the added/stored SearchResult objects, converted to SearchResultRead schemas.
+
+        Raises:
+            ServiceError: If there is an issue with the API call or database operation,
+                        or if NCBI credentials are not set in environment variables.
+        """
+        logger.info(
+            f"Starting async PubMed search for review {review_id!r} with query {query!r} (max: {max_results})"
+        )
+
+        fetcher = self._pubmed_fetcher(chunk_size)
+        try:
+            search = await asyncio.to_thread(fetcher.esearch, query, max_results)
+            fetched_pmids = search.pmids
+
+            if not fetched_pmids:
+                logger.info("No PMIDs found by Entrez.esearch for query.")
                 return []
 
-            for article_dict in actual_articles_data:
-                mapped_model = self._map_pubmed_to_search_result(
-                    review_id, article_dict
+            async with self.asession_factory() as session:
+                existing_pmids_in_db = await self.asearch_repo.get_existing_source_ids(
+                    session, review_id, SearchDatabaseSource.PUBMED, fetched_pmids
                 )
-                if mapped_model:
-                    mapped_model_results.append(mapped_model)
 
-            if not mapped_model_results:
+            new_pmids_to_fetch_details = [
+                pmid for pmid in fetched_pmids if pmid not in existing_pmids_in_db
+            ]
+
+            if not new_pmids_to_fetch_details:
                 logger.info(
-                    f"No new results successfully mapped from PubMed for review {review_id!r}."
+                    f"All {len(fetched_pmids)} PMIDs found already exist in the database for review {review_id!r}. No new articles to fetch."
                 )
                 return []
 
+            # May epost the new PMIDs
+            efetch_requests = await asyncio.to_thread(
+                fetcher.efetch_requests, search, new_pmids_to_fetch_details
+            )
         except Exception as e:
             logger.opt(exception=True).error(
                 f"Error during PubMed API interaction or mapping for query '{query}': {e!r}"
             )
-            raise ServiceError(
-                f"PubMed API interaction or mapping failed for query '{query}'."
-            ) from e
-
-        # This block handles database storage and transaction for NEW articles
-        if (
-            not mapped_model_results
-        ):  # Should be redundant if logic above is correct, but safeguard
-            logger.info("No new mapped models to store.")
-            return []
+            msg = f"PubMed API interaction or mapping failed for query '{query}'."
+            raise ServiceError(msg) from e
 
+        added: list[schemas.SearchResultRead] = []
+        chunks = fetcher.iter_chunks(
+            efetch_requests, functools.partial(map_pubmed_article, review_id=review_id)
+        )
+        # One thread steps the generator, so closing it waits for a step in progress
+        # when the search is cancelled.
+        stepper = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pubmed-chunks")
+        loop = asyncio.get_running_loop()
         try:
-            with self.session_factory.begin() as session:
-                persisted_models = self.search_repo.add_all(
-                    session,
-                    mapped_model_results,  # Only try to add new, mapped models
-                )
-
-                refreshed_models: list[models.SearchResult] = []
-                for model_instance in persisted_models:
-                    session.refresh(model_instance)
-                    refreshed_models.append(model_instance)
+            while True:
+                try:
+                    chunk = await loop.run_in_executor(stepper, next, chunks, None)
+                except Exception as e:
+                    logger.opt(exception=True).error(
+                        f"Error during PubMed API interaction or mapping for query '{query}': {e!r}"
+                    )
+                    msg = (
+                        f"PubMed API interaction or mapping failed for query '{query}'."
+                    )
+                    raise ServiceError(msg) from e
+                if chunk is None:
+                    break
+                if chunk:
+                    added.extend(
+                        await self._astore_search_results_chunk(review_id, chunk)
+                    )
+        finally:
+            stepper.submit(chunks.close)
+            stepper.shutdown(wait=False)
 
-                added_search_result_models_for_conversion = refreshed_models
+        if not added:
+            logger.info(
+                f"No new results successfully mapped and stored from PubMed for review {review_id!r}."
+            )
+        else:
+            logger.info(
+                f"Stored {len(added)} new results from PubMed for review {review_id!r}"
+            )
+        return added
 
-                logger.info(
-                    f"Successfully stored and refreshed {len(added_search_result_models_for_conversion)} new results from PubMed for review {review_id!r}"
-                )
+    def _store_search_results_chunk(
+        self, review_id: uuid.UUID, search_results: list[models.SearchResult]
+    ) -> list[schemas.SearchResultRead]:
+        """Upsert a chunk of mapped search results in its own transaction.
 
-        except (
-            repositories.ConstraintViolationError
-        ) as e:  # Should be less likely with proactive check, but good to keep
-            logger.warning(
-                f"Constraint violation storing new PubMed results for review {review_id!r}, this is unexpected after proactive check: {e!r}"
+        Records stored meanwhile, e.g. by a concurrent search of the same review, are
+        skipped rather than failing the chunk.
+        """
+        source = search_results[0].source_db.value
+        try:
+            with self.session_factory.begin() as session:
+                upserted = self.search_repo.upsert_many(session, search_results)
+                stored = self._search_result_reads(upserted.inserted)
+        except Exception as e:
+            logger.opt(exception=True).error(
+                f"Database error storing new {source} results for review {review_id!r}: {e!r}"
             )
-            # Depending on desired behavior, could try to return already existing ones or just fail.
-            # For now, returning empty, signaling no *new* articles were successfully added and persisted in this transaction.
-            return []
+            msg = f"Failed to store new {source} results for review {review_id!r}."
+            raise ServiceError(msg) from e
+        self._log_stored_chunk(review_id, source, upserted, stored)
+        return stored
+
+    async def _astore_search_results_chunk(
+        self, review_id: uuid.UUID, search_results: list[models.SearchResult]
+    ) -> list[schemas.SearchResultRead]:
+        """Async variant of :meth:`_store_search_results_chunk`."""
+        source = search_results[0].source_db.value
+        try:
+            async with self.asession_factory.begin() as session:
+                upserted = await self.asearch_repo.upsert_many(session, search_results)
+                stored = self._search_result_reads(upserted.inserted)
         except Exception as e:
             logger.opt(exception=True).error(
-                f"Database error storing new PubMed results for review {review_id!r}: {e!r}"
+                f"Database error storing new {source} results for review {review_id!r}: {e!r}"
             )
-            raise ServiceError(
-                f"Failed to store new PubMed results for review {review_id!r}."
-            ) from e
-
-        # Final conversion to schema and return
-        # return [
-        #     schemas.SearchResultRead.model_validate(model_res, from_attributes=True)
-        #     for model_res in added_search_result_models_for_conversion
-        # ]
+            msg = f"Failed to store new {source} results for review {review_id!r}."
+            raise ServiceError(msg) from e
+        self._log_stored_chunk(review_id, source, upserted, stored)
+        return stored
+
+    @staticmethod
+    def _search_result_reads(
+        search_results: Sequence[models.SearchResult],
+    ) -> list[schemas.SearchResultRead]:
         # Explicitly select fields for SearchResultRead to avoid validation errors with extra model attributes
         search_result_read_fields = schemas.SearchResultRead.model_fields.keys()
         return [
@@ -659,9 +948,95 @@ class SearchService(BaseService):
                     if hasattr(model_res, field)
                 }
             )
-            for model_res in added_search_result_models_for_conversion
+            for model_res in search_results
         ]
 
+    @staticmethod
+    def _log_stored_chunk(
+        review_id: uuid.UUID,
+        source: str,
+        upserted: repositories.UpsertResult[models.SearchResult],
+        stored: Sequence[schemas.SearchResultRead],
+    ) -> None:
+        if upserted.skipped:
+            logger.info(
+                f"Skipped {upserted.skipped} {source} results already stored for review {review_id!r}"
+            )
+        logger.debug(
+            f"Stored a chunk of {len(stored)} {source} results for review {review_id!r}"
+        )
+
+    def search_scopus_and_store_results(
+        self,
+        review_id: uuid.UUID,
+        query: str,
+        max_results: int = 100,
+        *,
+        page_size: int = SCOPUS_PAGE_SIZE,
+    ) -> Sequence[schemas.SearchResultRead]:
+        """Performs a Scopus search, maps results and stores them page by page.
+
+        Pages are read with the cursor, completed and mapped concurrently, see
+        :mod:`sr_assistant.app.scopus_ingest`. Each page is upserted in its own
+        transaction as soon as it arrives, records already stored for the review are
+        skipped.
+
+        Args:
+            review_id: The ID of the review to associate results with.
+            query: Scopus advanced search query, e.g. ``TITLE-ABS-KEY(...)``.
+            max_results: The maximum number of results to read and store.
+            page_size: Results per page and transaction.
+
+        Returns:
+            A sequence of the newly stored results, converted to SearchResultRead schemas.
+
+        Raises:
+            ServiceError: If there is an issue with the API call or database operation,
+                        or if SCOPUS_API_KEY is not set in environment variables.
+        """
+        logger.info(
+            f"Starting Scopus search for review {review_id!r} with query {query!r} (max: {max_results})"
+        )
+        api_key = os.getenv("SCOPUS_API_KEY")
+        if not api_key:
+            logger.error(
+                "SCOPUS_API_KEY environment variable not set. Scopus search cannot proceed."
+            )
+            msg = "SCOPUS_API_KEY environment variable not set."
+            raise ServiceError(msg)
+
+        client = ScopusClient(
+            api_key, inst_token=os.getenv("SCOPUS_INST_TOKEN"), page_size=page_size
+        )
+        added: list[schemas.SearchResultRead] = []
+        with closing(
+            client.iter_pages(
+                query,
+                max_results,
+                functools.partial(self._map_scopus_to_search_result, review_id),
+            )
+        ) as pages:
+            while True:
+                try:
+                    page = next(pages, None)
+                except Exception as e:
+                    logger.opt(exception=True).error(
+                        f"Error during Scopus API interaction or mapping for query '{query}': {e!r}"
+                    )
+                    msg = (
+                        f"Scopus API interaction or mapping failed for query '{query}'."
+                    )
+                    raise ServiceError(msg) from e
+                if page is None:
+                    break
+                if page:
+                    added.extend(self._store_search_results_chunk(review_id, page))
+
+        logger.info(
+            f"Stored {len(added)} new results from Scopus for review {review_id!r}"
+        )
+        return added
+
     def get_search_results_by_review_id(
         self, review_id: uuid.UUID
     ) -> Sequence[schemas.SearchResultRead]:  # MODIFIED return type
@@ -797,6 +1172,38 @@ class SearchService(BaseService):
                 # Rollback is handled automatically by .begin() context manager on exception
                 raise ServiceError("Failed to delete search result") from e
 
+    def deduplicate_search_results(self, review_id: uuid.UUID) -> DeduplicationSummary:
+        """Mark near-duplicate search results of a review, see :mod:`~sr_assistant.app.dedup`.
+
+        MinHash signatures are computed for search results that don't have one yet,
+        then all of the review's signatures are clustered. Each cluster keeps one
+        representative, preferring search results that were already screened, have
+        a DOI or the longest abstract. The others get its ID in ``duplicate_of_id``
+        and aren't screened themselves.
+
+        Screening runs call it first, see
+        :meth:`ScreeningService.perform_batch_abstract_screening`.
+
+        Raises:
+            ServiceError: If loading or updating the search results fails.
+        """
+        with self.session_factory.begin() as session:
+            try:
+                summary = _mark_duplicates(
+                    session,
+                    self.search_repo,
+                    self.search_repo.get_by_review_id(session, review_id),
+                )
+            except Exception as e:
+                logger.exception(
+                    f"Error deduplicating search results for review {review_id!r}"
+                )
+                msg = f"Failed to deduplicate search results: {e!r}"
+                raise ServiceError(msg) from e
+
+        logger.info(f"Deduplicated search results for review {review_id}: {summary}")
+        return summary
+
 
 # --- Review Service ---
 
@@ -919,14 +1326,19 @@ class ScreeningService(BaseService):
         resolution_repo: repositories.ScreeningResolutionRepository | None = None,
         search_repo: repositories.SearchResultRepository | None = None,
         review_repo: repositories.SystematicReviewRepository | None = None,
+        benchmark_item_repo: repositories.BenchmarkResultItemRepository | None = None,
+        afactory: async_sessionmaker[AsyncSession] = asession_factory,
     ):
-        super().__init__(factory)
+        super().__init__(factory, afactory)
         self.screen_repo = screen_repo or repositories.ScreenAbstractResultRepository()
         self.resolution_repo = (
             resolution_repo or repositories.ScreeningResolutionRepository()
         )
         self.search_repo = search_repo or repositories.SearchResultRepository()
         self.review_repo = review_repo or repositories.SystematicReviewRepository()
+        self.benchmark_item_repo = (
+            benchmark_item_repo or repositories.BenchmarkResultItemRepository()
+        )
 
     def add_screening_result(
         self,
@@ -1110,221 +1522,1337 @@ class ScreeningService(BaseService):
                 )
                 raise ServiceError(f"Failed to get screening results: {e}") from e
 
+    @staticmethod
+    def _result_models(
+        search_result: models.SearchResult,
+        result_tuple: ScreenAbstractResultTuple,
+        fingerprint: str | None = None,
+    ) -> list[models.ScreenAbstractResult]:
+        """A result tuple's ScreenAbstractResult rows, linked on ``search_result``.
+
+        Only the ``search_result`` instance is updated. Reviewer errors are logged and
+        skipped. With the review's criteria ``fingerprint`` the rows get their reuse
+        key, see :mod:`~sr_assistant.app.agents.screening_reuse`.
+        """
+        result_models: list[models.ScreenAbstractResult] = []
+        for strategy, result in (
+            (ScreeningStrategyType.CONSERVATIVE, result_tuple.conservative_result),
+            (ScreeningStrategyType.COMPREHENSIVE, result_tuple.comprehensive_result),
+        ):
+            if isinstance(result, ScreeningError):
+                logger.error(
+                    f"{strategy.capitalize()} screening error for SearchResult {search_result.id}: {result.error!r} - {result.message}"
+                )
+                continue
+            if not isinstance(result, schemas.ScreeningResult):
+                continue
+            result_model = _to_screen_abstract_result_model(result)
+            if fingerprint:
+                result_model.reuse_key = reuse_key(
+                    search_result, fingerprint, strategy, result.model_name
+                )
+            result_models.append(result_model)
+            # The link is made on the SearchResult model instance:
+            if strategy == ScreeningStrategyType.CONSERVATIVE:
+                search_result.conservative_result_id = result_model.id
+            else:
+                search_result.comprehensive_result_id = result_model.id
+        return result_models
+
     def perform_batch_abstract_screening(
-        self, review_id: uuid.UUID, search_result_ids_to_screen: list[uuid.UUID]
+        self,
+        review_id: uuid.UUID,
+        search_result_ids_to_screen: list[uuid.UUID],
+        *,
+        bypass_cache: bool = False,
+        prioritize: bool = False,
+        chunk_size: int = SCREENING_CHUNK_SIZE,
+        resume: bool = True,
     ) -> list[ScreenAbstractResultTuple]:
         """Orchestrates batch abstract screening for a given review and list of search results.
 
         - Fetches the SystematicReview.
         - Fetches the SearchResult models.
-        - Invokes the screen_abstracts_batch agent.
+        - Invokes the screen_abstracts_batch agent on chunks of ``chunk_size``.
         - Persists ScreeningResult data as ScreenAbstractResult records.
         - Updates SearchResult records with conservative_result_id and comprehensive_result_id.
         - Handles errors from the screening agent.
+
+        No database session is held during LLM calls. Each chunk's results are
+        committed in a short transaction together with the review's
+        :class:`ScreeningCheckpoint`, so a crash loses at most the chunk in flight.
+        Calling again with the same search result IDs resumes after the last committed
+        chunk, the results of committed chunks are read back from the database. Pass
+        ``resume=False`` to start over. The checkpoint is removed when the run
+        completes.
+
+        The review's search results are deduplicated first (see
+        :meth:`SearchService.deduplicate_search_results`) and near-duplicates are
+        screened through their cluster's representative, whose results are linked to
+        all of the cluster's search results.
+
+        Decisions already made on the same article (DOI or PMID) under the same
+        criteria, prompts and model, in this or another review, are cloned instead of
+        screened again, see :meth:`_reuse_screening_results`.
+
+        Pass ``bypass_cache=True`` to re-screen with fresh LLM calls instead of cached
+        responses or reused decisions. Pass ``prioritize=True`` to screen the search
+        results most likely to be included first, see :meth:`_review_prioritizer`.
+        They're re-ranked after each chunk as decisions accumulate. Blocks until the whole batch is done, see
+        :meth:`stream_batch_abstract_screening` to get results as they complete.
+
+        Raises:
+            RecordNotFoundError: If the review doesn't exist.
         """
         logger.info(
             f"Starting batch abstract screening for review {review_id} and {len(search_result_ids_to_screen)} search results."
         )
-        processed_agent_results: list[ScreenAbstractResultTuple] = []
-
         with self.session_factory() as session:  # Manages commit/rollback
-            review = self.review_repo.get_by_id(session, review_id)
-            if not review:
-                logger.error(f"SystematicReview with ID {review_id} not found.")
-                raise RecordNotFoundError(
-                    f"SystematicReview with ID {review_id} not found."
-                )
-
-            search_results_to_screen_models: list[models.SearchResult] = []
-            if search_result_ids_to_screen:
-                for sr_id in search_result_ids_to_screen:
-                    sr = self.search_repo.get_by_id(session, sr_id)
-                    if sr and sr.review_id == review_id:
-                        search_results_to_screen_models.append(sr)
-                    else:
-                        logger.warning(
-                            f"SearchResult with ID {sr_id} not found or does not belong to review {review_id}."
-                        )
-
-            if not search_results_to_screen_models:
-                logger.warning(
-                    f"No valid SearchResults found to screen for review {review_id}."
-                )
-                return []
+            run = self._start_screening_run(
+                session,
+                review_id,
+                search_result_ids_to_screen,
+                bypass_cache=bypass_cache,
+                prioritize=prioritize,
+                resume=resume,
+            )
+        if run is None:
+            return []
 
+        for batch_idx, start in enumerate(range(0, len(run.pending), chunk_size)):
+            chunk = run.pending[start : start + chunk_size]
             # Assuming screen_abstracts_batch is a potentially long-running operation.
             # The agent's signature: screen_abstracts_batch(batch: list[models.SearchResult], batch_idx: int, review: models.SystematicReview) -> ScreenAbstractsBatchOutput | None
             agent_output: ScreenAbstractsBatchOutput | None = screen_abstracts_batch(
-                batch=search_results_to_screen_models, batch_idx=0, review=review
+                batch=chunk,
+                batch_idx=batch_idx,
+                review=run.review,
+                bypass_cache=bypass_cache,
             )
 
             if not agent_output:
-                logger.error(f"Screening agent returned None for review {review_id}.")
-                return []  # Or raise an error based on requirements
-
-            # Deepcopy to ensure we are working with mutable copies if agent_output.results contains mutable structures,
-            # though NamedTuple with Pydantic models should generally be fine.
-            # This also helps in modifying processed_agent_results to include errors without affecting original agent output.
-            processed_agent_results = deepcopy(agent_output.results)
-
-            for i, result_tuple in enumerate(agent_output.results):
-                # Find the corresponding SearchResult model from the ones fetched in this session
-                # This ensures we're updating the attached instances.
-                original_search_result_from_agent = result_tuple.search_result
-                current_search_result_in_session = next(
-                    (
-                        sr_model
-                        for sr_model in search_results_to_screen_models
-                        if sr_model.id == original_search_result_from_agent.id
-                    ),
-                    None,
+                logger.error(
+                    f"Screening agent returned None for review {review_id}, chunk {batch_idx}. Stopping, the run can be resumed."
                 )
+                break
 
-                if not current_search_result_in_session:
-                    logger.error(
-                        f"Critical: Could not find search result {original_search_result_from_agent.id} from agent output in the current session's list. Skipping persistence for this item."
-                    )
-                    # Update the processed_agent_results to reflect this issue if needed,
-                    # e.g., by replacing the tuple with one containing an error.
-                    # For now, just logging and skipping.
-                    continue
+            with self.session_factory() as session:
+                self._commit_screened_chunk(
+                    session, run, agent_output.results, next_start=start + chunk_size
+                )
+        else:
+            logger.info(
+                f"Batch abstract screening completed successfully for review {review_id}."
+            )
 
-                # Process conservative result
-                if isinstance(
-                    result_tuple.conservative_result, schemas.ScreeningResult
-                ):
-                    kons_screening_result_dto: schemas.ScreeningResult = (
-                        result_tuple.conservative_result
-                    )
-                    kons_create_dto = schemas.ScreeningResultCreate(
-                        id=kons_screening_result_dto.id,
-                        review_id=review_id,
-                        decision=kons_screening_result_dto.decision,
-                        confidence_score=kons_screening_result_dto.confidence_score,
-                        rationale=kons_screening_result_dto.rationale,
-                        extracted_quotes=kons_screening_result_dto.extracted_quotes,
-                        exclusion_reason_categories=kons_screening_result_dto.exclusion_reason_categories,
-                        trace_id=kons_screening_result_dto.trace_id,
-                        model_name=kons_screening_result_dto.model_name,
-                        screening_strategy=kons_screening_result_dto.screening_strategy,
-                        start_time=kons_screening_result_dto.start_time,
-                        end_time=kons_screening_result_dto.end_time,
-                        response_metadata=kons_screening_result_dto.response_metadata,
-                    )
-                    # Ensure exclusion_reason_categories is a dict, and its inner lists are not None
-                    kons_dump = kons_create_dto.model_dump()
-                    erc_value_kons = kons_dump.get("exclusion_reason_categories")
-                    if isinstance(erc_value_kons, dict):
-                        for reason_key in erc_value_kons:
-                            if erc_value_kons[reason_key] is None:
-                                erc_value_kons[reason_key] = []
-                    elif erc_value_kons is None:
-                        kons_dump["exclusion_reason_categories"] = {}
-
-                    # Create instance from DTO dump. ScreenAbstractResult does NOT have search_result_id.
-                    kons_db_model = models.ScreenAbstractResult(**kons_dump)
-
-                    persisted_kons = self.screen_repo.add(session, kons_db_model)
-                    # The link is made on the SearchResult model instance:
-                    current_search_result_in_session.conservative_result_id = (
-                        persisted_kons.id
-                    )
-                elif isinstance(result_tuple.conservative_result, ScreeningError):
-                    logger.error(
-                        f"Conservative screening error for SearchResult {original_search_result_from_agent.id}: {result_tuple.conservative_result.error!r} - {result_tuple.conservative_result.message}"
-                    )
-                    # Ensure the error is reflected in the returned results
-                    processed_agent_results[i] = processed_agent_results[i]._replace(
-                        conservative_result=result_tuple.conservative_result
-                    )
+        return run.results
 
-                # Process comprehensive result
-                if isinstance(
-                    result_tuple.comprehensive_result, schemas.ScreeningResult
-                ):
-                    comp_screening_result_dto: schemas.ScreeningResult = (
-                        result_tuple.comprehensive_result
-                    )
-                    comp_create_dto = schemas.ScreeningResultCreate(
-                        id=comp_screening_result_dto.id,
-                        review_id=review_id,
-                        decision=comp_screening_result_dto.decision,
-                        confidence_score=comp_screening_result_dto.confidence_score,
-                        rationale=comp_screening_result_dto.rationale,
-                        extracted_quotes=comp_screening_result_dto.extracted_quotes,
-                        exclusion_reason_categories=comp_screening_result_dto.exclusion_reason_categories,
-                        trace_id=comp_screening_result_dto.trace_id,
-                        model_name=comp_screening_result_dto.model_name,
-                        screening_strategy=comp_screening_result_dto.screening_strategy,
-                        start_time=comp_screening_result_dto.start_time,
-                        end_time=comp_screening_result_dto.end_time,
-                        response_metadata=comp_screening_result_dto.response_metadata,
-                    )
-                    # Ensure exclusion_reason_categories is a dict, and its inner lists are not None
-                    comp_dump = comp_create_dto.model_dump()
-                    erc_value_comp = comp_dump.get("exclusion_reason_categories")
-                    if isinstance(erc_value_comp, dict):
-                        for reason_key in erc_value_comp:
-                            if erc_value_comp[reason_key] is None:
-                                erc_value_comp[reason_key] = []
-                    elif erc_value_comp is None:
-                        comp_dump["exclusion_reason_categories"] = {}
-
-                    # Create instance from DTO dump. ScreenAbstractResult does NOT have search_result_id.
-                    comp_db_model = models.ScreenAbstractResult(**comp_dump)
-
-                    persisted_comp = self.screen_repo.add(session, comp_db_model)
-                    # The link is made on the SearchResult model instance:
-                    current_search_result_in_session.comprehensive_result_id = (
-                        persisted_comp.id
-                    )
-                elif isinstance(result_tuple.comprehensive_result, ScreeningError):
-                    logger.error(
-                        f"Comprehensive screening error for SearchResult {original_search_result_from_agent.id}: {result_tuple.comprehensive_result.error!r} - {result_tuple.comprehensive_result.message}"
-                    )
-                    # Ensure the error is reflected in the returned results
-                    processed_agent_results[i] = processed_agent_results[i]._replace(
-                        comprehensive_result=result_tuple.comprehensive_result
-                    )
+    async def aperform_batch_abstract_screening(  # noqa: PLR0913
+        self,
+        review_id: uuid.UUID,
+        search_result_ids_to_screen: list[uuid.UUID],
+        *,
+        bypass_cache: bool = False,
+        prioritize: bool = False,
+        chunk_size: int = SCREENING_CHUNK_SIZE,
+        resume: bool = True,
+        engine: ScreeningEngine | None = None,
+    ) -> list[ScreenAbstractResultTuple]:
+        """Async variant of :meth:`perform_batch_abstract_screening`.
+
+        Chunks are screened with
+        :func:`~sr_assistant.app.agents.screening_engine.ascreen_abstracts_batch` and
+        read and committed with ``asession_factory`` sessions, whose queries are
+        awaited too, so reviewer calls, database round trips and other coroutines
+        such as :meth:`SearchService.asearch_pubmed_and_store_results` share one
+        event loop. Checkpoints, resuming, near-duplicates and reused decisions are
+        as in the sync method, the same helpers run on the sessions' sync facade.
+
+        Run it on the application event loop, from sync code with
+        :func:`~sr_assistant.app.database.run_async`.
+
+        Args:
+            review_id: Review the search results belong to.
+            search_result_ids_to_screen: Search results to screen.
+            bypass_cache: Screen with fresh LLM calls, see the sync method.
+            prioritize: Screen the likeliest includes first, see the sync method.
+            chunk_size: Search results screened and committed together.
+            resume: Resume after the last committed chunk of the same run.
+            engine: Engine screening the chunks. Defaults to the shared engine, or a
+                new one bypassing the LLM cache with ``bypass_cache``.
+
+        Raises:
+            RecordNotFoundError: If the review doesn't exist.
+        """
+        logger.info(
+            f"Starting async batch abstract screening for review {review_id} and {len(search_result_ids_to_screen)} search results."
+        )
+        async with self.asession_factory() as session:
+            run = await session.run_sync(
+                self._start_screening_run,
+                review_id,
+                search_result_ids_to_screen,
+                bypass_cache=bypass_cache,
+                prioritize=prioritize,
+                resume=resume,
+            )
+        if run is None:
+            return []
+        if engine is None:
+            engine = (
+                ScreeningEngine(bypass_cache=True, hedging=default_hedge_policy())
+                if bypass_cache
+                else get_screening_engine()
+            )
+
+        for batch_idx, start in enumerate(range(0, len(run.pending), chunk_size)):
+            chunk = run.pending[start : start + chunk_size]
+            agent_output = await ascreen_abstracts_batch(
+                chunk, batch_idx, run.review, engine=engine
+            )
+
+            if not agent_output:
+                logger.error(
+                    f"Screening agent returned None for review {review_id}, chunk {batch_idx}. Stopping, the run can be resumed."
+                )
+                break
+
+            async with self.asession_factory() as session:
+                await session.run_sync(
+                    self._commit_screened_chunk,
+                    run,
+                    agent_output.results,
+                    next_start=start + chunk_size,
+                )
+        else:
+            logger.info(
+                f"Batch abstract screening completed successfully for review {review_id}."
+            )
+
+        return run.results
+
+    def _start_screening_run(  # noqa: PLR0913
+        self,
+        session: Session,
+        review_id: uuid.UUID,
+        search_result_ids_to_screen: list[uuid.UUID],
+        *,
+        bypass_cache: bool,
+        prioritize: bool,
+        resume: bool,
+    ) -> _ScreeningRun | None:
+        """Plan a batch screening run, None if there's nothing to screen.
+
+        Loads the review and search results, commits the review's duplicate marks,
+        replaces near-duplicates by their representatives, reads back the results of a resumed run's committed chunks
+        and commits reused decisions. See :meth:`perform_batch_abstract_screening`.
+
+        Raises:
+            RecordNotFoundError: If the review doesn't exist.
+        """
+        processed_agent_results: list[ScreenAbstractResultTuple] = []
+        review = self.review_repo.get_by_id(session, review_id)
+        if not review:
+            logger.error(f"SystematicReview with ID {review_id} not found.")
+            msg = f"SystematicReview with ID {review_id} not found."
+            raise RecordNotFoundError(msg)
+        review_results = self.search_repo.get_by_review_id(session, review_id)
+        if _mark_duplicates(session, self.search_repo, review_results).updated:
+            session.commit()
+
+        fetched = self.search_repo.get_many_by_ids(session, search_result_ids_to_screen)
+        search_results_to_screen_models = [
+            sr for sr in fetched.records if sr.review_id == review_id
+        ]
+        for sr_id in [
+            *fetched.missing_ids,
+            *(sr.id for sr in fetched.records if sr.review_id != review_id),
+        ]:
+            logger.warning(
+                f"SearchResult with ID {sr_id} not found or does not belong to review {review_id}."
+            )
+
+        if not search_results_to_screen_models:
+            logger.warning(
+                f"No valid SearchResults found to screen for review {review_id}."
+            )
+            return None
+
+        plan = self._plan_duplicates(search_results_to_screen_models, review_results)
+        checkpoint = ScreeningCheckpoint.for_run(review, plan, resume=resume)
+        if checkpoint.completed:
+            logger.info(
+                f"Resuming screening of review {review_id} after {len(checkpoint.completed)} screened search results"
+            )
+            processed_agent_results.extend(
+                item
+                for persisted in self._persisted_result_tuples(
+                    session,
+                    [sr for sr in plan.to_screen if sr.id in checkpoint.completed],
+                )
+                for item in self._requested_results(plan, persisted)
+            )
+
+        fingerprint = criteria_fingerprint(review)
+        pending = [sr for sr in plan.to_screen if sr.id not in checkpoint.completed]
+        reused = (
+            {}
+            if bypass_cache
+            else self._reuse_screening_results(session, review, pending, fingerprint)
+        )
+        pending = [sr for sr in pending if sr.id not in reused]
+        prioritizer = self._review_prioritizer(session, review) if prioritize else None
+        if prioritizer is not None:
+            pending = prioritizer.rank(pending)
+
+        if reused or not pending:
+            self._persist_chunk(
+                session, plan, list(reused.values()), checkpoint, fingerprint
+            )
+            self._save_checkpoint(session, review_id, checkpoint, done=not pending)
+            session.commit()
+        processed_agent_results.extend(
+            item
+            for result_tuple in deepcopy(list(reused.values()))
+            for item in self._requested_results(plan, result_tuple)
+        )
+        return _ScreeningRun(
+            review=review,
+            plan=plan,
+            checkpoint=checkpoint,
+            fingerprint=fingerprint,
+            pending=pending,
+            results=processed_agent_results,
+            prioritizer=prioritizer,
+        )
+
+    def _commit_screened_chunk(
+        self,
+        session: Session,
+        run: _ScreeningRun,
+        result_tuples: Sequence[ScreenAbstractResultTuple],
+        *,
+        next_start: int,
+    ) -> None:
+        """Commit a screened chunk with the checkpoint and add it to ``run.results``.
+
+        ``run.pending[next_start:]`` is what's left to screen. A prioritized run
+        trains on the chunk's decisions and re-ranks it.
+        """
+        self._persist_chunk(
+            session, run.plan, result_tuples, run.checkpoint, run.fingerprint
+        )
+        self._save_checkpoint(
+            session, run.review.id, run.checkpoint, done=next_start >= len(run.pending)
+        )
+        session.commit()
+        if run.prioritizer is not None and next_start < len(run.pending):
+            run.prioritizer.observe(
+                {
+                    result_tuple.search_result.id: label
+                    for result_tuple in result_tuples
+                    if (label := result_tuple_label(result_tuple)) is not None
+                }
+            )
+            run.pending[next_start:] = run.prioritizer.rank(run.pending[next_start:])
+        # Deepcopy to ensure we are working with mutable copies if agent_output.results contains mutable structures,
+        # though NamedTuple with Pydantic models should generally be fine.
+        run.results.extend(
+            item
+            for result_tuple in deepcopy(result_tuples)
+            for item in self._requested_results(run.plan, result_tuple)
+        )
+
+    def _persist_chunk(
+        self,
+        session: Session,
+        plan: _DuplicatePlan,
+        result_tuples: Sequence[ScreenAbstractResultTuple],
+        checkpoint: ScreeningCheckpoint | None,
+        fingerprint: str,
+    ) -> None:
+        """Bulk add a chunk's screening results and mark it completed. Doesn't commit.
+
+        All ScreenAbstractResults are written with multi-row INSERTs and all links,
+        near-duplicates' included, with one UPDATE. The search result instances get
+        their links as committed values, so they aren't flushed again.
+        """
+        by_id = {sr.id: sr for sr in plan.to_screen}
+        result_models: list[models.ScreenAbstractResult] = []
+        links: dict[uuid.UUID, tuple[uuid.UUID | None, uuid.UUID | None]] = {}
+        for result_tuple in result_tuples:
+            search_result = by_id.get(result_tuple.search_result.id)
+            if search_result is None:
+                logger.error(
+                    f"Critical: Could not find search result {result_tuple.search_result.id} from agent output in the screening plan. Skipping persistence for this item."
+                )
+                continue
+            new_models = self._result_models(search_result, result_tuple, fingerprint)
+            if not new_models:
+                continue
+            result_models.extend(new_models)
+            linked = (
+                search_result.conservative_result_id,
+                search_result.comprehensive_result_id,
+            )
+            for sr in [search_result, *plan.duplicates.get(search_result.id, [])]:
+                set_committed_value(sr, "conservative_result_id", linked[0])
+                set_committed_value(sr, "comprehensive_result_id", linked[1])
+                links[sr.id] = linked
+            if checkpoint is not None and all(linked):
+                checkpoint.completed.add(search_result.id)
+
+        # The ScreenAbstractResults first, the SearchResult foreign keys reference them
+        self.screen_repo.insert_many(session, result_models)
+        self.search_repo.link_screening_results(session, links)
+        logger.debug(
+            f"Persisted {len(result_models)} screening results linked to {len(links)} SearchResults"
+        )
+
+    def _save_checkpoint(
+        self,
+        session: Session,
+        review_id: uuid.UUID,
+        checkpoint: ScreeningCheckpoint,
+        *,
+        done: bool,
+    ) -> None:
+        """Write the review's screening checkpoint, or remove it when ``done``."""
+        checkpoint.updated_at = datetime.now(UTC)
+        self.review_repo.set_metadata_key(
+            session,
+            review_id,
+            CHECKPOINT_METADATA_KEY,
+            None if done else checkpoint.model_dump(mode="json"),
+        )
+
+    def _persisted_result_tuples(
+        self, session: Session, search_results: Sequence[models.SearchResult]
+    ) -> list[ScreenAbstractResultTuple]:
+        """Result tuples of search results' linked screening results.
 
-            # Flush all ScreenAbstractResult records first to ensure they exist in the database
-            # before updating SearchResult records with foreign key references
-            session.flush()
-
-            # Now update all SearchResult records with their foreign key references
-            for i, result_tuple in enumerate(agent_output.results):
-                original_search_result_from_agent = result_tuple.search_result
-                current_search_result_in_session = next(
-                    (
-                        sr_model
-                        for sr_model in search_results_to_screen_models
-                        if sr_model.id == original_search_result_from_agent.id
+        Search results that aren't linked to both reviewers' results are skipped.
+        """
+        result_ids = [
+            result_id
+            for sr in search_results
+            for result_id in (sr.conservative_result_id, sr.comprehensive_result_id)
+            if result_id
+        ]
+        persisted = {
+            result.id: result
+            for result in self.screen_repo.get_many_by_ids(session, result_ids).records
+        }
+        result_tuples: list[ScreenAbstractResultTuple] = []
+        for sr in search_results:
+            results = [
+                persisted.get(result_id) if result_id else None
+                for result_id in (sr.conservative_result_id, sr.comprehensive_result_id)
+            ]
+            if None in results:
+                continue
+            result_tuples.append(
+                ScreenAbstractResultTuple(
+                    sr,
+                    *(
+                        schemas.ScreeningResult.model_validate(
+                            result.model_dump() | {"search_result_id": sr.id}  # type: ignore[union-attr]
+                        )
+                        for result in results
                     ),
-                    None,
                 )
+            )
+        return result_tuples
+
+    def get_screened_result_tuples(
+        self, review_id: uuid.UUID, search_result_ids: Sequence[uuid.UUID]
+    ) -> list[ScreenAbstractResultTuple]:
+        """Result tuples of the review's search results both reviewers screened.
 
-                if not current_search_result_in_session:
+        Search results of other reviews, or missing a reviewer's result, are skipped.
+        Lets a requeued screening job continue where it stopped.
+
+        Raises:
+            ServiceError: If loading the results fails.
+        """
+        with self.session_factory() as session:
+            try:
+                fetched = self.search_repo.get_many_by_ids(session, search_result_ids)
+                return self._persisted_result_tuples(
+                    session, [sr for sr in fetched.records if sr.review_id == review_id]
+                )
+            except Exception as e:
+                logger.exception(
+                    f"Error loading screened results of review {review_id}"
+                )
+                msg = f"Failed to load screened results: {e!r}"
+                raise ServiceError(msg) from e
+
+    def stream_batch_abstract_screening(  # noqa: PLR0913
+        self,
+        review_id: uuid.UUID,
+        search_result_ids_to_screen: list[uuid.UUID],
+        *,
+        bypass_cache: bool = False,
+        prioritize: bool = False,
+        chunk_size: int = SCREENING_CHUNK_SIZE,
+        resume: bool = True,
+    ) -> Iterator[ScreenAbstractResultTuple]:
+        """Streaming variant of :meth:`perform_batch_abstract_screening`.
+
+        Search results are screened concurrently and their tuples collected as both
+        reviewers finish. Every ``chunk_size`` tuples are committed together with the
+        review's :class:`ScreeningCheckpoint`, as in the batch method, and yielded
+        once committed. Progress survives a failure later in the batch and nothing
+        is held back by slow or retrying calls. Calling again with the same search
+        result IDs resumes after the last committed chunk.
+
+        If persisting a chunk fails, its results are yielded as ScreeningErrors and
+        the stream continues.
+
+        Reviews with an enabled model cascade in their ``review_metadata`` are
+        triaged by the cheaper model first, see
+        :mod:`~sr_assistant.app.agents.screening_cascade`.
+
+        With ``prioritize=True`` the search results are screened in chunks of
+        :data:`~sr_assistant.app.agents.screening_prioritizer.PRIORITIZATION_CHUNK_SIZE`,
+        most likely includes first. The ranker learns from each chunk's decisions
+        before the rest is re-ranked.
+
+        Near-duplicates are screened once, through their cluster's representative,
+        and decisions made under the same criteria are reused, see
+        :meth:`perform_batch_abstract_screening`. Resumed and reused tuples are
+        yielded first.
+
+        Raises:
+            RecordNotFoundError: If the review doesn't exist.
+        """
+        with self.session_factory() as session:
+            run = self._start_screening_run(
+                session,
+                review_id,
+                search_result_ids_to_screen,
+                bypass_cache=bypass_cache,
+                prioritize=prioritize,
+                resume=resume,
+            )
+        if run is None:
+            return
+        yield from run.results
+
+        cascade = CascadeConfig.from_review(run.review)
+        batch_size = (
+            len(run.pending) if run.prioritizer is None else PRIORITIZATION_CHUNK_SIZE
+        )
+        for batch_idx, start in enumerate(range(0, len(run.pending), batch_size)):
+            batch = run.pending[start : start + batch_size]
+            last_batch = start + batch_size >= len(run.pending)
+            screened = (
+                screen_abstracts_cascade_as_completed(
+                    batch,
+                    batch_idx,
+                    run.review,
+                    cascade=cascade,
+                    bypass_cache=bypass_cache,
+                )
+                if cascade.enabled
+                else screen_abstracts_batch_as_completed(
+                    batch=batch,
+                    batch_idx=batch_idx,
+                    review=run.review,
+                    bypass_cache=bypass_cache,
+                )
+            )
+            labels: dict[uuid.UUID, bool] = {}
+            chunk: list[ScreenAbstractResultTuple] = []
+            for result_tuple in screened:
+                chunk.append(result_tuple)
+                if len(chunk) < chunk_size:
                     continue
+                for item in self._commit_streamed_chunk(run, chunk, done=False):
+                    if (label := result_tuple_label(item)) is not None:
+                        labels[item.search_result.id] = label
+                    yield item
+                chunk = []
+            # The last chunk removes the checkpoint, even if it's empty
+            for item in self._commit_streamed_chunk(run, chunk, done=last_batch):
+                if (label := result_tuple_label(item)) is not None:
+                    labels[item.search_result.id] = label
+                yield item
+            if run.prioritizer is not None and not last_batch:
+                run.prioritizer.observe(labels)
+                run.pending[start + batch_size :] = run.prioritizer.rank(
+                    run.pending[start + batch_size :]
+                )
+
+    def _commit_streamed_chunk(
+        self,
+        run: _ScreeningRun,
+        result_tuples: Sequence[ScreenAbstractResultTuple],
+        *,
+        done: bool,
+    ) -> list[ScreenAbstractResultTuple]:
+        """Commit a streamed chunk with the checkpoint in its own transaction.
 
-                # Update SearchResult in DB if any screening result ID was set
-                if (
-                    current_search_result_in_session.conservative_result_id
-                    or current_search_result_in_session.comprehensive_result_id
-                ):
-                    self.search_repo.update(session, current_search_result_in_session)
-                    logger.debug(
-                        f"Updated SearchResult {current_search_result_in_session.id} with screening linkage."
+        Returns:
+            list[ScreenAbstractResultTuple]: The requested tuples to yield, see
+                :meth:`_requested_results`. ScreeningErrors if persisting failed.
+        """
+        completed = set(run.checkpoint.completed)
+        with self.session_factory() as session:
+            try:
+                self._persist_chunk(
+                    session, run.plan, result_tuples, run.checkpoint, run.fingerprint
+                )
+                self._save_checkpoint(session, run.review.id, run.checkpoint, done=done)
+                session.commit()
+            except Exception as e:
+                logger.exception(
+                    f"Error persisting a chunk of {len(result_tuples)} screening results for review {run.review.id}"
+                )
+                session.rollback()
+                run.checkpoint.completed = completed
+                failed: list[ScreenAbstractResultTuple] = []
+                for result_tuple in result_tuples:
+                    error = ScreeningError(
+                        search_result=result_tuple.search_result,
+                        error=e,
+                        message="Failed to persist screening result",
                     )
+                    failed.append(
+                        ScreenAbstractResultTuple(
+                            search_result=result_tuple.search_result,
+                            conservative_result=error,
+                            comprehensive_result=error,
+                        )
+                    )
+                result_tuples = failed
+        return [
+            item
+            for result_tuple in result_tuples
+            for item in self._requested_results(run.plan, result_tuple)
+        ]
 
-            session.commit()
+    def _reuse_screening_results(
+        self,
+        session: Session,
+        review: models.SystematicReview,
+        search_results: Sequence[models.SearchResult],
+        fingerprint: str,
+    ) -> dict[uuid.UUID, ScreenAbstractResultTuple]:
+        """Clone existing decisions on the same articles under the same criteria.
+
+        Both reviewers' results must be found for a search result to be reused,
+        matches are looked up by their indexed reuse key, see
+        :mod:`~sr_assistant.app.agents.screening_reuse`. The most recent match wins.
+
+        Returns:
+            dict[uuid.UUID, ScreenAbstractResultTuple]: Cloned result tuples by
+                search result ID, not persisted yet.
+        """
+        strategies = (
+            ScreeningStrategyType.CONSERVATIVE,
+            ScreeningStrategyType.COMPREHENSIVE,
+        )
+        keys: dict[uuid.UUID, tuple[str, str]] = {}
+        for sr in search_results:
+            conservative, comprehensive = (
+                reuse_key(sr, fingerprint, strategy, REVIEWER_MODEL_NAME)
+                for strategy in strategies
+            )
+            if conservative and comprehensive:
+                keys[sr.id] = (conservative, comprehensive)
+        if not keys:
+            return {}
+        matches: dict[str, models.ScreenAbstractResult] = {}
+        for result in self.screen_repo.get_by_reuse_keys(
+            session, [key for pair in keys.values() for key in pair]
+        ):
+            if result.reuse_key:
+                matches.setdefault(result.reuse_key, result)
+
+        reused: dict[uuid.UUID, ScreenAbstractResultTuple] = {}
+        for sr in search_results:
+            sources = [matches.get(key) for key in keys.get(sr.id, ())]
+            if len(sources) != len(strategies) or None in sources:
+                continue
+            trace_id = uuid.uuid4()
+            conservative, comprehensive = (
+                clone_screening_result(
+                    source,  # type: ignore[arg-type]
+                    review_id=review.id,
+                    search_result_id=sr.id,
+                    trace_id=trace_id,
+                )
+                for source in sources
+            )
+            reused[sr.id] = ScreenAbstractResultTuple(
+                search_result=sr,
+                conservative_result=conservative,
+                comprehensive_result=comprehensive,
+            )
+        if reused:
             logger.info(
-                f"Batch abstract screening completed successfully for review {review_id}."
+                f"Reusing screening decisions for {len(reused)} of {len(search_results)} search results in review {review.id}"
+            )
+        return reused
+
+    @staticmethod
+    def _plan_duplicates(
+        search_results: Sequence[models.SearchResult],
+        review_results: t.Iterable[models.SearchResult],
+    ) -> _DuplicatePlan:
+        """Replace near-duplicates by their representatives, keeping the order."""
+        by_id = {sr.id: sr for sr in review_results}
+        duplicates: defaultdict[uuid.UUID, list[models.SearchResult]] = defaultdict(
+            list
+        )
+        for sr in by_id.values():
+            if sr.duplicate_of_id in by_id:
+                duplicates[sr.duplicate_of_id].append(sr)
+        to_screen: dict[uuid.UUID, models.SearchResult] = {}
+        for sr in search_results:
+            representative = (
+                by_id.get(sr.duplicate_of_id, sr) if sr.duplicate_of_id else sr
+            )
+            to_screen.setdefault(representative.id, representative)
+        if len(to_screen) < len(search_results):
+            logger.info(
+                f"Screening {len(to_screen)} representatives for {len(search_results)} search results with near-duplicates"
+            )
+        return _DuplicatePlan(
+            to_screen=list(to_screen.values()),
+            duplicates={
+                sr_id: duplicates[sr_id] for sr_id in to_screen if sr_id in duplicates
+            },
+            requested={sr.id for sr in search_results},
+        )
+
+    @staticmethod
+    def _requested_results(
+        plan: _DuplicatePlan, result_tuple: ScreenAbstractResultTuple
+    ) -> list[ScreenAbstractResultTuple]:
+        """A representative's result tuple and its duplicates', if they were requested."""
+        representative = result_tuple.search_result
+        return [
+            result_tuple._replace(search_result=sr)
+            for sr in [representative, *plan.duplicates.get(representative.id, [])]
+            if sr.id in plan.requested
+        ]
+
+    def _review_prioritizer(
+        self, session: Session, review: models.SystematicReview
+    ) -> ScreeningPrioritizer:
+        """The review's cached screening prioritizer, brought up to date.
+
+        Search results added since the last run are appended to its TF-IDF matrix
+        and screening decisions made since are trained on. Final decisions take
+        precedence over the reviewers', see
+        :mod:`~sr_assistant.app.agents.screening_prioritizer`.
+        """
+        prioritizer = get_prioritizer(review)
+        search_results = self.search_repo.get_by_review_id(session, review.id)
+        prioritizer.add(search_results)
+        decisions = {
+            result.id: result.decision
+            for result in self.screen_repo.get_by_review_id(session, review.id)
+        }
+        labels: dict[uuid.UUID, bool] = {}
+        for sr in search_results:
+            label = relevance_label(
+                [sr.final_decision]
+                if sr.final_decision
+                else [
+                    decisions[result_id]
+                    for result_id in (
+                        sr.conservative_result_id,
+                        sr.comprehensive_result_id,
+                    )
+                    if result_id in decisions
+                ]
+            )
+            if label is not None:
+                labels[sr.id] = label
+        prioritizer.observe(labels)
+        return prioritizer
+
+    def estimate_screening_run(
+        self, review_id: uuid.UUID, search_result_ids: list[uuid.UUID] | None = None
+    ) -> ScreeningRunEstimate:
+        """Estimate tokens, cost and wall time of screening a review.
+
+        Nothing is sent to a provider. Use it to pick between interactive, batch API
+        and cascade screening before starting, see
+        :mod:`~sr_assistant.app.agents.screening_estimate`.
+
+        Args:
+            review_id (uuid.UUID): Review to estimate.
+            search_result_ids (list[uuid.UUID] | None): Search results to screen, all
+                of the review's if None.
+
+        Raises:
+            RecordNotFoundError: If the review doesn't exist.
+        """
+        with self.session_factory() as session:
+            review = self.review_repo.get_by_id(session, review_id)
+            if not review:
+                msg = f"SystematicReview with ID {review_id} not found."
+                raise RecordNotFoundError(msg)
+            if search_result_ids is None:
+                search_results = list(
+                    self.search_repo.get_by_review_id(session, review_id)
+                )
+            else:
+                search_results = list(
+                    self._get_review_search_results(
+                        session, review_id, search_result_ids
+                    ).values()
+                )
+            conflict_stats = self.benchmark_item_repo.get_conflict_stats(session)
+        return estimate_screening_run(
+            review, search_results, conflict_stats=conflict_stats
+        )
+
+    def _get_review_search_results(
+        self, session: Session, review_id: uuid.UUID, ids: t.Iterable[uuid.UUID]
+    ) -> dict[uuid.UUID, models.SearchResult]:
+        """SearchResults of a review by id, ignoring ids of other reviews."""
+        fetched = self.search_repo.get_many_by_ids(session, list(dict.fromkeys(ids)))
+        return {sr.id: sr for sr in fetched.records if sr.review_id == review_id}
+
+    def submit_bulk_abstract_screening(
+        self,
+        review_id: uuid.UUID,
+        search_result_ids_to_screen: list[uuid.UUID],
+        *,
+        client: BatchJobClient | None = None,
+    ) -> BatchJob | None:
+        """Serialize both reviewers' requests for the search results into a batch job.
+
+        Like :meth:`perform_batch_abstract_screening`, near-duplicates are submitted
+        once, through their cluster's representative, and decisions made under the
+        same criteria are reused instead of submitted. Reused decisions are
+        committed right away.
+
+        Returns:
+            BatchJob | None: the submitted job, pass it to
+                :meth:`ingest_bulk_abstract_screening` once done. None if all
+                decisions were reused.
+
+        Raises:
+            RecordNotFoundError: If the review doesn't exist.
+            ServiceError: If none of the search results belong to the review.
+        """
+        client = client or OpenAIBatchJobClient()
+        with self.session_factory() as session:
+            review = self.review_repo.get_by_id(session, review_id)
+            if not review:
+                msg = f"SystematicReview with ID {review_id} not found."
+                raise RecordNotFoundError(msg)
+            review_results = self.search_repo.get_by_review_id(session, review_id)
+            if _mark_duplicates(session, self.search_repo, review_results).updated:
+                session.commit()
+            search_results = self._get_review_search_results(
+                session, review_id, search_result_ids_to_screen
+            )
+            if not search_results:
+                msg = f"No valid SearchResults found to screen for review {review_id}."
+                raise ServiceError(msg)
+            plan = self._plan_duplicates(list(search_results.values()), review_results)
+            fingerprint = criteria_fingerprint(review)
+            reused = self._reuse_screening_results(
+                session, review, plan.to_screen, fingerprint
             )
+            if reused:
+                self._persist_chunk(
+                    session, plan, list(reused.values()), None, fingerprint
+                )
+                session.commit()
+            to_screen = [sr for sr in plan.to_screen if sr.id not in reused]
+            if not to_screen:
+                logger.info(
+                    f"All decisions on the search results of review {review_id} were reused, no bulk screening job submitted."
+                )
+                return None
+            requests = make_batch_requests(to_screen, review)
+        job = client.submit(
+            requests,
+            metadata={
+                "review_id": str(review_id),
+                "sra_job": "screening",
+                "criteria_fingerprint": fingerprint,
+            },
+        )
+        logger.info(
+            f"Submitted bulk screening job {job.id} for review {review_id} with {len(requests)} requests."
+        )
+        return job
+
+    def ingest_bulk_abstract_screening(
+        self, review_id: uuid.UUID, job: BatchJob, *, client: BatchJobClient
+    ) -> BulkScreeningSummary:
+        """Persist the results of a finished bulk screening job.
+
+        Adds one ScreenAbstractResult per parsed result and links it to its
+        SearchResult and the search result's near-duplicates, with the bulk INSERT
+        and UPDATE of :meth:`_persist_chunk`. Results get the reuse key of the
+        criteria the job was submitted under, see :meth:`_reuse_screening_results`.
+        Result ids are derived from the job, so re-ingesting a job skips the rows
+        already added.
+        """
+        parsed = parse_batch_results(
+            client.results(job.id), review_id=review_id, job=job
+        )
+        fingerprint = (job.metadata or {}).get("criteria_fingerprint")
+        with self.session_factory() as session:
+            try:
+                review_results = self.search_repo.get_by_review_id(session, review_id)
+                search_results = {sr.id: sr for sr in review_results}
+                duplicates = self._plan_duplicates(
+                    [
+                        search_results[sr_id]
+                        for sr_id in dict.fromkeys(
+                            r.search_result_id for r in parsed.results
+                        )
+                        if sr_id in search_results
+                    ],
+                    review_results,
+                ).duplicates
+                existing_ids = {
+                    r.id
+                    for r in self.screen_repo.get_many_by_ids(
+                        session, [r.id for r in parsed.results]
+                    ).records
+                }
+                to_add: list[models.ScreenAbstractResult] = []
+                links: dict[uuid.UUID, tuple[uuid.UUID | None, uuid.UUID | None]] = {}
+                for result in parsed.results:
+                    search_result = search_results.get(result.search_result_id)
+                    if result.id in existing_ids or search_result is None:
+                        continue
+                    result_model = _to_screen_abstract_result_model(result)
+                    if fingerprint:
+                        result_model.reuse_key = reuse_key(
+                            search_result,
+                            fingerprint,
+                            result.screening_strategy,
+                            result.model_name,
+                        )
+                    to_add.append(result_model)
+                    for sr in [search_result, *duplicates.get(search_result.id, [])]:
+                        conservative_id, comprehensive_id = links.get(
+                            sr.id, (None, None)
+                        )
+                        if (
+                            result.screening_strategy
+                            == ScreeningStrategyType.CONSERVATIVE
+                        ):
+                            conservative_id = result.id
+                        else:
+                            comprehensive_id = result.id
+                        links[sr.id] = (conservative_id, comprehensive_id)
+                # The ScreenAbstractResults first, the links reference them
+                self.screen_repo.insert_many(session, to_add)
+                self.search_repo.link_screening_results(session, links)
+                session.commit()
+                for sr_id, (conservative_id, comprehensive_id) in links.items():
+                    if conservative_id:
+                        set_committed_value(
+                            search_results[sr_id],
+                            "conservative_result_id",
+                            conservative_id,
+                        )
+                    if comprehensive_id:
+                        set_committed_value(
+                            search_results[sr_id],
+                            "comprehensive_result_id",
+                            comprehensive_id,
+                        )
+            except Exception as e:
+                logger.exception(f"Error ingesting bulk screening job {job.id}")
+                session.rollback()
+                msg = f"Failed to ingest bulk screening job {job.id}: {e}"
+                raise ServiceError(msg) from e
+        summary = BulkScreeningSummary(
+            job_id=job.id,
+            ingested=len(to_add),
+            skipped=len(parsed.results) - len(to_add),
+            errors=parsed.errors,
+        )
+        logger.info(f"Ingested bulk screening job for review {review_id}: {summary!r}")
+        return summary
 
-        return processed_agent_results
+    def perform_bulk_abstract_screening(
+        self,
+        review_id: uuid.UUID,
+        search_result_ids_to_screen: list[uuid.UUID],
+        *,
+        client: BatchJobClient | None = None,
+        poll_interval: float = 60.0,
+        timeout: float | None = None,
+    ) -> BulkScreeningSummary:
+        """Offline counterpart of :meth:`perform_batch_abstract_screening`.
+
+        Submits a batch job, blocks polling it until done and ingests the results.
+        Meant for overnight screening of large reviews, the batch API is half the
+        price of interactive calls and not subject to their rate limits.
+        """
+        client = client or OpenAIBatchJobClient()
+        job = self.submit_bulk_abstract_screening(
+            review_id, search_result_ids_to_screen, client=client
+        )
+        if job is None:
+            return BulkScreeningSummary(job_id=None, ingested=0, skipped=0, errors={})
+        job = client.wait(job.id, poll_interval=poll_interval, timeout=timeout)
+        return self.ingest_bulk_abstract_screening(review_id, job, client=client)
 
     # TODO: get_conflicting_results(...)
-    # TODO: add_resolution(...)
+
+    def add_resolution(
+        self,
+        review_id: uuid.UUID,
+        search_result_id: uuid.UUID,
+        resolver_output: schemas.ResolverOutputSchema,
+        *,
+        commit_if: Callable[[Session], bool] | None = None,
+    ) -> models.ScreeningResolution | None:
+        """Store the resolver's decision on a conflict.
+
+        The decision becomes the search result's ``final_decision``.
+
+        Args:
+            review_id: Review the search result belongs to.
+            search_result_id: The conflicting search result.
+            resolver_output: The resolver's decision.
+            commit_if: Called in the transaction before it's committed. If it
+                returns False the decision is rolled back and None returned, e.g. a
+                screening worker no longer owns its job.
+
+        Raises:
+            RecordNotFoundError: If the search result doesn't exist.
+            ServiceError: If storing fails.
+        """
+        with self.session_factory() as session:
+            search_result = self.search_repo.get_by_id(session, search_result_id)
+            if not search_result:
+                msg = f"SearchResult with ID {search_result_id} not found."
+                raise RecordNotFoundError(msg)
+            try:
+                resolution = self.resolution_repo.add(
+                    session,
+                    models.ScreeningResolution(
+                        review_id=review_id,
+                        search_result_id=search_result_id,
+                        resolver_decision=resolver_output.resolver_decision,
+                        resolver_reasoning=resolver_output.resolver_reasoning,
+                        resolver_confidence_score=resolver_output.resolver_confidence_score,
+                        resolver_model_name=RESOLVER_MODEL_NAME,
+                    ),
+                )
+                search_result.resolution_id = resolution.id
+                search_result.final_decision = resolution.resolver_decision
+                self.search_repo.update(session, search_result)
+                if commit_if is not None and not commit_if(session):
+                    logger.info(
+                        f"Discarded resolution of SearchResult {search_result_id}"
+                    )
+                    session.rollback()
+                    return None
+                session.commit()
+                logger.info(
+                    f"Resolved SearchResult {search_result_id}: {resolution.resolver_decision}"
+                )
+                return resolution
+            except Exception as e:
+                logger.exception(f"Error resolving SearchResult {search_result_id}")
+                session.rollback()
+                msg = f"Failed to add resolution: {e!r}"
+                raise ServiceError(msg) from e
+
+
+# --- Screening Job Service ---
+
+
+class ScreeningJobService(BaseService):
+    """Service queueing screening work for the worker process (sync).
+
+    Pages enqueue a job and poll it with :meth:`get_job`, the work runs in
+    :mod:`sr_assistant.app.worker`, which survives browser sessions and scales with
+    the number of workers.
+    """
+
+    def __init__(
+        self,
+        factory: sessionmaker[Session] = session_factory,
+        job_repo: repositories.ScreeningJobRepository | None = None,
+        search_repo: repositories.SearchResultRepository | None = None,
+        benchmark_run_repo: repositories.BenchmarkRunRepository | None = None,
+    ) -> None:
+        """Initialize the service, creating repositories that aren't given."""
+        super().__init__(factory)
+        self.job_repo = job_repo or repositories.ScreeningJobRepository()
+        self.search_repo = search_repo or repositories.SearchResultRepository()
+        self.benchmark_run_repo = (
+            benchmark_run_repo or repositories.BenchmarkRunRepository()
+        )
+
+    def _enqueue(
+        self,
+        session: Session,
+        review_id: uuid.UUID,
+        kind: ScreeningJobKind,
+        params: BaseModel,
+        total_items: int,
+    ) -> models.ScreeningJob:
+        active = next(
+            (
+                job
+                for job in self.job_repo.get_by_review_id(session, review_id, kind=kind)
+                if job.status in ACTIVE_JOB_STATUSES
+            ),
+            None,
+        )
+        if active is not None:
+            msg = (
+                f"Review {review_id} already has {active.status} {kind} job {active.id}"
+            )
+            raise ScreeningJobActiveError(msg)
+        try:
+            job = self.job_repo.add(
+                session,
+                models.ScreeningJob(
+                    review_id=review_id,
+                    kind=kind,
+                    params=params.model_dump(mode="json"),
+                    total_items=total_items,
+                ),
+            )
+        except repositories.ConstraintViolationError as e:
+            # Queued concurrently, see ScreeningJob.__table_args__
+            msg = f"Review {review_id} already has an active {kind} job"
+            raise ScreeningJobActiveError(msg) from e
+        logger.info(f"Queued {kind} job {job.id} of {total_items} items")
+        return job
+
+    def enqueue_abstract_screening(
+        self,
+        review_id: uuid.UUID,
+        search_result_ids: Sequence[uuid.UUID],
+        *,
+        bypass_cache: bool = False,
+        prioritize: bool = False,
+        resolve_conflicts: bool = True,
+    ) -> models.ScreeningJob:
+        """Queue screening of search results, see :meth:`ScreeningService.stream_batch_abstract_screening`.
+
+        Raises:
+            ScreeningJobActiveError: If the review's previous screening job is still
+                queued or running.
+            ServiceError: If queueing fails.
+        """
+        params = AbstractScreeningJobParams(
+            search_result_ids=list(dict.fromkeys(search_result_ids)),
+            bypass_cache=bypass_cache,
+            prioritize=prioritize,
+            resolve_conflicts=resolve_conflicts,
+        )
+        with self.session_factory.begin() as session:
+            try:
+                return self._enqueue(
+                    session,
+                    review_id,
+                    ScreeningJobKind.ABSTRACT_SCREENING,
+                    params,
+                    len(params.search_result_ids),
+                )
+            except ScreeningJobActiveError:
+                raise
+            except Exception as e:
+                logger.exception(f"Error queueing screening of review {review_id}")
+                msg = f"Failed to queue screening: {e!r}"
+                raise ServiceError(msg) from e
+
+    def enqueue_benchmark(  # noqa: PLR0913
+        self,
+        review_id: uuid.UUID,
+        *,
+        config_details: Mapping[str, JsonValue] | None = None,
+        batch_size: int = BENCHMARK_BATCH_SIZE,
+        bypass_cache: bool = False,
+        pack_size: int = 1,
+        cascade: CascadeConfig | None = None,
+    ) -> models.ScreeningJob:
+        """Create a BenchmarkRun of a benchmark review and queue screening it.
+
+        The run's ID is in the job's ``params["benchmark_run_id"]``.
+
+        Raises:
+            ScreeningJobActiveError: If the review's previous benchmark job is still
+                queued or running.
+            ServiceError: If queueing fails.
+        """
+        with self.session_factory.begin() as session:
+            try:
+                run = self.benchmark_run_repo.add(
+                    session,
+                    models.BenchmarkRun(
+                        review_id=review_id, config_details=dict(config_details or {})
+                    ),
+                )
+                params = BenchmarkJobParams(
+                    benchmark_run_id=run.id,
+                    batch_size=batch_size,
+                    bypass_cache=bypass_cache,
+                    pack_size=pack_size,
+                    cascade=cascade or CascadeConfig(),
+                )
+                total = self.search_repo.count(
+                    session,
+                    search_params=schemas.SearchResultFilter(review_id=review_id),
+                )
+                return self._enqueue(
+                    session, review_id, ScreeningJobKind.BENCHMARK, params, total
+                )
+            except ScreeningJobActiveError:
+                raise
+            except Exception as e:
+                logger.exception(f"Error queueing benchmark of review {review_id}")
+                msg = f"Failed to queue benchmark: {e!r}"
+                raise ServiceError(msg) from e
+
+    def get_job(self, job_id: uuid.UUID) -> models.ScreeningJob | None:
+        """Get a job, e.g. to poll its progress."""
+        with self.session_factory() as session:
+            try:
+                return self.job_repo.get_by_id(session, job_id)
+            except Exception as e:
+                logger.exception(f"Error getting screening job {job_id}")
+                msg = f"Failed to get screening job: {e!r}"
+                raise ServiceError(msg) from e
+
+    def get_jobs_for_review(
+        self, review_id: uuid.UUID, *, kind: ScreeningJobKind | None = None
+    ) -> Sequence[models.ScreeningJob]:
+        """Get a review's jobs, newest first."""
+        with self.session_factory() as session:
+            try:
+                return self.job_repo.get_by_review_id(session, review_id, kind=kind)
+            except Exception as e:
+                logger.exception(f"Error getting screening jobs of review {review_id}")
+                msg = f"Failed to get screening jobs: {e!r}"
+                raise ServiceError(msg) from e
+
+    def get_active_job(
+        self, review_id: uuid.UUID, kind: ScreeningJobKind
+    ) -> models.ScreeningJob | None:
+        """Get a review's queued or running job of a kind, e.g. to resume polling it."""
+        return next(
+            (
+                job
+                for job in self.get_jobs_for_review(review_id, kind=kind)
+                if job.status in ACTIVE_JOB_STATUSES
+            ),
+            None,
+        )
+
+    def cancel_job(self, job_id: uuid.UUID) -> bool:
+        """Cancel a queued or running job.
+
+        Results a running job stored so far are kept.
+
+        Returns:
+            bool: False if the job had already finished.
+        """
+        with self.session_factory.begin() as session:
+            try:
+                cancelled = self.job_repo.cancel(session, job_id)
+            except Exception as e:
+                logger.exception(f"Error cancelling screening job {job_id}")
+                msg = f"Failed to cancel screening job: {e!r}"
+                raise ServiceError(msg) from e
+        if cancelled:
+            logger.info(f"Cancelled screening job {job_id}")
+        return cancelled
+
+
+def _representative_preference(
+    search_result: models.SearchResult,
+) -> tuple[bool, bool, int]:
+    """Sort key putting the best duplicate cluster representatives first."""
+    return (
+        not (
+            search_result.conservative_result_id
+            or search_result.comprehensive_result_id
+        ),
+        not search_result.doi,
+        -len(search_result.abstract or ""),
+    )
+
+
+def _mark_duplicates(
+    session: Session,
+    search_repo: repositories.SearchResultRepository,
+    review_results: t.Iterable[models.SearchResult],
+) -> DeduplicationSummary:
+    """Cluster a review's search results and store their duplicate marks.
+
+    See :meth:`SearchService.deduplicate_search_results`. Changed search results are
+    updated with one statement and their instances kept in sync. Doesn't commit.
+    """
+    search_results = sorted(review_results, key=_representative_preference)
+    hashed: set[uuid.UUID] = set()
+    stored: dict[uuid.UUID, bytes | None] = {}
+    for sr in search_results:
+        if sr.minhash_signature is None:
+            signature = minhash_signature(sr)
+            if signature is None:
+                continue
+            stored[sr.id] = signature_to_bytes(signature)
+            hashed.add(sr.id)
+        elif shingles(sr) is not None:
+            stored[sr.id] = sr.minhash_signature
+    signatures = {
+        sr_id: signature_from_bytes(signature)
+        for sr_id, signature in stored.items()
+        if signature is not None
+    }
+
+    clusters = cluster_duplicates(
+        signatures, dois={sr.id: sr.doi for sr in search_results}
+    )
+    duplicate_of = {
+        duplicate_id: cluster.representative_id
+        for cluster in clusters
+        for duplicate_id in cluster.duplicate_ids
+    }
+    changed: dict[uuid.UUID, tuple[uuid.UUID | None, bytes | None]] = {}
+    for sr in search_results:
+        marks = (duplicate_of.get(sr.id), stored.get(sr.id))
+        if marks != (sr.duplicate_of_id, sr.minhash_signature):
+            set_committed_value(sr, "duplicate_of_id", marks[0])
+            set_committed_value(sr, "minhash_signature", marks[1])
+            changed[sr.id] = marks
+    search_repo.mark_duplicates(session, changed)
+    return DeduplicationSummary(
+        search_results=len(search_results),
+        hashed=len(hashed),
+        clusters=len(clusters),
+        duplicates=len(duplicate_of),
+        updated=len(changed),
+    )
+
+
+def _to_screen_abstract_result_model(
+    result: schemas.ScreeningResult,
+) -> models.ScreenAbstractResult:
+    dump = schemas.ScreeningResultCreate(
+        **result.model_dump(exclude={"search_result_id"})
+    ).model_dump()
+    # ScreenAbstractResult expects lists, not None, for the reason categories
+    dump["exclusion_reason_categories"] = {
+        k: v or [] for k, v in (dump.get("exclusion_reason_categories") or {}).items()
+    }
+    return models.ScreenAbstractResult(**dump)
 
 
 # TODO: Define other services (ReviewService, ScreeningService, LogService) following the same pattern.
@@ -0,0 +1,605 @@
+# Copyright 2025 Gareth Morgan
+# SPDX-License-Identifier: MIT
+
+"""Screening worker: runs queued ``screening_jobs`` outside Streamlit.
+
+Pages queue work with :class:`~sr_assistant.app.services.ScreeningJobService` and
+poll the job row, a :class:`ScreeningWorker` process does the work. Closing the
+browser tab doesn't stop a run, and throughput scales with the number of workers
+rather than of browser sessions::
+
+    python -m sr_assistant.app.worker  # or: make worker
+
+Workers claim the oldest queued job with ``FOR UPDATE SKIP LOCKED`` (see
+:meth:`~sr_assistant.core.repositories.ScreeningJobRepository.claim_next`), so any
+number of them can poll the same table. A running job's worker heartbeats every
+:data:`HEARTBEAT_INTERVAL` from a background thread, and with each progress update:
+
+- A job whose worker stops heartbeating for :data:`STALE_AFTER` is requeued, or
+  failed after :data:`MAX_ATTEMPTS` claims. Screening skips search results already
+  screened and resolved, and benchmarks skip stored items, so a requeued job
+  continues rather than restarts.
+- A worker stops working on a job at its next progress update once the job is
+  cancelled.
+- A worker asked to stop (SIGTERM, SIGINT) requeues its job at the next progress
+  update.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import socket
+import threading
+import time
+import typing as t
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing, contextmanager
+from datetime import UTC, datetime, timedelta
+
+from loguru import logger
+
+from sr_assistant.app.agents.screening_agents import invoke_resolver_chain
+from sr_assistant.app.agents.screening_pipeline import (
+    DEFAULT_RESOLVER_WORKERS,
+    needs_resolver,
+    screen_and_resolve_as_completed,
+)
+from sr_assistant.app.database import session_factory
+from sr_assistant.app.logging import configure_logging
+from sr_assistant.app.services import (
+    AbstractScreeningJobParams,
+    BenchmarkJobParams,
+    ScreeningService,
+)
+from sr_assistant.benchmark.logic.metrics_calculator import (
+    calculate_and_update_benchmark_metrics,
+)
+from sr_assistant.benchmark.logic.result_items import make_benchmark_result_item
+from sr_assistant.core import models, repositories, schemas
+from sr_assistant.core.repositories import RecordNotFoundError, RepositoryError
+from sr_assistant.core.types import ScreeningJobKind, ScreeningJobStatus
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterator, Sequence
+    from concurrent.futures import Future
+
+    from sqlalchemy.orm import sessionmaker
+    from sqlmodel import Session
+
+    from sr_assistant.app.agents.screening_agents import ScreenAbstractResultTuple
+
+POLL_INTERVAL = 5.0
+"""Seconds an idle worker waits before polling for a job again."""
+STALE_AFTER = timedelta(minutes=10)
+"""Time without a heartbeat after which a running job is requeued."""
+HEARTBEAT_INTERVAL = timedelta(minutes=1)
+"""Time between background heartbeats of a running job, well within STALE_AFTER."""
+PROGRESS_INTERVAL = timedelta(seconds=5)
+"""Minimum time between progress saves of :meth:`JobProgress.advance`."""
+MAX_ATTEMPTS = 3
+"""Claims of a job before a stale job is failed rather than requeued."""
+
+
+class JobStoppedError(Exception):
+    """The worker can't continue the job it's running."""
+
+
+class JobCancelledError(JobStoppedError):
+    """The job was cancelled, or claimed by another worker after going stale."""
+
+
+class WorkerStoppingError(JobStoppedError):
+    """The worker was asked to stop, its job is requeued."""
+
+
+class JobProgress:
+    """Progress of the job a worker runs, saved to the job row as its heartbeat.
+
+    Args:
+        worker (ScreeningWorker): Worker running the job.
+        job (models.ScreeningJob): The claimed job.
+    """
+
+    def __init__(self, worker: ScreeningWorker, job: models.ScreeningJob) -> None:
+        """Initialize progress reporting for ``job``."""
+        self.worker = worker
+        self.job = job
+        self.processed = 0
+        self.stats: Counter[str] = Counter()
+        self._saved_at: float | None = None
+
+    def advance(self, processed: int = 1, **counts: int) -> None:
+        """Count processed items and stats, saved every ``progress_interval``.
+
+        Call :meth:`save` once done to save the last counts.
+
+        Raises:
+            JobStoppedError: If the worker should stop working on the job.
+        """
+        self.processed += processed
+        self.stats.update(counts)
+        interval = self.worker.progress_interval.total_seconds()
+        if self._saved_at is None or time.monotonic() - self._saved_at >= interval:
+            self.save()
+        else:
+            self._check_stopping()
+
+    def save(self, total_items: int | None = None) -> None:
+        """Save the progress, and ``total_items`` if given.
+
+        Raises:
+            JobStoppedError: If the worker should stop working on the job.
+        """
+        with self.worker.session_factory.begin() as session:
+            self._update(session, total_items)
+        self._saved_at = time.monotonic()
+        self._check_stopping()
+
+    @contextmanager
+    def saving(self, processed: int = 1, **counts: int) -> Iterator[Session]:
+        """Transaction whose writes are saved with the progress, see :meth:`advance`.
+
+        The writes are rolled back unless the worker still owns the job, so results
+        aren't stored twice after it was taken over.
+
+        Yields:
+            Session: The transaction's session.
+
+        Raises:
+            JobStoppedError: If the worker should stop working on the job.
+        """
+        with self.worker.session_factory.begin() as session:
+            yield session
+            self.processed += processed
+            self.stats.update(counts)
+            self._update(session)
+        self._saved_at = time.monotonic()
+        self._check_stopping()
+
+    @contextmanager
+    def heartbeating(self) -> Iterator[None]:
+        """Heartbeat from a background thread until the block exits.
+
+        Progress updates can be further apart than :data:`STALE_AFTER`, e.g. while
+        a large benchmark batch is screened.
+        """
+        done = threading.Event()
+        thread = threading.Thread(
+            target=self._heartbeat,
+            args=(done,),
+            name=f"heartbeat-{self.job.id}",
+            daemon=True,
+        )
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def _heartbeat(self, done: threading.Event) -> None:
+        interval = self.worker.heartbeat_interval.total_seconds()
+        while not done.wait(interval):
+            try:
+                with self.worker.session_factory.begin() as session:
+                    owned = self.worker.job_repo.heartbeat(
+                        session, self.job.id, self.worker.worker_id
+                    )
+            except RepositoryError:
+                # Logged by the repository, the next heartbeat may get through
+                continue
+            if not owned:
+                # The job's thread finds out at its next progress update
+                return
+
+    def owns_job(self, session: Session) -> bool:
+        """Whether the worker still runs the job, checked in ``session``'s transaction.
+
+        Heartbeats, so the job row stays locked until the transaction ends and a
+        cancellation can't slip in before its writes are committed.
+        """
+        return self.worker.job_repo.heartbeat(
+            session, self.job.id, self.worker.worker_id
+        )
+
+    def _update(self, session: Session, total_items: int | None = None) -> None:
+        owned = self.worker.job_repo.update_progress(
+            session,
+            self.job.id,
+            self.worker.worker_id,
+            processed_items=self.processed,
+            stats=dict(self.stats),
+            total_items=total_items,
+        )
+        if not owned:
+            msg = f"Screening job {self.job.id} was cancelled or taken over"
+            raise JobCancelledError(msg)
+
+    def _check_stopping(self) -> None:
+        if self.worker.stopping.is_set():
+            msg = f"Worker {self.worker.worker_id} is stopping"
+            raise WorkerStoppingError(msg)
+
+
+class ScreeningWorker:
+    """Claims queued screening jobs and runs them.
+
+    Args:
+        factory (sessionmaker[Session]): Session factory.
+        worker_id (str | None): ID written to claimed jobs, defaults to
+            ``<hostname>:<pid>``.
+        kinds (Collection[ScreeningJobKind] | None): Kinds of jobs to run, None
+            for all.
+        screening_service (ScreeningService | None): Screens abstract screening jobs.
+        poll_interval (float): Seconds to wait for a job when none is queued.
+        stale_after (timedelta): See :data:`STALE_AFTER`.
+        heartbeat_interval (timedelta): See :data:`HEARTBEAT_INTERVAL`.
+        progress_interval (timedelta): See :data:`PROGRESS_INTERVAL`.
+        max_attempts (int): See :data:`MAX_ATTEMPTS`.
+        max_resolver_workers (int): Resolver calls in flight at once.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        factory: sessionmaker[Session] = session_factory,
+        *,
+        worker_id: str | None = None,
+        kinds: Collection[ScreeningJobKind] | None = None,
+        screening_service: ScreeningService | None = None,
+        poll_interval: float = POLL_INTERVAL,
+        stale_after: timedelta = STALE_AFTER,
+        heartbeat_interval: timedelta = HEARTBEAT_INTERVAL,
+        progress_interval: timedelta = PROGRESS_INTERVAL,
+        max_attempts: int = MAX_ATTEMPTS,
+        max_resolver_workers: int = DEFAULT_RESOLVER_WORKERS,
+    ) -> None:
+        """Initialize the worker, nothing runs until :meth:`run`."""
+        self.session_factory = factory
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.kinds = kinds
+        self.screening_service = screening_service or ScreeningService(factory)
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.heartbeat_interval = heartbeat_interval
+        self.progress_interval = progress_interval
+        self.max_attempts = max_attempts
+        self.max_resolver_workers = max_resolver_workers
+        self.stopping = threading.Event()
+        self.job_repo = repositories.ScreeningJobRepository()
+        self.review_repo = repositories.SystematicReviewRepository()
+        self.search_repo = repositories.SearchResultRepository()
+        self.benchmark_run_repo = repositories.BenchmarkRunRepository()
+        self.benchmark_item_repo = repositories.BenchmarkResultItemRepository()
+        self.handlers: dict[
+            ScreeningJobKind, Callable[[models.ScreeningJob, JobProgress], None]
+        ] = {
+            ScreeningJobKind.ABSTRACT_SCREENING: self._run_abstract_screening,
+            ScreeningJobKind.BENCHMARK: self._run_benchmark,
+        }
+
+    def stop(self) -> None:
+        """Stop after the current progress update, requeueing the running job."""
+        self.stopping.set()
+
+    def claim(self) -> models.ScreeningJob | None:
+        """Requeue stale jobs, then claim the oldest queued one.
+
+        Returns:
+            models.ScreeningJob | None: The claimed job, None if none is queued.
+        """
+        with self.session_factory.begin() as session:
+            requeued, failed = self.job_repo.requeue_stale(
+                session,
+                heartbeat_before=datetime.now(UTC) - self.stale_after,
+                max_attempts=self.max_attempts,
+            )
+            if requeued or failed:
+                logger.warning(
+                    f"Requeued {requeued} and failed {failed} screening jobs without a heartbeat"
+                )
+            return self.job_repo.claim_next(session, self.worker_id, kinds=self.kinds)
+
+    def run_once(self) -> models.ScreeningJob | None:
+        """Claim and run one job.
+
+        Returns:
+            models.ScreeningJob | None: The job as claimed, None if none was queued.
+        """
+        job = self.claim()
+        if job is None:
+            return None
+        logger.info(
+            f"Worker {self.worker_id} running {job.kind} job {job.id} (attempt {job.attempts})"
+        )
+        status, error = ScreeningJobStatus.SUCCEEDED, None
+        progress = JobProgress(self, job)
+        try:
+            with progress.heartbeating():
+                self.handlers[job.kind](job, progress)
+        except JobCancelledError:
+            logger.info(f"Screening job {job.id} was cancelled, stopped working on it")
+            return job
+        except WorkerStoppingError:
+            with self.session_factory.begin() as session:
+                self.job_repo.release(session, job.id, self.worker_id)
+            logger.info(f"Requeued screening job {job.id}, worker is stopping")
+            return job
+        except Exception as e:
+            logger.exception(f"Screening job {job.id} failed")
+            status, error = ScreeningJobStatus.FAILED, repr(e)
+        with self.session_factory.begin() as session:
+            finished = self.job_repo.finish(
+                session, job.id, self.worker_id, status, error=error
+            )
+        if finished:
+            logger.info(f"Screening job {job.id} {status}")
+        else:
+            logger.warning(f"Screening job {job.id} was taken over before it finished")
+        return job
+
+    def run_forever(self) -> None:
+        """Run jobs until :meth:`stop` is called."""
+        logger.info(f"Screening worker {self.worker_id} started")
+        while not self.stopping.is_set():
+            try:
+                job = self.run_once()
+            except RepositoryError:
+                logger.exception("Failed to claim a screening job")
+                job = None
+            if job is None:
+                self.stopping.wait(self.poll_interval)
+        logger.info(f"Screening worker {self.worker_id} stopped")
+
+    def _run_abstract_screening(
+        self, job: models.ScreeningJob, progress: JobProgress
+    ) -> None:
+        """Screen the job's search results, resolving conflicts as they're found.
+
+        Search results already screened by both reviewers, e.g. before the job was
+        requeued, aren't screened again. Their conflicts are only resolved if they
+        weren't yet, like those of the newly screened search results.
+
+        Resolver calls still running when the job stops are waited for, their
+        decisions are only stored while the worker owns the job.
+        """
+        params = AbstractScreeningJobParams.model_validate(job.params)
+        screened = self.screening_service.get_screened_result_tuples(
+            job.review_id, params.search_result_ids
+        )
+        screened_ids = {result_tuple.search_result.id for result_tuple in screened}
+        pending_ids = [
+            sr_id for sr_id in params.search_result_ids if sr_id not in screened_ids
+        ]
+        if screened_ids:
+            logger.info(
+                f"Screening job {job.id} skips {len(screened_ids)} screened search results"
+            )
+            progress.processed = len(screened_ids)
+            progress.save()
+        review = None
+        if params.resolve_conflicts:
+            with self.session_factory() as session:
+                review = self.review_repo.get_by_id(session, job.review_id)
+        resolver_pool = ThreadPoolExecutor(
+            max_workers=self.max_resolver_workers, thread_name_prefix="resolver"
+        )
+        resolving: set[Future[bool]] = set()
+
+        def _resolve_later(result_tuple: ScreenAbstractResultTuple) -> None:
+            if review is not None and result_tuple.search_result.resolution_id is None:
+                resolving.add(
+                    resolver_pool.submit(
+                        self._resolve,
+                        review,
+                        result_tuple,
+                        progress,
+                        bypass_cache=params.bypass_cache,
+                    )
+                )
+
+        try:
+            for result_tuple in screened:
+                if needs_resolver(
+                    t.cast("schemas.ScreeningResult", result_tuple.conservative_result),
+                    t.cast(
+                        "schemas.ScreeningResult", result_tuple.comprehensive_result
+                    ),
+                ):
+                    _resolve_later(result_tuple)
+            if pending_ids:
+                results = self.screening_service.stream_batch_abstract_screening(
+                    job.review_id,
+                    pending_ids,
+                    bypass_cache=params.bypass_cache,
+                    prioritize=params.prioritize,
+                )
+                with closing(results):
+                    for result_tuple in results:
+                        conservative = result_tuple.conservative_result
+                        comprehensive = result_tuple.comprehensive_result
+                        if not isinstance(
+                            conservative, schemas.ScreeningResult
+                        ) or not isinstance(comprehensive, schemas.ScreeningResult):
+                            progress.advance(screening_errors=1)
+                        elif needs_resolver(conservative, comprehensive):
+                            _resolve_later(result_tuple)
+                            progress.advance(conflicts_detected=1)
+                        else:
+                            progress.advance()
+                        resolving = self._count_resolved(resolving, progress)
+            self._count_resolved(resolving, progress, wait=True)
+            progress.save()
+        finally:
+            resolver_pool.shutdown(wait=True, cancel_futures=True)
+
+    def _resolve(
+        self,
+        review: models.SystematicReview,
+        result_tuple: ScreenAbstractResultTuple,
+        progress: JobProgress,
+        *,
+        bypass_cache: bool,
+    ) -> bool:
+        """Resolve a conflict and store the decision if the job is still owned.
+
+        Returns:
+            bool: True if the decision was stored.
+        """
+        search_result = result_tuple.search_result
+        output = invoke_resolver_chain(
+            search_result=search_result,
+            review=review,
+            conservative_result=t.cast(
+                "schemas.ScreeningResult", result_tuple.conservative_result
+            ),
+            comprehensive_result=t.cast(
+                "schemas.ScreeningResult", result_tuple.comprehensive_result
+            ),
+            bypass_cache=bypass_cache,
+        )
+        if output is None:
+            return False
+        resolution = self.screening_service.add_resolution(
+            review.id, search_result.id, output, commit_if=progress.owns_job
+        )
+        return resolution is not None
+
+    @staticmethod
+    def _count_resolved(
+        resolving: set[Future[bool]], progress: JobProgress, *, wait: bool = False
+    ) -> set[Future[bool]]:
+        """Count finished resolver calls, all of them with ``wait=True``.
+
+        Returns:
+            set[Future[bool]]: The calls still running.
+        """
+        done = resolving if wait else {f for f in resolving if f.done()}
+        for future in as_completed(done):
+            try:
+                resolved = future.result()
+            except Exception:
+                logger.exception("Failed to store a resolver decision")
+                resolved = False
+            if resolved:
+                progress.advance(0, resolved=1)
+            else:
+                progress.advance(0, resolver_errors=1)
+        return resolving - done
+
+    def _run_benchmark(self, job: models.ScreeningJob, progress: JobProgress) -> None:
+        """Screen the benchmark review into the job's BenchmarkRun.
+
+        Result items are stored per batch. Search results with a stored item are
+        skipped, so a requeued job continues where it stopped. Metrics are
+        calculated once all items are processed.
+        """
+        params = BenchmarkJobParams.model_validate(job.params)
+        with self.session_factory() as session:
+            review = self.review_repo.get_by_id(session, job.review_id)
+            if review is None:
+                msg = f"SystematicReview with ID {job.review_id} not found."
+                raise RecordNotFoundError(msg)
+            search_results = self.search_repo.get_by_review_id(session, job.review_id)
+            stored = {
+                item.search_result_id
+                for item in self.benchmark_item_repo.get_by_benchmark_run_id(
+                    session, params.benchmark_run_id
+                )
+            }
+        remaining = [sr for sr in search_results if sr.id not in stored]
+        progress.processed = len(search_results) - len(remaining)
+        progress.save(total_items=len(search_results))
+
+        for batch_idx, start in enumerate(range(0, len(remaining), params.batch_size)):
+            batch = remaining[start : start + params.batch_size]
+            items, counts = self._screen_benchmark_batch(
+                batch, batch_idx, review, params
+            )
+            with progress.saving(len(batch), **counts) as session:
+                self.benchmark_item_repo.add_all(session, items)
+
+        with self.session_factory.begin() as session:
+            run = calculate_and_update_benchmark_metrics(
+                session=session,
+                benchmark_run_id=params.benchmark_run_id,
+                benchmark_run_repo=self.benchmark_run_repo,
+                benchmark_result_item_repo=self.benchmark_item_repo,
+            )
+        logger.info(f"Benchmark run {run.id} done, sensitivity {run.sensitivity}")
+
+    @staticmethod
+    def _screen_benchmark_batch(
+        batch: Sequence[models.SearchResult],
+        batch_idx: int,
+        review: models.SystematicReview,
+        params: BenchmarkJobParams,
+    ) -> tuple[list[models.BenchmarkResultItem], Counter[str]]:
+        """Screen and resolve a batch into its BenchmarkResultItems and stats."""
+        items: list[models.BenchmarkResultItem] = []
+        counts: Counter[str] = Counter()
+        try:
+            results = screen_and_resolve_as_completed(
+                list(batch),
+                batch_idx,
+                review,
+                bypass_cache=params.bypass_cache,
+                pack_size=params.pack_size,
+                cascade=params.cascade,
+            )
+            with closing(results):
+                for result_tuple in results:
+                    if result_tuple.resolver_needed:
+                        counts["conflicts_detected"] += 1
+                    if result_tuple.resolver_result is not None:
+                        counts["resolver_invoked"] += 1
+                    item = make_benchmark_result_item(
+                        params.benchmark_run_id, result_tuple
+                    )
+                    if item is None:
+                        logger.warning(
+                            f"Screening error for {result_tuple.search_result.source_id}"
+                        )
+                        counts["screening_errors"] += 1
+                    else:
+                        items.append(item)
+        except Exception:
+            # As on the benchmark page, a failed batch counts as errors and the run
+            # goes on. Its items are screened again if the job is requeued.
+            logger.exception(f"Screening failed for batch {batch_idx + 1}")
+            counts["screening_errors"] += len(batch) - len(items)
+        return items, counts
+
+
+def main() -> None:
+    """Run a screening worker until SIGTERM or SIGINT."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--kind",
+        action="append",
+        choices=[kind.value for kind in ScreeningJobKind],
+        help="Kind of job to run, repeat for several. Defaults to all.",
+    )
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL)
+    parser.add_argument(
+        "--once", action="store_true", help="Run at most one job and exit."
+    )
+    args = parser.parse_args()
+
+    configure_logging()
+    worker = ScreeningWorker(
+        kinds=[ScreeningJobKind(kind) for kind in args.kind] if args.kind else None,
+        poll_interval=args.poll_interval,
+    )
+    if args.once:
+        worker.run_once()
+        return
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: worker.stop())
+    worker.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark result items from screening pipeline output.
+
+Decides a benchmark item's final SRA decision and its classification against the
+human ground truth, and builds the :class:`~sr_assistant.core.models.BenchmarkResultItem`
+stored for it. Used by the benchmark page and the screening worker, so it doesn't
+depend on Streamlit.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+from loguru import logger
+
+from sr_assistant.core import models, schemas
+from sr_assistant.core.types import ScreeningDecisionType
+
+if t.TYPE_CHECKING:
+    import uuid
+
+    from sr_assistant.app.agents.screening_pipeline import ScreenResolveResultTuple
+
+HUMAN_DECISION_METADATA_KEY = "benchmark_human_decision"
+"""``SearchResult.source_metadata`` key of the seeded ground truth decision."""
+
+
+def determine_final_decision(
+    conservative_decision: ScreeningDecisionType,
+    comprehensive_decision: ScreeningDecisionType,
+    resolver_decision: ScreeningDecisionType | None,
+) -> ScreeningDecisionType:
+    """Determine final decision based on all screening decisions."""
+    # If the resolver was invoked its decision stands, uncertain included
+    if resolver_decision is not None:
+        return resolver_decision
+
+    # If no resolver, check for agreement
+    if conservative_decision == comprehensive_decision:
+        return conservative_decision
+
+    # Disagreement without resolver - should not happen with proper needs_resolver logic
+    logger.warning(
+        f"No resolver result but decisions disagree: conservative={conservative_decision}, comprehensive={comprehensive_decision}"
+    )
+    return ScreeningDecisionType.UNCERTAIN
+
+
+def classify_decision(
+    final_decision: ScreeningDecisionType, human_decision: bool | None
+) -> str:
+    """Calculate the classification (TP, FP, TN, FN) based on final decision vs human decision."""
+    if human_decision is None:
+        return "UNKNOWN"
+
+    ai_include = final_decision == ScreeningDecisionType.INCLUDE
+    if ai_include:
+        return "TP" if human_decision else "FP"
+    return "FN" if human_decision else "TN"
+
+
+def human_decision_of(search_result: models.SearchResult) -> bool | None:
+    """Ground truth decision seeded for a benchmark search result, if any."""
+    decision = search_result.source_metadata.get(HUMAN_DECISION_METADATA_KEY)
+    return decision if isinstance(decision, bool) else None
+
+
+def make_benchmark_result_item(
+    benchmark_run_id: uuid.UUID, result_tuple: ScreenResolveResultTuple
+) -> models.BenchmarkResultItem | None:
+    """Build the BenchmarkResultItem of a screened benchmark search result.
+
+    Args:
+        benchmark_run_id (uuid.UUID): Run the item belongs to.
+        result_tuple (ScreenResolveResultTuple): Reviewer and resolver output.
+
+    Returns:
+        models.BenchmarkResultItem | None: The item, None if a reviewer failed.
+    """
+    conservative = result_tuple.conservative_result
+    comprehensive = result_tuple.comprehensive_result
+    if not isinstance(conservative, schemas.ScreeningResult) or not isinstance(
+        comprehensive, schemas.ScreeningResult
+    ):
+        return None
+    resolver = result_tuple.resolver_result
+    final_decision = determine_final_decision(
+        conservative.decision,
+        comprehensive.decision,
+        resolver.resolver_decision if resolver else None,
+    )
+    human_decision = human_decision_of(result_tuple.search_result)
+    return models.BenchmarkResultItem(
+        benchmark_run_id=benchmark_run_id,
+        search_result_id=result_tuple.search_result.id,
+        human_decision=human_decision,
+        conservative_decision=conservative.decision,
+        conservative_confidence=conservative.confidence_score,
+        conservative_rationale=conservative.rationale,
+        conservative_run_id=conservative.id,
+        conservative_trace_id=conservative.trace_id,
+        comprehensive_decision=comprehensive.decision,
+        comprehensive_confidence=comprehensive.confidence_score,
+        comprehensive_rationale=comprehensive.rationale,
+        comprehensive_run_id=comprehensive.id,
+        comprehensive_trace_id=comprehensive.trace_id,
+        resolver_decision=resolver.resolver_decision if resolver else None,
+        resolver_confidence=resolver.resolver_confidence_score if resolver else None,
+        resolver_reasoning=resolver.resolver_reasoning if resolver else None,
+        final_decision=final_decision,
+        classification=classify_decision(final_decision, human_decision),
+    )
@@ -27,6 +27,8 @@ from sr_assistant.core.types import (
     CriteriaFramework,
     LogLevel,
     ScreeningDecisionType,
+    ScreeningJobKind,
+    ScreeningJobStatus,
     ScreeningStrategyType,
     SearchDatabaseSource,
     UtcDatetime,
@@ -291,6 +293,20 @@ class SearchResult(SQLModelBase, table=True):
     )
     # <<< End of added field >>>
 
+    # --- Near-duplicate detection, see sr_assistant.app.dedup ---
+    minhash_signature: bytes | None = Field(
+        default=None,
+        sa_column=sa.Column(sa.LargeBinary(), nullable=True),
+        description="MinHash signature of the normalized title and abstract.",
+    )
+    duplicate_of_id: uuid.UUID | None = Field(
+        default=None,
+        foreign_key="search_results.id",
+        index=True,
+        nullable=True,
+        description="Representative search result this one is a near-duplicate of.",
+    )
+
     # --- Relationships ---
     # review: Mapped["SystematicReview"] = Relationship(
     #    back_populates="search_results",
@@ -523,6 +539,11 @@ class ScreenAbstractResult(SQLModelBase, table=True):
         description="Metadata from the LLM invocation.",
         sa_column=sa.Column(sa_pg.JSONB, nullable=False),
     )
+    reuse_key: str | None = Field(
+        default=None,
+        description="Hash of article, criteria, prompt version, strategy and model. Results with the same key are reused instead of calling the LLM again.",
+        sa_column=sa.Column(sa.String(64), nullable=True, index=True),
+    )
 
     # Relationships
     review_id: uuid.UUID = Field(foreign_key="systematic_reviews.id", index=True)
@@ -645,7 +666,14 @@ class BenchmarkResultItem(SQLModelBase, table=True):
     )
     __tablename__ = _tablename  # pyright: ignore # type: ignore
 
-    # No specific __table_args__ like GIN indexes mentioned for now, add if needed later.
+    # One item per search result and run, a requeued benchmark job can't store twice
+    __table_args__ = (
+        sa.UniqueConstraint(
+            "benchmark_run_id",
+            "search_result_id",
+            name="uq_benchmark_result_items_run_search_result",
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     """Unique identifier for this benchmark result item."""
@@ -851,3 +879,160 @@ class LogRecord(SQLModelBase, table=True):
             nullable=True,
         ),
     )
+
+
+class LLMCacheEntry(SQLModelBase, table=True):
+    """Cached structured LLM output, keyed by a content hash of everything the output depends on.
+
+    See :mod:`sr_assistant.app.llm_cache`.
+    """
+
+    _tablename: t.ClassVar[t.Literal["llm_cache_entries"]] = "llm_cache_entries"
+    __tablename__ = _tablename  # pyright: ignore # type: ignore
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+
+    cache_key: str = Field(
+        sa_column=sa.Column(sa.String(64), nullable=False, unique=True, index=True)
+    )
+    """SHA-256 hex digest of prompt template, model, temperature and prompt inputs."""
+
+    namespace: str = Field(index=True)
+    """Chain the entry belongs to, e.g. ``screening:conservative`` or ``resolver``."""
+
+    model_name: str
+    """Model that produced the output."""
+
+    value: Mapping[str, JsonValue] = Field(
+        default_factory=dict, sa_column=sa.Column(JSONB, nullable=False)
+    )
+    """JSON dump of the structured output."""
+
+    hit_count: int = Field(default=0)
+    """Number of times the entry has been served."""
+
+    created_at: datetime | None = Field(
+        default=None,
+        sa_column=sa.Column(
+            sa.DateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('UTC', CURRENT_TIMESTAMP)"),
+            nullable=False,
+            index=True,
+        ),
+    )
+    """Database generated UTC timestamp when the entry was written. Used for TTL."""
+
+    last_accessed_at: datetime | None = Field(
+        default=None,
+        sa_column=sa.Column(
+            sa.DateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('UTC', CURRENT_TIMESTAMP)"),
+            nullable=False,
+            index=True,
+        ),
+    )
+    """UTC timestamp of the last write or hit. Used for LRU eviction."""
+
+
+class ScreeningJob(SQLModelBase, table=True):
+    """Screening work queued for a worker process, and its progress.
+
+    Pages insert a queued job and poll the row, workers claim jobs with
+    ``FOR UPDATE SKIP LOCKED`` so each job runs once however many workers there
+    are. See :mod:`sr_assistant.app.worker`.
+    """
+
+    _tablename: t.ClassVar[t.Literal["screening_jobs"]] = "screening_jobs"
+    __tablename__ = _tablename  # pyright: ignore # type: ignore
+
+    __table_args__ = (
+        sa.Index(f"ix_{_tablename}_status_created_at", "status", "created_at"),
+        # A review has at most one queued or running job of each kind
+        sa.Index(
+            f"uq_{_tablename}_review_id_kind_active",
+            "review_id",
+            "kind",
+            unique=True,
+            postgresql_where=sa.text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+
+    created_at: datetime | None = Field(
+        default=None,
+        sa_column=sa.Column(
+            sa.DateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('UTC', CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+    )
+    """Database generated UTC timestamp when the job was queued."""
+
+    updated_at: datetime | None = Field(
+        default=None,
+        sa_column=sa.Column(
+            sa.DateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('UTC', CURRENT_TIMESTAMP)"),
+            onupdate=sa.func.now(),
+            nullable=True,
+        ),
+    )
+
+    review_id: uuid.UUID = Field(foreign_key="systematic_reviews.id", index=True)
+
+    kind: ScreeningJobKind = Field(
+        sa_column=sa.Column(
+            sa_pg.ENUM(
+                ScreeningJobKind, name="screeningjobkind", values_callable=enum_values
+            ),
+            nullable=False,
+        )
+    )
+
+    status: ScreeningJobStatus = Field(
+        default=ScreeningJobStatus.QUEUED,
+        sa_column=sa.Column(
+            sa_pg.ENUM(
+                ScreeningJobStatus,
+                name="screeningjobstatus",
+                values_callable=enum_values,
+            ),
+            nullable=False,
+        ),
+    )
+
+    params: Mapping[str, JsonValue] = Field(
+        default_factory=dict, sa_column=sa.Column(sa_pg.JSONB, nullable=False)
+    )
+    """Arguments of the job's handler, see ``sr_assistant.app.services``."""
+
+    total_items: int = Field(default=0)
+    processed_items: int = Field(default=0)
+
+    stats: Mapping[str, JsonValue] = Field(
+        default_factory=dict, sa_column=sa.Column(sa_pg.JSONB, nullable=False)
+    )
+    """Counters of the run so far, e.g. conflicts and errors."""
+
+    worker_id: str | None = Field(default=None)
+    """Worker running the job, None while queued."""
+
+    attempts: int = Field(default=0)
+    """Times the job was claimed, including after a worker stopped heartbeating."""
+
+    started_at: datetime | None = Field(
+        default=None, sa_column=sa.Column(sa.DateTime(timezone=True), nullable=True)
+    )
+    heartbeat_at: datetime | None = Field(
+        default=None, sa_column=sa.Column(sa.DateTime(timezone=True), nullable=True)
+    )
+    """Last progress update of the running worker."""
+    finished_at: datetime | None = Field(
+        default=None, sa_column=sa.Column(sa.DateTime(timezone=True), nullable=True)
+    )
+
+    error: str | None = Field(
+        default=None, sa_column=sa.Column(sa.Text(), nullable=True)
+    )
+    """Why the job failed."""
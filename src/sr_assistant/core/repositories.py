@@ -51,7 +51,22 @@ import uuid
 
 from loguru import logger
 from pydantic.types import JsonValue
-from sqlalchemy import func, text
+from sqlalchemy import (
+    LargeBinary,
+    Uuid,
+    cast,
+    column,
+    func,
+    literal,
+    literal_column,
+    text,
+)
+from sqlalchemy import delete as sa_delete
+from sqlalchemy import insert as sa_insert
+from sqlalchemy import update as sa_update
+from sqlalchemy import values as sa_values
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlmodel import Session, and_, col, or_, select
 from sqlmodel.sql.expression import SelectOfScalar
@@ -60,8 +75,10 @@ from sr_assistant.core.models import (
     Base,
     BenchmarkResultItem,
     BenchmarkRun,
+    LLMCacheEntry,
     LogRecord,
     ScreenAbstractResult,
+    ScreeningJob,
     ScreeningResolution,
     SearchResult,
     SystematicReview,
@@ -69,12 +86,16 @@ from sr_assistant.core.models import (
 from sr_assistant.core.schemas import ExclusionReasons, SearchResultFilter
 from sr_assistant.core.types import (
     LogLevel,
+    ScreeningJobStatus,
     ScreeningStrategyType,
     SearchDatabaseSource,
 )
 
 if t.TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Collection, Iterable, Mapping, Sequence
+    from datetime import datetime
+
+    from sr_assistant.core.types import ScreeningJobKind
 
 
 # Define a protocol for models with an ID
@@ -82,6 +103,47 @@ class ModelWithID(t.Protocol):
     id: uuid.UUID
 
 
+GET_MANY_CHUNK_SIZE = 1000
+"""IDs per ``IN`` query of :meth:`BaseRepository.get_many_by_ids`."""
+
+
+class RecordsByIds[T](t.NamedTuple):
+    """Records fetched by :meth:`BaseRepository.get_many_by_ids`."""
+
+    records: list[T]
+    missing_ids: list[uuid.UUID]
+    """Requested IDs without a record, in request order."""
+
+
+UPSERT_CHUNK_SIZE = 500
+"""Rows per ``INSERT ... ON CONFLICT`` of :meth:`SearchResultRepository.upsert_many`."""
+
+# Columns taken from the source record, overwritten when an upsert updates a row.
+# The signature is reset so deduplication recomputes it from the new text.
+_SEARCH_RESULT_SOURCE_COLUMNS = (
+    "doi",
+    "title",
+    "abstract",
+    "journal",
+    "year",
+    "authors",
+    "keywords",
+    "raw_data",
+    "source_metadata",
+    "minhash_signature",
+)
+
+
+class UpsertResult[T](t.NamedTuple):
+    """Outcome of :meth:`SearchResultRepository.upsert_many`."""
+
+    inserted: list[T]
+    updated: list[T]
+    """Existing records overwritten with the new values, empty unless updating."""
+    skipped: int
+    """Records not written: existing ones unless updating, and repeated source keys."""
+
+
 class RepositoryError(Exception):
     """Base exception for persistence layer failures."""
 
@@ -141,6 +203,53 @@ class BaseRepository[T: Base]:
             logger.exception(msg)
             raise RepositoryError(msg) from exc
 
+    def get_many_by_ids(
+        self,
+        session: Session,
+        ids: Iterable[uuid.UUID],
+        *,
+        preserve_order: bool = True,
+        chunk_size: int = GET_MANY_CHUNK_SIZE,
+    ) -> RecordsByIds[T]:
+        """Get records by ID with one ``IN`` query per ``chunk_size`` IDs.
+
+        Args:
+            session: The database session.
+            ids: IDs to fetch, duplicates are fetched once.
+            preserve_order: Return the records in the order of ``ids``, else in
+                database order.
+            chunk_size: Maximum IDs per query.
+
+        Returns:
+            RecordsByIds[T]: The records found and the IDs that weren't.
+
+        Raises:
+            RepositoryError: If a database error occurs.
+        """
+        Model = self.model_cls
+        unique_ids = list(dict.fromkeys(ids))
+        found: dict[uuid.UUID, T] = {}
+        try:
+            for start in range(0, len(unique_ids), chunk_size):
+                stmt = select(Model).where(
+                    col(Model.id).in_(unique_ids[start : start + chunk_size])  # pyright: ignore[attr-defined]
+                )
+                for record in session.exec(stmt).all():
+                    found[record.id] = record  # pyright: ignore[attr-defined]
+        except SQLAlchemyError as exc:
+            msg = f"Database error fetching {len(unique_ids)} {Model.__name__} records by ID: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+        missing_ids = [id_ for id_ in unique_ids if id_ not in found]
+        if missing_ids:
+            logger.debug(f"{len(missing_ids)} {Model.__name__} IDs not found")
+        records = (
+            [found[id_] for id_ in unique_ids if id_ in found]
+            if preserve_order
+            else list(found.values())
+        )
+        return RecordsByIds(records, missing_ids)
+
     def get_all(self, session: Session, limit: int | None = None) -> Sequence[T]:
         try:
             query = select(self.model_cls)
@@ -284,6 +393,33 @@ class SystematicReviewRepository(BaseRepository[SystematicReview]):
         logger.debug("Calling get_by_id via get_with_all alias.")
         return self.get_by_id(session, id)
 
+    def set_metadata_key(
+        self, session: Session, id: uuid.UUID, key: str, value: JsonValue | None
+    ) -> None:
+        """Set one ``review_metadata`` key, or remove it if ``value`` is None.
+
+        Updated in place in the database, the review's other fields and metadata keys
+        aren't written. Doesn't commit.
+        """
+        metadata = col(SystematicReview.review_metadata)
+        try:
+            session.execute(
+                sa_update(SystematicReview)
+                .where(col(SystematicReview.id) == id)
+                .values(
+                    review_metadata=(
+                        metadata.op("-")(key)
+                        if value is None
+                        else metadata.op("||")(literal({key: value}, JSONB))
+                    )
+                )
+                .execution_options(synchronize_session=False)
+            )
+        except SQLAlchemyError as exc:
+            msg = f"Failed to set review_metadata[{key!r}] of SystematicReview {id}: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+
 
 class SearchResultRepository(BaseRepository[SearchResult]):
     """Repository for SearchResult model operations."""
@@ -526,6 +662,194 @@ class SearchResultRepository(BaseRepository[SearchResult]):
             logger.exception(msg)
             raise RepositoryError(msg) from exc
 
+    def upsert_many(
+        self,
+        session: Session,
+        results: Sequence[SearchResult],
+        *,
+        update_existing: bool = False,
+        chunk_size: int = UPSERT_CHUNK_SIZE,
+    ) -> UpsertResult[SearchResult]:
+        """Insert search results with ``INSERT ... ON CONFLICT ... RETURNING``.
+
+        Conflicts on ``uq_review_source_id`` (review, source database and source ID)
+        are skipped, or with ``update_existing`` overwrite the source columns of the
+        stored record, so concurrent searches of a review don't fail on each other.
+        Only the first of repeated source keys in ``results`` is written.
+
+        Written records are returned as loaded from ``RETURNING`` with their server
+        defaults, the given instances aren't added to the session.
+
+        Args:
+            session: The database session.
+            results: Search results to write.
+            update_existing: Overwrite stored records instead of skipping them.
+            chunk_size: Rows per statement.
+
+        Returns:
+            UpsertResult[SearchResult]: Inserted and updated records, in input order
+                per statement, and the number of skipped ones.
+
+        Raises:
+            ConstraintViolationError: If another constraint is violated.
+            RepositoryError: If a database error occurs.
+        """
+        # ON CONFLICT DO UPDATE can't affect a row twice in one statement
+        unique: dict[tuple[uuid.UUID, SearchDatabaseSource, str], SearchResult] = {}
+        for result in results:
+            unique.setdefault(
+                (result.review_id, result.source_db, result.source_id), result
+            )
+        rows = [
+            result.model_dump(exclude={"created_at", "updated_at"})
+            for result in unique.values()
+        ]
+        inserted: list[SearchResult] = []
+        updated: list[SearchResult] = []
+        try:
+            for start in range(0, len(rows), chunk_size):
+                stmt = pg_insert(SearchResult).values(rows[start : start + chunk_size])
+                if update_existing:
+                    stmt = stmt.on_conflict_do_update(
+                        constraint="uq_review_source_id",
+                        set_={
+                            **{
+                                name: stmt.excluded[name]
+                                for name in _SEARCH_RESULT_SOURCE_COLUMNS
+                            },
+                            "updated_at": func.now(),
+                        },
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(constraint="uq_review_source_id")
+                # xmax is 0 for rows this statement inserted, not for updated ones
+                returning = stmt.returning(
+                    SearchResult, literal_column("xmax = 0").label("inserted")
+                ).execution_options(populate_existing=True)
+                for record, was_inserted in session.execute(returning):
+                    (inserted if was_inserted else updated).append(record)
+        except IntegrityError as exc:
+            msg = f"Constraint violation upserting {len(rows)} SearchResults: {exc}"
+            logger.exception(msg)
+            raise ConstraintViolationError(msg) from exc
+        except SQLAlchemyError as exc:
+            msg = f"Failed to upsert {len(rows)} SearchResults: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+        return UpsertResult(
+            inserted=inserted,
+            updated=updated,
+            skipped=len(results) - len(inserted) - len(updated),
+        )
+
+    def link_screening_results(
+        self,
+        session: Session,
+        links: Mapping[uuid.UUID, tuple[uuid.UUID | None, uuid.UUID | None]],
+    ) -> int:
+        """Set many search results' screening result IDs with one UPDATE ... FROM VALUES.
+
+        Doesn't load the search results, in-session instances aren't refreshed.
+
+        Args:
+            session: The database session.
+            links: ``(conservative_result_id, comprehensive_result_id)`` by search
+                result ID. None keeps the current ID.
+
+        Returns:
+            int: Number of updated rows.
+
+        Raises:
+            RepositoryError: If a database error occurs.
+        """
+        if not links:
+            return 0
+        rows = sa_values(
+            column("id", Uuid),
+            column("conservative_result_id", Uuid),
+            column("comprehensive_result_id", Uuid),
+            name="links",
+        ).data(
+            [
+                (sr_id, conservative_id, comprehensive_id)
+                for sr_id, (conservative_id, comprehensive_id) in links.items()
+            ]
+        )
+        try:
+            result = session.execute(
+                sa_update(SearchResult)
+                .where(col(SearchResult.id) == rows.c.id)
+                .values(
+                    # Casts type all-NULL VALUES columns
+                    conservative_result_id=func.coalesce(
+                        cast(rows.c.conservative_result_id, Uuid),
+                        col(SearchResult.conservative_result_id),
+                    ),
+                    comprehensive_result_id=func.coalesce(
+                        cast(rows.c.comprehensive_result_id, Uuid),
+                        col(SearchResult.comprehensive_result_id),
+                    ),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount  # type: ignore[attr-defined]
+        except SQLAlchemyError as exc:
+            msg = (
+                f"Failed to link screening results of {len(links)} SearchResults: {exc}"
+            )
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+
+    def mark_duplicates(
+        self,
+        session: Session,
+        duplicates: Mapping[uuid.UUID, tuple[uuid.UUID | None, bytes | None]],
+    ) -> int:
+        """Set many search results' duplicate marks with one UPDATE ... FROM VALUES.
+
+        Doesn't load the search results, in-session instances aren't refreshed.
+
+        Args:
+            session: The database session.
+            duplicates: ``(duplicate_of_id, minhash_signature)`` by search result ID.
+                Both are set as given, None clears them.
+
+        Returns:
+            int: Number of updated rows.
+
+        Raises:
+            RepositoryError: If a database error occurs.
+        """
+        if not duplicates:
+            return 0
+        rows = sa_values(
+            column("id", Uuid),
+            column("duplicate_of_id", Uuid),
+            column("minhash_signature", LargeBinary),
+            name="duplicates",
+        ).data(
+            [
+                (sr_id, duplicate_of_id, signature)
+                for sr_id, (duplicate_of_id, signature) in duplicates.items()
+            ]
+        )
+        try:
+            result = session.execute(
+                sa_update(SearchResult)
+                .where(col(SearchResult.id) == rows.c.id)
+                .values(
+                    # Casts type all-NULL VALUES columns
+                    duplicate_of_id=cast(rows.c.duplicate_of_id, Uuid),
+                    minhash_signature=cast(rows.c.minhash_signature, LargeBinary),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount  # type: ignore[attr-defined]
+        except SQLAlchemyError as exc:
+            msg = f"Failed to mark duplicates of {len(duplicates)} SearchResults: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+
 
 class ScreenAbstractResultRepository(BaseRepository[ScreenAbstractResult]):
     """Repository for ScreenAbstractResult model operations.
@@ -554,6 +878,37 @@ class ScreenAbstractResultRepository(BaseRepository[ScreenAbstractResult]):
         ```
     """
 
+    def insert_many(
+        self, session: Session, results: Sequence[ScreenAbstractResult]
+    ) -> None:
+        """Insert screening results with multi-row INSERTs, bypassing the unit of work.
+
+        The instances aren't added to the session. ``created_at``/``updated_at`` are
+        left to their server defaults.
+
+        Raises:
+            ConstraintViolationError: If a constraint is violated.
+            RepositoryError: If a database error occurs.
+        """
+        if not results:
+            return
+        try:
+            session.execute(
+                sa_insert(ScreenAbstractResult),
+                [
+                    result.model_dump(exclude={"created_at", "updated_at"})
+                    for result in results
+                ],
+            )
+        except IntegrityError as exc:
+            msg = f"Constraint violation inserting {len(results)} ScreenAbstractResults: {exc}"
+            logger.exception(msg)
+            raise ConstraintViolationError(msg) from exc
+        except SQLAlchemyError as exc:
+            msg = f"Failed to insert {len(results)} ScreenAbstractResults: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+
     def get_by_review_id(
         self, session: Session, review_id: uuid.UUID
     ) -> Sequence[ScreenAbstractResult]:
@@ -667,6 +1022,24 @@ class ScreenAbstractResultRepository(BaseRepository[ScreenAbstractResult]):
             logger.exception(msg)
             raise RepositoryError(msg) from exc
 
+    def get_by_reuse_keys(
+        self, session: Session, reuse_keys: Collection[str]
+    ) -> Sequence[ScreenAbstractResult]:
+        """Get screening results with any of the reuse keys, most recent first."""
+        if not reuse_keys:
+            return []
+        try:
+            stmt = (
+                select(self.model_cls)
+                .where(col(self.model_cls.reuse_key).in_(list(reuse_keys)))
+                .order_by(col(self.model_cls.created_at).desc())
+            )
+            return session.exec(stmt).all()
+        except SQLAlchemyError as exc:
+            msg = f"Failed to fetch ScreenAbstractResult by {len(reuse_keys)} reuse keys: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+
 
 class LogRepository(BaseRepository[LogRecord]):
     """Repository for log records."""
@@ -792,3 +1165,405 @@ class BenchmarkResultItemRepository(BaseRepository[BenchmarkResultItem]):
             msg = f"Failed to fetch BenchmarkResultItems for search result {search_result_id}: {exc}"
             logger.exception(msg)
             raise RepositoryError(msg) from exc
+
+    def get_conflict_stats(self, session: Session) -> tuple[int, int]:
+        """Count benchmark items whose reviewers needed the resolver.
+
+        An item counts as a conflict if the resolver decided it or the two
+        reviewers disagreed. Items missing a reviewer decision are left out.
+
+        Returns:
+            tuple[int, int]: Number of conflicts and of items considered.
+        """
+        try:
+            conflict = or_(
+                col(self.model_cls.resolver_decision).is_not(None),
+                col(self.model_cls.conservative_decision)
+                != col(self.model_cls.comprehensive_decision),
+            )
+            stmt = select(func.count().filter(conflict), func.count()).where(
+                col(self.model_cls.conservative_decision).is_not(None),
+                col(self.model_cls.comprehensive_decision).is_not(None),
+            )
+            conflicts, total = session.exec(stmt).one()
+            return int(conflicts), int(total)
+        except SQLAlchemyError as exc:
+            msg = f"Failed to count BenchmarkResultItem conflicts: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+
+
+class LLMCacheEntryRepository(BaseRepository[LLMCacheEntry]):
+    """Repository for LLMCacheEntry model operations."""
+
+    def get_by_key(self, session: Session, cache_key: str) -> LLMCacheEntry | None:
+        """Get a cache entry by its content hash."""
+        try:
+            stmt = select(self.model_cls).where(self.model_cls.cache_key == cache_key)
+            return session.exec(stmt).first()
+        except SQLAlchemyError as exc:
+            msg = f"Failed to fetch LLMCacheEntry {cache_key}: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+
+    def touch(self, session: Session, cache_key: str) -> None:
+        """Record a cache hit: bump ``hit_count`` and ``last_accessed_at``."""
+        try:
+            session.execute(
+                sa_update(LLMCacheEntry)
+                .where(col(LLMCacheEntry.cache_key) == cache_key)
+                .values(
+                    hit_count=col(LLMCacheEntry.hit_count) + 1,
+                    last_accessed_at=func.now(),
+                )
+            )
+        except SQLAlchemyError as exc:
+            msg = f"Failed to touch LLMCacheEntry {cache_key}: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+
+    def upsert(
+        self,
+        session: Session,
+        *,
+        cache_key: str,
+        namespace: str,
+        model_name: str,
+        value: Mapping[str, JsonValue],
+    ) -> None:
+        """Insert a cache entry, replacing the value if the key already exists."""
+        try:
+            stmt = pg_insert(LLMCacheEntry).values(
+                id=uuid.uuid4(),
+                cache_key=cache_key,
+                namespace=namespace,
+                model_name=model_name,
+                value=value,
+                hit_count=0,
+            )
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[LLMCacheEntry.cache_key],
+                    set_={
+                        "value": stmt.excluded.value,
+                        "model_name": stmt.excluded.model_name,
+                        "created_at": func.now(),
+                        "last_accessed_at": func.now(),
+                    },
+                )
+            )
+        except SQLAlchemyError as exc:
+            msg = f"Failed to upsert LLMCacheEntry {cache_key}: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+
+    def evict(
+        self,
+        session: Session,
+        *,
+        max_entries: int | None = None,
+        expired_before: datetime | None = None,
+    ) -> int:
+        """Delete expired entries and least recently used entries over ``max_entries``.
+
+        Args:
+            session: The database session.
+            max_entries: Keep at most this many entries. None disables LRU eviction.
+            expired_before: Delete entries created before this time. None disables TTL
+                eviction.
+
+        Returns:
+            Number of deleted entries.
+
+        Raises:
+            RepositoryError: If a database error occurs.
+        """
+        deleted = 0
+        try:
+            if expired_before is not None:
+                res = session.execute(
+                    sa_delete(LLMCacheEntry).where(
+                        col(LLMCacheEntry.created_at) < expired_before
+                    )
+                )
+                deleted += res.rowcount  # pyright: ignore[reportAttributeAccessIssue]
+            if max_entries is not None:
+                # Delete from the bottom of the last_accessed_at index, everything at
+                # or below the first entry past max_entries.
+                cutoff = (
+                    select(LLMCacheEntry.last_accessed_at)
+                    .order_by(col(LLMCacheEntry.last_accessed_at).desc())
+                    .offset(max_entries)
+                    .limit(1)
+                    .scalar_subquery()
+                )
+                res = session.execute(
+                    sa_delete(LLMCacheEntry).where(
+                        col(LLMCacheEntry.last_accessed_at) <= cutoff
+                    )
+                )
+                deleted += res.rowcount  # pyright: ignore[reportAttributeAccessIssue]
+        except SQLAlchemyError as exc:
+            msg = f"Failed to evict LLMCacheEntry records: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+        return deleted
+
+
+class ScreeningJobRepository(BaseRepository[ScreeningJob]):
+    """Repository for ScreeningJob model operations.
+
+    Workers claim jobs with :meth:`claim_next` and report on them only while they
+    still own them: progress and finishing are conditional on the job still being
+    ``running`` under the worker's ID, so a cancelled job, or one requeued after
+    its worker stopped heartbeating, isn't written by the old worker.
+    """
+
+    def get_by_review_id(
+        self,
+        session: Session,
+        review_id: uuid.UUID,
+        *,
+        kind: ScreeningJobKind | None = None,
+    ) -> Sequence[ScreeningJob]:
+        """Get a review's jobs, newest first."""
+        try:
+            stmt = select(self.model_cls).where(self.model_cls.review_id == review_id)
+            if kind is not None:
+                stmt = stmt.where(self.model_cls.kind == kind)
+            stmt = stmt.order_by(col(self.model_cls.created_at).desc())
+            return session.exec(stmt).all()
+        except SQLAlchemyError as exc:
+            msg = f"Failed to fetch ScreeningJobs for review {review_id}: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+
+    def claim_next(
+        self,
+        session: Session,
+        worker_id: str,
+        *,
+        kinds: Collection[ScreeningJobKind] | None = None,
+    ) -> ScreeningJob | None:
+        """Claim the oldest queued job for a worker.
+
+        One ``UPDATE ... WHERE id = (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING``:
+        a worker skips the row another worker is claiming rather than waiting for
+        its lock, so each job is claimed once however many workers poll. The claim
+        holds once the caller commits.
+
+        Args:
+            session: The database session.
+            worker_id: ID of the claiming worker.
+            kinds: Kinds of jobs to claim, None for any.
+
+        Returns:
+            The claimed job, None if no job is queued.
+
+        Raises:
+            RepositoryError: If a database error occurs.
+        """
+        next_job = select(ScreeningJob.id).where(
+            col(ScreeningJob.status) == ScreeningJobStatus.QUEUED
+        )
+        if kinds:
+            next_job = next_job.where(col(ScreeningJob.kind).in_(kinds))
+        next_job = (
+            next_job.order_by(col(ScreeningJob.created_at))
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        try:
+            return session.execute(
+                sa_update(ScreeningJob)
+                .where(col(ScreeningJob.id) == next_job.scalar_subquery())
+                .values(
+                    status=ScreeningJobStatus.RUNNING,
+                    worker_id=worker_id,
+                    attempts=col(ScreeningJob.attempts) + 1,
+                    started_at=func.now(),
+                    heartbeat_at=func.now(),
+                    finished_at=None,
+                    error=None,
+                )
+                .returning(ScreeningJob)
+                .execution_options(populate_existing=True)
+            ).scalar_one_or_none()
+        except SQLAlchemyError as exc:
+            msg = f"Failed to claim a ScreeningJob for worker {worker_id}: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+
+    def _update_owned(
+        self, session: Session, id: uuid.UUID, worker_id: str, /, **values: t.Any
+    ) -> bool:
+        """Update a job if the worker still runs it, see the class docstring."""
+        try:
+            result = session.execute(
+                sa_update(ScreeningJob)
+                .where(
+                    col(ScreeningJob.id) == id,
+                    col(ScreeningJob.worker_id) == worker_id,
+                    col(ScreeningJob.status) == ScreeningJobStatus.RUNNING,
+                )
+                .values(**values)
+                .returning(col(ScreeningJob.id))
+                .execution_options(synchronize_session=False)
+            )
+            return result.first() is not None
+        except SQLAlchemyError as exc:
+            msg = f"Failed to update ScreeningJob {id} of worker {worker_id}: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+
+    def update_progress(
+        self,
+        session: Session,
+        id: uuid.UUID,
+        worker_id: str,
+        *,
+        processed_items: int,
+        stats: Mapping[str, JsonValue],
+        total_items: int | None = None,
+    ) -> bool:
+        """Record a running job's progress, which also serves as its heartbeat.
+
+        Returns:
+            False if the worker no longer owns the job, e.g. it was cancelled, and
+            should stop working on it.
+
+        Raises:
+            RepositoryError: If a database error occurs.
+        """
+        values: dict[str, t.Any] = {
+            "processed_items": processed_items,
+            "stats": stats,
+            "heartbeat_at": func.now(),
+        }
+        if total_items is not None:
+            values["total_items"] = total_items
+        return self._update_owned(session, id, worker_id, **values)
+
+    def heartbeat(self, session: Session, id: uuid.UUID, worker_id: str) -> bool:
+        """Record that a worker is still running a job, between progress updates.
+
+        Returns:
+            False if the worker no longer owns the job.
+
+        Raises:
+            RepositoryError: If a database error occurs.
+        """
+        return self._update_owned(session, id, worker_id, heartbeat_at=func.now())
+
+    def finish(
+        self,
+        session: Session,
+        id: uuid.UUID,
+        worker_id: str,
+        status: ScreeningJobStatus,
+        *,
+        error: str | None = None,
+    ) -> bool:
+        """Mark a running job succeeded, failed or cancelled.
+
+        Returns:
+            False if the worker no longer owned the job, which is left as it was.
+
+        Raises:
+            RepositoryError: If a database error occurs.
+        """
+        return self._update_owned(
+            session, id, worker_id, status=status, error=error, finished_at=func.now()
+        )
+
+    def release(self, session: Session, id: uuid.UUID, worker_id: str) -> bool:
+        """Requeue a running job the worker is stopping before it's done.
+
+        Returns:
+            False if the worker no longer owned the job, which is left as it was.
+
+        Raises:
+            RepositoryError: If a database error occurs.
+        """
+        return self._update_owned(
+            session, id, worker_id, status=ScreeningJobStatus.QUEUED, worker_id=None
+        )
+
+    def cancel(self, session: Session, id: uuid.UUID) -> bool:
+        """Cancel a queued or running job.
+
+        A running job's worker stops at its next progress update.
+
+        Returns:
+            False if the job had already finished.
+
+        Raises:
+            RepositoryError: If a database error occurs.
+        """
+        try:
+            result = session.execute(
+                sa_update(ScreeningJob)
+                .where(
+                    col(ScreeningJob.id) == id,
+                    col(ScreeningJob.status).in_(
+                        [ScreeningJobStatus.QUEUED, ScreeningJobStatus.RUNNING]
+                    ),
+                )
+                .values(status=ScreeningJobStatus.CANCELLED, finished_at=func.now())
+                .returning(col(ScreeningJob.id))
+                .execution_options(synchronize_session=False)
+            )
+            return result.first() is not None
+        except SQLAlchemyError as exc:
+            msg = f"Failed to cancel ScreeningJob {id}: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+
+    def requeue_stale(
+        self, session: Session, *, heartbeat_before: datetime, max_attempts: int
+    ) -> tuple[int, int]:
+        """Requeue running jobs whose worker stopped heartbeating.
+
+        Jobs already claimed ``max_attempts`` times are failed instead, so a job
+        that kills its workers isn't retried forever.
+
+        Args:
+            session: The database session.
+            heartbeat_before: Jobs last heartbeating before this time are stale.
+            max_attempts: Claims after which a stale job is failed.
+
+        Returns:
+            tuple[int, int]: Number of requeued and of failed jobs.
+
+        Raises:
+            RepositoryError: If a database error occurs.
+        """
+        stale = (
+            col(ScreeningJob.status) == ScreeningJobStatus.RUNNING,
+            col(ScreeningJob.heartbeat_at) < heartbeat_before,
+        )
+        try:
+            failed = session.execute(
+                sa_update(ScreeningJob)
+                .where(*stale, col(ScreeningJob.attempts) >= max_attempts)
+                .values(
+                    status=ScreeningJobStatus.FAILED,
+                    error=f"Worker stopped heartbeating, gave up after {max_attempts} attempts",
+                    finished_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            requeued = session.execute(
+                sa_update(ScreeningJob)
+                .where(*stale)
+                .values(status=ScreeningJobStatus.QUEUED, worker_id=None)
+                .execution_options(synchronize_session=False)
+            )
+        except SQLAlchemyError as exc:
+            msg = f"Failed to requeue stale ScreeningJobs: {exc}"
+            logger.exception(msg)
+            raise RepositoryError(msg) from exc
+        return (
+            requeued.rowcount,  # pyright: ignore[reportAttributeAccessIssue]
+            failed.rowcount,  # pyright: ignore[reportAttributeAccessIssue]
+        )
@@ -0,0 +1,229 @@
+"""Asynchronous repository implementations for systematic review models.
+
+Async counterparts of the repositories in :mod:`sr_assistant.core.repositories`.
+Methods take an :class:`~sqlmodel.ext.asyncio.session.AsyncSession` and run the sync
+repository's method on it with ``AsyncSession.run_sync``: the method gets the
+session's sync facade, whose queries are awaited on the event loop instead of
+blocking a thread. Statements, error handling (``RepositoryError`` and
+subclasses) and transaction rules are the sync repository's, so they can't drift
+apart.
+
+Note:
+    - Repositories do not manage transactions, the calling service commits.
+    - Sessions come from ``sr_assistant.app.database.asession_factory`` and are used
+      on the application event loop, see ``sr_assistant.app.database.run_async``.
+
+Examples:
+    ```python
+    search_repo = AsyncSearchResultRepository()
+
+    async with asession_factory() as session:
+        stored = await search_repo.get_existing_source_ids(
+            session, review_id, SearchDatabaseSource.PUBMED, pmids
+        )
+        upserted = await search_repo.upsert_many(session, results)
+        await session.commit()
+
+    # Base methods for any repository
+    log_repo = AsyncBaseRepository(LogRepository())
+    ```
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+from sr_assistant.core.models import (
+    Base,
+    ScreenAbstractResult,
+    SearchResult,
+    SystematicReview,
+)
+from sr_assistant.core.repositories import (
+    GET_MANY_CHUNK_SIZE,
+    UPSERT_CHUNK_SIZE,
+    BaseRepository,
+    RecordsByIds,
+    ScreenAbstractResultRepository,
+    SearchResultRepository,
+    SystematicReviewRepository,
+    UpsertResult,
+)
+
+if t.TYPE_CHECKING:
+    import uuid
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from pydantic.types import JsonValue
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from sr_assistant.core.types import ScreeningStrategyType, SearchDatabaseSource
+
+
+class AsyncBaseRepository[T: Base]:
+    """Base repository implementing common async database operations.
+
+    Args:
+        sync_repo (BaseRepository[T]): Repository whose methods are run on the
+            async sessions.
+    """
+
+    def __init__(self, sync_repo: BaseRepository[T]) -> None:
+        """Initialize the repository wrapping ``sync_repo``."""
+        self.sync_repo = sync_repo
+
+    @property
+    def model_cls(self) -> type[T]:
+        """Get the model class associated with the repository."""
+        return self.sync_repo.model_cls
+
+    async def get_by_id(self, session: AsyncSession, id: uuid.UUID) -> T | None:
+        """See :meth:`BaseRepository.get_by_id`."""
+        return await session.run_sync(self.sync_repo.get_by_id, id)
+
+    async def get_many_by_ids(
+        self,
+        session: AsyncSession,
+        ids: Iterable[uuid.UUID],
+        *,
+        preserve_order: bool = True,
+        chunk_size: int = GET_MANY_CHUNK_SIZE,
+    ) -> RecordsByIds[T]:
+        """See :meth:`BaseRepository.get_many_by_ids`."""
+        return await session.run_sync(
+            self.sync_repo.get_many_by_ids,
+            ids,
+            preserve_order=preserve_order,
+            chunk_size=chunk_size,
+        )
+
+    async def get_all(
+        self, session: AsyncSession, limit: int | None = None
+    ) -> Sequence[T]:
+        """See :meth:`BaseRepository.get_all`."""
+        return await session.run_sync(self.sync_repo.get_all, limit)
+
+    async def list(self, session: AsyncSession, **filters: t.Any) -> Sequence[T]:
+        """See :meth:`BaseRepository.list`."""
+        return await session.run_sync(self.sync_repo.list, **filters)
+
+    async def add(self, session: AsyncSession, record: T) -> T:
+        """See :meth:`BaseRepository.add`."""
+        return await session.run_sync(self.sync_repo.add, record)
+
+    async def add_all(self, session: AsyncSession, objs: Sequence[T]) -> Sequence[T]:
+        """See :meth:`BaseRepository.add_all`."""
+        return await session.run_sync(self.sync_repo.add_all, objs)
+
+    async def update(self, session: AsyncSession, record: T) -> T:
+        """See :meth:`BaseRepository.update`."""
+        return await session.run_sync(self.sync_repo.update, record)
+
+    async def delete(self, session: AsyncSession, id: uuid.UUID) -> None:
+        """See :meth:`BaseRepository.delete`."""
+        await session.run_sync(self.sync_repo.delete, id)
+
+
+class AsyncSystematicReviewRepository(AsyncBaseRepository[SystematicReview]):
+    """Async repository for SystematicReview model operations."""
+
+    sync_repo: SystematicReviewRepository
+
+    def __init__(self, sync_repo: SystematicReviewRepository | None = None) -> None:
+        """Initialize the repository, wrapping a new sync repository by default."""
+        super().__init__(sync_repo or SystematicReviewRepository())
+
+    async def set_metadata_key(
+        self,
+        session: AsyncSession,
+        review_id: uuid.UUID,
+        key: str,
+        value: JsonValue | None,
+    ) -> None:
+        """See :meth:`SystematicReviewRepository.set_metadata_key`."""
+        await session.run_sync(self.sync_repo.set_metadata_key, review_id, key, value)
+
+
+class AsyncSearchResultRepository(AsyncBaseRepository[SearchResult]):
+    """Async repository for SearchResult model operations."""
+
+    sync_repo: SearchResultRepository
+
+    def __init__(self, sync_repo: SearchResultRepository | None = None) -> None:
+        """Initialize the repository, wrapping a new sync repository by default."""
+        super().__init__(sync_repo or SearchResultRepository())
+
+    async def get_by_review_id(
+        self, session: AsyncSession, review_id: uuid.UUID
+    ) -> Sequence[SearchResult]:
+        """See :meth:`SearchResultRepository.get_by_review_id`."""
+        return await session.run_sync(self.sync_repo.get_by_review_id, review_id)
+
+    async def get_existing_source_ids(
+        self,
+        session: AsyncSession,
+        review_id: uuid.UUID,
+        source_db: SearchDatabaseSource,
+        source_ids: list[str],
+    ) -> set[str]:
+        """See :meth:`SearchResultRepository.get_existing_source_ids`."""
+        return await session.run_sync(
+            self.sync_repo.get_existing_source_ids, review_id, source_db, source_ids
+        )
+
+    async def upsert_many(
+        self,
+        session: AsyncSession,
+        results: Sequence[SearchResult],
+        *,
+        update_existing: bool = False,
+        chunk_size: int = UPSERT_CHUNK_SIZE,
+    ) -> UpsertResult[SearchResult]:
+        """See :meth:`SearchResultRepository.upsert_many`."""
+        return await session.run_sync(
+            self.sync_repo.upsert_many,
+            results,
+            update_existing=update_existing,
+            chunk_size=chunk_size,
+        )
+
+    async def link_screening_results(
+        self,
+        session: AsyncSession,
+        links: Mapping[uuid.UUID, tuple[uuid.UUID | None, uuid.UUID | None]],
+    ) -> int:
+        """See :meth:`SearchResultRepository.link_screening_results`."""
+        return await session.run_sync(self.sync_repo.link_screening_results, links)
+
+
+class AsyncScreenAbstractResultRepository(AsyncBaseRepository[ScreenAbstractResult]):
+    """Async repository for ScreenAbstractResult model operations."""
+
+    sync_repo: ScreenAbstractResultRepository
+
+    def __init__(self, sync_repo: ScreenAbstractResultRepository | None = None) -> None:
+        """Initialize the repository, wrapping a new sync repository by default."""
+        super().__init__(sync_repo or ScreenAbstractResultRepository())
+
+    async def insert_many(
+        self, session: AsyncSession, results: Sequence[ScreenAbstractResult]
+    ) -> None:
+        """See :meth:`ScreenAbstractResultRepository.insert_many`."""
+        await session.run_sync(self.sync_repo.insert_many, results)
+
+    async def get_by_review_id(
+        self, session: AsyncSession, review_id: uuid.UUID
+    ) -> Sequence[ScreenAbstractResult]:
+        """See :meth:`ScreenAbstractResultRepository.get_by_review_id`."""
+        return await session.run_sync(self.sync_repo.get_by_review_id, review_id)
+
+    async def get_by_strategy(
+        self,
+        session: AsyncSession,
+        review_id: uuid.UUID,
+        strategy: ScreeningStrategyType,
+    ) -> Sequence[ScreenAbstractResult]:
+        """See :meth:`ScreenAbstractResultRepository.get_by_strategy`."""
+        return await session.run_sync(
+            self.sync_repo.get_by_strategy, review_id, strategy
+        )
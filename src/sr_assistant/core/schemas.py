@@ -163,6 +163,23 @@ class ScreeningResponse(BaseSchema):
     """
 
 
+class PackedScreeningItem(ScreeningResponse):
+    """Your systematic review screening response/decision for one of the given studies.
+
+    Assess each study independently, as if it were the only study given.
+    """
+
+    search_result_id: str = Field(...)
+    """The search_result_id of the study this decision is for, copied verbatim."""
+
+
+class PackedScreeningResponse(BaseSchema):
+    """Your systematic review screening responses/decisions for all the given studies."""
+
+    items: list[PackedScreeningItem] = Field(...)
+    """Exactly one screening response per given study, in any order."""
+
+
 # response fields:
 # From model:
 # - decision ScreeningDecisionType
@@ -627,6 +644,9 @@ class SearchResultRead(BaseSchema):
     resolution_id: uuid.UUID | None = None
     """Identifier of the ScreeningResolution record, if a conflict was resolved for this search result."""
 
+    duplicate_of_id: uuid.UUID | None = None
+    """Representative search result this one is a near-duplicate of, screened in its place."""
+
     # Add relationships if needed
     # resolution: Optional["ScreeningResolutionRead"] = None
     # conservative_result: Optional["ScreenAbstractResultRead"] = None
@@ -2836,6 +2836,25 @@ class LogLevel(StrEnum):
     CRITICAL = auto(), 50
 
 
+class ScreeningJobKind(StrEnum):
+    """Work a ``screening_jobs`` row asks the worker to do."""
+
+    ABSTRACT_SCREENING = auto()
+    """Screen search results of a review and resolve the reviewers' conflicts."""
+    BENCHMARK = auto()
+    """Screen a benchmark review into a BenchmarkRun and calculate its metrics."""
+
+
+class ScreeningJobStatus(StrEnum):
+    """Lifecycle of a ``screening_jobs`` row."""
+
+    QUEUED = auto()
+    RUNNING = auto()
+    SUCCEEDED = auto()
+    FAILED = auto()
+    CANCELLED = auto()
+
+
 class SearchDatabaseSource(StrEnum):
     """Enum for supported search database sources."""
 
@@ -8,6 +8,10 @@ from __future__ import annotations
 from langchain_openai import ChatOpenAI
 from loguru import logger
 
+from sr_assistant.app.agents.retry_policy import (
+    structured_output_with_repair,
+    with_retry_policy,
+)
 from sr_assistant.core.models import SystematicReview
 from sr_assistant.core.schemas import PicosSuggestions, SuggestionResult
 
@@ -17,9 +21,14 @@ class SuggestionAgent:
 
     def __init__(self, model: str = "gpt-4o", temperature: float = 0.0) -> None:
         """Initialize the agent with model configuration."""
-        self.llm = ChatOpenAI(
-            model=model, temperature=temperature
-        ).with_structured_output(PicosSuggestions)
+        # max_retries=0: the retry policy does the retrying, the SDK's own retries
+        # would multiply its attempts.
+        self.llm = with_retry_policy(
+            structured_output_with_repair(
+                ChatOpenAI(model=model, temperature=temperature, max_retries=0),
+                PicosSuggestions,
+            )
+        )
 
     @logger.catch(Exception)
     def get_suggestions(self, review: SystematicReview) -> SuggestionResult:
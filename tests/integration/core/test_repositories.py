@@ -332,3 +332,47 @@ def existing_review_id(db_session: Session) -> uuid.UUID:
     if not review:
         pytest.skip(f"Review ID {hardcoded_id} not found in integration database.")
     return hardcoded_id
+
+
+@pytest.mark.integration
+def test_search_result_upsert_many(
+    db_session: Session, test_review: models.SystematicReview
+):
+    """Test upsert_many skips or updates rows with the same source key."""
+    repo = SearchResultRepository()
+
+    def _result(source_id: str, title: str) -> models.SearchResult:
+        return models.SearchResult(
+            review_id=test_review.id,
+            source_db=SearchDatabaseSource.PUBMED,
+            source_id=source_id,
+            title=title,
+        )
+
+    first = repo.upsert_many(db_session, [_result("UP1", "A"), _result("UP2", "B")])
+    db_session.commit()
+    assert [r.source_id for r in first.inserted] == ["UP1", "UP2"]
+    assert all(r.created_at is not None for r in first.inserted)
+
+    skipped = repo.upsert_many(
+        db_session, [_result("UP2", "B2"), _result("UP3", "C"), _result("UP3", "C2")]
+    )
+    db_session.commit()
+    assert [r.source_id for r in skipped.inserted] == ["UP3"]
+    assert skipped.updated == []
+    assert skipped.skipped == 2  # noqa: PLR2004
+
+    updated = repo.upsert_many(
+        db_session, [_result("UP1", "A2"), _result("UP4", "D")], update_existing=True
+    )
+    db_session.commit()
+    assert [r.source_id for r in updated.inserted] == ["UP4"]
+    assert [(r.source_id, r.title) for r in updated.updated] == [("UP1", "A2")]
+    assert updated.updated[0].id == first.inserted[0].id
+    stored = repo.get_by_review_id(db_session, test_review.id)
+    assert {r.source_id: r.title for r in stored} == {
+        "UP1": "A2",
+        "UP2": "B",
+        "UP3": "C",
+        "UP4": "D",
+    }
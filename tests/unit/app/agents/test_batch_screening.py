@@ -0,0 +1,206 @@
+"""Unit tests for offline bulk screening through batch jobs."""
+
+from __future__ import annotations
+
+import json
+import typing as t
+import uuid
+
+import httpx
+import pytest
+from langchain_openai import ChatOpenAI
+from pydantic import SecretStr
+
+from sr_assistant.app.agents.batch_screening import (
+    SCREENING_RESPONSE_FORMAT,
+    BatchJob,
+    BatchScreeningError,
+    LocalBatchJobClient,
+    make_batch_requests,
+    make_custom_id,
+    parse_batch_results,
+    parse_custom_id,
+)
+from sr_assistant.app.agents.retry_policy import structured_output_with_repair
+from sr_assistant.core import models
+from sr_assistant.core.schemas import ScreeningResponse
+from sr_assistant.core.types import (
+    ScreeningDecisionType,
+    ScreeningStrategyType,
+    SearchDatabaseSource,
+)
+
+
+def fake_chat_completion(body: dict[str, t.Any]) -> dict[str, t.Any]:
+    """Answer a screening request like the chat completions API would."""
+    if "Abstract FAIL" in body["messages"][-1]["content"]:
+        msg = "model overloaded"
+        raise RuntimeError(msg)
+    screening_response = {
+        "decision": ScreeningDecisionType.INCLUDE,
+        "confidence_score": 0.9,
+        "rationale": "Matches criteria",
+    }
+    return {
+        "id": "chatcmpl-1",
+        "created": 1_700_000_000,
+        "model": body["model"],
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {
+                    "role": "assistant",
+                    "content": json.dumps(screening_response),
+                    "refusal": None,
+                },
+            }
+        ],
+        "usage": {
+            "prompt_tokens": 1500,
+            "completion_tokens": 80,
+            "prompt_tokens_details": {"cached_tokens": 1280},
+        },
+    }
+
+
+@pytest.fixture
+def review() -> models.SystematicReview:
+    return models.SystematicReview(
+        id=uuid.uuid4(),
+        background="Background",
+        research_question="Question?",
+        inclusion_criteria="Adults",
+        exclusion_criteria="Children",
+    )
+
+
+def _search_result(review_id: uuid.UUID, abstract: str) -> models.SearchResult:
+    return models.SearchResult(
+        id=uuid.uuid4(),
+        review_id=review_id,
+        source_db=SearchDatabaseSource.PUBMED,
+        source_id=abstract,
+        title="Title",
+        year="2024",
+        abstract=abstract,
+    )
+
+
+def test_custom_id_roundtrip() -> None:
+    sr_id = uuid.uuid4()
+    custom_id = make_custom_id(sr_id, ScreeningStrategyType.COMPREHENSIVE)
+    assert parse_custom_id(custom_id) == (sr_id, ScreeningStrategyType.COMPREHENSIVE)
+    with pytest.raises(BatchScreeningError):
+        parse_custom_id("not-a-custom-id")
+
+
+def test_make_batch_requests(review: models.SystematicReview) -> None:
+    search_results = [_search_result(review.id, f"Abstract {i}") for i in range(2)]
+
+    requests = make_batch_requests(search_results, review)
+
+    assert len(requests) == 4  # noqa: PLR2004
+    assert {r["custom_id"] for r in requests} == {
+        make_custom_id(sr.id, strategy)
+        for sr in search_results
+        for strategy in ScreeningStrategyType
+    }
+    first, second = requests[0]["body"], requests[2]["body"]
+    assert first["messages"][0] == second["messages"][0]
+    assert "Abstract 0" in first["messages"][1]["content"]
+    response_format = first["response_format"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["name"] == "ScreeningResponse"
+    assert response_format["json_schema"]["strict"] is True
+    assert "tools" not in first
+    assert all(r["url"] == "/v1/chat/completions" for r in requests)
+
+
+def test_response_format_matches_interactive_chain() -> None:
+    bodies: list[dict[str, t.Any]] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        bodies.append(body)
+        return httpx.Response(200, json=fake_chat_completion(body))
+
+    llm = ChatOpenAI(
+        model="gpt-4o",
+        api_key=SecretStr("test"),
+        max_retries=0,
+        http_client=httpx.Client(transport=httpx.MockTransport(_handler)),
+    )
+    structured_output_with_repair(llm, ScreeningResponse).invoke("Screen this")
+
+    assert bodies[0]["response_format"] == SCREENING_RESPONSE_FORMAT
+
+
+def test_local_client_roundtrip(
+    review: models.SystematicReview, tmp_path: t.Any
+) -> None:
+    search_results = [
+        _search_result(review.id, "Abstract OK"),
+        _search_result(review.id, "Abstract FAIL"),
+    ]
+    client = LocalBatchJobClient(tmp_path, responder=fake_chat_completion)
+
+    job = client.submit(make_batch_requests(search_results, review))
+    assert not job.done
+    job = client.wait(job.id, poll_interval=0)
+    assert (job.status, job.completed_count, job.failed_count) == ("completed", 2, 2)
+
+    parsed = parse_batch_results(client.results(job.id), review_id=review.id, job=job)
+
+    assert len(parsed.results) == 2  # noqa: PLR2004
+    assert set(parsed.errors) == {
+        make_custom_id(search_results[1].id, strategy)
+        for strategy in ScreeningStrategyType
+    }
+    result = parsed.results[0]
+    assert result.search_result_id == search_results[0].id
+    assert result.decision == ScreeningDecisionType.INCLUDE
+    assert result.model_name == "gpt-4o"
+    assert result.response_metadata["batch_job_id"] == job.id
+    assert result.response_metadata["token_usage"]["cached_input_tokens"] == 1280  # noqa: PLR2004
+    # Same trace for both reviewers, ids stable across re-parses
+    assert result.trace_id == parsed.results[1].trace_id
+    reparsed = parse_batch_results(client.results(job.id), review_id=review.id, job=job)
+    assert [r.id for r in reparsed.results] == [r.id for r in parsed.results]
+
+
+def test_unusable_response_is_an_error(review: models.SystematicReview) -> None:
+    sr_id = uuid.uuid4()
+    custom_id = make_custom_id(sr_id, ScreeningStrategyType.CONSERVATIVE)
+    line = {
+        "custom_id": custom_id,
+        "response": {
+            "status_code": 200,
+            "body": {"choices": [{"message": {"content": "include"}}]},
+        },
+        "error": None,
+    }
+
+    parsed = parse_batch_results(
+        [line], review_id=review.id, job=BatchJob("b", "completed")
+    )
+
+    assert parsed.results == []
+    assert custom_id in parsed.errors
+
+    line["response"]["body"] = {
+        "choices": [{"message": {"content": None, "refusal": "I can't help"}}]
+    }
+    parsed = parse_batch_results(
+        [line], review_id=review.id, job=BatchJob("b", "completed")
+    )
+    assert "refused" in parsed.errors[custom_id]
+
+
+def test_wait_raises_on_failed_job(tmp_path: t.Any) -> None:
+    client = LocalBatchJobClient(tmp_path, responder=fake_chat_completion)
+    job = client.submit([])
+    client._write_job(job._replace(status="expired"))  # noqa: SLF001
+
+    with pytest.raises(BatchScreeningError, match="expired"):
+        client.wait(job.id, poll_interval=0)
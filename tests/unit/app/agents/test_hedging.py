@@ -0,0 +1,153 @@
+"""Unit tests for hedged reviewer calls."""
+
+from __future__ import annotations
+
+import asyncio
+import typing as t
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from sr_assistant.app.agents.hedging import (
+    HEDGER_KEY,
+    HedgePolicy,
+    Hedger,
+    LatencyWindow,
+    hedged,
+)
+
+# Hedge after 50ms, with room for one hedge per call
+FAST_POLICY = HedgePolicy(initial_delay=0.05, min_delay=0.0, max_hedge_ratio=1.0)
+
+
+class FakeModel:
+    """Async model whose call latencies are scripted per call."""
+
+    def __init__(self, delays: list[float], errors: set[int] | None = None) -> None:
+        self.delays = delays
+        self.errors = errors or set()
+        self.calls = 0
+        self.cancelled = 0
+        self.hedge_started = asyncio.Event()
+
+    async def __call__(self, value: str) -> str:
+        call = self.calls
+        self.calls += 1
+        if call == 1:
+            self.hedge_started.set()
+        try:
+            await asyncio.sleep(self.delays[call])
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if call in self.errors:
+            msg = f"call {call} failed"
+            raise RuntimeError(msg)
+        return f"{value}:{call}"
+
+
+def _config(hedger: Hedger) -> dict[str, t.Any]:
+    return {"configurable": {HEDGER_KEY: hedger}}
+
+
+def test_latency_window_quantile() -> None:
+    window = LatencyWindow(size=100)
+    for latency in range(1, 201):
+        window.add(float(latency))
+
+    assert len(window) == 100  # noqa: PLR2004
+    assert window.quantile(0.5) == pytest.approx(150.5, abs=0.5)
+    assert window.quantile(0.95) == pytest.approx(195, abs=1)
+
+
+def test_delay_uses_percentile_after_min_samples() -> None:
+    policy = HedgePolicy(min_samples=3, initial_delay=30.0, min_delay=2.0)
+    hedger = Hedger(policy)
+
+    assert hedger.delay() == 30.0  # noqa: PLR2004
+    for latency in (5.0, 6.0, 7.0):
+        hedger.latencies.add(latency)
+    assert 6.0 < hedger.delay() <= 7.0  # noqa: PLR2004
+    hedger.latencies = LatencyWindow()
+    for latency in (0.1, 0.1, 0.1):
+        hedger.latencies.add(latency)
+    assert hedger.delay() == 2.0  # noqa: PLR2004
+
+
+def test_hedge_budget() -> None:
+    hedger = Hedger(HedgePolicy(max_hedge_ratio=0.5, max_hedges=2))
+
+    hedger.start_call()
+    assert not hedger.try_hedge()
+    hedger.start_call()
+    assert hedger.try_hedge()
+    assert not hedger.try_hedge()
+    for _ in range(10):
+        hedger.start_call()
+    assert hedger.try_hedge()
+    assert not hedger.try_hedge()
+    assert hedger.stats().hedges == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged() -> None:
+    model = FakeModel(delays=[10.0, 0.01])
+    hedger = Hedger(FAST_POLICY)
+
+    result = await hedged(RunnableLambda(model)).ainvoke("x", _config(hedger))
+
+    assert result == "x:1"
+    assert model.cancelled == 1
+    stats = hedger.stats()
+    assert (stats.calls, stats.hedges, stats.hedge_wins) == (1, 1, 1)
+    assert len(hedger.latencies) == 1
+
+
+@pytest.mark.asyncio
+async def test_primary_wins_when_hedge_fails() -> None:
+    model = FakeModel(delays=[0.1, 0.01], errors={1})
+    hedger = Hedger(FAST_POLICY)
+
+    result = await hedged(RunnableLambda(model)).ainvoke("x", _config(hedger))
+
+    assert result == "x:0"
+    assert hedger.stats().hedge_wins == 0
+
+
+@pytest.mark.asyncio
+async def test_both_failing_raises_primary_error() -> None:
+    model = FakeModel(delays=[0.1, 0.01], errors={0, 1})
+    hedger = Hedger(FAST_POLICY)
+
+    with pytest.raises(RuntimeError, match="call 0"):
+        await hedged(RunnableLambda(model)).ainvoke("x", _config(hedger))
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_budget_or_hedger() -> None:
+    model = FakeModel(delays=[0.1, 0.1])
+    hedger = Hedger(FAST_POLICY._replace(max_hedges=0))
+    runnable = hedged(RunnableLambda(model))
+
+    assert await runnable.ainvoke("x", _config(hedger)) == "x:0"
+    assert await runnable.ainvoke("y") == "y:1"
+    assert model.calls == 2  # noqa: PLR2004
+    assert hedger.stats().hedges == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelling_caller_cancels_both_calls() -> None:
+    model = FakeModel(delays=[10.0, 10.0])
+    hedger = Hedger(FAST_POLICY)
+
+    call = asyncio.create_task(
+        hedged(RunnableLambda(model)).ainvoke("x", _config(hedger))
+    )
+    async with asyncio.timeout(5):
+        await model.hedge_started.wait()
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    await asyncio.sleep(0)
+
+    assert model.cancelled == 2  # noqa: PLR2004
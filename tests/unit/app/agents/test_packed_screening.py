@@ -0,0 +1,183 @@
+"""Unit tests for packed multi-abstract screening."""
+
+from __future__ import annotations
+
+import typing as t
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from sr_assistant.app.agents import packed_screening
+from sr_assistant.app.agents.packed_screening import (
+    PACKED_SCREENING_TOOL,
+    comprehensive_packed_prompt,
+    conservative_packed_prompt,
+    make_packed_chain_input,
+    parse_packed_response,
+    screen_abstracts_packed,
+)
+from sr_assistant.app.agents.screening_agents import (
+    ScreenAbstractResultTuple,
+    comprehensive_reviewer_prompt,
+    conservative_reviewer_prompt,
+)
+from sr_assistant.core import models
+from sr_assistant.core.schemas import ScreeningResult
+from sr_assistant.core.types import ScreeningDecisionType, ScreeningStrategyType
+
+
+def _item(search_result_id: uuid.UUID | str, **overrides: t.Any) -> dict[str, t.Any]:
+    return {
+        "search_result_id": str(search_result_id),
+        "decision": "include",
+        "confidence_score": 0.9,
+        "rationale": "Matches criteria",
+    } | overrides
+
+
+def _message(items: list[t.Any]) -> AIMessage:
+    return AIMessage(
+        content="",
+        tool_calls=[
+            {"name": PACKED_SCREENING_TOOL, "args": {"items": items}, "id": "call_1"}
+        ],
+        response_metadata={
+            "model_name": "gpt-4o-2024-08-06",
+            "token_usage": {
+                "prompt_tokens": 3000,
+                "completion_tokens": 400,
+                "prompt_tokens_details": {"cached_tokens": 1280},
+            },
+        },
+    )
+
+
+@pytest.fixture
+def review() -> models.SystematicReview:
+    return models.SystematicReview(
+        id=uuid.uuid4(),
+        background="Background",
+        research_question="Question?",
+        inclusion_criteria="Adults",
+        exclusion_criteria="Children",
+    )
+
+
+@pytest.fixture
+def batch(review: models.SystematicReview) -> list[models.SearchResult]:
+    return [
+        models.SearchResult(
+            id=uuid.uuid4(), review_id=review.id, title=f"T{i}", abstract=f"A{i}"
+        )
+        for i in range(3)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("packed_prompt", "single_prompt"),
+    [
+        (conservative_packed_prompt, conservative_reviewer_prompt),
+        (comprehensive_packed_prompt, comprehensive_reviewer_prompt),
+    ],
+)
+def test_packed_prompt_shares_system_prefix(
+    packed_prompt: t.Any,
+    single_prompt: t.Any,
+    review: models.SystematicReview,
+    batch: list[models.SearchResult],
+) -> None:
+    packed_input = make_packed_chain_input(batch, review)
+    packed = packed_prompt.format_messages(**packed_input)
+    single = single_prompt.format_messages(
+        **{k: v for k, v in packed_input.items() if k not in {"pack_size", "studies"}},
+        title="T0",
+        year="",
+        journal="",
+        abstract="A0",
+    )
+
+    assert packed[0].content == single[0].content
+    assert all(str(sr.id) in packed[1].content for sr in batch)
+    assert "3 studies" in packed[1].content
+
+
+def test_parse_packed_response(batch: list[models.SearchResult]) -> None:
+    message = _message(
+        [
+            _item(batch[0].id),
+            _item(batch[1].id, decision="maybe"),  # invalid decision
+            _item(uuid.uuid4()),  # not in the pack
+            _item(batch[2].id),
+            _item(batch[2].id, decision="exclude"),  # duplicate
+        ]
+    )
+
+    responses = parse_packed_response(message, batch)
+
+    assert set(responses) == {batch[0].id}
+    assert responses[batch[0].id].decision == ScreeningDecisionType.INCLUDE
+    assert parse_packed_response(RuntimeError("boom"), batch) == {}
+    assert parse_packed_response(AIMessage(content="include"), batch) == {}
+
+
+def test_screen_abstracts_packed_falls_back(
+    review: models.SystematicReview, batch: list[models.SearchResult]
+) -> None:
+    def _reviewers(input_: dict[str, t.Any]) -> dict[str, AIMessage]:
+        if str(batch[2].id) in input_["studies"]:
+            msg = "pack failed"
+            raise RuntimeError(msg)
+        return {
+            ScreeningStrategyType.CONSERVATIVE: _message(
+                [_item(batch[0].id), _item(batch[1].id)]
+            ),
+            # batch[1] missing from the comprehensive response
+            ScreeningStrategyType.COMPREHENSIVE: _message([_item(batch[0].id)]),
+        }
+
+    fallback_results: list[ScreenAbstractResultTuple] = []
+
+    def _fallback(
+        items: list[models.SearchResult], *_: t.Any, **__: t.Any
+    ) -> t.Iterator[ScreenAbstractResultTuple]:
+        for search_result in reversed(items):
+            result = MagicMock(spec=ScreeningResult)
+            fallback_results.append(
+                ScreenAbstractResultTuple(search_result, result, result)
+            )
+            yield fallback_results[-1]
+
+    fallback = MagicMock(side_effect=_fallback)
+    with (
+        patch.object(
+            packed_screening, "packed_screening_chain", RunnableLambda(_reviewers)
+        ),
+        patch.object(packed_screening, "screen_abstracts_batch_as_completed", fallback),
+    ):
+        output = screen_abstracts_packed(batch, 0, review, pack_size=2)
+
+    assert [r.search_result for r in output.results] == batch
+    assert fallback.call_args.args[0] == [batch[1], batch[2]]
+    assert output.results[1:] == [fallback_results[1], fallback_results[0]]
+
+    packed = output.results[0]
+    assert isinstance(packed.conservative_result, ScreeningResult)
+    assert isinstance(packed.comprehensive_result, ScreeningResult)
+    assert packed.conservative_result.trace_id == packed.comprehensive_result.trace_id
+    assert packed.conservative_result.id != packed.comprehensive_result.id
+    assert batch[0].conservative_result_id == packed.conservative_result.id
+    metadata = packed.comprehensive_result.response_metadata
+    assert metadata["packed"] is True
+    assert metadata["pack_size"] == 2  # noqa: PLR2004
+    assert metadata["pack_token_usage"]["uncached_input_tokens"] == 1720  # noqa: PLR2004
+    assert packed.comprehensive_result.model_name == "gpt-4o-2024-08-06"
+
+
+def test_screen_abstracts_packed_rejects_empty_packs(
+    review: models.SystematicReview, batch: list[models.SearchResult]
+) -> None:
+    with pytest.raises(ValueError, match="pack_size"):
+        screen_abstracts_packed(batch, 0, review, pack_size=0)
@@ -0,0 +1,277 @@
+"""Unit tests for the adaptive concurrency limiter."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+import typing as t
+
+import httpx
+import pytest
+from langchain_core.runnables import RunnableLambda
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, SecretStr
+
+from sr_assistant.app.agents.rate_limit import (
+    AdaptiveConcurrencyLimiter,
+    RequestRateLimiter,
+    get_limiter,
+    is_rate_limit_error,
+    rate_limit_http_clients,
+    rate_limited,
+)
+
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+
+def _limiter(**kwargs: t.Any) -> AdaptiveConcurrencyLimiter:
+    kwargs.setdefault("initial_limit", 4)
+    kwargs.setdefault("cooldown", 0)
+    return AdaptiveConcurrencyLimiter("test", "model", **kwargs)
+
+
+def test_additive_increase() -> None:
+    limiter = _limiter(initial_limit=4)
+    for _ in range(4):
+        limiter.on_success(0.1)
+    assert 4.9 < limiter.limit < 5.0  # noqa: PLR2004
+    limiter.on_success(0.1)
+    assert limiter.limit > 5  # noqa: PLR2004
+
+
+def test_increase_is_capped() -> None:
+    limiter = _limiter(initial_limit=4, max_limit=4)
+    limiter.on_success(0.1)
+    assert limiter.limit == 4  # noqa: PLR2004
+
+
+def test_multiplicative_decrease_on_rate_limit() -> None:
+    limiter = _limiter(initial_limit=8, min_limit=2)
+    limiter.on_rate_limited()
+    assert limiter.limit == 4  # noqa: PLR2004
+    limiter.on_rate_limited()
+    limiter.on_rate_limited()
+    assert limiter.limit == 2  # noqa: PLR2004
+    stats = limiter.stats()
+    assert stats.rate_limited == 3  # noqa: PLR2004
+    assert stats.decreases == 3  # noqa: PLR2004
+
+
+def test_decrease_cooldown() -> None:
+    limiter = _limiter(initial_limit=8, cooldown=60)
+    limiter.on_rate_limited()
+    limiter.on_rate_limited()
+    assert limiter.limit == 4  # noqa: PLR2004
+    assert limiter.stats().decreases == 1
+
+
+def test_latency_above_target_holds_limit() -> None:
+    limiter = _limiter(latency_target=1.0)
+    limiter.on_success(5.0)
+    assert limiter.limit == 4  # noqa: PLR2004
+
+
+def test_headers_hold_and_decrease() -> None:
+    limiter = _limiter(initial_limit=8, headroom=0.1)
+    limiter.observe_headers(
+        {"x-ratelimit-remaining-requests": "80", "x-ratelimit-limit-requests": "1000"}
+    )
+    limiter.on_success(0.1)
+    assert limiter.limit == 8  # noqa: PLR2004
+    limiter.observe_headers(
+        {
+            "x-ratelimit-remaining-requests": "900",
+            "x-ratelimit-limit-requests": "1000",
+            "x-ratelimit-remaining-tokens": "100",
+            "x-ratelimit-limit-tokens": "30000",
+        }
+    )
+    assert limiter.limit == 4  # noqa: PLR2004
+    limiter.observe_headers(
+        {"x-ratelimit-remaining-requests": "900", "x-ratelimit-limit-requests": "1000"}
+    )
+    limiter.on_success(0.1)
+    assert limiter.limit > 4  # noqa: PLR2004
+
+
+def test_acquire_blocks_at_limit() -> None:
+    limiter = _limiter(initial_limit=1)
+    assert limiter.acquire()
+    assert not limiter.acquire(timeout=0.01)
+    assert not limiter.try_acquire()
+    limiter.release()
+    assert limiter.try_acquire()
+
+
+def test_is_rate_limit_error() -> None:
+    class ResourceExhausted(Exception):  # noqa: N818  # google.api_core's name
+        pass
+
+    assert is_rate_limit_error(FakeRateLimitError())
+    assert is_rate_limit_error(ResourceExhausted())
+    assert not is_rate_limit_error(ValueError())
+
+
+def test_get_limiter_is_shared_per_model() -> None:
+    assert get_limiter("p", "a") is get_limiter("p", "a")
+    assert get_limiter("p", "a") is not get_limiter("p", "b")
+
+
+def test_rate_limited_sync_bounds_concurrency_and_observes_429() -> None:
+    limiter = _limiter(initial_limit=2, max_limit=2)
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def _call(x: int) -> int:
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(max_active, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        if x < 0:
+            raise FakeRateLimitError
+        return x
+
+    runnable = rate_limited(RunnableLambda(_call), limiter)
+    assert runnable.batch(list(range(6)), config={"max_concurrency": 6}) == list(
+        range(6)
+    )
+    assert max_active == 2  # noqa: PLR2004
+    with pytest.raises(FakeRateLimitError):
+        runnable.invoke(-1)
+    assert limiter.limit == 1
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_async_bounds_concurrency() -> None:
+    limiter = _limiter(initial_limit=3, max_limit=3)
+    active = 0
+    max_active = 0
+
+    async def _call(x: int) -> int:
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return x
+
+    runnable = rate_limited(RunnableLambda(_call), limiter)
+    results = await asyncio.gather(*(runnable.ainvoke(i) for i in range(10)))
+
+    assert results == list(range(10))
+    assert max_active == 3  # noqa: PLR2004
+    assert limiter.stats().successes == 10  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_aacquire_waits_for_release() -> None:
+    limiter = _limiter(initial_limit=1, max_limit=1)
+    assert limiter.try_acquire()
+    first = asyncio.ensure_future(limiter.aacquire())
+    second = asyncio.ensure_future(limiter.aacquire())
+    await asyncio.sleep(0)
+    assert not first.done()
+
+    # The slot is handed to the first waiter, which is cancelled before it runs:
+    # the wake-up must pass on to the second waiter.
+    limiter.release()
+    first.cancel()
+    await asyncio.wait_for(second, timeout=1)
+    assert first.cancelled()
+
+    # Slots released by threads wake async waiters too.
+    third = asyncio.ensure_future(limiter.aacquire())
+    await asyncio.sleep(0)
+    await asyncio.to_thread(limiter.release)
+    await asyncio.wait_for(third, timeout=1)
+    assert limiter.in_flight == 1
+
+
+class _Decision(BaseModel):
+    include: bool
+
+
+def test_rate_limit_http_clients_feed_structured_output_headers() -> None:
+    # Structured output sends response_format, for which LangChain drops the
+    # response headers; the HTTP client hook must still see them.
+    requests: list[dict[str, t.Any]] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(
+            200,
+            headers={
+                "x-ratelimit-remaining-tokens": "100",
+                "x-ratelimit-limit-tokens": "30000",
+            },
+            json={
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {
+                            "role": "assistant",
+                            "content": '{"include": true}',
+                        },
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 1,
+                    "completion_tokens": 1,
+                    "total_tokens": 2,
+                },
+            },
+        )
+
+    limiter = _limiter(initial_limit=8)
+    http_client, http_async_client = rate_limit_http_clients(
+        limiter, transport=httpx.MockTransport(_handler)
+    )
+    llm = ChatOpenAI(
+        model="gpt-4o",
+        api_key=SecretStr("test"),
+        max_retries=0,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
+    result = llm.with_structured_output(_Decision, include_raw=True).invoke("x")
+
+    assert result["parsed"] == _Decision(include=True)
+    assert requests[0]["response_format"]["type"] == "json_schema"
+    assert limiter.limit == 4  # noqa: PLR2004
+    assert limiter.stats().decreases == 1
+
+
+def test_request_rate_limiter_spaces_requests() -> None:
+    limiter = RequestRateLimiter(rate=50)
+    starts: list[float] = []
+    lock = threading.Lock()
+
+    def _request() -> None:
+        limiter.acquire()
+        with lock:
+            starts.append(time.monotonic())
+
+    threads = [threading.Thread(target=_request) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 5 requests at 50/s take at least 4 intervals of 20ms
+    assert max(starts) - min(starts) >= 0.075  # noqa: PLR2004
+    with pytest.raises(ValueError, match="positive"):
+        RequestRateLimiter(rate=0)
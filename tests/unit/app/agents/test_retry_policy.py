@@ -0,0 +1,169 @@
+"""Unit tests for error-classifying retries."""
+
+from __future__ import annotations
+
+import json
+import typing as t
+import uuid
+
+import pytest
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from sr_assistant.app.agents.retry_policy import (
+    ErrorClass,
+    PolicyRetry,
+    RetryPolicy,
+    classify_error,
+    retry_stats,
+    structured_output_with_repair,
+)
+from sr_assistant.app.agents.screening_agents import ScreeningError
+from sr_assistant.core import models
+from sr_assistant.core.schemas import ScreeningResponse
+from sr_assistant.core.types import ScreeningDecisionType
+
+if t.TYPE_CHECKING:
+    from langchain_core.tracers.schemas import Run
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class AuthenticationError(Exception):
+    pass
+
+
+@pytest.mark.parametrize(
+    ("exc", "expected"),
+    [
+        (_HTTPError(429), ErrorClass.RATE_LIMIT),
+        (_HTTPError(400), ErrorClass.PERMANENT),
+        (_HTTPError(408), ErrorClass.TRANSIENT),
+        (_HTTPError(503), ErrorClass.TRANSIENT),
+        (AuthenticationError("bad key"), ErrorClass.PERMANENT),
+        (OutputParserException("not json"), ErrorClass.OUTPUT_PARSE),
+        (json.JSONDecodeError("x", "", 0), ErrorClass.OUTPUT_PARSE),
+        (KeyError("missing prompt variable"), ErrorClass.PERMANENT),
+        (TimeoutError(), ErrorClass.TRANSIENT),
+        (ConnectionError(), ErrorClass.TRANSIENT),
+    ],
+)
+def test_classify_error(exc: BaseException, expected: ErrorClass) -> None:
+    assert classify_error(exc) is expected
+
+
+def test_screening_error_records_error_class() -> None:
+    search_result = models.SearchResult(id=uuid.uuid4(), review_id=uuid.uuid4())
+
+    error = ScreeningError(search_result=search_result, error=_HTTPError(400))
+
+    assert error.error_class == ErrorClass.PERMANENT
+
+
+def _flaky(errors: list[Exception]) -> tuple[PolicyRetry, list[int]]:
+    calls: list[int] = []
+
+    def _call(value: int) -> int:
+        calls.append(value)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return value
+
+    retry = PolicyRetry(
+        bound=RunnableLambda(_call),
+        kwargs={},
+        config={},
+        retry_exception_types=(Exception,),
+        wait_exponential_jitter=False,
+        max_attempt_number=5,
+        policy=RetryPolicy(transient=3, rate_limit=3),
+    )
+    return retry, calls
+
+
+def test_transient_errors_are_retried_and_recorded() -> None:
+    retry, calls = _flaky([TimeoutError(), _HTTPError(429)])
+    runs: list[Run] = []
+
+    assert retry.with_listeners(on_end=runs.append).invoke(7) == 7  # noqa: PLR2004
+    assert len(calls) == 3  # noqa: PLR2004
+    assert retry_stats(runs[0]) == {
+        "retries": 2,
+        "error_classes": ["transient", "rate_limit"],
+        "output_repairs": 0,
+    }
+
+
+@pytest.mark.parametrize(
+    "error", [_HTTPError(400), OutputParserException("bad"), AuthenticationError()]
+)
+def test_non_retryable_errors_fail_fast(error: Exception) -> None:
+    retry, calls = _flaky([error])
+
+    with pytest.raises(type(error)):
+        retry.invoke(1)
+    assert len(calls) == 1
+
+
+def test_retries_stop_at_policy_limit() -> None:
+    retry, calls = _flaky([TimeoutError()] * 5)
+
+    with pytest.raises(TimeoutError):
+        retry.invoke(1)
+    assert len(calls) == 3  # noqa: PLR2004
+
+
+def test_batch_retries_items_independently() -> None:
+    retry, calls = _flaky([_HTTPError(400), TimeoutError()])
+
+    results = retry.batch([1, 2], return_exceptions=True)
+
+    # One item failed permanently, the other one was retried until it succeeded
+    assert sum(isinstance(r, _HTTPError) for r in results) == 1
+    assert len(calls) == 3  # noqa: PLR2004
+
+
+class _FakeToolModel(FakeMessagesListChatModel):
+    def bind_tools(self, tools: t.Any, **kwargs: t.Any) -> t.Any:  # noqa: ARG002
+        return self
+
+
+def _tool_message(**args: t.Any) -> AIMessage:
+    return AIMessage(
+        content="",
+        tool_calls=[{"name": "ScreeningResponse", "args": args, "id": "call_1"}],
+    )
+
+
+def test_structured_output_repair() -> None:
+    model = _FakeToolModel(
+        responses=[
+            _tool_message(decision="maybe", confidence_score=0.9, rationale="R"),
+            _tool_message(decision="include", confidence_score=0.9, rationale="R"),
+        ]
+    )
+    runs: list[Run] = []
+
+    chain = structured_output_with_repair(model, ScreeningResponse).with_listeners(
+        on_end=runs.append
+    )
+    response = chain.invoke("Screen this")
+
+    assert isinstance(response, ScreeningResponse)
+    assert response.decision == ScreeningDecisionType.INCLUDE
+    assert retry_stats(runs[0])["output_repairs"] == 1
+
+
+def test_structured_output_repair_failure_is_output_parse_error() -> None:
+    bad = _tool_message(decision="maybe", confidence_score=0.9, rationale="R")
+    model = _FakeToolModel(responses=[bad, bad])
+
+    with pytest.raises(OutputParserException) as exc_info:
+        structured_output_with_repair(model, ScreeningResponse).invoke("Screen this")
+    assert classify_error(exc_info.value) is ErrorClass.OUTPUT_PARSE
@@ -2,16 +2,21 @@
 
 import typing as t
 import uuid
-from unittest.mock import MagicMock
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
 
+from sr_assistant.app.agents import screening_agents
 from sr_assistant.app.agents.screening_agents import (
+    BATCH_MAX_CONCURRENCY,
     ScreenAbstractResultTuple,
     ScreenAbstractsChainInput,
     ScreeningError,
     make_screen_abstracts_chain_input,
+    screen_abstracts_batch_as_completed,
 )
 from sr_assistant.core import models
 from sr_assistant.core.schemas import ScreeningResponse, ScreeningResult
+from sr_assistant.core.types import ScreeningDecisionType, ScreeningStrategyType
 
 
 class TestScreenAbstractsChainInput:
@@ -207,6 +212,7 @@ class TestMakeScreenAbstractsChainInput:
         assert "metadata" in config_item
         assert config_item["metadata"]["review_id"] == str(mock_review.id)
         assert config_item["metadata"]["search_result_id"] == str(mock_search_result.id)
+        assert config_item["max_concurrency"] == BATCH_MAX_CONCURRENCY
 
         # Check tags
         assert "tags" in config_item
@@ -272,3 +278,49 @@ class TestMakeScreenAbstractsChainInput:
                 in config_item["tags"]
             )
             assert f"sra:screen_abstracts_chain:i:{i}" in config_item["tags"]
+
+
+class TestScreenAbstractsBatchAsCompleted:
+    """Tests for screen_abstracts_batch_as_completed."""
+
+    def test_yields_in_completion_order(self) -> None:
+        review = models.SystematicReview(
+            id=uuid.uuid4(), research_question="Q", exclusion_criteria="E"
+        )
+        batch = [
+            models.SearchResult(id=uuid.uuid4(), review_id=review.id, title=f"T{i}")
+            for i in range(2)
+        ]
+
+        def _result(strategy: ScreeningStrategyType) -> ScreeningResult:
+            return ScreeningResult(
+                review_id=review.id,
+                search_result_id=batch[1].id,
+                trace_id=uuid.uuid4(),
+                model_name="gpt-4o",
+                screening_strategy=strategy,
+                start_time=datetime.now(UTC),
+                end_time=datetime.now(UTC),
+                decision=ScreeningDecisionType.INCLUDE,
+                confidence_score=0.9,
+                rationale="R",
+            )
+
+        chain = MagicMock()
+        chain.batch_as_completed.return_value = iter(
+            [
+                (
+                    1,
+                    {strategy: _result(strategy) for strategy in ScreeningStrategyType},
+                ),
+                (0, RuntimeError("boom")),
+            ]
+        )
+        with patch.object(screening_agents, "screen_abstracts_chain", chain):
+            results = list(screen_abstracts_batch_as_completed(batch, 0, review))
+
+        assert [r.search_result for r in results] == [batch[1], batch[0]]
+        assert isinstance(results[0].conservative_result, ScreeningResult)
+        assert batch[1].conservative_result_id == results[0].conservative_result.id
+        assert isinstance(results[1].comprehensive_result, ScreeningError)
+        assert chain.batch_as_completed.call_args.kwargs["return_exceptions"] is True
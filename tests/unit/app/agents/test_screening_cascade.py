@@ -0,0 +1,158 @@
+"""Unit tests for the confidence-based screening model cascade."""
+
+from __future__ import annotations
+
+import typing as t
+import uuid
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from sr_assistant.app.agents import screening_cascade
+from sr_assistant.app.agents.screening_agents import ScreenAbstractResultTuple
+from sr_assistant.app.agents.screening_cascade import (
+    CASCADE_METADATA_KEY,
+    CascadeConfig,
+    screen_abstracts_cascade_as_completed,
+)
+from sr_assistant.app.agents.screening_pipeline import screen_and_resolve_as_completed
+from sr_assistant.core import models
+from sr_assistant.core.schemas import ScreeningResult
+from sr_assistant.core.types import ScreeningDecisionType, ScreeningStrategyType
+
+INCLUDE = ScreeningDecisionType.INCLUDE
+EXCLUDE = ScreeningDecisionType.EXCLUDE
+UNCERTAIN = ScreeningDecisionType.UNCERTAIN
+
+
+def _result(
+    search_result: models.SearchResult,
+    decision: ScreeningDecisionType,
+    confidence: float,
+    strategy: ScreeningStrategyType = ScreeningStrategyType.CONSERVATIVE,
+) -> ScreeningResult:
+    return ScreeningResult(
+        review_id=search_result.review_id,
+        search_result_id=search_result.id,
+        trace_id=uuid.uuid4(),
+        model_name="gpt-4o",
+        screening_strategy=strategy,
+        start_time=datetime.now(UTC),
+        end_time=datetime.now(UTC),
+        decision=decision,
+        confidence_score=confidence,
+        rationale="R",
+    )
+
+
+@pytest.fixture
+def review() -> models.SystematicReview:
+    return models.SystematicReview(
+        id=uuid.uuid4(),
+        research_question="Q",
+        exclusion_criteria="E",
+        review_metadata={
+            CASCADE_METADATA_KEY: {"enabled": True, "exclude_threshold": 0.97}
+        },
+    )
+
+
+def test_config_from_review(review: models.SystematicReview) -> None:
+    cascade = CascadeConfig.from_review(review)
+
+    assert cascade.enabled
+    assert cascade.exclude_threshold == 0.97  # noqa: PLR2004
+    assert cascade.include_threshold == CascadeConfig().include_threshold
+    review.review_metadata = {}
+    assert not CascadeConfig.from_review(review).enabled
+
+
+@pytest.mark.parametrize(
+    ("decision", "confidence", "expected"),
+    [
+        (INCLUDE, 0.9, True),
+        (INCLUDE, 0.89, False),
+        (EXCLUDE, 0.9, False),
+        (EXCLUDE, 0.95, True),
+        (UNCERTAIN, 1.0, False),
+    ],
+)
+def test_config_accepts(
+    decision: ScreeningDecisionType,
+    confidence: float,
+    expected: bool,  # noqa: FBT001
+) -> None:
+    search_result = models.SearchResult(id=uuid.uuid4(), review_id=uuid.uuid4())
+    triage = _result(search_result, decision, confidence)
+
+    assert CascadeConfig(enabled=True).accepts(triage) is expected
+
+
+def test_cascade_escalates_unsure_items(review: models.SystematicReview) -> None:
+    batch = [
+        models.SearchResult(id=uuid.uuid4(), review_id=review.id, title=f"T{i}")
+        for i in range(3)
+    ]
+    cascade = CascadeConfig.from_review(review)
+    triage_chain = MagicMock()
+    triage_chain.batch_as_completed.return_value = [
+        (0, {ScreeningStrategyType.CONSERVATIVE: _result(batch[0], INCLUDE, 0.95)}),
+        (1, {ScreeningStrategyType.CONSERVATIVE: _result(batch[1], EXCLUDE, 0.96)}),
+        (2, RuntimeError("boom")),
+    ]
+
+    def _full(
+        items: list[models.SearchResult], *_: t.Any, **__: t.Any
+    ) -> t.Iterator[ScreenAbstractResultTuple]:
+        for search_result in items:
+            yield ScreenAbstractResultTuple(
+                search_result,
+                _result(search_result, EXCLUDE, 0.9),
+                _result(
+                    search_result, EXCLUDE, 0.9, ScreeningStrategyType.COMPREHENSIVE
+                ),
+            )
+
+    full = MagicMock(side_effect=_full)
+    with (
+        patch.object(screening_cascade, "get_triage_chain", return_value=triage_chain),
+        patch.object(screening_cascade, "screen_abstracts_batch_as_completed", full),
+    ):
+        results = list(
+            screen_abstracts_cascade_as_completed(batch, 0, review, cascade=cascade)
+        )
+
+    assert [r.search_result for r in results] == batch
+    assert full.call_args.args[0] == batch[1:]
+
+    accepted = results[0]
+    assert isinstance(accepted.conservative_result, ScreeningResult)
+    assert isinstance(accepted.comprehensive_result, ScreeningResult)
+    assert accepted.comprehensive_result.screening_strategy == "comprehensive"
+    assert accepted.comprehensive_result.id != accepted.conservative_result.id
+    assert accepted.comprehensive_result.decision == INCLUDE
+    assert accepted.conservative_result.model_name == cascade.model_name
+    assert batch[0].comprehensive_result_id == accepted.comprehensive_result.id
+    assert accepted.conservative_result.response_metadata["cascade"]["stage"] == (
+        "accepted"
+    )
+
+    escalated = results[1].comprehensive_result
+    assert isinstance(escalated, ScreeningResult)
+    metadata = escalated.response_metadata["cascade"]
+    assert metadata["stage"] == "escalated"
+    assert metadata["triage"]["decision"] == "exclude"
+    assert metadata["exclude_threshold"] == 0.97  # noqa: PLR2004
+    assert (
+        "error" in results[2].conservative_result.response_metadata["cascade"]["triage"]
+    )  # type: ignore[union-attr]
+
+
+def test_pipeline_rejects_packed_cascade(review: models.SystematicReview) -> None:
+    with pytest.raises(ValueError, match="cascade"):
+        list(
+            screen_and_resolve_as_completed(
+                [], 0, review, pack_size=5, cascade=CascadeConfig(enabled=True)
+            )
+        )
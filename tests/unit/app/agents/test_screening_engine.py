@@ -0,0 +1,275 @@
+"""Unit tests for the async screening engine."""
+
+from __future__ import annotations
+
+import asyncio
+import typing as t
+import uuid
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from sr_assistant.app.agents.hedging import HEDGER_KEY, HedgePolicy, Hedger
+from sr_assistant.app.agents.screening_agents import ScreeningError
+from sr_assistant.app.agents.screening_engine import (
+    ScreeningEngine,
+    ascreen_abstracts_batch,
+    default_hedge_policy,
+    get_screening_engine,
+)
+from sr_assistant.core import models
+from sr_assistant.core.schemas import ScreeningDecisionType, ScreeningResult
+from sr_assistant.core.types import ScreeningStrategyType, SearchDatabaseSource
+
+
+def _make_review() -> MagicMock:
+    review = MagicMock(spec=models.SystematicReview)
+    review.id = uuid.uuid4()
+    review.background = "Background"
+    review.research_question = "Question"
+    review.inclusion_criteria = "Inclusion"
+    review.exclusion_criteria = "Exclusion"
+    return review
+
+
+def _make_search_results(review_id: uuid.UUID, n: int) -> list[models.SearchResult]:
+    return [
+        models.SearchResult(
+            review_id=review_id,
+            source_db=SearchDatabaseSource.PUBMED,
+            source_id=str(i),
+            title=f"Title {i}",
+            abstract=f"Abstract {i}",
+            journal="Journal",
+            year="2024",
+        )
+        for i in range(n)
+    ]
+
+
+def _make_result(
+    config: dict[str, t.Any], strategy: ScreeningStrategyType
+) -> ScreeningResult:
+    now = datetime.now(tz=UTC)
+    return ScreeningResult(
+        id=uuid.uuid4(),
+        review_id=uuid.UUID(config["metadata"]["review_id"]),
+        search_result_id=uuid.UUID(config["metadata"]["search_result_id"]),
+        trace_id=uuid.uuid4(),
+        model_name="fake-model",
+        screening_strategy=strategy,
+        start_time=now,
+        end_time=now,
+        decision=ScreeningDecisionType.INCLUDE,
+        confidence_score=0.9,
+        rationale="Fake rationale",
+    )
+
+
+class FakeChain:
+    """Stand-in for screen_abstracts_chain that tracks concurrency."""
+
+    def __init__(
+        self,
+        delay: float = 0.01,
+        fail_titles: set[str] | None = None,
+        block_titles: set[str] | None = None,
+    ) -> None:
+        self.delay = delay
+        self.fail_titles = fail_titles or set()
+        self.block_titles = block_titles or set()
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+
+    async def __call__(
+        self, chain_input: dict[str, t.Any], config: dict[str, t.Any]
+    ) -> dict[str, ScreeningResult]:
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if chain_input["title"] in self.block_titles:
+                await asyncio.Event().wait()
+            await asyncio.sleep(self.delay)
+            if chain_input["title"] in self.fail_titles:
+                msg = "boom"
+                raise RuntimeError(msg)
+            return {
+                ScreeningStrategyType.CONSERVATIVE: _make_result(
+                    config, ScreeningStrategyType.CONSERVATIVE
+                ),
+                ScreeningStrategyType.COMPREHENSIVE: _make_result(
+                    config, ScreeningStrategyType.COMPREHENSIVE
+                ),
+            }
+        finally:
+            self.active -= 1
+
+    def as_runnable(self) -> RunnableLambda[t.Any, t.Any]:
+        return RunnableLambda(self.__call__)
+
+
+@pytest.mark.asyncio
+async def test_ascreen_returns_results_in_input_order() -> None:
+    review = _make_review()
+    search_results = _make_search_results(review.id, 5)
+    engine = ScreeningEngine(FakeChain().as_runnable(), max_concurrency=5)
+
+    results = await engine.ascreen(search_results, review)
+
+    assert [r.search_result for r in results] == search_results
+    for res in results:
+        assert isinstance(res.conservative_result, ScreeningResult)
+        assert isinstance(res.comprehensive_result, ScreeningResult)
+        assert res.conservative_result.search_result_id == res.search_result.id
+        assert res.search_result.conservative_result_id == res.conservative_result.id
+        assert res.search_result.comprehensive_result_id == res.comprehensive_result.id
+    assert engine.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded() -> None:
+    review = _make_review()
+    fake = FakeChain(delay=0.02)
+    engine = ScreeningEngine(fake.as_runnable(), max_concurrency=3)
+
+    await engine.ascreen(_make_search_results(review.id, 12), review)
+
+    assert fake.calls == 12  # noqa: PLR2004
+    assert fake.max_active == 3  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_failed_item_does_not_fail_batch() -> None:
+    review = _make_review()
+    search_results = _make_search_results(review.id, 3)
+    engine = ScreeningEngine(
+        FakeChain(fail_titles={"Title 1"}).as_runnable(), max_concurrency=3
+    )
+
+    results = await engine.ascreen(search_results, review)
+
+    assert isinstance(results[0].conservative_result, ScreeningResult)
+    assert isinstance(results[1].conservative_result, ScreeningError)
+    assert isinstance(results[1].comprehensive_result, ScreeningError)
+    assert isinstance(results[1].conservative_result.error, RuntimeError)
+    assert isinstance(results[2].comprehensive_result, ScreeningResult)
+
+
+@pytest.mark.asyncio
+async def test_cancel_single_item() -> None:
+    review = _make_review()
+    search_results = _make_search_results(review.id, 3)
+    engine = ScreeningEngine(
+        FakeChain(block_titles={"Title 2"}).as_runnable(), max_concurrency=3
+    )
+
+    screening = asyncio.create_task(engine.ascreen(search_results, review))
+    await asyncio.sleep(0.05)
+    assert engine.in_flight == 1
+    assert engine.cancel(search_results[2].id) is True
+    results = await screening
+
+    assert isinstance(results[0].conservative_result, ScreeningResult)
+    assert isinstance(results[1].conservative_result, ScreeningResult)
+    cancelled = results[2].conservative_result
+    assert isinstance(cancelled, ScreeningError)
+    assert cancelled.message == "Screening cancelled"
+    assert search_results[2].conservative_result_id is None
+    assert engine.cancel(search_results[2].id) is False
+
+
+@pytest.mark.asyncio
+async def test_astream_yields_in_completion_order() -> None:
+    review = _make_review()
+    search_results = _make_search_results(review.id, 3)
+    fake = FakeChain()
+    engine = ScreeningEngine(fake.as_runnable(), max_concurrency=1)
+
+    seen = [res.search_result async for res in engine.astream(search_results, review)]
+
+    assert sorted(sr.source_id for sr in seen) == ["0", "1", "2"]
+    assert fake.max_active == 1
+
+
+@pytest.mark.asyncio
+async def test_ascreen_abstracts_batch_collects_callback() -> None:
+    review = _make_review()
+    search_results = _make_search_results(review.id, 2)
+    engine = ScreeningEngine(FakeChain().as_runnable())
+
+    output = await ascreen_abstracts_batch(search_results, 0, review, engine=engine)
+
+    assert output is not None
+    assert len(output.results) == 2  # noqa: PLR2004
+    assert output.cb.successful_requests == 0
+
+
+def test_invalid_max_concurrency() -> None:
+    with pytest.raises(ValueError, match="max_concurrency"):
+        ScreeningEngine(MagicMock(), max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_hedging_passes_run_hedger_to_chain() -> None:
+    review = _make_review()
+    hedgers: list[t.Any] = []
+    fake = FakeChain()
+
+    async def _chain(
+        chain_input: dict[str, t.Any], config: dict[str, t.Any]
+    ) -> dict[str, ScreeningResult]:
+        hedgers.append(config["configurable"].get(HEDGER_KEY))
+        return await fake(chain_input, config)
+
+    engine = ScreeningEngine(RunnableLambda(_chain), hedging=HedgePolicy())
+    await engine.ascreen(_make_search_results(review.id, 2), review)
+    first = hedgers[0]
+    await engine.ascreen(_make_search_results(review.id, 1), review)
+
+    assert isinstance(first, Hedger)
+    assert hedgers[1] is first
+    assert hedgers[2] is not first
+    assert hedgers[2].latencies is first.latencies is engine.latencies
+
+
+@pytest.mark.asyncio
+async def test_concurrent_batches_report_their_own_hedge_stats() -> None:
+    review = _make_review()
+    fake = FakeChain()
+
+    async def _chain(
+        chain_input: dict[str, t.Any], config: dict[str, t.Any]
+    ) -> dict[str, ScreeningResult]:
+        config["configurable"][HEDGER_KEY].start_call()
+        return await fake(chain_input, config)
+
+    engine = ScreeningEngine(RunnableLambda(_chain), hedging=HedgePolicy())
+
+    outputs = await asyncio.gather(
+        engine.ascreen_batch(_make_search_results(review.id, 3), 0, review),
+        engine.ascreen_batch(_make_search_results(review.id, 1), 1, review),
+    )
+
+    assert [o.hedge_stats.calls for o in outputs if o.hedge_stats] == [3, 1]
+    unhedged = ScreeningEngine(FakeChain().as_runnable())
+    output = await unhedged.ascreen_batch(_make_search_results(review.id, 1), 0, review)
+    assert output.hedge_stats is None
+
+
+def test_default_engine_hedges_per_settings() -> None:
+    settings = MagicMock(SCREENING_HEDGING=True, SCREENING_HEDGE_MAX_RATIO=0.2)
+    with (
+        patch(
+            "sr_assistant.app.agents.screening_engine.get_settings",
+            return_value=settings,
+        ),
+        patch("sr_assistant.app.agents.screening_engine._default_engine", None),
+    ):
+        assert get_screening_engine().hedging == HedgePolicy(max_hedge_ratio=0.2)
+
+        settings.SCREENING_HEDGING = False
+        assert default_hedge_policy() is None
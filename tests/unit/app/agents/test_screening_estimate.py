@@ -0,0 +1,116 @@
+"""Unit tests for the pre-flight screening run estimate."""
+
+from __future__ import annotations
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from sr_assistant.app.agents import screening_estimate
+from sr_assistant.app.agents.screening_estimate import (
+    DEFAULT_CONFLICT_RATE,
+    RESOLVER_OUTPUT_TOKENS,
+    REVIEWER_OUTPUT_TOKENS,
+    TokenCounter,
+    estimate_screening_run,
+)
+from sr_assistant.core import models
+from sr_assistant.core.types import ScreeningStrategyType
+
+
+@pytest.fixture
+def counter() -> TokenCounter:
+    # chars/4, tiktoken encodings are downloaded on first use
+    with patch.object(
+        screening_estimate.tiktoken, "encoding_for_model", side_effect=KeyError("x")
+    ):
+        return TokenCounter("gpt-4o")
+
+
+@pytest.fixture
+def review() -> models.SystematicReview:
+    return models.SystematicReview(
+        id=uuid.uuid4(),
+        background="Background",
+        research_question="Does X improve Y?",
+        inclusion_criteria="RCTs in adults",
+        exclusion_criteria="Animal studies",
+    )
+
+
+def _search_results(review_id: uuid.UUID, n: int) -> list[models.SearchResult]:
+    return [
+        models.SearchResult(
+            id=uuid.uuid4(),
+            review_id=review_id,
+            title=f"Title {i}",
+            abstract="word " * (100 * (i + 1)),
+        )
+        for i in range(n)
+    ]
+
+
+def test_token_counter_fallback(counter: TokenCounter) -> None:
+    assert counter.name == "chars/4"
+    assert counter.count(["abcd", "abcde", ""]).tolist() == [1, 2, 0]
+    assert counter.count([]).size == 0
+
+
+def test_estimate(review: models.SystematicReview, counter: TokenCounter) -> None:
+    search_results = _search_results(review.id, 10)
+
+    estimate = estimate_screening_run(
+        review, search_results, conflict_stats=(3, 10), counter=counter
+    )
+
+    assert estimate.search_results == 10  # noqa: PLR2004
+    assert estimate.token_counter == "chars/4"  # noqa: S105
+    conservative, comprehensive = estimate.strategies
+    assert conservative.strategy == ScreeningStrategyType.CONSERVATIVE
+    assert conservative.calls == comprehensive.calls == 10  # noqa: PLR2004
+    # Abstracts alone are 500 to 5000 chars
+    assert conservative.input_tokens > sum(125 * (i + 1) for i in range(10))
+    assert conservative.output_tokens == 10 * REVIEWER_OUTPUT_TOKENS
+    assert 0 < conservative.cached_input_tokens < conservative.input_tokens
+    assert estimate.conflict_rate == 0.3  # noqa: PLR2004
+    assert estimate.resolver_calls == 3  # noqa: PLR2004
+    assert estimate.resolver_output_tokens == 3 * RESOLVER_OUTPUT_TOKENS
+    assert estimate.total_cost == pytest.approx(
+        conservative.cost + comprehensive.cost + estimate.resolver_cost
+    )
+    assert estimate.batch_cost < estimate.total_cost
+    assert estimate.cascade_cost(0.0) < estimate.cascade_cost(0.5)
+    assert estimate.cascade_cost(0.5) < estimate.total_cost
+    assert estimate.wall_time >= estimate.reviewer_wall_time > 0
+
+
+def test_estimate_without_history(
+    review: models.SystematicReview, counter: TokenCounter
+) -> None:
+    estimate = estimate_screening_run(
+        review, _search_results(review.id, 5), counter=counter
+    )
+
+    assert estimate.conflict_rate == DEFAULT_CONFLICT_RATE
+    assert estimate.conflict_rate_samples == 0
+    assert estimate.resolver_calls == 1
+
+
+def test_estimate_is_cached_per_criteria_version(
+    review: models.SystematicReview, counter: TokenCounter
+) -> None:
+    search_results = _search_results(review.id, 3)
+
+    with patch.object(counter, "count", wraps=counter.count) as count:
+        first = estimate_screening_run(review, search_results, counter=counter)
+        calls = count.call_count
+        estimate_screening_run(review, search_results, counter=counter)
+        assert count.call_count == calls
+
+        review.inclusion_criteria = "RCTs in adults and children " * 20
+        changed = estimate_screening_run(review, search_results, counter=counter)
+        assert count.call_count > calls
+
+    assert changed.criteria_fingerprint != first.criteria_fingerprint
+    assert changed.strategies[0].input_tokens > first.strategies[0].input_tokens
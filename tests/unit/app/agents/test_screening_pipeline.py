@@ -0,0 +1,106 @@
+"""Unit tests for pipelined screen -> resolve execution."""
+
+from __future__ import annotations
+
+import threading
+import typing as t
+import uuid
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from sr_assistant.app.agents import screening_pipeline
+from sr_assistant.app.agents.screening_agents import (
+    ScreenAbstractResultTuple,
+    ScreeningError,
+)
+from sr_assistant.app.agents.screening_pipeline import (
+    needs_resolver,
+    screen_and_resolve_as_completed,
+)
+from sr_assistant.core import models
+from sr_assistant.core.schemas import ResolverOutputSchema, ScreeningResult
+from sr_assistant.core.types import ScreeningDecisionType, ScreeningStrategyType
+
+INCLUDE = ScreeningDecisionType.INCLUDE
+EXCLUDE = ScreeningDecisionType.EXCLUDE
+UNCERTAIN = ScreeningDecisionType.UNCERTAIN
+
+
+def _result(
+    decision: ScreeningDecisionType,
+    confidence: float = 0.9,
+    strategy: ScreeningStrategyType = ScreeningStrategyType.CONSERVATIVE,
+) -> ScreeningResult:
+    return ScreeningResult(
+        review_id=uuid.uuid4(),
+        search_result_id=uuid.uuid4(),
+        trace_id=uuid.uuid4(),
+        model_name="gpt-4o",
+        screening_strategy=strategy,
+        start_time=datetime.now(UTC),
+        end_time=datetime.now(UTC),
+        decision=decision,
+        confidence_score=confidence,
+        rationale="R",
+    )
+
+
+@pytest.mark.parametrize(
+    ("conservative", "comprehensive", "expected"),
+    [
+        (_result(INCLUDE), _result(INCLUDE), False),
+        (_result(INCLUDE), _result(EXCLUDE), True),
+        (_result(UNCERTAIN), _result(UNCERTAIN), True),
+        (_result(INCLUDE, 0.6), _result(INCLUDE), True),
+    ],
+)
+def test_needs_resolver(
+    conservative: ScreeningResult,
+    comprehensive: ScreeningResult,
+    expected: bool,  # noqa: FBT001
+) -> None:
+    assert needs_resolver(conservative, comprehensive) is expected
+
+
+def test_resolution_overlaps_screening() -> None:
+    review = models.SystematicReview(
+        id=uuid.uuid4(), research_question="Q", exclusion_criteria="E"
+    )
+    batch = [
+        models.SearchResult(id=uuid.uuid4(), review_id=review.id, title=f"T{i}")
+        for i in range(3)
+    ]
+    resolver_started = threading.Event()
+    resolver_output = MagicMock(spec=ResolverOutputSchema)
+
+    def _screen(*_: t.Any, **__: t.Any) -> t.Iterator[ScreenAbstractResultTuple]:
+        # Conflict first, screening of the rest only finishes once it's resolving
+        yield ScreenAbstractResultTuple(batch[0], _result(INCLUDE), _result(EXCLUDE))
+        assert resolver_started.wait(timeout=5)
+        yield ScreenAbstractResultTuple(batch[1], _result(INCLUDE), _result(INCLUDE))
+        error = ScreeningError(search_result=batch[2], error="boom")
+        yield ScreenAbstractResultTuple(batch[2], error, error)
+
+    def _resolve(**_: t.Any) -> ResolverOutputSchema:
+        resolver_started.set()
+        return resolver_output
+
+    resolver = MagicMock(side_effect=_resolve)
+    with (
+        patch.object(
+            screening_pipeline, "screen_abstracts_batch_as_completed", _screen
+        ),
+        patch.object(screening_pipeline, "invoke_resolver_chain", resolver),
+    ):
+        results = list(screen_and_resolve_as_completed(batch, 0, review))
+
+    by_id = {r.search_result.id: r for r in results}
+    assert len(results) == 3  # noqa: PLR2004
+    assert by_id[batch[0].id].resolver_needed
+    assert by_id[batch[0].id].resolver_result is resolver_output
+    assert not by_id[batch[1].id].resolver_needed
+    assert by_id[batch[2].id].resolver_result is None
+    resolver.assert_called_once()
+    assert resolver.call_args.kwargs["search_result"] is batch[0]
@@ -0,0 +1,137 @@
+"""Unit tests for screening prioritization."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from sr_assistant.app.agents.screening_agents import (
+    ScreenAbstractResultTuple,
+    ScreeningError,
+)
+from sr_assistant.app.agents.screening_prioritizer import (
+    MODEL_RAMP_LABELS,
+    ScreeningPrioritizer,
+    get_prioritizer,
+    relevance_label,
+    result_tuple_label,
+)
+from sr_assistant.core import models
+from sr_assistant.core.schemas import ScreeningResult
+from sr_assistant.core.types import ScreeningDecisionType, ScreeningStrategyType
+
+RELEVANT = "Randomized controlled trial of exercise therapy for knee osteoarthritis pain in adults"
+OFF_TOPIC = "Soil microbiome diversity in alpine grassland after nitrogen deposition"
+# Matches neither the criteria nor the relevant studies above
+LABELLED_TOPIC = "Cardiac rehabilitation adherence in heart failure outpatients"
+
+
+@pytest.fixture
+def review() -> models.SystematicReview:
+    return models.SystematicReview(
+        id=uuid.uuid4(),
+        research_question="Does exercise therapy reduce knee osteoarthritis pain?",
+        inclusion_criteria="Randomized controlled trials in adults with knee osteoarthritis",
+        exclusion_criteria="Animal studies",
+    )
+
+
+def _search_result(review_id: uuid.UUID, abstract: str, n: int) -> models.SearchResult:
+    return models.SearchResult(
+        id=uuid.uuid4(), review_id=review_id, title=f"Study {n}", abstract=abstract
+    )
+
+
+def test_relevance_label() -> None:
+    include, exclude, uncertain = (
+        ScreeningDecisionType.INCLUDE,
+        ScreeningDecisionType.EXCLUDE,
+        ScreeningDecisionType.UNCERTAIN,
+    )
+
+    assert relevance_label([include, exclude]) is True
+    assert relevance_label([uncertain, None]) is True
+    assert relevance_label([exclude, exclude]) is False
+    assert relevance_label([None, None]) is None
+
+
+def test_result_tuple_label_ignores_errors(review: models.SystematicReview) -> None:
+    sr = _search_result(review.id, OFF_TOPIC, 0)
+    result = ScreeningResult(
+        review_id=review.id,
+        search_result_id=sr.id,
+        trace_id=uuid.uuid4(),
+        model_name="gpt-4o",
+        screening_strategy=ScreeningStrategyType.CONSERVATIVE,
+        decision=ScreeningDecisionType.EXCLUDE,
+        confidence_score=0.9,
+        rationale="R",
+        start_time=datetime.now(UTC),
+        end_time=datetime.now(UTC),
+    )
+    error = ScreeningError(search_result=sr, error=TimeoutError())
+
+    assert result_tuple_label(ScreenAbstractResultTuple(sr, result, error)) is False
+    assert result_tuple_label(ScreenAbstractResultTuple(sr, error, error)) is None
+
+
+def test_cold_start_ranks_by_criteria_similarity(
+    review: models.SystematicReview,
+) -> None:
+    off_topic = [_search_result(review.id, OFF_TOPIC, i) for i in range(3)]
+    relevant = _search_result(review.id, RELEVANT, 3)
+    prioritizer = ScreeningPrioritizer(review)
+
+    ranked = prioritizer.rank([*off_topic, relevant])
+
+    assert ranked == [relevant, *off_topic]
+    assert len(prioritizer) == 4  # noqa: PLR2004
+    assert prioritizer.model_weight == 0.0
+
+
+def test_decisions_reorder_queue(review: models.SystematicReview) -> None:
+    prioritizer = ScreeningPrioritizer(review)
+    n = MODEL_RAMP_LABELS // 2
+    included = [_search_result(review.id, LABELLED_TOPIC, i) for i in range(n)]
+    excluded = [_search_result(review.id, RELEVANT, i) for i in range(n)]
+    prioritizer.add([*included, *excluded])
+    queue = [
+        _search_result(review.id, LABELLED_TOPIC, n),
+        _search_result(review.id, RELEVANT, n),
+    ]
+    assert prioritizer.rank(queue)[0] is queue[1]
+
+    labels = {sr.id: True for sr in included} | {sr.id: False for sr in excluded}
+    assert prioritizer.observe(labels) == 2 * n
+    # Unchanged labels aren't trained on again
+    assert prioritizer.observe(labels) == 0
+
+    assert prioritizer.labels == 2 * n
+    assert prioritizer.model_weight == 1.0
+    # The decisions disagree with the criteria, the classifier wins
+    assert prioritizer.rank(queue)[0] is queue[0]
+
+
+def test_new_search_results_are_appended(review: models.SystematicReview) -> None:
+    prioritizer = ScreeningPrioritizer(review)
+    first = [_search_result(review.id, OFF_TOPIC, i) for i in range(2)]
+
+    assert prioritizer.add(first) == 2  # noqa: PLR2004
+    assert prioritizer.add(first) == 0
+    later = _search_result(review.id, RELEVANT, 2)
+    assert prioritizer.rank([*first, later])[0] is later
+    assert len(prioritizer) == 3  # noqa: PLR2004
+
+
+def test_prioritizer_is_cached_per_criteria_version(
+    review: models.SystematicReview,
+) -> None:
+    prioritizer = get_prioritizer(review)
+
+    assert get_prioritizer(review) is prioritizer
+    review.inclusion_criteria = "Observational cohorts"
+    changed = get_prioritizer(review)
+    assert changed is not prioritizer
+    assert get_prioritizer(review) is changed
@@ -0,0 +1,121 @@
+"""Unit tests for cross-review reuse of screening decisions."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime
+
+from sr_assistant.app.agents.screening_reuse import (
+    REUSED_FROM_KEY,
+    article_key,
+    clone_screening_result,
+    reuse_key,
+)
+from sr_assistant.core import models
+from sr_assistant.core.types import (
+    ScreeningDecisionType,
+    ScreeningStrategyType,
+    SearchDatabaseSource,
+)
+
+FINGERPRINT = "a" * 64
+
+
+def _search_result(
+    doi: str | None = None,
+    source_db: SearchDatabaseSource = SearchDatabaseSource.PUBMED,
+    source_id: str = "12345",
+) -> models.SearchResult:
+    return models.SearchResult(
+        id=uuid.uuid4(),
+        review_id=uuid.uuid4(),
+        source_db=source_db,
+        source_id=source_id,
+        doi=doi,
+        title="T",
+    )
+
+
+def test_article_key() -> None:
+    assert article_key(_search_result("10.1000/ABC")) == "doi:10.1000/abc"
+    assert (
+        article_key(_search_result("https://doi.org/10.1000/abc")) == "doi:10.1000/abc"
+    )
+    assert article_key(_search_result()) == "pmid:12345"
+    assert article_key(_search_result(source_db=SearchDatabaseSource.SCOPUS)) is None
+
+
+def test_reuse_key() -> None:
+    pubmed = _search_result("10.1000/abc")
+    scopus = _search_result(
+        "doi:10.1000/ABC", source_db=SearchDatabaseSource.SCOPUS, source_id="2-s2.0-1"
+    )
+    conservative = ScreeningStrategyType.CONSERVATIVE
+    key = reuse_key(pubmed, FINGERPRINT, conservative, "gpt-4o")
+
+    assert key is not None
+    assert len(key) == 64  # noqa: PLR2004
+    # Same article from another database and review
+    assert reuse_key(scopus, FINGERPRINT, conservative, "gpt-4o") == key
+    assert key not in {
+        reuse_key(pubmed, "b" * 64, conservative, "gpt-4o"),
+        reuse_key(pubmed, FINGERPRINT, ScreeningStrategyType.COMPREHENSIVE, "gpt-4o"),
+        reuse_key(pubmed, FINGERPRINT, conservative, "gpt-4o-mini"),
+    }
+    assert (
+        reuse_key(
+            _search_result(source_db=SearchDatabaseSource.SCOPUS),
+            FINGERPRINT,
+            conservative,
+            "gpt-4o",
+        )
+        is None
+    )
+
+
+def test_clone_screening_result() -> None:
+    source = models.ScreenAbstractResult(
+        id=uuid.uuid4(),
+        review_id=uuid.uuid4(),
+        trace_id=uuid.uuid4(),
+        model_name="gpt-4o",
+        screening_strategy=ScreeningStrategyType.CONSERVATIVE,
+        decision=ScreeningDecisionType.EXCLUDE,
+        confidence_score=0.9,
+        rationale="Animal study",
+        extracted_quotes=["in mice"],
+        exclusion_reason_categories={
+            "population_exclusion_reasons": ["Non-human subjects"]
+        },
+        start_time=datetime.now(UTC),
+        end_time=datetime.now(UTC),
+        response_metadata={},
+        reuse_key="c" * 64,
+    )
+    review_id, search_result_id, trace_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    clone = clone_screening_result(
+        source,
+        review_id=review_id,
+        search_result_id=search_result_id,
+        trace_id=trace_id,
+    )
+
+    assert clone.id != source.id
+    assert (clone.review_id, clone.search_result_id, clone.trace_id) == (
+        review_id,
+        search_result_id,
+        trace_id,
+    )
+    assert clone.decision == ScreeningDecisionType.EXCLUDE
+    assert clone.rationale == "Animal study"
+    assert clone.extracted_quotes == ["in mice"]
+    assert clone.exclusion_reason_categories is not None
+    assert clone.exclusion_reason_categories.population_exclusion_reasons == [
+        "Non-human subjects"
+    ]
+    assert clone.response_metadata[REUSED_FROM_KEY] == {
+        "screen_abstract_result_id": str(source.id),
+        "review_id": str(source.review_id),
+        "reuse_key": "c" * 64,
+    }
@@ -277,7 +277,7 @@ class TestScreenAbstractsPage:
 
         assert not at.exception
         expected_sr_ids = [sr.id for sr in mock_search_results_list]
-        mock_screening_service.perform_batch_abstract_screening.assert_called_once_with(
+        mock_screening_service.stream_batch_abstract_screening.assert_called_once_with(
             review_id=mock_review_model.id, search_result_ids_to_screen=expected_sr_ids
         )
 
@@ -363,7 +363,7 @@ class TestScreenAbstractsPage:
             ScreenAbstractResultTuple(sr1, mock_kons_res1, mock_comp_res1),
             ScreenAbstractResultTuple(sr2, mock_kons_res2, mock_comp_res2),
         ]
-        mock_screening_service.perform_batch_abstract_screening.return_value = (
+        mock_screening_service.stream_batch_abstract_screening.return_value = (
             service_return_tuples
         )
 
@@ -421,7 +421,7 @@ class TestScreenAbstractsPage:
             search_result=sr1, error="Test error", message="Something went wrong"
         )
         service_return_tuples = [ScreenAbstractResultTuple(sr1, mock_error, mock_error)]
-        mock_screening_service.perform_batch_abstract_screening.return_value = (
+        mock_screening_service.stream_batch_abstract_screening.return_value = (
             service_return_tuples
         )
 
@@ -461,7 +461,7 @@ class TestScreenAbstractsPage:
         ],
     ):
         at, _, mock_screening_service, _, _ = app_test_env_v2
-        mock_screening_service.perform_batch_abstract_screening.side_effect = (
+        mock_screening_service.stream_batch_abstract_screening.side_effect = (
             RecordNotFoundError("Review not found by service")
         )
 
@@ -503,7 +503,7 @@ class TestScreenAbstractsPage:
         ],
     ):
         at, _, mock_screening_service, _, _ = app_test_env_v2
-        mock_screening_service.perform_batch_abstract_screening.side_effect = (
+        mock_screening_service.stream_batch_abstract_screening.side_effect = (
             app_services_module.ServiceError("Generic service failure")
         )
 
@@ -570,7 +570,7 @@ class TestScreenAbstractsPage:
         at.run()
 
         assert not at.exception
-        mock_screening_service.perform_batch_abstract_screening.assert_not_called()
+        mock_screening_service.stream_batch_abstract_screening.assert_not_called()
 
         # Check that error message is shown in the UI
         error_found = False
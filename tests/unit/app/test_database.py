@@ -0,0 +1,48 @@
+"""Unit tests for the database setup."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from sqlmodel.orm.session import Session as SQLModelSession
+
+from sr_assistant.app import database
+
+
+def test_asession_factory_uses_the_pooled_engine() -> None:
+    session = database.asession_factory()
+
+    assert session.bind is database.async_engine
+    assert isinstance(session.sync_session, SQLModelSession)
+    assert database.async_engine.pool.size() == 10  # noqa: PLR2004
+
+
+def test_run_async_runs_on_one_loop() -> None:
+    async def _loop_thread() -> tuple[asyncio.AbstractEventLoop, str]:
+        return asyncio.get_running_loop(), threading.current_thread().name
+
+    first = database.run_async(_loop_thread())
+    second = database.run_async(_loop_thread())
+
+    assert first == second
+    assert first[0] is database.get_event_loop()
+    assert first[1] != threading.current_thread().name
+
+
+def test_run_async_raises_coroutine_errors() -> None:
+    async def _fail() -> None:
+        msg = "boom"
+        raise ValueError(msg)
+
+    with pytest.raises(ValueError, match="boom"):
+        database.run_async(_fail())
+
+
+def test_run_async_on_the_loop_raises() -> None:
+    async def _nested() -> None:
+        database.run_async(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError, match="await instead"):
+        database.run_async(_nested())
@@ -0,0 +1,137 @@
+"""Unit tests for near-duplicate detection."""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from sr_assistant.app.dedup import (
+    DUPLICATE_THRESHOLD,
+    NUM_PERM,
+    DuplicateCluster,
+    LSHIndex,
+    cluster_duplicates,
+    jaccard,
+    minhash_signature,
+    normalize_text,
+    signature_from_bytes,
+    signature_to_bytes,
+)
+from sr_assistant.core import models
+
+TITLE = "Exercise therapy for knee osteoarthritis: a randomised controlled trial"
+ABSTRACT = (
+    "Background: Knee osteoarthritis is a leading cause of pain and disability in "
+    + "older adults. Methods: We randomly assigned 312 adults with symptomatic knee "
+    + "osteoarthritis to a 12-week supervised exercise programme or usual care. The "
+    + "primary outcome was pain on a visual analogue scale at 6 months. Results: "
+    + "Exercise reduced pain compared with usual care, and improved function and "
+    + "quality of life. Conclusions: Supervised exercise therapy is an effective "
+    + "first-line treatment for knee osteoarthritis."
+)
+SOIL_TITLE = "Soil microbiome diversity in alpine grassland"
+SOIL_ABSTRACT = (
+    "Nitrogen deposition changed bacterial community composition across twelve "
+    + "alpine grassland sites, reducing the diversity of nitrifying taxa."
+)
+
+
+def _search_result(title: str, abstract: str | None) -> models.SearchResult:
+    return models.SearchResult(
+        id=uuid.uuid4(), review_id=uuid.uuid4(), title=title, abstract=abstract
+    )
+
+
+def test_normalize_text() -> None:
+    assert normalize_text("Éxercise-THERAPY: a trial", None, "(n=312)") == [
+        "exercise",
+        "therapy",
+        "a",
+        "trial",
+        "n",
+        "312",
+    ]
+
+
+def test_near_duplicates_have_similar_signatures() -> None:
+    pubmed = minhash_signature(_search_result(TITLE, ABSTRACT))
+    # Scopus copy: different case and punctuation, no structured abstract headings
+    scopus = minhash_signature(
+        _search_result(
+            TITLE.upper().replace(":", " -"),
+            ABSTRACT.replace("Background: ", "").replace("Methods: ", ""),
+        )
+    )
+    other = minhash_signature(_search_result(SOIL_TITLE, SOIL_ABSTRACT))
+
+    assert pubmed is not None
+    assert scopus is not None
+    assert other is not None
+    assert pubmed.shape == (NUM_PERM,)
+    assert jaccard(pubmed, scopus) >= DUPLICATE_THRESHOLD
+    assert jaccard(pubmed, other) < 0.2  # noqa: PLR2004
+    assert (signature_from_bytes(signature_to_bytes(pubmed)) == pubmed).all()
+
+
+def test_signature_without_enough_text() -> None:
+    assert minhash_signature(_search_result("", None)) is None
+    # Generic records would all look alike
+    assert minhash_signature(_search_result(TITLE, None)) is None
+    assert (
+        minhash_signature(_search_result("Erratum", "Correction to table 2.")) is None
+    )
+
+
+def test_cluster_duplicates() -> None:
+    copies = [
+        _search_result(TITLE, ABSTRACT),
+        _search_result(TITLE.lower(), ABSTRACT + " Trial registration: ISRCTN1."),
+        _search_result(TITLE, ABSTRACT.replace("Results: ", "")),
+    ]
+    unrelated = _search_result(SOIL_TITLE, SOIL_ABSTRACT)
+    search_results = [unrelated, *copies]
+
+    clusters = cluster_duplicates(
+        {sr.id: minhash_signature(sr) for sr in search_results}  # type: ignore[misc]
+    )
+
+    assert len(clusters) == 1
+    assert clusters[0].representative_id == copies[0].id
+    assert set(clusters[0].duplicate_ids) == {copies[1].id, copies[2].id}
+
+
+def test_cluster_duplicates_keeps_different_dois_apart() -> None:
+    first, other_doi, no_doi = (_search_result(TITLE, ABSTRACT) for _ in range(3))
+    dois = {first.id: "10.1/A", other_doi.id: "10.1/b", no_doi.id: None}
+
+    clusters = cluster_duplicates(
+        {sr.id: minhash_signature(sr) for sr in (first, other_doi, no_doi)},  # type: ignore[misc]
+        dois=dois,
+    )
+
+    assert clusters == [
+        DuplicateCluster(representative_id=first.id, duplicate_ids=(no_doi.id,))
+    ]
+    # DOIs are compared case-insensitively
+    dois[other_doi.id] = "10.1/a"
+    clusters = cluster_duplicates(
+        {sr.id: minhash_signature(sr) for sr in (first, other_doi, no_doi)},  # type: ignore[misc]
+        dois=dois,
+    )
+    assert clusters[0].duplicate_ids == (other_doi.id, no_doi.id)
+
+
+def test_lsh_index() -> None:
+    index = LSHIndex()
+    sr = _search_result(TITLE, ABSTRACT)
+    signature = minhash_signature(sr)
+    assert signature is not None
+
+    index.add(sr.id, signature)
+    index.add(sr.id, signature)
+
+    assert len(index) == 1
+    assert index.query(signature) == [sr.id]
+    with pytest.raises(ValueError, match="bands"):
+        LSHIndex(bands=3)
@@ -0,0 +1,207 @@
+"""Unit tests for the LLM response cache."""
+
+from __future__ import annotations
+
+import typing as t
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+from sr_assistant.app import llm_cache
+from sr_assistant.app.llm_cache import (
+    BYPASS_CACHE_KEY,
+    PostgresLLMCache,
+    SQLiteLLMCache,
+    cached,
+    make_cache_key,
+)
+from sr_assistant.core.repositories import RepositoryError
+
+PROMPT = ChatPromptTemplate.from_messages(
+    [("system", "You are a reviewer."), ("human", "{title}\n{abstract}")]
+)
+INPUTS = {"title": "A title", "abstract": "An abstract"}
+
+
+class Answer(BaseModel):
+    decision: str
+    n: int
+
+
+class ExplainedAnswer(Answer):
+    rationale: str
+
+
+def _key(**overrides: t.Any) -> str:
+    kwargs: dict[str, t.Any] = {
+        "namespace": "screening:conservative",
+        "prompt": PROMPT,
+        "model_name": "gpt-4o",
+        "temperature": 0,
+        "schema": Answer,
+        "inputs": INPUTS,
+    }
+    kwargs.update(overrides)
+    return make_cache_key(**kwargs)
+
+
+class TestMakeCacheKey:
+    def test_stable(self) -> None:
+        assert _key() == _key(inputs=dict(reversed(INPUTS.items())))
+        assert len(_key()) == 64  # noqa: PLR2004
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"namespace": "screening:comprehensive"},
+            {"model_name": "gpt-4o-mini"},
+            {"temperature": 0.5},
+            {"schema": ExplainedAnswer},
+            {"inputs": {**INPUTS, "abstract": "Another abstract"}},
+            {
+                "prompt": ChatPromptTemplate.from_messages(
+                    [("system", "You are strict."), ("human", "{title}\n{abstract}")]
+                )
+            },
+        ],
+    )
+    def test_changes_with_content(self, overrides: dict[str, t.Any]) -> None:
+        assert _key() != _key(**overrides)
+
+
+class TestSQLiteLLMCache:
+    def test_hit_miss_counters(self) -> None:
+        cache = SQLiteLLMCache(":memory:")
+        assert cache.lookup("k") is None
+        cache.update("k", namespace="ns", model_name="m", value={"a": 1})
+        assert cache.lookup("k") == {"a": 1}
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.writes) == (1, 1, 1)
+        assert stats.hit_rate == 0.5  # noqa: PLR2004
+
+    def test_ttl(self) -> None:
+        cache = SQLiteLLMCache(":memory:", ttl=timedelta(seconds=-1))
+        cache.update("k", namespace="ns", model_name="m", value={"a": 1})
+        assert cache.lookup("k") is None
+        assert cache.evict() == 1
+
+    def test_lru_eviction(self, tmp_path: t.Any) -> None:
+        cache = SQLiteLLMCache(tmp_path / "cache" / "llm.sqlite3", max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.update(key, namespace="ns", model_name="m", value={"k": key})
+        # touch "a" so "b" is the least recently used
+        assert cache.lookup("a") == {"k": "a"}
+
+        assert cache.evict() == 1
+        assert cache.lookup("b") is None
+        assert cache.lookup("a") is not None
+        assert cache.lookup("c") is not None
+        assert cache.stats().evictions == 1
+
+    def test_clear(self) -> None:
+        cache = SQLiteLLMCache(":memory:")
+        cache.update("k", namespace="ns", model_name="m", value={"a": 1})
+        cache.clear()
+        assert cache.lookup("k") is None
+
+
+def test_backend_errors_are_misses() -> None:
+    factory = MagicMock()
+    factory.begin.side_effect = RepositoryError("DB down")
+    cache = PostgresLLMCache(factory)
+
+    assert cache.lookup("k") is None
+    cache.update("k", namespace="ns", model_name="m", value={})
+
+    stats = cache.stats()
+    assert stats.errors == 2  # noqa: PLR2004
+    assert stats.misses == 1
+    assert stats.writes == 0
+
+
+class TestCached:
+    @pytest.fixture
+    def model(self) -> MagicMock:
+        return MagicMock(side_effect=lambda _: Answer(decision="include", n=1))
+
+    def _runnable(self, model: MagicMock, cache: SQLiteLLMCache) -> t.Any:
+        return cached(
+            RunnableLambda(model),
+            namespace="test",
+            prompt=PROMPT,
+            model_name="gpt-4o",
+            temperature=0,
+            output_type=Answer,
+            cache=cache,
+        )
+
+    def test_second_call_is_served_from_cache(self, model: MagicMock) -> None:
+        cache = SQLiteLLMCache(":memory:")
+        runnable = self._runnable(model, cache)
+
+        first = runnable.invoke(INPUTS)
+        second = runnable.invoke(INPUTS)
+
+        assert first == second == Answer(decision="include", n=1)
+        assert model.call_count == 1
+        assert cache.stats().hits == 1
+
+    def test_bypass(self, model: MagicMock) -> None:
+        cache = SQLiteLLMCache(":memory:")
+        runnable = self._runnable(model, cache)
+        runnable.invoke(INPUTS)
+
+        runnable.invoke(INPUTS, config={"configurable": {BYPASS_CACHE_KEY: True}})
+
+        assert model.call_count == 2  # noqa: PLR2004
+        assert cache.stats().bypassed == 1
+        assert cache.stats().writes == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_async(self, model: MagicMock) -> None:
+        cache = SQLiteLLMCache(":memory:")
+        runnable = self._runnable(model, cache)
+
+        await runnable.ainvoke(INPUTS)
+        await runnable.ainvoke(INPUTS)
+
+        assert model.call_count == 1
+
+    def test_non_output_type_not_cached(self) -> None:
+        cache = SQLiteLLMCache(":memory:")
+        model = MagicMock(return_value={"raw": "unparsed"})
+        runnable = self._runnable(model, cache)
+
+        runnable.invoke(INPUTS)
+        runnable.invoke(INPUTS)
+
+        assert model.call_count == 2  # noqa: PLR2004
+        assert cache.stats().writes == 0
+
+    def test_disabled_cache(self, model: MagicMock) -> None:
+        runnable = cached(
+            RunnableLambda(model),
+            namespace="test",
+            prompt=PROMPT,
+            model_name="gpt-4o",
+            temperature=0,
+            output_type=Answer,
+            cache=lambda: None,
+        )
+        runnable.invoke(INPUTS)
+        runnable.invoke(INPUTS)
+        assert model.call_count == 2  # noqa: PLR2004
+
+
+def test_get_llm_cache_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = MagicMock(LLM_CACHE_BACKEND="disabled", LLM_CACHE_TTL_SECONDS=None)
+    monkeypatch.setattr(llm_cache, "get_settings", lambda: settings)
+    monkeypatch.setattr(llm_cache, "_llm_cache_initialized", False)
+    monkeypatch.setattr(llm_cache, "_llm_cache", None)
+
+    assert llm_cache.get_llm_cache() is None
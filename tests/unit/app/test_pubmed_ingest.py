@@ -0,0 +1,208 @@
+"""Unit tests for chunked PubMed retrieval, against a local Entrez stand-in."""
+
+from __future__ import annotations
+
+import io
+import threading
+import time
+import typing as t
+
+import pytest
+from Bio import Entrez
+
+from sr_assistant.app.agents.rate_limit import RequestRateLimiter
+from sr_assistant.app.pubmed_ingest import PubMedFetcher, PubMedSearch
+
+if t.TYPE_CHECKING:
+    import xml.etree.ElementTree as ET
+
+ESEARCH_DOCTYPE = '<!DOCTYPE eSearchResult PUBLIC "-//NLM//DTD esearch 20060628//EN" "https://eutils.ncbi.nlm.nih.gov/eutils/dtd/20060628/esearch.dtd">'
+EPOST_DOCTYPE = '<!DOCTYPE ePostResult PUBLIC "-//NLM//DTD epost 20060628//EN" "https://eutils.ncbi.nlm.nih.gov/eutils/dtd/20060628/epost.dtd">'
+PUBMED_DOCTYPE = '<!DOCTYPE PubmedArticleSet PUBLIC "-//NLM//DTD PubMedArticle, 1st January 2019//EN" "https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_190101.dtd">'
+
+
+def _article_xml(pmid: str) -> str:
+    return "".join(
+        [
+            '<PubmedArticle><MedlineCitation Status="MEDLINE" Owner="NLM">',
+            f'<PMID Version="1">{pmid}</PMID><Article PubModel="Print"><Journal>',
+            '<JournalIssue CitedMedium="Print"><PubDate><Year>2020</Year></PubDate>',
+            "</JournalIssue><Title>Journal</Title></Journal>",
+            f"<ArticleTitle>Article {pmid}</ArticleTitle></Article></MedlineCitation>",
+            "<PubmedData><PublicationStatus>ppublish</PublicationStatus>",
+            f'<ArticleIdList><ArticleId IdType="pubmed">{pmid}</ArticleId>',
+            "</ArticleIdList></PubmedData></PubmedArticle>",
+        ]
+    )
+
+
+class FakeEntrez:
+    """E-utilities stand-in serving XML for a fixed list of PMIDs."""
+
+    api_key = "key"
+
+    def __init__(self, pmids: list[str], *, latency: float = 0.0) -> None:
+        self.pmids = pmids
+        self.latency = latency
+        self.history: dict[str, list[str]] = {"1": pmids}
+        self.calls: list[tuple[str, dict[str, t.Any]]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _handle(xml: str) -> io.BytesIO:
+        return io.BytesIO(f'<?xml version="1.0" ?>\n{xml}'.encode())
+
+    def esearch(self, **params: t.Any) -> io.BytesIO:
+        self.calls.append(("esearch", params))
+        ids = "".join(f"<Id>{pmid}</Id>" for pmid in self.pmids[: params["retmax"]])
+        return self._handle(
+            "".join(
+                [
+                    f"{ESEARCH_DOCTYPE}<eSearchResult><Count>{len(self.pmids)}</Count>",
+                    f"<RetMax>{params['retmax']}</RetMax><RetStart>0</RetStart>",
+                    f"<QueryKey>1</QueryKey><WebEnv>MCID_test</WebEnv><IdList>{ids}</IdList>",
+                    "<TranslationSet/><QueryTranslation>q</QueryTranslation></eSearchResult>",
+                ]
+            )
+        )
+
+    def epost(self, **params: t.Any) -> io.BytesIO:
+        self.calls.append(("epost", params))
+        query_key = str(len(self.history) + 1)
+        self.history[query_key] = params["id"].split(",")
+        return self._handle(
+            f"{EPOST_DOCTYPE}<ePostResult><QueryKey>{query_key}</QueryKey>"
+            + f"<WebEnv>{params['webenv']}</WebEnv></ePostResult>"
+        )
+
+    def efetch(self, **params: t.Any) -> io.BytesIO:
+        with self._lock:
+            self.calls.append(("efetch", params))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        if "id" in params:
+            pmids = params["id"]
+        else:
+            start = params["retstart"]
+            pmids = self.history[params["query_key"]][start : start + params["retmax"]]
+        with self._lock:
+            self.in_flight -= 1
+        articles = "".join(_article_xml(pmid) for pmid in pmids)
+        return self._handle(
+            f"{PUBMED_DOCTYPE}<PubmedArticleSet>{articles}</PubmedArticleSet>"
+        )
+
+    read = staticmethod(Entrez.read)
+
+    def utility_calls(self, utility: str) -> list[dict[str, t.Any]]:
+        return [params for name, params in self.calls if name == utility]
+
+
+def _pmid(article: ET.Element) -> str:
+    return article.findtext("MedlineCitation/PMID", "")
+
+
+def _fetcher(entrez: FakeEntrez, **kwargs: t.Any) -> PubMedFetcher:
+    return PubMedFetcher(entrez, limiter=RequestRateLimiter(1000), **kwargs)
+
+
+def test_esearch_uses_history() -> None:
+    entrez = FakeEntrez([str(n) for n in range(1, 6)])
+
+    search = _fetcher(entrez).esearch("query", max_results=3)
+
+    assert search == PubMedSearch(
+        pmids=["1", "2", "3"], webenv="MCID_test", query_key="1"
+    )
+    assert entrez.utility_calls("esearch")[0]["usehistory"] == "y"
+
+
+def test_small_result_set_is_fetched_by_id() -> None:
+    entrez = FakeEntrez(["1", "2", "3"])
+    fetcher = _fetcher(entrez, chunk_size=5)
+    search = fetcher.esearch("query", max_results=3)
+
+    requests = fetcher.efetch_requests(search, ["1", "3"])
+    chunks = list(fetcher.iter_chunks(requests, _pmid))
+
+    assert requests == [{"id": ["1", "3"]}]
+    assert chunks == [["1", "3"]]
+    assert not entrez.utility_calls("epost")
+
+
+def test_large_result_set_is_paged_from_history() -> None:
+    pmids = [str(n) for n in range(1, 11)]
+    entrez = FakeEntrez(pmids)
+    fetcher = _fetcher(entrez, chunk_size=4)
+    search = fetcher.esearch("query", max_results=10)
+
+    requests = fetcher.efetch_requests(search, pmids)
+
+    assert [(r["query_key"], r["retstart"], r["retmax"]) for r in requests] == [
+        ("1", 0, 4),
+        ("1", 4, 4),
+        ("1", 8, 2),
+    ]
+    assert not entrez.utility_calls("epost")
+    assert list(fetcher.iter_chunks(requests, _pmid)) == [
+        ["1", "2", "3", "4"],
+        ["5", "6", "7", "8"],
+        ["9", "10"],
+    ]
+
+
+def test_new_pmids_are_posted_to_history() -> None:
+    entrez = FakeEntrez([str(n) for n in range(1, 11)])
+    fetcher = _fetcher(entrez, chunk_size=2)
+    search = fetcher.esearch("query", max_results=10)
+    new_pmids = ["2", "3", "5", "8", "9"]
+
+    requests = fetcher.efetch_requests(search, new_pmids)
+    chunks = list(fetcher.iter_chunks(requests, _pmid))
+
+    assert entrez.utility_calls("epost") == [
+        {"db": "pubmed", "id": "2,3,5,8,9", "webenv": "MCID_test"}
+    ]
+    assert {r["query_key"] for r in requests} == {"2"}
+    assert chunks == [["2", "3"], ["5", "8"], ["9"]]
+
+
+def test_chunks_are_fetched_concurrently_with_bounded_prefetch() -> None:
+    pmids = [str(n) for n in range(1, 21)]
+    entrez = FakeEntrez(pmids, latency=0.05)
+    fetcher = _fetcher(entrez, chunk_size=2, concurrency=3)
+    requests = fetcher.efetch_requests(PubMedSearch(pmids, "MCID_test", "1"), pmids)
+
+    chunks = fetcher.iter_chunks(requests, _pmid)
+    first = next(chunks)
+    time.sleep(0.2)
+    # The consumed chunk's request was replaced, no further requests were started
+    assert len(entrez.utility_calls("efetch")) == 4  # noqa: PLR2004
+    rest = list(chunks)
+
+    assert [first, *rest] == [pmids[i : i + 2] for i in range(0, 20, 2)]
+    assert entrez.max_in_flight == 3  # noqa: PLR2004
+
+
+def test_iter_chunks_raises_fetch_errors_in_order() -> None:
+    entrez = FakeEntrez(["1", "2", "3"])
+    fetcher = _fetcher(entrez, chunk_size=1)
+
+    def _transform(article: ET.Element) -> str | None:
+        pmid = _pmid(article)
+        if pmid == "2":
+            msg = "bad record"
+            raise ValueError(msg)
+        return pmid
+
+    chunks = fetcher.iter_chunks(
+        fetcher.efetch_requests(PubMedSearch([], None, None), ["1", "2", "3"]),
+        _transform,
+    )
+
+    assert next(chunks) == ["1"]
+    with pytest.raises(ValueError, match="bad record"):
+        next(chunks)
@@ -0,0 +1,166 @@
+"""Unit tests for the streaming PubMed XML mapper."""
+
+from __future__ import annotations
+
+import io
+import uuid
+from pathlib import Path
+
+import pytest
+
+from sr_assistant.app import pubmed_xml
+from sr_assistant.app.pubmed_xml import (
+    element_data,
+    iter_pubmed_articles,
+    map_pubmed_article,
+    pubmed_article_fields,
+)
+from sr_assistant.core import models
+from sr_assistant.core.types import SearchDatabaseSource
+
+EFETCH_XML = Path(__file__).parent / "data" / "pubmed_efetch.xml"
+
+
+@pytest.fixture
+def fields() -> dict[str, dict]:
+    with EFETCH_XML.open("rb") as f:
+        return {
+            values["source_id"]: values
+            for article in iter_pubmed_articles(f)
+            if (values := pubmed_article_fields(article)) is not None
+        }
+
+
+def test_book_articles_are_skipped(fields: dict[str, dict]) -> None:
+    assert list(fields) == ["31475799", "35012345", "38000001"]
+
+
+def test_iter_pubmed_articles_across_read_blocks(
+    monkeypatch: pytest.MonkeyPatch, fields: dict[str, dict]
+) -> None:
+    monkeypatch.setattr(pubmed_xml, "READ_SIZE", 64)
+
+    articles = iter_pubmed_articles(io.BytesIO(EFETCH_XML.read_bytes()))
+
+    assert [pubmed_article_fields(a) for a in articles] == list(fields.values())
+
+
+def test_structured_article_fields(fields: dict[str, dict]) -> None:
+    values = fields["31475799"]
+
+    assert values["source_db"] == SearchDatabaseSource.PUBMED
+    assert values["doi"] == "10.1016/j.joca.2019.08.005"
+    assert values["title"].startswith("Supervised exercise therapy")
+    assert values["abstract"].startswith(
+        "OBJECTIVE: To compare supervised exercise therapy with usual care in adults"
+        + " with symptomatic knee osteoarthritis. DESIGN: Randomised"
+    )
+    assert "CONCLUSIONS: Supervised exercise" in values["abstract"]
+    assert values["journal"] == "Osteoarthritis and cartilage"
+    assert values["year"] == "2020"
+    assert values["authors"] == [
+        "Aoife Murphy",
+        "O'Brien K",
+        "Knee Exercise Trial Group",
+    ]
+    assert values["keywords"] == ["Exercise", "Knee osteoarthritis", "Pain"]
+    assert values["source_metadata"] == {
+        "pmc": "PMC7001234",
+        "publication_status": "ppublish",
+        "mesh_headings": [
+            {"DescriptorName": "Humans"},
+            {"DescriptorName": "Exercise Therapy", "QualifierName": "methods"},
+            {"DescriptorName": "Osteoarthritis, Knee", "QualifierName": "therapy"},
+        ],
+    }
+
+
+def test_doi_from_elocation_and_medline_date_year(fields: dict[str, dict]) -> None:
+    values = fields["35012345"]
+
+    assert values["doi"] == "10.1007/s11845-021-02601-x"
+    assert values["year"] == "2021"
+    assert values["authors"] == ["Siobhan Kelly"]
+    assert values["keywords"] is None
+    assert values["source_metadata"]["pmc"] is None
+
+
+def test_inline_markup_is_text(fields: dict[str, dict]) -> None:
+    values = fields["38000001"]
+
+    assert values["title"] == (
+        "Effect of CO2 laser therapy on pain: protocol for a systematic review."
+    )
+    raw_article = values["raw_data"]["MedlineCitation"]["Article"]
+    assert raw_article["ArticleTitle"] == values["title"]
+    assert values["abstract"] == (
+        "INTRODUCTION: Evidence on laser therapy is conflicting."
+        + " METHODS AND ANALYSIS: We will search MEDLINE, Embase and CENTRAL."
+    )
+    assert values["journal"] == "BMJ open"
+    assert values["authors"] is None
+
+
+def test_raw_data_layout(fields: dict[str, dict]) -> None:
+    raw = fields["31475799"]["raw_data"]
+    article = raw["MedlineCitation"]["Article"]
+
+    assert raw["MedlineCitation"]["PMID"] == "31475799"
+    assert article["ELocationID"] == [
+        "S1063-4584(19)31189-4",
+        "10.1016/j.joca.2019.08.005",
+    ]
+    assert len(article["Abstract"]["AbstractText"]) == 4  # noqa: PLR2004
+    assert article["AuthorList"][1] == {"LastName": "O'Brien", "Initials": "K"}
+    assert article["PublicationTypeList"] == [
+        "Randomized Controlled Trial",
+        "Journal Article",
+    ]
+    assert raw["PubmedData"]["History"] == {
+        "PubMedPubDate": [
+            {"Year": "2019", "Month": "03", "Day": "11"},
+            {"Year": "2019", "Month": "9", "Day": "2"},
+        ]
+    }
+    # Single AbstractText is a list too
+    second = fields["35012345"]["raw_data"]["MedlineCitation"]["Article"]
+    assert len(second["Abstract"]["AbstractText"]) == 1
+
+
+def test_element_data_repeated_children() -> None:
+    article = next(
+        iter_pubmed_articles(
+            io.BytesIO(
+                b"<PubmedArticleSet><PubmedArticle><A><B>1</B><B>2</B><B>3</B>"
+                + b"<C><D>x</D></C></A></PubmedArticle></PubmedArticleSet>"
+            )
+        )
+    )
+
+    assert element_data(article) == {"A": {"B": ["1", "2", "3"], "C": {"D": "x"}}}
+
+
+def test_article_without_title_is_skipped() -> None:
+    article = next(
+        iter_pubmed_articles(
+            io.BytesIO(
+                b'<PubmedArticleSet><PubmedArticle><MedlineCitation><PMID Version="1">'
+                + b"1</PMID><Article><ArticleTitle> </ArticleTitle></Article>"
+                + b"</MedlineCitation></PubmedArticle></PubmedArticleSet>"
+            )
+        )
+    )
+
+    assert pubmed_article_fields(article) is None
+    assert map_pubmed_article(article, uuid.uuid4()) is None
+
+
+def test_map_pubmed_article() -> None:
+    review_id = uuid.uuid4()
+
+    with EFETCH_XML.open("rb") as f:
+        results = [map_pubmed_article(a, review_id) for a in iter_pubmed_articles(f)]
+
+    assert all(isinstance(r, models.SearchResult) for r in results)
+    assert [r.source_id for r in results] == ["31475799", "35012345", "38000001"]  # type: ignore[union-attr]
+    assert all(r.review_id == review_id for r in results)  # type: ignore[union-attr]
@@ -0,0 +1,179 @@
+"""Unit tests for paginated Scopus retrieval, against a local stand-in server."""
+
+from __future__ import annotations
+
+import json
+import threading
+import typing as t
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+from sr_assistant.app import scopus_ingest
+from sr_assistant.app.agents.rate_limit import RequestRateLimiter
+from sr_assistant.app.scopus_ingest import ScopusClient, ScopusError
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+RECORDED_RESPONSES = Path(__file__).parent / "data" / "scopus_search.json"
+QUERY = "TITLE-ABS-KEY(knee osteoarthritis exercise)"
+SEARCH_PATH = "/content/search/scopus"
+
+
+class RecordedScopusServer(ThreadingHTTPServer):
+    """Scopus Search API stand-in serving recorded responses.
+
+    A request gets the first recorded response whose ``request`` parameters it has,
+    404 otherwise. ``failures`` are sent first, as ``(status, headers)``.
+    """
+
+    def __init__(self, recordings: list[dict[str, t.Any]]) -> None:
+        super().__init__(("127.0.0.1", 0), _RecordedScopusHandler)
+        self.recordings = recordings
+        self.failures: list[tuple[int, dict[str, str]]] = []
+        self.requests: list[dict[str, str]] = []
+        self.api_keys: set[str | None] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{SEARCH_PATH}"
+
+    def respond(
+        self, params: dict[str, str], api_key: str | None
+    ) -> tuple[int, dict[str, str], dict[str, t.Any]]:
+        with self._lock:
+            self.requests.append(params)
+            self.api_keys.add(api_key)
+            if self.failures:
+                status, headers = self.failures.pop(0)
+                return status, headers, {"service-error": {"status": status}}
+        for recording in self.recordings:
+            if recording["request"].items() <= params.items():
+                return 200, {}, recording["response"]
+        return 404, {}, {"service-error": {"status": "RESOURCE_NOT_FOUND"}}
+
+    def searches(self, view: str = "STANDARD") -> list[dict[str, str]]:
+        return [params for params in self.requests if params["view"] == view]
+
+
+class _RecordedScopusHandler(BaseHTTPRequestHandler):
+    server: RecordedScopusServer
+
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlsplit(self.path)
+        status, headers, body = self.server.respond(
+            dict(parse_qsl(url.query)), self.headers.get("X-ELS-APIKey")
+        )
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: t.Any) -> None:  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def scopus_server() -> Iterator[RecordedScopusServer]:
+    server = RecordedScopusServer(json.loads(RECORDED_RESPONSES.read_text()))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server: RecordedScopusServer, **kwargs: t.Any) -> ScopusClient:
+    return ScopusClient(
+        "key",
+        base_url=server.url,
+        page_size=2,
+        limiter=RequestRateLimiter(1000),
+        **kwargs,
+    )
+
+
+def _eid_and_abstract(entry: dict[str, t.Any]) -> tuple[str, str | None]:
+    return entry["eid"][-1], entry.get("dc:description")
+
+
+def test_pages_are_read_by_cursor_and_completed(
+    scopus_server: RecordedScopusServer,
+) -> None:
+    pages = list(_client(scopus_server).iter_pages(QUERY, 100, _eid_and_abstract))
+
+    assert [[eid for eid, _ in page] for page in pages] == [
+        ["1", "2"],
+        ["3", "4"],
+        ["5"],
+    ]
+    assert all(abstract for page in pages for _, abstract in page)
+    # The empty page ends the search
+    assert [p["cursor"] for p in scopus_server.searches()] == [
+        "*",
+        "AoJ2a1",
+        "AoJ2a2",
+        "AoJ2a3",
+    ]
+    # Only entries without an abstract are requested in the COMPLETE view
+    assert [p["query"] for p in scopus_server.searches("COMPLETE")] == [
+        "EID(2-s2.0-85100000002)",
+        "EID(2-s2.0-85100000003)",
+    ]
+    assert scopus_server.api_keys == {"key"}
+
+
+def test_max_results_limits_pages(scopus_server: RecordedScopusServer) -> None:
+    pages = list(_client(scopus_server).iter_pages(QUERY, 3, _eid_and_abstract))
+
+    assert [[eid for eid, _ in page] for page in pages] == [["1", "2"], ["3"]]
+    assert [(p["cursor"], p["count"]) for p in scopus_server.searches()] == [
+        ("*", "2"),
+        ("AoJ2a1", "1"),
+    ]
+
+
+def test_transform_drops_none(scopus_server: RecordedScopusServer) -> None:
+    def _odd(entry: dict[str, t.Any]) -> str | None:
+        eid = entry["eid"][-1]
+        return eid if int(eid) % 2 else None
+
+    pages = list(_client(scopus_server).iter_pages(QUERY, 100, _odd))
+
+    assert pages == [["1"], ["3"], ["5"]]
+
+
+def test_throttled_requests_are_retried(
+    scopus_server: RecordedScopusServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(scopus_ingest, "SCOPUS_RETRY_BACKOFF", 0.0)
+    scopus_server.failures = [(429, {"Retry-After": "0"}), (503, {})]
+
+    page = _client(scopus_server).search_page(QUERY)
+
+    assert page.entries[0]["eid"] == "2-s2.0-85100000001"
+    assert page.total_results == 5  # noqa: PLR2004
+    assert page.next_cursor == "AoJ2a1"
+    assert len(scopus_server.requests) == 3  # noqa: PLR2004
+
+
+def test_errors_raise_scopus_error_in_order(
+    scopus_server: RecordedScopusServer,
+) -> None:
+    # The second page isn't recorded
+    scopus_server.recordings = scopus_server.recordings[:1] + [
+        r for r in scopus_server.recordings if r["request"]["view"] == "COMPLETE"
+    ]
+    pages = _client(scopus_server).iter_pages(QUERY, 100, _eid_and_abstract)
+
+    assert [eid for eid, _ in next(pages)] == ["1", "2"]
+    with pytest.raises(ScopusError, match="404"):
+        next(pages)
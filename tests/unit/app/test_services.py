@@ -10,24 +10,33 @@ from typing import override
 if t.TYPE_CHECKING:
     from pydantic import JsonValue
 import copy
+import functools
+import io
 import uuid
 from datetime import UTC, datetime
 from unittest.mock import (
+    ANY,
+    AsyncMock,
     MagicMock,
     patch,
 )
 
 import pytest
 from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from sr_assistant.app import services
+from sr_assistant.app.agents.batch_screening import LocalBatchJobClient
+from sr_assistant.app.agents.rate_limit import RequestRateLimiter
 from sr_assistant.app.agents.screening_agents import (
     ScreenAbstractResultTuple,
     ScreenAbstractsBatchOutput,
     # screen_abstracts_batch, # Will be mocked
 )
+from sr_assistant.app.agents.screening_cascade import CascadeConfig
 from sr_assistant.core import models, repositories, schemas
 from sr_assistant.core.schemas import (
     ExclusionReasons,
@@ -37,10 +46,16 @@ from sr_assistant.core.schemas import (
     ScreeningResult as ScreeningResultSchema,  # Alias to avoid clash with models.ScreeningResult if any
 )
 from sr_assistant.core.types import (
+    ScreeningJobKind,
+    ScreeningJobStatus,
     ScreeningStrategyType,
     SearchDatabaseSource,
 )
 
+from .agents.test_batch_screening import fake_chat_completion
+from .test_scopus_ingest import QUERY as SCOPUS_QUERY
+from .test_scopus_ingest import RecordedScopusServer, scopus_server  # noqa: F401
+
 
 # --- Test Data ---
 # Minimal mock for Bio.Entrez.Element.StringElement or similar simple elements
@@ -55,6 +70,31 @@ class MockEntrezStringElement:
 
 
 # Mock for more complex Bio.Entrez.Element.DictElement or ListElement if needed
+
+
+def _efetch_handle(*articles: tuple[str, str]) -> io.BytesIO:
+    """EFetch response with (PMID, title) articles."""
+    xml = "".join(
+        f'<PubmedArticle><MedlineCitation><PMID Version="1">{pmid}</PMID>'
+        + f"<Article><ArticleTitle>{title}</ArticleTitle></Article>"
+        + "</MedlineCitation></PubmedArticle>"
+        for pmid, title in articles
+    )
+    return io.BytesIO(f"<PubmedArticleSet>{xml}</PubmedArticleSet>".encode())
+
+
+def _async_session_factory(session: MagicMock) -> MagicMock:
+    """Async session factory mock whose sessions ``run_sync`` on ``session``."""
+    asession = MagicMock(spec=AsyncSession)
+    asession.run_sync = AsyncMock(
+        side_effect=lambda fn, *args, **kwargs: fn(session, *args, **kwargs)
+    )
+    factory = MagicMock(spec=async_sessionmaker)
+    factory.return_value.__aenter__.return_value = asession
+    factory.begin.return_value.__aenter__.return_value = asession
+    return factory
+
+
 # For now, recursive_clean handles dicts and lists directly.
 
 SAMPLE_RAW_PUBMED_RECORD_SIMPLE = {
@@ -110,6 +150,12 @@ SAMPLE_CLEANED_PUBMED_RECORD_SIMPLE = {
     },
 }
 
+KNEE_ABSTRACT = (
+    "We randomly assigned 312 adults with symptomatic knee osteoarthritis to a "
+    + "12-week supervised exercise programme or usual care. Exercise reduced pain "
+    + "at 6 months compared with usual care and improved function."
+)
+
 
 # --- Test SearchService Helper Methods ---
 
@@ -521,14 +567,11 @@ class TestSearchServiceSearchPubmedAndStoreResults:
             },
         }
 
-        # Default read sequence: first for esearch, second for efetch
-        mock_entrez.read.side_effect = [
-            {"IdList": ["12345", "pmid2"]},  # PMIDs for esearch
-            [  # List of records for efetch
-                SAMPLE_CLEANED_PUBMED_RECORD_SIMPLE,  # Already defined globally
-                sample_pubmed_record_2_cleaned,
-            ],
-        ]
+        # read parses esearch, efetch responses are parsed from the XML
+        mock_entrez.read.side_effect = [{"IdList": ["12345", "pmid2"]}]  # esearch
+        mock_entrez.efetch.side_effect = lambda **_params: _efetch_handle(
+            ("12345", "Test Title Simple"), ("pmid2", "Title 2 for Schema Test")
+        )
 
         # 3. Mock session factory and session
         mock_session_factory = MagicMock(spec=sessionmaker)
@@ -536,11 +579,11 @@ class TestSearchServiceSearchPubmedAndStoreResults:
         mock_session_factory.begin.return_value.__enter__.return_value = mock_session
 
         # 4. Mock repository
-        # The repo.add_all is expected to return a list of models.SearchResult instances
+        # The repo.upsert_many is expected to return the inserted models.SearchResult instances
         # The service then converts these to schemas.SearchResultRead
         mock_repo = MagicMock(spec=repositories.SearchResultRepository)
 
-        # Create mock model instances that would be returned by repo.add_all
+        # Create mock model instances that would be returned by repo.upsert_many
         # These should correspond to SAMPLE_CLEANED_PUBMED_RECORD_SIMPLE and sample_pubmed_record_2_cleaned
         mock_model_1 = models.SearchResult(
             id=uuid.uuid4(),
@@ -580,10 +623,14 @@ class TestSearchServiceSearchPubmedAndStoreResults:
             created_at=datetime.now(UTC),  # USE timezone-aware UTC
             updated_at=datetime.now(UTC),  # USE timezone-aware UTC
         )
-        mock_repo.add_all.return_value = [mock_model_1, mock_model_2]
+        mock_repo.upsert_many.return_value = repositories.UpsertResult(
+            inserted=[mock_model_1, mock_model_2], updated=[], skipped=0
+        )
 
         service_instance = services.SearchService(
-            factory=mock_session_factory, search_repo=mock_repo
+            factory=mock_session_factory,
+            search_repo=mock_repo,
+            afactory=_async_session_factory(mock_session),
         )
         return (
             service_instance,
@@ -603,10 +650,10 @@ class TestSearchServiceSearchPubmedAndStoreResults:
         )
         review_id = uuid.uuid4()
 
-        # Assign the actual review_id to the mock models that repo.add_all will return
+        # Assign the actual review_id to the mock models that repo.upsert_many will return
         # This ensures the models used for schema validation have the correct review_id
-        mock_repo.add_all.return_value[0].review_id = review_id
-        mock_repo.add_all.return_value[1].review_id = review_id
+        for model in mock_repo.upsert_many.return_value.inserted:
+            model.review_id = review_id
 
         results = search_service.search_pubmed_and_store_results(
             review_id, "test query", max_results=2
@@ -633,18 +680,18 @@ class TestSearchServiceSearchPubmedAndStoreResults:
 
         # Verify Entrez calls
         mock_entrez.esearch.assert_called_once_with(
-            db="pubmed", term="test query", retmax=2, sort="relevance"
+            db="pubmed", term="test query", retmax=2, sort="relevance", usehistory="y"
         )
         mock_entrez.efetch.assert_called_once_with(
             db="pubmed", id=["12345", "pmid2"], rettype="xml", retmode="xml"
         )
-        assert mock_entrez.read.call_count == 2
+        assert mock_entrez.read.call_count == 1
 
         # Verify repository call
-        # The objects passed to add_all are models.SearchResult instances generated internally
+        # The objects passed to upsert_many are models.SearchResult instances generated internally
         # We can check the number of items and that they are of the correct type.
-        assert mock_repo.add_all.call_count == 1
-        call_args = mock_repo.add_all.call_args[0]  # Get positional arguments
+        assert mock_repo.upsert_many.call_count == 1
+        call_args = mock_repo.upsert_many.call_args[0]  # Get positional arguments
         assert isinstance(call_args[0], MagicMock)  # Session mock
         assert isinstance(call_args[1], list)
         assert len(call_args[1]) == 2
@@ -656,13 +703,111 @@ class TestSearchServiceSearchPubmedAndStoreResults:
 
         # Verify session management (begin was called)
         mock_session_factory.begin.assert_called_once()
-        # Access the actual session mock to check for refresh calls
+        # Upserted rows come back from RETURNING, no refresh round trips
         actual_session_mock = (
             mock_session_factory.begin.return_value.__enter__.return_value
         )
-        assert (
-            actual_session_mock.refresh.call_count == 2
-        )  # Called for each added model
+        actual_session_mock.refresh.assert_not_called()
+
+    def test_search_pubmed_stores_each_chunk(
+        self,
+        search_service_and_mocks: tuple[
+            services.SearchService, MagicMock, MagicMock, MagicMock
+        ],
+    ):
+        search_service, mock_entrez, mock_repo, mock_session_factory = (
+            search_service_and_mocks
+        )
+        review_id = uuid.uuid4()
+        articles = [("12345", "Title 1"), ("pmid2", "Title 2")]
+        mock_entrez.esearch.return_value = MagicMock(
+            records={"IdList": ["12345", "pmid2"], "WebEnv": "W", "QueryKey": "1"}
+        )
+        # Chunks are fetched in threads, serve them by retstart
+        mock_entrez.efetch.side_effect = lambda **params: _efetch_handle(
+            articles[params["retstart"]]
+        )
+        mock_entrez.read.side_effect = lambda handle: handle.records
+        mock_repo.get_existing_source_ids.return_value = set()
+        mock_repo.upsert_many.side_effect = (
+            lambda _session, objs: repositories.UpsertResult(list(objs), [], 0)
+        )
+
+        results = search_service.search_pubmed_and_store_results(
+            review_id, "test query", max_results=2, chunk_size=1
+        )
+
+        assert [r.source_id for r in results] == ["12345", "pmid2"]
+        efetch_calls = mock_entrez.efetch.call_args_list
+        assert [c.kwargs["retstart"] for c in efetch_calls] == [0, 1]
+        assert all(c.kwargs["webenv"] == "W" for c in efetch_calls)
+        assert mock_repo.upsert_many.call_count == 2  # noqa: PLR2004
+        assert mock_session_factory.begin.call_count == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_asearch_pubmed_stores_each_chunk(
+        self,
+        search_service_and_mocks: tuple[
+            services.SearchService, MagicMock, MagicMock, MagicMock
+        ],
+    ):
+        search_service, mock_entrez, mock_repo, mock_session_factory = (
+            search_service_and_mocks
+        )
+        review_id = uuid.uuid4()
+        articles = [("12345", "Title 1"), ("pmid2", "Title 2"), ("pmid3", "Title 3")]
+        mock_entrez.esearch.return_value = MagicMock(
+            records={
+                "IdList": ["12345", "pmid2", "pmid3"],
+                "WebEnv": "W",
+                "QueryKey": "1",
+            }
+        )
+        mock_entrez.efetch.side_effect = lambda **params: _efetch_handle(
+            articles[params["retstart"]]
+        )
+        mock_entrez.read.side_effect = lambda handle: handle.records
+        mock_repo.get_existing_source_ids.return_value = set()
+        mock_repo.upsert_many.side_effect = (
+            lambda _session, objs, **_kwargs: repositories.UpsertResult(
+                list(objs), [], 0
+            )
+        )
+
+        results = await search_service.asearch_pubmed_and_store_results(
+            review_id, "test query", max_results=3, chunk_size=1
+        )
+
+        assert [r.source_id for r in results] == ["12345", "pmid2", "pmid3"]
+        assert all(r.review_id == review_id for r in results)
+        # Each chunk is upserted in its own async transaction, not the sync factory's
+        afactory = search_service.asession_factory
+        assert afactory.begin.call_count == 3  # type: ignore[attr-defined]  # noqa: PLR2004
+        assert mock_repo.upsert_many.call_count == 3  # noqa: PLR2004
+        mock_session_factory.begin.assert_not_called()
+        mock_repo.get_existing_source_ids.assert_called_once_with(
+            mock_session_factory.begin.return_value.__enter__.return_value,
+            review_id,
+            SearchDatabaseSource.PUBMED,
+            ["12345", "pmid2", "pmid3"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_asearch_pubmed_efetch_fails(
+        self,
+        search_service_and_mocks: tuple[
+            services.SearchService, MagicMock, MagicMock, MagicMock
+        ],
+    ):
+        search_service, mock_entrez, mock_repo, _ = search_service_and_mocks
+        mock_repo.get_existing_source_ids.return_value = set()
+        mock_entrez.efetch.side_effect = RuntimeError("NCBI down")
+
+        with pytest.raises(services.ServiceError, match="PubMed API interaction"):
+            await search_service.asearch_pubmed_and_store_results(
+                uuid.uuid4(), "test query", max_results=2
+            )
+        mock_repo.upsert_many.assert_not_called()
 
     def test_search_pubmed_no_pmids_found(
         self,
@@ -680,7 +825,7 @@ class TestSearchServiceSearchPubmedAndStoreResults:
         assert results == []
         mock_entrez.esearch.assert_called_once()
         mock_entrez.efetch.assert_not_called()
-        mock_repo.add_all.assert_not_called()
+        mock_repo.upsert_many.assert_not_called()
 
     def test_search_pubmed_esearch_fails(
         self,
@@ -717,7 +862,25 @@ class TestSearchServiceSearchPubmedAndStoreResults:
         ):
             search_service.search_pubmed_and_store_results(uuid.uuid4(), "query")
 
-    def test_search_pubmed_repo_add_all_fails_constraint(
+    def test_search_pubmed_skips_stored_records(
+        self,
+        search_service_and_mocks: tuple[
+            services.SearchService, MagicMock, MagicMock, MagicMock
+        ],
+    ):
+        search_service, _, mock_repo, _ = search_service_and_mocks
+        # A concurrent search stored the second record after the existence check
+        upserted = mock_repo.upsert_many.return_value
+        mock_repo.upsert_many.return_value = upserted._replace(
+            inserted=upserted.inserted[:1], skipped=1
+        )
+
+        results = search_service.search_pubmed_and_store_results(uuid.uuid4(), "query")
+
+        assert [r.source_id for r in results] == ["12345"]
+        mock_repo.upsert_many.assert_called_once()
+
+    def test_search_pubmed_repo_upsert_fails_constraint(
         self,
         search_service_and_mocks: tuple[
             services.SearchService, MagicMock, MagicMock, MagicMock
@@ -726,15 +889,17 @@ class TestSearchServiceSearchPubmedAndStoreResults:
         search_service, _, mock_repo, _ = (
             search_service_and_mocks  # mock_entrez removed
         )
-        # Entrez calls succeed, but repo.add_all raises ConstraintViolationError
-        mock_repo.add_all.side_effect = repositories.ConstraintViolationError(
-            "Unique constraint failed"
+        # Entrez calls succeed, but a constraint other than the source key is violated
+        mock_repo.upsert_many.side_effect = repositories.ConstraintViolationError(
+            "Foreign key constraint failed"
         )
 
-        # Expect an empty list as per current service logic for ConstraintViolationError
-        results = search_service.search_pubmed_and_store_results(uuid.uuid4(), "query")
-        assert results == []
-        mock_repo.add_all.assert_called_once()
+        # The chunk isn't dropped silently
+        with pytest.raises(
+            services.ServiceError, match="Failed to store new PubMed results"
+        ):
+            search_service.search_pubmed_and_store_results(uuid.uuid4(), "query")
+        mock_repo.upsert_many.assert_called_once()
 
     def test_search_pubmed_mapping_returns_none(
         self,
@@ -746,10 +911,9 @@ class TestSearchServiceSearchPubmedAndStoreResults:
             search_service_and_mocks
         )
 
-        # Mock _map_pubmed_to_search_result to return None for all records
-        # We need to patch it on the instance of the service, or the class if it's a static/classmethod
-        with patch.object(
-            search_service, "_map_pubmed_to_search_result", return_value=None
+        # Mock map_pubmed_article to return None for all records
+        with patch(
+            "sr_assistant.app.services.map_pubmed_article", return_value=None
         ) as mock_mapper:
             results = search_service.search_pubmed_and_store_results(
                 uuid.uuid4(), "test query"
@@ -759,11 +923,95 @@ class TestSearchServiceSearchPubmedAndStoreResults:
             mock_entrez.efetch.assert_called_once()
             assert (
                 mock_mapper.call_count == 2
-            )  # Called for pmid1 and pmid2 from mock_entrez.read side_effect
-            mock_repo.add_all.assert_not_called()  # Should not be called if all mappings fail
+            )  # Called for both articles of the efetch response
+            mock_repo.upsert_many.assert_not_called()  # Should not be called if all mappings fail
             mock_session_factory.begin.assert_not_called()  # No DB transaction if no items to add
 
 
+class TestSearchServiceSearchScopusAndStoreResults:
+    @pytest.fixture
+    def scopus_service(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        scopus_server: RecordedScopusServer,  # noqa: F811
+    ) -> tuple[services.SearchService, MagicMock, MagicMock]:
+        """SearchService reading the recorded Scopus responses, with a mocked repo."""
+        monkeypatch.setenv("SCOPUS_API_KEY", "key")
+        monkeypatch.setattr(
+            services,
+            "ScopusClient",
+            functools.partial(
+                services.ScopusClient,
+                base_url=scopus_server.url,
+                limiter=RequestRateLimiter(1000),
+            ),
+        )
+        mock_session_factory = MagicMock(spec=sessionmaker)
+        mock_repo = MagicMock(spec=repositories.SearchResultRepository)
+        mock_repo.upsert_many.side_effect = (
+            lambda _session, objs: repositories.UpsertResult(list(objs), [], 0)
+        )
+        service = services.SearchService(
+            factory=mock_session_factory, search_repo=mock_repo
+        )
+        return service, mock_repo, mock_session_factory
+
+    def test_search_scopus_stores_each_page(
+        self, scopus_service: tuple[services.SearchService, MagicMock, MagicMock]
+    ):
+        service, mock_repo, mock_session_factory = scopus_service
+        review_id = uuid.uuid4()
+
+        results = service.search_scopus_and_store_results(
+            review_id, SCOPUS_QUERY, max_results=100, page_size=2
+        )
+
+        assert [r.source_id for r in results] == [f"8510000000{n}" for n in range(1, 6)]
+        assert all(r.source_db == SearchDatabaseSource.SCOPUS for r in results)
+        assert all(r.review_id == review_id and r.abstract for r in results)
+        # Authors and keywords of the COMPLETE view
+        assert results[1].authors == ["Murphy A.", "O'Brien K."]
+        assert results[1].keywords == ["Exercise", "Knee osteoarthritis", "Pain"]
+        assert results[2].doi is None
+        assert mock_repo.upsert_many.call_count == 3  # noqa: PLR2004
+        assert mock_session_factory.begin.call_count == 3  # noqa: PLR2004
+
+    def test_search_scopus_no_api_key(
+        self,
+        scopus_service: tuple[services.SearchService, MagicMock, MagicMock],
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        service, mock_repo, _ = scopus_service
+        monkeypatch.delenv("SCOPUS_API_KEY")
+
+        with pytest.raises(
+            services.ServiceError, match="SCOPUS_API_KEY environment variable not set"
+        ):
+            service.search_scopus_and_store_results(uuid.uuid4(), SCOPUS_QUERY)
+        mock_repo.upsert_many.assert_not_called()
+
+    def test_search_scopus_api_error_keeps_stored_pages(
+        self,
+        scopus_service: tuple[services.SearchService, MagicMock, MagicMock],
+        scopus_server: RecordedScopusServer,  # noqa: F811
+    ):
+        service, mock_repo, _ = scopus_service
+        # Only the first page and the COMPLETE responses are recorded
+        scopus_server.recordings = [
+            r
+            for r in scopus_server.recordings
+            if r["request"].get("cursor", "*") == "*"
+        ]
+
+        with pytest.raises(
+            services.ServiceError, match="Scopus API interaction or mapping failed"
+        ):
+            service.search_scopus_and_store_results(
+                uuid.uuid4(), SCOPUS_QUERY, page_size=2
+            )
+        mock_repo.upsert_many.assert_called_once()
+
+
 @pytest.fixture
 def search_service_generic_mocks(
     mocker: MagicMock,
@@ -1012,6 +1260,58 @@ class TestSearchServiceGetAndUpdateMethods:
             service.update_search_result(result_id, update_payload)
         mock_repo.update.assert_not_called()
 
+    def test_deduplicate_search_results(
+        self,
+        search_service_generic_mocks: tuple[
+            services.SearchService, MagicMock, MagicMock
+        ],
+    ):
+        service, mock_repo, _ = search_service_generic_mocks
+        review_id = uuid.uuid4()
+        scopus, pubmed, other_doi, short = (
+            models.SearchResult(
+                id=uuid.uuid4(),
+                review_id=review_id,
+                title=title,
+                abstract=abstract,
+                doi=doi,
+            )
+            for title, abstract, doi in (
+                ("EXERCISE FOR KNEE OSTEOARTHRITIS", KNEE_ABSTRACT, None),
+                (
+                    "Exercise for knee osteoarthritis.",
+                    KNEE_ABSTRACT + " Funded by X.",
+                    "10.1/knee",
+                ),
+                ("Exercise for knee osteoarthritis", KNEE_ABSTRACT, "10.1/OTHER"),
+                ("Poster session", None, None),
+            )
+        )
+        mock_repo.get_by_review_id.return_value = [scopus, pubmed, other_doi, short]
+
+        summary = service.deduplicate_search_results(review_id)
+
+        assert summary == services.DeduplicationSummary(
+            search_results=4, hashed=3, clusters=1, duplicates=1, updated=3
+        )
+        # The copy with a DOI is kept, the copy with another DOI isn't merged
+        assert scopus.duplicate_of_id == pubmed.id
+        assert pubmed.duplicate_of_id is None
+        assert other_doi.duplicate_of_id is None
+        # Too little text to sign
+        assert short.minhash_signature is None
+        mock_repo.mark_duplicates.assert_called_once()
+        marks = mock_repo.mark_duplicates.call_args.args[1]
+        assert set(marks) == {scopus.id, pubmed.id, other_doi.id}
+        assert marks[scopus.id] == (pubmed.id, scopus.minhash_signature)
+        mock_repo.update.assert_not_called()
+
+        # Signatures are reused and unchanged rows aren't written again
+        mock_repo.mark_duplicates.reset_mock()
+        summary = service.deduplicate_search_results(review_id)
+        assert (summary.hashed, summary.updated) == (0, 0)
+        mock_repo.mark_duplicates.assert_called_once_with(ANY, {})
+
 
 # --- Test ReviewService Methods ---
 
@@ -1250,15 +1550,19 @@ def screening_service_with_mocks(mocker: MockerFixture) -> dict[str, t.Any]:
         "sr_assistant.app.services.screen_abstracts_batch"
     )
 
+    mock_asession_factory = _async_session_factory(mock_session)
+
     service_instance = services.ScreeningService(
         factory=mock_session_factory,
         review_repo=mock_review_repo,
         search_repo=mock_search_repo,
         screen_repo=mock_screen_repo,
+        afactory=mock_asession_factory,
     )
     return {
         "service": service_instance,
         "mock_session_factory": mock_session_factory,
+        "mock_asession_factory": mock_asession_factory,
         "mock_session": mock_session,
         "mock_review_repo": mock_review_repo,
         "mock_search_repo": mock_search_repo,
@@ -1306,15 +1610,9 @@ class TestScreeningService:
             year="2024",
         )
 
-        # Configure side_effect for get_by_id if called multiple times
-        def search_repo_get_by_id_side_effect(session: Session, id_val: uuid.UUID):
-            if id_val == sr_id1:
-                return mock_sr1
-            if id_val == sr_id2:
-                return mock_sr2
-            return None
-
-        mock_search_repo.get_by_id.side_effect = search_repo_get_by_id_side_effect
+        mock_search_repo.get_many_by_ids.return_value = repositories.RecordsByIds(
+            [mock_sr1, mock_sr2], []
+        )
 
         # Explicitly import inside the test method for diagnosis
 
@@ -1402,10 +1700,6 @@ class TestScreeningService:
             results=agent_results_tuples, cb=mocker.MagicMock()
         )
 
-        # Mock repository add and update methods to return the object passed to them
-        mock_screen_repo.add.side_effect = lambda session, obj: obj
-        mock_search_repo.update.side_effect = lambda session, obj: obj
-
         # Call the service method
         returned_results = service.perform_batch_abstract_screening(
             review_id, search_result_ids_to_screen
@@ -1413,9 +1707,11 @@ class TestScreeningService:
 
         # Assertions
         mock_review_repo.get_by_id.assert_called_once_with(mock_session, review_id)
-        assert mock_search_repo.get_by_id.call_count == 2
-        mock_search_repo.get_by_id.assert_any_call(mock_session, sr_id1)
-        mock_search_repo.get_by_id.assert_any_call(mock_session, sr_id2)
+        # One query for all search results
+        mock_search_repo.get_many_by_ids.assert_called_once_with(
+            mock_session, search_result_ids_to_screen
+        )
+        mock_search_repo.get_by_id.assert_not_called()
 
         mock_agent_screen_batch.assert_called_once()
         agent_call_args = mock_agent_screen_batch.call_args[1]  # kwargs
@@ -1424,23 +1720,19 @@ class TestScreeningService:
         assert mock_sr1 in agent_call_args["batch"]
         assert mock_sr2 in agent_call_args["batch"]
 
-        assert mock_screen_repo.add.call_count == 4  # 2 per search result (kons & comp)
+        # One multi-row insert of 2 results per search result (kons & comp)
+        mock_screen_repo.insert_many.assert_called_once()
+        added = mock_screen_repo.insert_many.call_args[0][1]
+        assert len(added) == 4  # noqa: PLR2004
+        mock_screen_repo.add.assert_not_called()
         # Check a few details of what was added
-        first_add_call_args = mock_screen_repo.add.call_args_list[0][0][
-            1
-        ]  # (session, obj) -> obj
-        assert isinstance(first_add_call_args, models.ScreenAbstractResult)
-        assert first_add_call_args.id == kons_run_id1
-        # assert first_add_call_args.search_result_id == sr_id1 # This field does not exist on ScreenAbstractResult
-        assert first_add_call_args.decision == ScreeningDecisionType.INCLUDE
-
-        fourth_add_call_args = mock_screen_repo.add.call_args_list[3][0][1]
-        assert isinstance(fourth_add_call_args, models.ScreenAbstractResult)
-        assert fourth_add_call_args.id == comp_run_id2
-        # assert fourth_add_call_args.search_result_id == sr_id2 # This field does not exist on ScreenAbstractResult
-        assert fourth_add_call_args.decision == ScreeningDecisionType.EXCLUDE
-
-        assert mock_search_repo.update.call_count == 2
+        assert isinstance(added[0], models.ScreenAbstractResult)
+        assert added[0].id == kons_run_id1
+        assert added[0].decision == ScreeningDecisionType.INCLUDE
+        assert isinstance(added[3], models.ScreenAbstractResult)
+        assert added[3].id == comp_run_id2
+        assert added[3].decision == ScreeningDecisionType.EXCLUDE
+
         # Check that sr1 was updated with correct IDs
         assert mock_sr1.conservative_result_id == kons_run_id1
         assert mock_sr1.comprehensive_result_id == comp_run_id1
@@ -1448,13 +1740,15 @@ class TestScreeningService:
         assert mock_sr2.conservative_result_id == kons_run_id2
         assert mock_sr2.comprehensive_result_id == comp_run_id2
 
-        # Ensure the objects passed to update were the modified mock_sr1 and mock_sr2
-        update_calls = mock_search_repo.update.call_args_list
-        updated_sr_ids = {
-            call[0][1].id for call in update_calls
-        }  # call[0] is args, call[0][1] is the SearchResult obj
-        assert sr_id1 in updated_sr_ids
-        assert sr_id2 in updated_sr_ids
+        # All links are set with one update
+        mock_search_repo.update.assert_not_called()
+        mock_search_repo.link_screening_results.assert_called_once_with(
+            mock_session,
+            {
+                sr_id1: (kons_run_id1, comp_run_id1),
+                sr_id2: (kons_run_id2, comp_run_id2),
+            },
+        )
 
         mock_session.commit.assert_called_once()
 
@@ -1464,3 +1758,919 @@ class TestScreeningService:
         assert returned_results[0].conservative_result.id == kons_run_id1  # type: ignore
         assert returned_results[1].search_result.id == sr_id2
         assert returned_results[1].comprehensive_result.id == comp_run_id2  # type: ignore
+
+    def test_perform_bulk_screening_with_local_batch_client(
+        self, screening_service_with_mocks: dict[str, t.Any], tmp_path: t.Any
+    ):
+        service_mocks = screening_service_with_mocks
+        service = service_mocks["service"]
+        mock_session = service_mocks["mock_session"]
+        mock_review_repo = service_mocks["mock_review_repo"]
+        mock_search_repo = service_mocks["mock_search_repo"]
+        mock_screen_repo = service_mocks["mock_screen_repo"]
+
+        review_id = uuid.uuid4()
+        review = models.SystematicReview(
+            id=review_id, research_question="Test RQ", exclusion_criteria="Test Excl"
+        )
+        mock_review_repo.get_by_id.return_value = review
+        search_results = [
+            models.SearchResult(
+                id=uuid.uuid4(),
+                review_id=review_id,
+                title=f"SR{i}",
+                source_db=SearchDatabaseSource.PUBMED,
+                source_id=f"pmid{i}",
+                abstract=abstract,
+            )
+            for i, abstract in enumerate((KNEE_ABSTRACT, "Abstract 1"))
+        ]
+        reused = models.SearchResult(
+            id=uuid.uuid4(), review_id=review_id, title="Reused", doi="10.1000/abc"
+        )
+        # Clustered with SR0 when the review is deduplicated on submit
+        duplicate = models.SearchResult(
+            id=uuid.uuid4(),
+            review_id=review_id,
+            title="SR0",
+            abstract=search_results[0].abstract,
+        )
+        review_results = [*search_results, reused, duplicate]
+        mock_search_repo.get_by_review_id.return_value = review_results
+        mock_search_repo.get_many_by_ids.side_effect = lambda _session, ids: (
+            repositories.RecordsByIds([sr for sr in review_results if sr.id in ids], [])
+        )
+        mock_screen_repo.get_many_by_ids.return_value = repositories.RecordsByIds(
+            [], []
+        )
+        mock_screen_repo.get_by_reuse_keys.return_value = [
+            models.ScreenAbstractResult(
+                id=uuid.uuid4(),
+                review_id=uuid.uuid4(),
+                trace_id=uuid.uuid4(),
+                model_name="gpt-4o",
+                screening_strategy=strategy,
+                decision=ScreeningDecisionType.EXCLUDE,
+                confidence_score=0.9,
+                rationale="R",
+                start_time=datetime.now(UTC),
+                end_time=datetime.now(UTC),
+                response_metadata={},
+                reuse_key=services.reuse_key(
+                    reused, services.criteria_fingerprint(review), strategy, "gpt-4o"
+                ),
+            )
+            for strategy in ScreeningStrategyType
+        ]
+        client = LocalBatchJobClient(tmp_path, responder=fake_chat_completion)
+
+        summary = service.perform_bulk_abstract_screening(
+            review_id,
+            [sr.id for sr in search_results] + [reused.id, uuid.uuid4()],
+            client=client,
+            poll_interval=0,
+        )
+
+        # The reused decisions are committed on submit, without requests
+        (reused_call, ingest_call) = mock_screen_repo.insert_many.call_args_list
+        assert [r.id for r in reused_call.args[1]] == [
+            reused.conservative_result_id,
+            reused.comprehensive_result_id,
+        ]
+        assert client.retrieve(summary.job_id).request_count == 4  # noqa: PLR2004
+        assert (summary.ingested, summary.skipped, summary.errors) == (4, 0, {})
+        added = ingest_call.args[1]
+        assert all(isinstance(r, models.ScreenAbstractResult) for r in added)
+        assert all(r.reuse_key for r in added)
+        links = mock_search_repo.link_screening_results.call_args[0][1]
+        for sr in search_results:
+            assert sr.conservative_result_id in {r.id for r in added}
+            assert sr.comprehensive_result_id in {r.id for r in added}
+            assert links[sr.id] == (
+                sr.conservative_result_id,
+                sr.comprehensive_result_id,
+            )
+        # Near-duplicates get their representative's results
+        assert links[duplicate.id] == links[search_results[0].id]
+        # Duplicate marks and reused decisions on submit, then the ingested results
+        assert mock_session.commit.call_count == 3  # noqa: PLR2004
+
+        # Re-ingesting the same job adds nothing
+        mock_screen_repo.get_many_by_ids.return_value = repositories.RecordsByIds(
+            added, []
+        )
+        job = client.retrieve(summary.job_id)
+        again = service.ingest_bulk_abstract_screening(review_id, job, client=client)
+        assert (again.ingested, again.skipped) == (0, 4)
+
+        # Nothing is submitted when every decision is reused
+        assert (
+            service.submit_bulk_abstract_screening(review_id, [reused.id], client=client)
+            is None
+        )
+
+    def test_stream_batch_screening_commits_each_chunk(
+        self, screening_service_with_mocks: dict[str, t.Any], mocker: MockerFixture
+    ):
+        service_mocks = screening_service_with_mocks
+        service = service_mocks["service"]
+        mock_session = service_mocks["mock_session"]
+        mock_review_repo = service_mocks["mock_review_repo"]
+        mock_search_repo = service_mocks["mock_search_repo"]
+        mock_screen_repo = service_mocks["mock_screen_repo"]
+
+        review_id = uuid.uuid4()
+        mock_review_repo.get_by_id.return_value = models.SystematicReview(
+            id=review_id, research_question="Test RQ", exclusion_criteria="Test Excl"
+        )
+        sr1, sr2 = (
+            models.SearchResult(
+                id=uuid.uuid4(),
+                review_id=review_id,
+                title=f"SR{i}",
+                source_db=SearchDatabaseSource.PUBMED,
+                source_id=f"pmid{i}",
+            )
+            for i in range(2)
+        )
+        mock_search_repo.get_by_review_id.return_value = [sr1, sr2]
+        mock_search_repo.get_many_by_ids.return_value = repositories.RecordsByIds(
+            [sr1, sr2], []
+        )
+
+        def _result(
+            sr: models.SearchResult, strategy: ScreeningStrategyType
+        ) -> ScreeningResultSchema:
+            return ScreeningResultSchema(
+                review_id=review_id,
+                search_result_id=sr.id,
+                trace_id=uuid.uuid4(),
+                model_name="gpt-4o",
+                screening_strategy=strategy,
+                decision=ScreeningDecisionType.INCLUDE,
+                confidence_score=0.9,
+                rationale="R",
+                start_time=datetime.now(UTC),
+                end_time=datetime.now(UTC),
+            )
+
+        agent_tuples = [
+            ScreenAbstractResultTuple(
+                sr,
+                _result(sr, ScreeningStrategyType.CONSERVATIVE),
+                _result(sr, ScreeningStrategyType.COMPREHENSIVE),
+            )
+            for sr in (sr2, sr1)
+        ]
+        mock_as_completed = mocker.patch(
+            "sr_assistant.app.services.screen_abstracts_batch_as_completed",
+            return_value=iter(agent_tuples),
+        )
+        # Persisting the second chunk fails
+        mock_search_repo.link_screening_results.side_effect = [
+            None,
+            repositories.RepositoryError("x"),
+            None,
+        ]
+
+        stream = service.stream_batch_abstract_screening(
+            review_id, [sr1.id, sr2.id], chunk_size=1
+        )
+        first = next(stream)
+        # First chunk is committed with the checkpoint before the next is requested
+        assert first.search_result is sr2
+        mock_session.commit.assert_called_once()
+        mock_screen_repo.insert_many.assert_called_once()
+        assert sr2.conservative_result_id == first.conservative_result.id  # type: ignore
+        _, _, key, checkpoint = mock_review_repo.set_metadata_key.call_args.args
+        assert key == services.CHECKPOINT_METADATA_KEY
+        assert checkpoint["completed"] == [str(sr2.id)]
+
+        second = next(stream)
+        assert second.search_result is sr1
+        assert isinstance(second.conservative_result, services.ScreeningError)
+        mock_session.rollback.assert_called_once()
+        assert list(stream) == []
+        assert mock_as_completed.call_args.kwargs["batch"] == [sr1, sr2]
+        # The final, empty chunk removes the checkpoint
+        mock_review_repo.set_metadata_key.assert_called_with(
+            mocker.ANY, review_id, key, None
+        )
+
+    def test_stream_batch_screening_prioritized(
+        self, screening_service_with_mocks: dict[str, t.Any], mocker: MockerFixture
+    ):
+        service = screening_service_with_mocks["service"]
+        mock_search_repo = screening_service_with_mocks["mock_search_repo"]
+        mock_screen_repo = screening_service_with_mocks["mock_screen_repo"]
+        review_id = uuid.uuid4()
+        review = models.SystematicReview(
+            id=review_id,
+            research_question="Does exercise reduce knee osteoarthritis pain?",
+            exclusion_criteria="E",
+        )
+        screening_service_with_mocks["mock_review_repo"].get_by_id.return_value = review
+        off_topic, relevant, screened = (
+            models.SearchResult(id=uuid.uuid4(), review_id=review_id, title=title)
+            for title in (
+                "Soil microbiome of alpine grassland",
+                "Exercise for knee osteoarthritis pain",
+                "Knee bracing",
+            )
+        )
+        screened.final_decision = ScreeningDecisionType.EXCLUDE
+        mock_search_repo.get_by_review_id.return_value = [off_topic, relevant, screened]
+        mock_search_repo.get_many_by_ids.return_value = repositories.RecordsByIds(
+            [off_topic, relevant], []
+        )
+        mock_screen_repo.get_by_review_id.return_value = []
+        mock_screen_repo.add.side_effect = lambda _session, obj: obj
+        mocker.patch.object(services, "PRIORITIZATION_CHUNK_SIZE", 1)
+
+        def _screen(batch, batch_idx, review, bypass_cache):  # noqa: ANN001, ANN202, ARG001
+            error = services.ScreeningError(search_result=batch[0], error=None)
+            return iter([ScreenAbstractResultTuple(batch[0], error, error)])
+
+        mock_as_completed = mocker.patch(
+            "sr_assistant.app.services.screen_abstracts_batch_as_completed",
+            side_effect=_screen,
+        )
+
+        stream = service.stream_batch_abstract_screening(
+            review_id, [off_topic.id, relevant.id], prioritize=True
+        )
+
+        assert [r.search_result for r in stream] == [relevant, off_topic]
+        assert [c.kwargs["batch"] for c in mock_as_completed.call_args_list] == [
+            [relevant],
+            [off_topic],
+        ]
+        prioritizer = services.get_prioritizer(review)
+        # Matrix covers the whole review, past final decisions are trained on
+        assert len(prioritizer) == 3  # noqa: PLR2004
+        assert prioritizer.labels == 1
+
+    def test_stream_batch_screening_fans_out_to_duplicates(
+        self, screening_service_with_mocks: dict[str, t.Any], mocker: MockerFixture
+    ):
+        service = screening_service_with_mocks["service"]
+        mock_search_repo = screening_service_with_mocks["mock_search_repo"]
+        review_id = uuid.uuid4()
+        review = models.SystematicReview(
+            id=review_id, research_question="Q", exclusion_criteria="E"
+        )
+        screening_service_with_mocks["mock_review_repo"].get_by_id.return_value = review
+        # Copies of one record, clustered when the run deduplicates the review
+        representative, duplicate, unrequested_duplicate = (
+            models.SearchResult(
+                id=uuid.uuid4(), review_id=review_id, title="A", abstract=KNEE_ABSTRACT
+            )
+            for _ in range(3)
+        )
+        mock_search_repo.get_by_review_id.return_value = [
+            representative,
+            duplicate,
+            unrequested_duplicate,
+        ]
+        mock_search_repo.get_many_by_ids.return_value = repositories.RecordsByIds(
+            [duplicate], []
+        )
+
+        def _result(strategy: ScreeningStrategyType) -> ScreeningResultSchema:
+            return ScreeningResultSchema(
+                review_id=review_id,
+                search_result_id=representative.id,
+                trace_id=uuid.uuid4(),
+                model_name="gpt-4o",
+                screening_strategy=strategy,
+                decision=ScreeningDecisionType.EXCLUDE,
+                confidence_score=0.9,
+                rationale="R",
+                start_time=datetime.now(UTC),
+                end_time=datetime.now(UTC),
+            )
+
+        result_tuple = ScreenAbstractResultTuple(
+            representative,
+            _result(ScreeningStrategyType.CONSERVATIVE),
+            _result(ScreeningStrategyType.COMPREHENSIVE),
+        )
+        mock_as_completed = mocker.patch(
+            "sr_assistant.app.services.screen_abstracts_batch_as_completed",
+            return_value=iter([result_tuple]),
+        )
+
+        results = list(
+            service.stream_batch_abstract_screening(review_id, [duplicate.id])
+        )
+
+        # Only the representative is screened, in place of the requested duplicate
+        assert mock_as_completed.call_args.kwargs["batch"] == [representative]
+        assert len(results) == 1
+        assert results[0].search_result is duplicate
+        assert results[0].conservative_result is result_tuple.conservative_result
+        for sr in (representative, duplicate, unrequested_duplicate):
+            assert sr.conservative_result_id == result_tuple.conservative_result.id
+            assert sr.comprehensive_result_id == result_tuple.comprehensive_result.id
+
+    def test_perform_batch_screening_reuses_decisions(
+        self, screening_service_with_mocks: dict[str, t.Any]
+    ):
+        service = screening_service_with_mocks["service"]
+        mock_search_repo = screening_service_with_mocks["mock_search_repo"]
+        mock_screen_repo = screening_service_with_mocks["mock_screen_repo"]
+        mock_agent_screen_batch = screening_service_with_mocks[
+            "mock_agent_screen_batch"
+        ]
+        review_id = uuid.uuid4()
+        review = models.SystematicReview(
+            id=review_id, research_question="Q", exclusion_criteria="E"
+        )
+        screening_service_with_mocks["mock_review_repo"].get_by_id.return_value = review
+        sr = models.SearchResult(
+            id=uuid.uuid4(), review_id=review_id, title="A", doi="10.1000/abc"
+        )
+        mock_search_repo.get_many_by_ids.return_value = repositories.RecordsByIds(
+            [sr], []
+        )
+        mock_search_repo.get_by_review_id.return_value = [sr]
+        other_review_id = uuid.uuid4()
+        sources = {
+            strategy: models.ScreenAbstractResult(
+                id=uuid.uuid4(),
+                review_id=other_review_id,
+                trace_id=uuid.uuid4(),
+                model_name="gpt-4o",
+                screening_strategy=strategy,
+                decision=ScreeningDecisionType.EXCLUDE,
+                confidence_score=0.9,
+                rationale="R",
+                start_time=datetime.now(UTC),
+                end_time=datetime.now(UTC),
+                response_metadata={},
+                reuse_key=services.reuse_key(
+                    sr, services.criteria_fingerprint(review), strategy, "gpt-4o"
+                ),
+            )
+            for strategy in ScreeningStrategyType
+        }
+        mock_screen_repo.get_by_reuse_keys.return_value = list(sources.values())
+
+        results = service.perform_batch_abstract_screening(review_id, [sr.id])
+
+        mock_agent_screen_batch.assert_not_called()
+        assert len(results) == 1
+        conservative = results[0].conservative_result
+        assert isinstance(conservative, ScreeningResultSchema)
+        assert conservative.review_id == review_id
+        assert conservative.response_metadata["reused_from"]["review_id"] == str(
+            other_review_id
+        )
+        added = mock_screen_repo.insert_many.call_args.args[1]
+        assert [r.reuse_key for r in added] == [
+            sources[ScreeningStrategyType.CONSERVATIVE].reuse_key,
+            sources[ScreeningStrategyType.COMPREHENSIVE].reuse_key,
+        ]
+        assert sr.conservative_result_id == added[0].id
+        assert sr.comprehensive_result_id == added[1].id
+
+        # bypass_cache screens again
+        mock_agent_screen_batch.return_value = None
+        results = service.perform_batch_abstract_screening(
+            review_id, [sr.id], bypass_cache=True
+        )
+        assert results == []
+        mock_agent_screen_batch.assert_called_once()
+
+    def test_get_screened_result_tuples(
+        self, screening_service_with_mocks: dict[str, t.Any]
+    ):
+        service = screening_service_with_mocks["service"]
+        mock_search_repo = screening_service_with_mocks["mock_search_repo"]
+        mock_screen_repo = screening_service_with_mocks["mock_screen_repo"]
+        review_id = uuid.uuid4()
+        screened, half_screened, other_review = (
+            models.SearchResult(id=uuid.uuid4(), review_id=review_id, title=title)
+            for title in "ABC"
+        )
+        other_review.review_id = uuid.uuid4()
+        results = {
+            strategy: services._to_screen_abstract_result_model(  # noqa: SLF001
+                ScreeningResultSchema(
+                    review_id=review_id,
+                    search_result_id=screened.id,
+                    trace_id=uuid.uuid4(),
+                    model_name="gpt-4o",
+                    screening_strategy=strategy,
+                    decision=ScreeningDecisionType.INCLUDE,
+                    confidence_score=0.9,
+                    rationale="R",
+                    start_time=datetime.now(UTC),
+                    end_time=datetime.now(UTC),
+                )
+            )
+            for strategy in ScreeningStrategyType
+        }
+        conservative = results[ScreeningStrategyType.CONSERVATIVE]
+        comprehensive = results[ScreeningStrategyType.COMPREHENSIVE]
+        for sr in (screened, other_review):
+            sr.conservative_result_id = conservative.id
+            sr.comprehensive_result_id = comprehensive.id
+        half_screened.conservative_result_id = conservative.id
+        mock_search_repo.get_many_by_ids.return_value = repositories.RecordsByIds(
+            [screened, half_screened, other_review], []
+        )
+        mock_screen_repo.get_many_by_ids.return_value = repositories.RecordsByIds(
+            [conservative, comprehensive], []
+        )
+
+        result_tuples = service.get_screened_result_tuples(
+            review_id, [screened.id, half_screened.id, other_review.id]
+        )
+
+        assert len(result_tuples) == 1
+        assert result_tuples[0].search_result is screened
+        assert result_tuples[0].conservative_result.id == conservative.id  # type: ignore[union-attr]
+        assert result_tuples[0].comprehensive_result.id == comprehensive.id  # type: ignore[union-attr]
+
+    def test_perform_batch_screening_resumes_from_checkpoint(
+        self, screening_service_with_mocks: dict[str, t.Any], mocker: MockerFixture
+    ):
+        service = screening_service_with_mocks["service"]
+        mock_review_repo = screening_service_with_mocks["mock_review_repo"]
+        mock_search_repo = screening_service_with_mocks["mock_search_repo"]
+        mock_screen_repo = screening_service_with_mocks["mock_screen_repo"]
+        mock_agent_screen_batch = screening_service_with_mocks[
+            "mock_agent_screen_batch"
+        ]
+        review_id = uuid.uuid4()
+        review = models.SystematicReview(
+            id=review_id, research_question="Q", exclusion_criteria="E"
+        )
+        mock_review_repo.get_by_id.return_value = review
+        search_results = {
+            sr.id: sr
+            for sr in (
+                models.SearchResult(id=uuid.uuid4(), review_id=review_id, title=title)
+                for title in "ABC"
+            )
+        }
+        mock_search_repo.get_many_by_ids.side_effect = lambda _session, ids: (
+            repositories.RecordsByIds([search_results[sr_id] for sr_id in ids], [])
+        )
+        mock_search_repo.get_by_review_id.return_value = list(search_results.values())
+        persisted: dict[uuid.UUID, models.ScreenAbstractResult] = {}
+        mock_screen_repo.insert_many.side_effect = lambda _session, results: (
+            persisted.update((r.id, r) for r in results)
+        )
+        mock_screen_repo.get_many_by_ids.side_effect = lambda _session, ids: (
+            repositories.RecordsByIds([persisted[result_id] for result_id in ids], [])
+        )
+
+        def _screen(
+            batch: list[models.SearchResult], **kwargs: t.Any
+        ) -> ScreenAbstractsBatchOutput:
+            return ScreenAbstractsBatchOutput(
+                results=[
+                    ScreenAbstractResultTuple(
+                        sr,
+                        *(
+                            ScreeningResultSchema(
+                                review_id=review_id,
+                                search_result_id=sr.id,
+                                trace_id=uuid.uuid4(),
+                                model_name="gpt-4o",
+                                screening_strategy=strategy,
+                                decision=ScreeningDecisionType.INCLUDE,
+                                confidence_score=0.9,
+                                rationale="R",
+                                start_time=datetime.now(UTC),
+                                end_time=datetime.now(UTC),
+                            )
+                            for strategy in ScreeningStrategyType
+                        ),
+                    )
+                    for sr in batch
+                ],
+                cb=mocker.MagicMock(),
+            )
+
+        mock_agent_screen_batch.side_effect = [
+            _screen(list(search_results.values())[:2]),
+            RuntimeError("crash"),
+        ]
+        ids = list(search_results)
+
+        with pytest.raises(RuntimeError, match="crash"):
+            service.perform_batch_abstract_screening(review_id, ids, chunk_size=2)
+
+        # The first chunk was committed with its checkpoint
+        _, _, key, checkpoint = mock_review_repo.set_metadata_key.call_args.args
+        assert key == services.CHECKPOINT_METADATA_KEY
+        assert set(checkpoint["completed"]) == {str(sr_id) for sr_id in ids[:2]}
+
+        review.review_metadata = {key: checkpoint}
+        mock_agent_screen_batch.side_effect = _screen
+        results = service.perform_batch_abstract_screening(review_id, ids, chunk_size=2)
+
+        assert mock_agent_screen_batch.call_args.kwargs["batch"] == [
+            search_results[ids[2]]
+        ]
+        assert [r.search_result.id for r in results] == ids
+        assert results[0].conservative_result.id == (
+            search_results[ids[0]].conservative_result_id
+        )
+        # Completed runs remove the checkpoint
+        mock_review_repo.set_metadata_key.assert_called_with(
+            mocker.ANY, review_id, key, None
+        )
+
+    def test_perform_batch_screening_reranks_between_chunks(
+        self, screening_service_with_mocks: dict[str, t.Any], mocker: MockerFixture
+    ):
+        service = screening_service_with_mocks["service"]
+        mock_review_repo = screening_service_with_mocks["mock_review_repo"]
+        mock_search_repo = screening_service_with_mocks["mock_search_repo"]
+        mock_agent_screen_batch = screening_service_with_mocks[
+            "mock_agent_screen_batch"
+        ]
+        review_id = uuid.uuid4()
+        mock_review_repo.get_by_id.return_value = models.SystematicReview(
+            id=review_id, research_question="Q", exclusion_criteria="E"
+        )
+        search_results = [
+            models.SearchResult(id=uuid.uuid4(), review_id=review_id, title=title)
+            for title in "ABC"
+        ]
+        a, b, c = search_results
+        mock_search_repo.get_many_by_ids.return_value = repositories.RecordsByIds(
+            search_results, []
+        )
+        mock_search_repo.get_by_review_id.return_value = search_results
+        # Stand-in ranking: reverse whatever is left
+        prioritizer = mocker.MagicMock(spec=services.ScreeningPrioritizer)
+        prioritizer.rank.side_effect = lambda srs: list(reversed(srs))
+        mocker.patch.object(service, "_review_prioritizer", return_value=prioritizer)
+
+        def _screen(
+            batch: list[models.SearchResult], **kwargs: t.Any
+        ) -> ScreenAbstractsBatchOutput:
+            return ScreenAbstractsBatchOutput(
+                results=[
+                    ScreenAbstractResultTuple(
+                        sr,
+                        *(
+                            ScreeningResultSchema(
+                                review_id=review_id,
+                                search_result_id=sr.id,
+                                trace_id=uuid.uuid4(),
+                                model_name="gpt-4o",
+                                screening_strategy=strategy,
+                                decision=ScreeningDecisionType.INCLUDE,
+                                confidence_score=0.9,
+                                rationale="R",
+                                start_time=datetime.now(UTC),
+                                end_time=datetime.now(UTC),
+                            )
+                            for strategy in ScreeningStrategyType
+                        ),
+                    )
+                    for sr in batch
+                ],
+                cb=mocker.MagicMock(),
+            )
+
+        mock_agent_screen_batch.side_effect = _screen
+
+        service.perform_batch_abstract_screening(
+            review_id, [a.id, b.id, c.id], prioritize=True, chunk_size=1
+        )
+
+        assert [
+            call.kwargs["batch"] for call in mock_agent_screen_batch.call_args_list
+        ] == [[c], [a], [b]]
+        assert [call.args[0] for call in prioritizer.observe.call_args_list] == [
+            {c.id: True},
+            {a.id: True},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_aperform_batch_screening_commits_each_chunk(
+        self, screening_service_with_mocks: dict[str, t.Any], mocker: MockerFixture
+    ):
+        service = screening_service_with_mocks["service"]
+        mock_session = screening_service_with_mocks["mock_session"]
+        mock_review_repo = screening_service_with_mocks["mock_review_repo"]
+        mock_search_repo = screening_service_with_mocks["mock_search_repo"]
+        mock_screen_repo = screening_service_with_mocks["mock_screen_repo"]
+        review_id = uuid.uuid4()
+        review = models.SystematicReview(
+            id=review_id, research_question="Q", exclusion_criteria="E"
+        )
+        mock_review_repo.get_by_id.return_value = review
+        search_results = [
+            models.SearchResult(id=uuid.uuid4(), review_id=review_id, title=title)
+            for title in "ABC"
+        ]
+        mock_search_repo.get_many_by_ids.return_value = repositories.RecordsByIds(
+            search_results, []
+        )
+        mock_search_repo.get_by_review_id.return_value = search_results
+        mock_screen_repo.get_by_reuse_keys.return_value = []
+
+        async def _ascreen(
+            batch: list[models.SearchResult],
+            _batch_idx: int,
+            review: models.SystematicReview,
+            **kwargs: t.Any,
+        ) -> ScreenAbstractsBatchOutput:
+            return ScreenAbstractsBatchOutput(
+                results=[
+                    ScreenAbstractResultTuple(
+                        sr,
+                        *(
+                            ScreeningResultSchema(
+                                review_id=review.id,
+                                search_result_id=sr.id,
+                                trace_id=uuid.uuid4(),
+                                model_name="gpt-4o",
+                                screening_strategy=strategy,
+                                decision=ScreeningDecisionType.INCLUDE,
+                                confidence_score=0.9,
+                                rationale="R",
+                                start_time=datetime.now(UTC),
+                                end_time=datetime.now(UTC),
+                            )
+                            for strategy in ScreeningStrategyType
+                        ),
+                    )
+                    for sr in batch
+                ],
+                cb=mocker.MagicMock(),
+            )
+
+        mock_ascreen = mocker.patch(
+            "sr_assistant.app.services.ascreen_abstracts_batch", side_effect=_ascreen
+        )
+        engine = mocker.MagicMock()
+
+        results = await service.aperform_batch_abstract_screening(
+            review_id, [sr.id for sr in search_results], chunk_size=2, engine=engine
+        )
+
+        assert [r.search_result.id for r in results] == [
+            sr.id for sr in search_results
+        ]
+        assert [c.args[0] for c in mock_ascreen.call_args_list] == [
+            search_results[:2],
+            search_results[2:],
+        ]
+        assert all(c.kwargs["engine"] is engine for c in mock_ascreen.call_args_list)
+        # Read in one async session, then a commit per chunk
+        assert screening_service_with_mocks["mock_asession_factory"].call_count == 3  # noqa: PLR2004
+        assert mock_session.commit.call_count == 2  # noqa: PLR2004
+        assert mock_screen_repo.insert_many.call_count == 2  # noqa: PLR2004
+        assert all(sr.conservative_result_id for sr in search_results)
+        screening_service_with_mocks["mock_agent_screen_batch"].assert_not_called()
+        mock_review_repo.set_metadata_key.assert_called_with(
+            mocker.ANY, review_id, services.CHECKPOINT_METADATA_KEY, None
+        )
+
+    def test_estimate_screening_run(
+        self, screening_service_with_mocks: dict[str, t.Any], mocker: MockerFixture
+    ):
+        service = screening_service_with_mocks["service"]
+        mock_session = screening_service_with_mocks["mock_session"]
+        mock_search_repo = screening_service_with_mocks["mock_search_repo"]
+        review_id = uuid.uuid4()
+        review = models.SystematicReview(
+            id=review_id, research_question="Q", exclusion_criteria="E"
+        )
+        screening_service_with_mocks["mock_review_repo"].get_by_id.return_value = review
+        sr1 = models.SearchResult(id=uuid.uuid4(), review_id=review_id, title="A")
+        sr2 = models.SearchResult(id=uuid.uuid4(), review_id=review_id, title="B")
+        mock_search_repo.get_by_review_id.return_value = [sr1, sr2]
+        service.benchmark_item_repo = mocker.MagicMock(
+            spec=repositories.BenchmarkResultItemRepository
+        )
+        service.benchmark_item_repo.get_conflict_stats.return_value = (1, 4)
+        mock_estimate = mocker.patch("sr_assistant.app.services.estimate_screening_run")
+
+        assert service.estimate_screening_run(review_id) is mock_estimate.return_value
+        mock_estimate.assert_called_once_with(review, [sr1, sr2], conflict_stats=(1, 4))
+        service.benchmark_item_repo.get_conflict_stats.assert_called_once_with(
+            mock_session
+        )
+
+        mock_search_repo.get_many_by_ids.return_value = repositories.RecordsByIds(
+            [sr2], []
+        )
+        service.estimate_screening_run(review_id, [sr2.id])
+        assert mock_estimate.call_args.args[1] == [sr2]
+
+        screening_service_with_mocks["mock_review_repo"].get_by_id.return_value = None
+        with pytest.raises(repositories.RecordNotFoundError):
+            service.estimate_screening_run(review_id)
+
+    def test_add_resolution(
+        self, screening_service_with_mocks: dict[str, t.Any], mocker: MockerFixture
+    ):
+        service = screening_service_with_mocks["service"]
+        mock_session = screening_service_with_mocks["mock_session"]
+        mock_search_repo = screening_service_with_mocks["mock_search_repo"]
+        service.resolution_repo = mocker.MagicMock(
+            spec=repositories.ScreeningResolutionRepository
+        )
+        service.resolution_repo.add.side_effect = (
+            lambda _session, resolution: resolution
+        )
+        review_id = uuid.uuid4()
+        search_result = models.SearchResult(
+            id=uuid.uuid4(), review_id=review_id, title="A"
+        )
+        mock_search_repo.get_by_id.return_value = search_result
+        resolver_output = schemas.ResolverOutputSchema(
+            resolver_decision=ScreeningDecisionType.INCLUDE,
+            resolver_reasoning="Both criteria met",
+            resolver_confidence_score=0.8,
+        )
+
+        resolution = service.add_resolution(
+            review_id, search_result.id, resolver_output
+        )
+
+        assert resolution.search_result_id == search_result.id
+        assert resolution.resolver_decision == ScreeningDecisionType.INCLUDE
+        assert search_result.resolution_id == resolution.id
+        assert search_result.final_decision == ScreeningDecisionType.INCLUDE
+        mock_search_repo.update.assert_called_once_with(mock_session, search_result)
+        mock_session.commit.assert_called_once()
+
+        # Rolled back if the caller vetoes the commit
+        commit_if = mocker.MagicMock(return_value=False)
+        assert (
+            service.add_resolution(
+                review_id, search_result.id, resolver_output, commit_if=commit_if
+            )
+            is None
+        )
+        commit_if.assert_called_once_with(mock_session)
+        mock_session.commit.assert_called_once()
+        mock_session.rollback.assert_called_once()
+
+        mock_search_repo.get_by_id.return_value = None
+        with pytest.raises(repositories.RecordNotFoundError):
+            service.add_resolution(review_id, search_result.id, resolver_output)
+
+        mock_search_repo.get_by_id.return_value = search_result
+        service.resolution_repo.add.side_effect = repositories.RepositoryError("db")
+        with pytest.raises(services.ServiceError, match="Failed to add resolution"):
+            service.add_resolution(review_id, search_result.id, resolver_output)
+        mock_session.rollback.assert_called()
+
+
+@pytest.fixture
+def screening_job_service_with_mocks(mocker: MockerFixture) -> dict[str, t.Any]:
+    """Provides a ScreeningJobService instance with mocked dependencies."""
+    mock_session_factory = mocker.MagicMock(spec=sessionmaker)
+    mock_session = mocker.MagicMock(spec=Session)
+    mock_session_factory.return_value.__enter__.return_value = mock_session
+    mock_session_factory.begin.return_value.__enter__.return_value = mock_session
+
+    mock_job_repo = mocker.MagicMock(spec=repositories.ScreeningJobRepository)
+    mock_job_repo.add.side_effect = lambda _session, job: job
+    mock_job_repo.get_by_review_id.return_value = []
+    mock_search_repo = mocker.MagicMock(spec=repositories.SearchResultRepository)
+    mock_benchmark_run_repo = mocker.MagicMock(spec=repositories.BenchmarkRunRepository)
+    mock_benchmark_run_repo.add.side_effect = lambda _session, run: run
+
+    service_instance = services.ScreeningJobService(
+        factory=mock_session_factory,
+        job_repo=mock_job_repo,
+        search_repo=mock_search_repo,
+        benchmark_run_repo=mock_benchmark_run_repo,
+    )
+    return {
+        "service": service_instance,
+        "mock_session": mock_session,
+        "mock_job_repo": mock_job_repo,
+        "mock_search_repo": mock_search_repo,
+        "mock_benchmark_run_repo": mock_benchmark_run_repo,
+    }
+
+
+class TestScreeningJobService:
+    def test_enqueue_abstract_screening(
+        self, screening_job_service_with_mocks: dict[str, t.Any]
+    ):
+        service = screening_job_service_with_mocks["service"]
+        review_id = uuid.uuid4()
+        sr_id1, sr_id2 = uuid.uuid4(), uuid.uuid4()
+
+        job = service.enqueue_abstract_screening(
+            review_id, [sr_id1, sr_id2, sr_id1], prioritize=True
+        )
+
+        assert job.kind == ScreeningJobKind.ABSTRACT_SCREENING
+        assert job.status == ScreeningJobStatus.QUEUED
+        assert job.total_items == 2  # noqa: PLR2004
+        assert job.params == {
+            "search_result_ids": [str(sr_id1), str(sr_id2)],
+            "bypass_cache": False,
+            "prioritize": True,
+            "resolve_conflicts": True,
+        }
+        params = services.AbstractScreeningJobParams.model_validate(job.params)
+        assert params.search_result_ids == [sr_id1, sr_id2]
+
+    def test_enqueue_benchmark_creates_run(
+        self, screening_job_service_with_mocks: dict[str, t.Any]
+    ):
+        service = screening_job_service_with_mocks["service"]
+        mock_session = screening_job_service_with_mocks["mock_session"]
+        mock_search_repo = screening_job_service_with_mocks["mock_search_repo"]
+        mock_benchmark_run_repo = screening_job_service_with_mocks[
+            "mock_benchmark_run_repo"
+        ]
+        mock_search_repo.count.return_value = 42
+        review_id = uuid.uuid4()
+
+        job = service.enqueue_benchmark(
+            review_id, config_details={"model": "test"}, batch_size=5
+        )
+
+        run = mock_benchmark_run_repo.add.call_args.args[1]
+        assert run.review_id == review_id
+        assert run.config_details == {"model": "test"}
+        assert job.kind == ScreeningJobKind.BENCHMARK
+        assert job.total_items == 42  # noqa: PLR2004
+        params = services.BenchmarkJobParams.model_validate(job.params)
+        assert params.benchmark_run_id == run.id
+        assert params.batch_size == 5  # noqa: PLR2004
+        assert params.cascade == CascadeConfig()
+        assert mock_search_repo.count.call_args.args[0] is mock_session
+        assert (
+            mock_search_repo.count.call_args.kwargs["search_params"].review_id
+            == review_id
+        )
+
+    def test_enqueue_errors_raise_service_error(
+        self, screening_job_service_with_mocks: dict[str, t.Any]
+    ):
+        service = screening_job_service_with_mocks["service"]
+        mock_job_repo = screening_job_service_with_mocks["mock_job_repo"]
+        mock_job_repo.add.side_effect = repositories.RepositoryError("db")
+
+        with pytest.raises(services.ServiceError, match="Failed to queue screening"):
+            service.enqueue_abstract_screening(uuid.uuid4(), [uuid.uuid4()])
+
+    def test_enqueue_refused_while_job_active(
+        self, screening_job_service_with_mocks: dict[str, t.Any]
+    ):
+        service = screening_job_service_with_mocks["service"]
+        mock_job_repo = screening_job_service_with_mocks["mock_job_repo"]
+        review_id = uuid.uuid4()
+        finished, running = (
+            models.ScreeningJob(
+                review_id=review_id,
+                kind=ScreeningJobKind.ABSTRACT_SCREENING,
+                status=status,
+            )
+            for status in (ScreeningJobStatus.SUCCEEDED, ScreeningJobStatus.RUNNING)
+        )
+        mock_job_repo.get_by_review_id.return_value = [running, finished]
+
+        assert (
+            service.get_active_job(review_id, ScreeningJobKind.ABSTRACT_SCREENING)
+            is running
+        )
+        with pytest.raises(services.ScreeningJobActiveError, match=str(running.id)):
+            service.enqueue_abstract_screening(review_id, [uuid.uuid4()])
+        mock_job_repo.add.assert_not_called()
+
+        # Queued concurrently by another session
+        mock_job_repo.get_by_review_id.return_value = [finished]
+        mock_job_repo.add.side_effect = repositories.ConstraintViolationError("uq")
+        with pytest.raises(services.ScreeningJobActiveError):
+            service.enqueue_abstract_screening(review_id, [uuid.uuid4()])
+        assert (
+            service.get_active_job(review_id, ScreeningJobKind.ABSTRACT_SCREENING)
+            is None
+        )
+
+    def test_cancel_job(self, screening_job_service_with_mocks: dict[str, t.Any]):
+        service = screening_job_service_with_mocks["service"]
+        mock_session = screening_job_service_with_mocks["mock_session"]
+        mock_job_repo = screening_job_service_with_mocks["mock_job_repo"]
+        job_id = uuid.uuid4()
+        mock_job_repo.cancel.return_value = True
+
+        assert service.cancel_job(job_id) is True
+        mock_job_repo.cancel.assert_called_once_with(mock_session, job_id)
+
+        mock_job_repo.cancel.return_value = False
+        assert service.cancel_job(job_id) is False
+
+        mock_job_repo.cancel.side_effect = repositories.RepositoryError("db")
+        with pytest.raises(services.ServiceError, match="Failed to cancel"):
+            service.cancel_job(job_id)
@@ -0,0 +1,538 @@
+"""Unit tests for the screening worker."""
+
+from __future__ import annotations
+
+import threading
+import typing as t
+import uuid
+from datetime import UTC, datetime, timedelta
+from unittest.mock import ANY
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import Session
+
+from sr_assistant.app import services, worker
+from sr_assistant.app.agents.screening_agents import (
+    ScreenAbstractResultTuple,
+    ScreeningError,
+)
+from sr_assistant.app.agents.screening_pipeline import ScreenResolveResultTuple
+from sr_assistant.core import models, repositories, schemas
+from sr_assistant.core.types import (
+    ScreeningDecisionType,
+    ScreeningJobKind,
+    ScreeningJobStatus,
+    ScreeningStrategyType,
+)
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterator
+    from unittest.mock import MagicMock
+
+    from pytest_mock import MockerFixture
+
+
+def _screening_result(
+    search_result: models.SearchResult,
+    strategy: ScreeningStrategyType,
+    decision: ScreeningDecisionType,
+) -> schemas.ScreeningResult:
+    return schemas.ScreeningResult(
+        id=uuid.uuid4(),
+        review_id=search_result.review_id,
+        search_result_id=search_result.id,
+        trace_id=uuid.uuid4(),
+        model_name="test-model",
+        screening_strategy=strategy,
+        decision=decision,
+        confidence_score=0.95,
+        rationale="R",
+        start_time=datetime.now(UTC),
+        end_time=datetime.now(UTC),
+    )
+
+
+def _results(
+    search_result: models.SearchResult,
+    conservative: ScreeningDecisionType,
+    comprehensive: ScreeningDecisionType,
+) -> tuple[schemas.ScreeningResult, schemas.ScreeningResult]:
+    return (
+        _screening_result(
+            search_result, ScreeningStrategyType.CONSERVATIVE, conservative
+        ),
+        _screening_result(
+            search_result, ScreeningStrategyType.COMPREHENSIVE, comprehensive
+        ),
+    )
+
+
+@pytest.fixture
+def review() -> models.SystematicReview:
+    return models.SystematicReview(
+        id=uuid.uuid4(), research_question="Q", exclusion_criteria="E"
+    )
+
+
+@pytest.fixture
+def worker_with_mocks(
+    mocker: MockerFixture, review: models.SystematicReview
+) -> dict[str, t.Any]:
+    """Provides a ScreeningWorker with mocked session factory, repositories and service."""
+    mock_session_factory = mocker.MagicMock(spec=sessionmaker)
+    mock_session = mocker.MagicMock(spec=Session)
+    mock_session_factory.return_value.__enter__.return_value = mock_session
+    mock_session_factory.begin.return_value.__enter__.return_value = mock_session
+    mock_screening_service = mocker.MagicMock(spec=services.ScreeningService)
+    mock_screening_service.get_screened_result_tuples.return_value = []
+
+    screening_worker = worker.ScreeningWorker(
+        mock_session_factory,
+        worker_id="test-worker",
+        screening_service=mock_screening_service,
+        poll_interval=0,
+        max_resolver_workers=1,
+    )
+    mock_job_repo = mocker.MagicMock(spec=repositories.ScreeningJobRepository)
+    mock_job_repo.requeue_stale.return_value = (0, 0)
+    mock_job_repo.update_progress.return_value = True
+    mock_job_repo.finish.return_value = True
+    screening_worker.job_repo = mock_job_repo
+    screening_worker.review_repo = mocker.MagicMock(
+        spec=repositories.SystematicReviewRepository
+    )
+    screening_worker.review_repo.get_by_id.return_value = review
+    screening_worker.search_repo = mocker.MagicMock(
+        spec=repositories.SearchResultRepository
+    )
+    screening_worker.benchmark_item_repo = mocker.MagicMock(
+        spec=repositories.BenchmarkResultItemRepository
+    )
+    return {
+        "worker": screening_worker,
+        "mock_session_factory": mock_session_factory,
+        "mock_session": mock_session,
+        "mock_job_repo": mock_job_repo,
+        "mock_screening_service": mock_screening_service,
+    }
+
+
+def _abstract_job(
+    review: models.SystematicReview, search_results: list[models.SearchResult]
+) -> models.ScreeningJob:
+    params = services.AbstractScreeningJobParams(
+        search_result_ids=[sr.id for sr in search_results]
+    )
+    return models.ScreeningJob(
+        review_id=review.id,
+        kind=ScreeningJobKind.ABSTRACT_SCREENING,
+        status=ScreeningJobStatus.RUNNING,
+        params=params.model_dump(mode="json"),
+        total_items=len(search_results),
+        attempts=1,
+    )
+
+
+def test_run_once_without_job(worker_with_mocks: dict[str, t.Any]) -> None:
+    mock_job_repo = worker_with_mocks["mock_job_repo"]
+    mock_job_repo.claim_next.return_value = None
+
+    assert worker_with_mocks["worker"].run_once() is None
+    mock_job_repo.claim_next.assert_called_once_with(
+        worker_with_mocks["mock_session"], "test-worker", kinds=None
+    )
+    assert mock_job_repo.requeue_stale.call_args.kwargs["max_attempts"] == (
+        worker.MAX_ATTEMPTS
+    )
+    mock_job_repo.finish.assert_not_called()
+
+
+def test_abstract_screening_job_resolves_conflicts(
+    worker_with_mocks: dict[str, t.Any],
+    review: models.SystematicReview,
+    mocker: MockerFixture,
+) -> None:
+    search_results = [
+        models.SearchResult(id=uuid.uuid4(), review_id=review.id, title=title)
+        for title in ("Agree", "Conflict", "Error")
+    ]
+    agree, conflict, failed = search_results
+    error = ScreeningError(search_result=failed, error=None)
+
+    def _stream(*_args: t.Any, **_kwargs: t.Any) -> Iterator[ScreenAbstractResultTuple]:
+        yield ScreenAbstractResultTuple(
+            agree,
+            *_results(
+                agree, ScreeningDecisionType.EXCLUDE, ScreeningDecisionType.EXCLUDE
+            ),
+        )
+        yield ScreenAbstractResultTuple(
+            conflict,
+            *_results(
+                conflict, ScreeningDecisionType.INCLUDE, ScreeningDecisionType.EXCLUDE
+            ),
+        )
+        yield ScreenAbstractResultTuple(failed, error, error)
+
+    mock_screening_service = worker_with_mocks["mock_screening_service"]
+    mock_screening_service.stream_batch_abstract_screening.side_effect = _stream
+    resolver_output = schemas.ResolverOutputSchema(
+        resolver_decision=ScreeningDecisionType.INCLUDE,
+        resolver_reasoning="R",
+        resolver_confidence_score=0.8,
+    )
+    mock_resolver = mocker.patch(
+        "sr_assistant.app.worker.invoke_resolver_chain", return_value=resolver_output
+    )
+    mock_job_repo = worker_with_mocks["mock_job_repo"]
+    job = _abstract_job(review, search_results)
+    mock_job_repo.claim_next.return_value = job
+
+    assert worker_with_mocks["worker"].run_once() is job
+
+    assert mock_screening_service.stream_batch_abstract_screening.call_args.args == (
+        review.id,
+        [sr.id for sr in search_results],
+    )
+    mock_resolver.assert_called_once()
+    assert mock_resolver.call_args.kwargs["search_result"] is conflict
+    mock_screening_service.add_resolution.assert_called_once_with(
+        review.id, conflict.id, resolver_output, commit_if=ANY
+    )
+    last_progress = mock_job_repo.update_progress.call_args.kwargs
+    assert last_progress["processed_items"] == 3  # noqa: PLR2004
+    assert last_progress["stats"] == {
+        "conflicts_detected": 1,
+        "screening_errors": 1,
+        "resolved": 1,
+    }
+    mock_job_repo.finish.assert_called_once_with(
+        worker_with_mocks["mock_session"],
+        job.id,
+        "test-worker",
+        ScreeningJobStatus.SUCCEEDED,
+        error=None,
+    )
+
+
+def test_requeued_abstract_screening_job_skips_screened(
+    worker_with_mocks: dict[str, t.Any],
+    review: models.SystematicReview,
+    mocker: MockerFixture,
+) -> None:
+    search_results = [
+        models.SearchResult(id=uuid.uuid4(), review_id=review.id, title=title)
+        for title in ("Resolved", "Unresolved", "Pending")
+    ]
+    resolved, unresolved, pending = search_results
+    resolved.resolution_id = uuid.uuid4()
+    mock_screening_service = worker_with_mocks["mock_screening_service"]
+    mock_screening_service.get_screened_result_tuples.return_value = [
+        ScreenAbstractResultTuple(
+            sr,
+            *_results(sr, ScreeningDecisionType.INCLUDE, ScreeningDecisionType.EXCLUDE),
+        )
+        for sr in (resolved, unresolved)
+    ]
+    mock_screening_service.stream_batch_abstract_screening.return_value = (
+        result_tuple
+        for result_tuple in [
+            ScreenAbstractResultTuple(
+                pending,
+                *_results(
+                    pending,
+                    ScreeningDecisionType.EXCLUDE,
+                    ScreeningDecisionType.EXCLUDE,
+                ),
+            )
+        ]
+    )
+    mock_resolver = mocker.patch(
+        "sr_assistant.app.worker.invoke_resolver_chain",
+        return_value=schemas.ResolverOutputSchema(
+            resolver_decision=ScreeningDecisionType.INCLUDE,
+            resolver_reasoning="R",
+            resolver_confidence_score=0.8,
+        ),
+    )
+    mock_job_repo = worker_with_mocks["mock_job_repo"]
+    mock_job_repo.claim_next.return_value = _abstract_job(review, search_results)
+
+    worker_with_mocks["worker"].run_once()
+
+    assert mock_screening_service.stream_batch_abstract_screening.call_args.args == (
+        review.id,
+        [pending.id],
+    )
+    # Only the conflict without a stored resolution is resolved
+    mock_resolver.assert_called_once()
+    assert mock_resolver.call_args.kwargs["search_result"] is unresolved
+    first_save, *_, last_save = (
+        c.kwargs for c in mock_job_repo.update_progress.call_args_list
+    )
+    assert first_save["processed_items"] == 2  # noqa: PLR2004
+    assert last_save["processed_items"] == 3  # noqa: PLR2004
+    assert last_save["stats"] == {"resolved": 1}
+
+
+def test_job_progress_heartbeats_in_background(
+    worker_with_mocks: dict[str, t.Any], review: models.SystematicReview
+) -> None:
+    screening_worker = worker_with_mocks["worker"]
+    screening_worker.heartbeat_interval = timedelta(milliseconds=1)
+    mock_job_repo = worker_with_mocks["mock_job_repo"]
+    beat = threading.Event()
+
+    def _heartbeat(*_args: t.Any) -> bool:
+        beat.set()
+        return True
+
+    mock_job_repo.heartbeat.side_effect = _heartbeat
+    job = _abstract_job(review, [])
+    progress = worker.JobProgress(screening_worker, job)
+
+    with progress.heartbeating():
+        assert beat.wait(timeout=5)
+
+    beats = mock_job_repo.heartbeat.call_count
+    threading.Event().wait(0.01)
+    assert mock_job_repo.heartbeat.call_count == beats  # stopped
+    mock_job_repo.heartbeat.assert_called_with(
+        worker_with_mocks["mock_session"], job.id, "test-worker"
+    )
+
+
+def test_job_progress_saving_rolls_back_when_taken_over(
+    worker_with_mocks: dict[str, t.Any], review: models.SystematicReview
+) -> None:
+    mock_job_repo = worker_with_mocks["mock_job_repo"]
+    mock_job_repo.update_progress.return_value = False
+    progress = worker.JobProgress(
+        worker_with_mocks["worker"], _abstract_job(review, [])
+    )
+
+    with (
+        pytest.raises(worker.JobCancelledError),
+        progress.saving(2, screening_errors=1) as session,
+    ):
+        session.add("item")
+
+    # The ownership check fails inside the transaction, which is rolled back
+    begin = worker_with_mocks["mock_session_factory"].begin.return_value
+    assert begin.__exit__.call_args.args[0] is worker.JobCancelledError
+
+
+def test_job_progress_saves_advances_at_intervals(
+    worker_with_mocks: dict[str, t.Any], review: models.SystematicReview
+) -> None:
+    screening_worker = worker_with_mocks["worker"]
+    screening_worker.progress_interval = timedelta(hours=1)
+    mock_job_repo = worker_with_mocks["mock_job_repo"]
+    progress = worker.JobProgress(screening_worker, _abstract_job(review, []))
+
+    for _ in range(3):
+        progress.advance(conflicts_detected=1)
+
+    mock_job_repo.update_progress.assert_called_once()
+    progress.save()
+    saved = mock_job_repo.update_progress.call_args.kwargs
+    assert saved["processed_items"] == 3  # noqa: PLR2004
+    assert progress.stats == {"conflicts_detected": 3}
+
+
+def test_resolutions_are_stored_only_while_job_is_owned(
+    worker_with_mocks: dict[str, t.Any],
+    review: models.SystematicReview,
+    mocker: MockerFixture,
+) -> None:
+    sr = models.SearchResult(id=uuid.uuid4(), review_id=review.id, title="Conflict")
+    mock_screening_service = worker_with_mocks["mock_screening_service"]
+    mock_screening_service.stream_batch_abstract_screening.return_value = (
+        result_tuple
+        for result_tuple in [
+            ScreenAbstractResultTuple(
+                sr,
+                *_results(
+                    sr, ScreeningDecisionType.INCLUDE, ScreeningDecisionType.EXCLUDE
+                ),
+            )
+        ]
+    )
+    mocker.patch(
+        "sr_assistant.app.worker.invoke_resolver_chain",
+        return_value=schemas.ResolverOutputSchema(
+            resolver_decision=ScreeningDecisionType.INCLUDE,
+            resolver_reasoning="R",
+            resolver_confidence_score=0.8,
+        ),
+    )
+    mock_job_repo = worker_with_mocks["mock_job_repo"]
+    job = _abstract_job(review, [sr])
+    mock_job_repo.claim_next.return_value = job
+    mock_job_repo.heartbeat.return_value = False
+
+    worker_with_mocks["worker"].run_once()
+
+    # The decision is committed only if the job is owned in the same transaction
+    commit_if = mock_screening_service.add_resolution.call_args.kwargs["commit_if"]
+    assert commit_if(worker_with_mocks["mock_session"]) is False
+    mock_job_repo.heartbeat.assert_called_with(
+        worker_with_mocks["mock_session"], job.id, "test-worker"
+    )
+
+
+def test_cancelled_job_stops_without_finishing(
+    worker_with_mocks: dict[str, t.Any], review: models.SystematicReview
+) -> None:
+    search_results = [
+        models.SearchResult(id=uuid.uuid4(), review_id=review.id, title=title)
+        for title in ("A", "B")
+    ]
+    screened: list[uuid.UUID] = []
+
+    def _stream(*_args: t.Any, **_kwargs: t.Any) -> Iterator[ScreenAbstractResultTuple]:
+        for sr in search_results:
+            screened.append(sr.id)
+            yield ScreenAbstractResultTuple(
+                sr,
+                *_results(
+                    sr, ScreeningDecisionType.EXCLUDE, ScreeningDecisionType.EXCLUDE
+                ),
+            )
+
+    mock_screening_service = worker_with_mocks["mock_screening_service"]
+    mock_screening_service.stream_batch_abstract_screening.side_effect = _stream
+    mock_job_repo = worker_with_mocks["mock_job_repo"]
+    mock_job_repo.claim_next.return_value = _abstract_job(review, search_results)
+    mock_job_repo.update_progress.return_value = False
+
+    worker_with_mocks["worker"].run_once()
+
+    assert screened == [search_results[0].id]
+    mock_job_repo.finish.assert_not_called()
+    mock_job_repo.release.assert_not_called()
+
+
+def test_stopping_worker_releases_job(
+    worker_with_mocks: dict[str, t.Any], review: models.SystematicReview
+) -> None:
+    sr = models.SearchResult(id=uuid.uuid4(), review_id=review.id, title="A")
+    mock_screening_service = worker_with_mocks["mock_screening_service"]
+    screened = (
+        ScreenAbstractResultTuple(
+            sr,
+            *_results(sr, ScreeningDecisionType.EXCLUDE, ScreeningDecisionType.EXCLUDE),
+        )
+        for _ in range(2)
+    )
+    mock_screening_service.stream_batch_abstract_screening.return_value = screened
+    mock_job_repo = worker_with_mocks["mock_job_repo"]
+    job = _abstract_job(review, [sr])
+    mock_job_repo.claim_next.return_value = job
+    screening_worker = worker_with_mocks["worker"]
+    screening_worker.stop()
+
+    screening_worker.run_once()
+
+    mock_job_repo.release.assert_called_once_with(
+        worker_with_mocks["mock_session"], job.id, "test-worker"
+    )
+    assert mock_job_repo.update_progress.call_count == 1
+    assert screened.gi_frame is None  # closed
+    mock_job_repo.finish.assert_not_called()
+
+
+def test_failed_job_is_marked_failed(
+    worker_with_mocks: dict[str, t.Any], review: models.SystematicReview
+) -> None:
+    mock_screening_service = worker_with_mocks["mock_screening_service"]
+    mock_screening_service.stream_batch_abstract_screening.side_effect = (
+        services.ServiceError("boom")
+    )
+    mock_job_repo = worker_with_mocks["mock_job_repo"]
+    job = _abstract_job(
+        review, [models.SearchResult(id=uuid.uuid4(), review_id=review.id, title="A")]
+    )
+    mock_job_repo.claim_next.return_value = job
+
+    worker_with_mocks["worker"].run_once()
+
+    args = mock_job_repo.finish.call_args
+    assert args.args[3] == ScreeningJobStatus.FAILED
+    assert "boom" in args.kwargs["error"]
+
+
+def test_benchmark_job_skips_stored_items(
+    worker_with_mocks: dict[str, t.Any],
+    review: models.SystematicReview,
+    mocker: MockerFixture,
+) -> None:
+    search_results = [
+        models.SearchResult(
+            id=uuid.uuid4(),
+            review_id=review.id,
+            source_id=str(i),
+            title=f"T{i}",
+            source_metadata={"benchmark_human_decision": True},
+        )
+        for i in range(3)
+    ]
+    stored, *remaining = search_results
+    run_id = uuid.uuid4()
+    screening_worker = worker_with_mocks["worker"]
+    screening_worker.search_repo.get_by_review_id.return_value = search_results
+    screening_worker.benchmark_item_repo.get_by_benchmark_run_id.return_value = [
+        models.BenchmarkResultItem(
+            benchmark_run_id=run_id,
+            search_result_id=stored.id,
+            conservative_decision=ScreeningDecisionType.INCLUDE,
+            comprehensive_decision=ScreeningDecisionType.INCLUDE,
+            final_decision=ScreeningDecisionType.INCLUDE,
+        )
+    ]
+
+    def _screen(
+        batch: list[models.SearchResult], *_args: t.Any, **_kwargs: t.Any
+    ) -> Iterator[ScreenResolveResultTuple]:
+        for sr in batch:
+            yield ScreenResolveResultTuple(
+                sr,
+                *_results(
+                    sr, ScreeningDecisionType.INCLUDE, ScreeningDecisionType.INCLUDE
+                ),
+            )
+
+    mock_screen = mocker.patch(
+        "sr_assistant.app.worker.screen_and_resolve_as_completed", side_effect=_screen
+    )
+    mock_metrics = mocker.patch(
+        "sr_assistant.app.worker.calculate_and_update_benchmark_metrics"
+    )
+    params = services.BenchmarkJobParams(benchmark_run_id=run_id, batch_size=1)
+    mock_job_repo = worker_with_mocks["mock_job_repo"]
+    job = models.ScreeningJob(
+        review_id=review.id,
+        kind=ScreeningJobKind.BENCHMARK,
+        status=ScreeningJobStatus.RUNNING,
+        params=params.model_dump(mode="json"),
+        attempts=2,
+    )
+    mock_job_repo.claim_next.return_value = job
+
+    screening_worker.run_once()
+
+    assert [c.args[0] for c in mock_screen.call_args_list] == [
+        [remaining[0]],
+        [remaining[1]],
+    ]
+    add_all: MagicMock = screening_worker.benchmark_item_repo.add_all
+    items = [item for c in add_all.call_args_list for item in c.args[1]]
+    assert [item.search_result_id for item in items] == [sr.id for sr in remaining]
+    assert all(item.classification == "TP" for item in items)
+    first_save = mock_job_repo.update_progress.call_args_list[0].kwargs
+    assert first_save["processed_items"] == 1
+    assert first_save["total_items"] == 3  # noqa: PLR2004
+    assert mock_job_repo.update_progress.call_args.kwargs["processed_items"] == 3  # noqa: PLR2004
+    assert mock_metrics.call_args.kwargs["benchmark_run_id"] == run_id
+    assert mock_job_repo.finish.call_args.args[3] == ScreeningJobStatus.SUCCEEDED
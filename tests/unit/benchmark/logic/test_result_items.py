@@ -0,0 +1,175 @@
+"""Unit tests for benchmark result items."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from sr_assistant.app.agents.screening_agents import ScreeningError
+from sr_assistant.app.agents.screening_pipeline import ScreenResolveResultTuple
+from sr_assistant.benchmark.logic.result_items import (
+    HUMAN_DECISION_METADATA_KEY,
+    classify_decision,
+    determine_final_decision,
+    human_decision_of,
+    make_benchmark_result_item,
+)
+from sr_assistant.core import models, schemas
+from sr_assistant.core.types import ScreeningDecisionType, ScreeningStrategyType
+
+INCLUDE = ScreeningDecisionType.INCLUDE
+EXCLUDE = ScreeningDecisionType.EXCLUDE
+UNCERTAIN = ScreeningDecisionType.UNCERTAIN
+
+
+def _screening_result(
+    search_result: models.SearchResult,
+    strategy: ScreeningStrategyType,
+    decision: ScreeningDecisionType,
+) -> schemas.ScreeningResult:
+    return schemas.ScreeningResult(
+        id=uuid.uuid4(),
+        review_id=search_result.review_id,
+        search_result_id=search_result.id,
+        trace_id=uuid.uuid4(),
+        model_name="test-model",
+        screening_strategy=strategy,
+        decision=decision,
+        confidence_score=0.9,
+        rationale=f"{strategy} rationale",
+        start_time=datetime.now(UTC),
+        end_time=datetime.now(UTC),
+    )
+
+
+@pytest.fixture
+def search_result() -> models.SearchResult:
+    return models.SearchResult(
+        id=uuid.uuid4(),
+        review_id=uuid.uuid4(),
+        source_id="123",
+        title="T",
+        source_metadata={HUMAN_DECISION_METADATA_KEY: True},
+    )
+
+
+@pytest.mark.parametrize(
+    ("conservative", "comprehensive", "resolver", "expected"),
+    [
+        (INCLUDE, INCLUDE, None, INCLUDE),
+        (EXCLUDE, EXCLUDE, None, EXCLUDE),
+        (INCLUDE, EXCLUDE, None, UNCERTAIN),
+        (INCLUDE, EXCLUDE, EXCLUDE, EXCLUDE),
+        (INCLUDE, INCLUDE, UNCERTAIN, UNCERTAIN),
+    ],
+)
+def test_determine_final_decision(
+    conservative: ScreeningDecisionType,
+    comprehensive: ScreeningDecisionType,
+    resolver: ScreeningDecisionType | None,
+    expected: ScreeningDecisionType,
+) -> None:
+    assert determine_final_decision(conservative, comprehensive, resolver) == expected
+
+
+@pytest.mark.parametrize(
+    ("final_decision", "human_decision", "expected"),
+    [
+        (INCLUDE, True, "TP"),
+        (INCLUDE, False, "FP"),
+        (EXCLUDE, True, "FN"),
+        (UNCERTAIN, True, "FN"),
+        (EXCLUDE, False, "TN"),
+        (INCLUDE, None, "UNKNOWN"),
+    ],
+)
+def test_classify_decision(
+    final_decision: ScreeningDecisionType, human_decision: bool | None, expected: str
+) -> None:
+    assert classify_decision(final_decision, human_decision) == expected
+
+
+def test_human_decision_of(search_result: models.SearchResult) -> None:
+    assert human_decision_of(search_result) is True
+
+    search_result.source_metadata = {HUMAN_DECISION_METADATA_KEY: "yes"}
+    assert human_decision_of(search_result) is None
+
+    search_result.source_metadata = {}
+    assert human_decision_of(search_result) is None
+
+
+def test_make_benchmark_result_item(search_result: models.SearchResult) -> None:
+    run_id = uuid.uuid4()
+    conservative = _screening_result(
+        search_result, ScreeningStrategyType.CONSERVATIVE, INCLUDE
+    )
+    comprehensive = _screening_result(
+        search_result, ScreeningStrategyType.COMPREHENSIVE, EXCLUDE
+    )
+    resolver = schemas.ResolverOutputSchema(
+        resolver_decision=INCLUDE,
+        resolver_reasoning="Meets criteria",
+        resolver_confidence_score=0.7,
+    )
+
+    item = make_benchmark_result_item(
+        run_id,
+        ScreenResolveResultTuple(
+            search_result,
+            conservative,
+            comprehensive,
+            resolver_needed=True,
+            resolver_result=resolver,
+        ),
+    )
+
+    assert item is not None
+    assert item.benchmark_run_id == run_id
+    assert item.search_result_id == search_result.id
+    assert item.human_decision is True
+    assert item.conservative_run_id == conservative.id
+    assert item.comprehensive_decision == EXCLUDE
+    assert item.resolver_decision == INCLUDE
+    assert item.resolver_reasoning == "Meets criteria"
+    assert item.final_decision == INCLUDE
+    assert item.classification == "TP"
+
+
+def test_make_benchmark_result_item_without_resolver(
+    search_result: models.SearchResult,
+) -> None:
+    conservative = _screening_result(
+        search_result, ScreeningStrategyType.CONSERVATIVE, EXCLUDE
+    )
+    comprehensive = _screening_result(
+        search_result, ScreeningStrategyType.COMPREHENSIVE, EXCLUDE
+    )
+
+    item = make_benchmark_result_item(
+        uuid.uuid4(),
+        ScreenResolveResultTuple(search_result, conservative, comprehensive),
+    )
+
+    assert item is not None
+    assert item.resolver_decision is None
+    assert item.final_decision == EXCLUDE
+    assert item.classification == "FN"
+
+
+def test_make_benchmark_result_item_screening_error(
+    search_result: models.SearchResult,
+) -> None:
+    conservative = _screening_result(
+        search_result, ScreeningStrategyType.CONSERVATIVE, INCLUDE
+    )
+    error = ScreeningError(search_result=search_result, error=None)
+
+    assert (
+        make_benchmark_result_item(
+            uuid.uuid4(), ScreenResolveResultTuple(search_result, conservative, error)
+        )
+        is None
+    )
@@ -5,10 +5,12 @@ from datetime import datetime, timezone
 from unittest.mock import MagicMock, create_autospec
 
 import pytest
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlmodel import Session as SQLModelSession
 
 from sr_assistant.core.models import (
+    LLMCacheEntry,
     LogRecord,
     ScreenAbstractResult,
     ScreeningDecisionType,
@@ -19,16 +21,24 @@ from sr_assistant.core.models import (
 )
 from sr_assistant.core.repositories import (
     ConstraintViolationError,
+    LLMCacheEntryRepository,
     LogRepository,
     RecordNotFoundError,
     RepositoryError,
     ScreenAbstractResultRepository,
+    ScreeningJobRepository,
     ScreeningResolutionRepository,
     SearchResultRepository,
     SystematicReviewRepository,
+    UpsertResult,
 )
 from sr_assistant.core.schemas import SearchResultFilter
-from sr_assistant.core.types import LogLevel, SearchDatabaseSource
+from sr_assistant.core.types import (
+    LogLevel,
+    ScreeningJobKind,
+    ScreeningJobStatus,
+    SearchDatabaseSource,
+)
 
 
 @pytest.fixture
@@ -633,3 +643,392 @@ def test_search_result_repo_count_error_handling(
 
     with pytest.raises(RepositoryError, match="DB count error"):
         search_repo.count(mock_session, search_params=SearchResultFilter())
+
+
+def test_llm_cache_repo_get_by_key(mock_session: MagicMock) -> None:
+    """Test get_by_key filters on cache_key."""
+    repo = LLMCacheEntryRepository()
+    entry = LLMCacheEntry(
+        cache_key="a" * 64, namespace="resolver", model_name="m", value={"x": 1}
+    )
+    mock_session.exec.return_value.first.return_value = entry
+
+    assert repo.get_by_key(mock_session, "a" * 64) is entry
+    args, _ = mock_session.exec.call_args
+    assert "llm_cache_entries.cache_key = :cache_key_1" in str(args[0])
+
+
+def test_llm_cache_repo_upsert_on_conflict(mock_session: MagicMock) -> None:
+    """Test upsert issues INSERT ... ON CONFLICT (cache_key) DO UPDATE."""
+    repo = LLMCacheEntryRepository()
+    repo.upsert(
+        mock_session,
+        cache_key="b" * 64,
+        namespace="screening:conservative",
+        model_name="gpt-4o",
+        value={"decision": "include"},
+    )
+
+    args, _ = mock_session.execute.call_args
+    query_str = str(args[0].compile(dialect=postgresql.dialect())).upper()
+    assert "INSERT INTO LLM_CACHE_ENTRIES" in query_str
+    assert "ON CONFLICT (CACHE_KEY) DO UPDATE" in query_str
+
+
+def test_llm_cache_repo_evict(mock_session: MagicMock) -> None:
+    """Test evict runs TTL and LRU deletes and sums deleted rows."""
+    repo = LLMCacheEntryRepository()
+    mock_session.execute.return_value.rowcount = 2
+
+    deleted = repo.evict(
+        mock_session,
+        max_entries=10,
+        expired_before=datetime.now(timezone.utc),
+    )
+
+    assert deleted == 4  # noqa: PLR2004
+    assert mock_session.execute.call_count == 2  # noqa: PLR2004
+    lru_delete = mock_session.execute.call_args_list[1].args[0]
+    query_str = str(lru_delete.compile(dialect=postgresql.dialect())).upper()
+    assert "NOT IN" not in query_str
+    assert "LAST_ACCESSED_AT <= (SELECT" in query_str
+    assert "OFFSET" in query_str
+
+
+def test_llm_cache_repo_error_handling(mock_session: MagicMock) -> None:
+    """Test SQLAlchemy errors are wrapped in RepositoryError."""
+    mock_session.execute.side_effect = SQLAlchemyError("DB touch error")
+
+    with pytest.raises(RepositoryError, match="DB touch error"):
+        LLMCacheEntryRepository().touch(mock_session, "c" * 64)
+
+
+def test_screen_repo_insert_many(mock_session: MagicMock) -> None:
+    """Test insert_many runs one executemany INSERT without the timestamps."""
+    results = [
+        ScreenAbstractResult(
+            id=uuid.uuid4(),
+            review_id=uuid.uuid4(),
+            trace_id=uuid.uuid4(),
+            model_name="gpt-4o",
+            screening_strategy=ScreeningStrategyType.CONSERVATIVE,
+            decision=ScreeningDecisionType.INCLUDE,
+            confidence_score=0.9,
+            rationale="R",
+            start_time=datetime.now(timezone.utc),
+            end_time=datetime.now(timezone.utc),
+            response_metadata={},
+        )
+        for _ in range(3)
+    ]
+    repo = ScreenAbstractResultRepository()
+
+    repo.insert_many(mock_session, results)
+    repo.insert_many(mock_session, [])
+
+    mock_session.execute.assert_called_once()
+    stmt, rows = mock_session.execute.call_args.args
+    assert "INSERT INTO screen_abstract_results" in str(stmt)
+    assert [row["id"] for row in rows] == [r.id for r in results]
+    assert "created_at" not in rows[0]
+    mock_session.add.assert_not_called()
+
+
+def test_screen_repo_insert_many_constraint_error(mock_session: MagicMock) -> None:
+    """Test IntegrityError from insert_many raises ConstraintViolationError."""
+    mock_session.execute.side_effect = IntegrityError("stmt", {}, Exception("FK"))
+    result = ScreenAbstractResult(
+        review_id=uuid.uuid4(),
+        trace_id=uuid.uuid4(),
+        model_name="gpt-4o",
+        screening_strategy=ScreeningStrategyType.CONSERVATIVE,
+        decision=ScreeningDecisionType.INCLUDE,
+        confidence_score=0.9,
+        rationale="R",
+        start_time=datetime.now(timezone.utc),
+        end_time=datetime.now(timezone.utc),
+        response_metadata={},
+    )
+
+    with pytest.raises(ConstraintViolationError):
+        ScreenAbstractResultRepository().insert_many(mock_session, [result])
+
+
+def test_search_result_repo_link_screening_results(
+    search_repo: SearchResultRepository, mock_session: MagicMock
+) -> None:
+    """Test link_screening_results issues one UPDATE ... FROM (VALUES ...)."""
+    mock_session.execute.return_value.rowcount = 2
+    links = {
+        uuid.uuid4(): (uuid.uuid4(), uuid.uuid4()),
+        uuid.uuid4(): (uuid.uuid4(), None),
+    }
+
+    assert search_repo.link_screening_results(mock_session, links) == 2  # noqa: PLR2004
+    assert search_repo.link_screening_results(mock_session, {}) == 0
+
+    mock_session.execute.assert_called_once()
+    query_str = str(
+        mock_session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+    )
+    assert "UPDATE search_results SET" in query_str
+    assert "FROM (VALUES" in query_str
+    assert "coalesce(CAST(links.comprehensive_result_id AS UUID)" in query_str
+
+
+def test_search_result_repo_mark_duplicates(
+    search_repo: SearchResultRepository, mock_session: MagicMock
+) -> None:
+    """Test mark_duplicates issues one UPDATE ... FROM (VALUES ...)."""
+    mock_session.execute.return_value.rowcount = 2
+    duplicates = {
+        uuid.uuid4(): (uuid.uuid4(), b"\x00" * 4),
+        uuid.uuid4(): (None, None),
+    }
+
+    assert search_repo.mark_duplicates(mock_session, duplicates) == 2  # noqa: PLR2004
+    assert search_repo.mark_duplicates(mock_session, {}) == 0
+
+    mock_session.execute.assert_called_once()
+    query_str = str(
+        mock_session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+    )
+    assert "UPDATE search_results SET" in query_str
+    assert "FROM (VALUES" in query_str
+    assert "CAST(duplicates.minhash_signature AS BYTEA)" in query_str
+
+
+def test_review_repo_set_metadata_key(
+    review_repo: SystematicReviewRepository, mock_session: MagicMock
+) -> None:
+    """Test set_metadata_key merges or removes one JSONB key in place."""
+    review_id = uuid.uuid4()
+
+    review_repo.set_metadata_key(mock_session, review_id, "checkpoint", {"a": 1})
+    review_repo.set_metadata_key(mock_session, review_id, "checkpoint", None)
+
+    set_stmt, remove_stmt = (
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in mock_session.execute.call_args_list
+    )
+    assert "review_metadata || " in set_stmt
+    assert "review_metadata - " in remove_stmt
+    mock_session.get.assert_not_called()
+
+
+def test_get_many_by_ids_preserves_order(
+    search_repo: SearchResultRepository, mock_session: MagicMock
+) -> None:
+    """Test get_many_by_ids chunks IN queries, orders records and reports misses."""
+    review_id = uuid.uuid4()
+    first, second, third = (
+        SearchResult(id=uuid.uuid4(), review_id=review_id, title=title)
+        for title in "ABC"
+    )
+    missing_id = uuid.uuid4()
+    # Database order differs from the requested order
+    mock_session.exec.return_value.all.side_effect = [[second, first], [third]]
+
+    fetched = search_repo.get_many_by_ids(
+        mock_session,
+        [first.id, second.id, missing_id, first.id, third.id],
+        chunk_size=3,
+    )
+
+    assert fetched.records == [first, second, third]
+    assert fetched.missing_ids == [missing_id]
+    assert mock_session.exec.call_count == 2  # noqa: PLR2004
+    stmt = mock_session.exec.call_args_list[0].args[0]
+    assert "search_results.id IN" in str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_get_many_by_ids_database_order(
+    search_repo: SearchResultRepository, mock_session: MagicMock
+) -> None:
+    """Test get_many_by_ids keeps database order without preserve_order."""
+    first, second = (
+        SearchResult(id=uuid.uuid4(), review_id=uuid.uuid4(), title=title)
+        for title in "AB"
+    )
+    mock_session.exec.return_value.all.return_value = [second, first]
+
+    fetched = search_repo.get_many_by_ids(
+        mock_session, [first.id, second.id], preserve_order=False
+    )
+
+    assert fetched.records == [second, first]
+    assert search_repo.get_many_by_ids(mock_session, []).records == []
+    mock_session.exec.assert_called_once()
+
+
+def test_get_many_by_ids_error_handling(
+    search_repo: SearchResultRepository, mock_session: MagicMock
+) -> None:
+    """Test SQLAlchemy errors are wrapped in RepositoryError."""
+    mock_session.exec.side_effect = SQLAlchemyError("DB error")
+
+    with pytest.raises(RepositoryError, match="DB error"):
+        search_repo.get_many_by_ids(mock_session, [uuid.uuid4()])
+
+
+def _pubmed_results(review_id: uuid.UUID, *source_ids: str) -> list[SearchResult]:
+    return [
+        SearchResult(
+            review_id=review_id,
+            source_db=SearchDatabaseSource.PUBMED,
+            source_id=source_id,
+            title=f"Title {source_id}",
+        )
+        for source_id in source_ids
+    ]
+
+
+def test_search_result_repo_upsert_many_skips_conflicts(
+    search_repo: SearchResultRepository, mock_session: MagicMock
+) -> None:
+    """Test upsert_many runs chunked INSERT ... ON CONFLICT DO NOTHING RETURNING."""
+    results = _pubmed_results(uuid.uuid4(), "1", "2", "1", "3")
+    stored = [SearchResult(**r.model_dump()) for r in results]
+    # "2" already exists and isn't returned
+    mock_session.execute.side_effect = [[(stored[0], True)], [(stored[3], True)]]
+
+    upserted = search_repo.upsert_many(mock_session, results, chunk_size=2)
+
+    assert upserted == UpsertResult(
+        inserted=[stored[0], stored[3]], updated=[], skipped=2
+    )
+    first, second = (call.args[0] for call in mock_session.execute.call_args_list)
+    query_str = str(first.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT ON CONSTRAINT uq_review_source_id DO NOTHING" in query_str
+    assert "RETURNING search_results.id" in query_str
+    assert "xmax = 0 AS inserted" in query_str
+    # The repeated "1" isn't written
+    assert [
+        value
+        for stmt in (first, second)
+        for name, value in stmt.compile().params.items()
+        if name.startswith("source_id_m")
+    ] == ["1", "2", "3"]
+    mock_session.add.assert_not_called()
+    assert search_repo.upsert_many(mock_session, []) == UpsertResult([], [], 0)
+
+
+def test_search_result_repo_upsert_many_updates_existing(
+    search_repo: SearchResultRepository, mock_session: MagicMock
+) -> None:
+    """Test update_existing overwrites the source columns and counts updates."""
+    results = _pubmed_results(uuid.uuid4(), "1", "2")
+    mock_session.execute.return_value = [(results[0], True), (results[1], False)]
+
+    upserted = search_repo.upsert_many(mock_session, results, update_existing=True)
+
+    assert upserted == UpsertResult(
+        inserted=[results[0]], updated=[results[1]], skipped=0
+    )
+    query_str = str(
+        mock_session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+    )
+    assert "ON CONFLICT ON CONSTRAINT uq_review_source_id DO UPDATE SET" in query_str
+    assert "raw_data = excluded.raw_data" in query_str
+    assert "updated_at = now()" in query_str
+    assert "review_id = excluded" not in query_str
+
+
+def test_search_result_repo_upsert_many_errors(
+    search_repo: SearchResultRepository, mock_session: MagicMock
+) -> None:
+    """Test IntegrityError and other database errors are wrapped."""
+    results = _pubmed_results(uuid.uuid4(), "1")
+    mock_session.execute.side_effect = IntegrityError("stmt", {}, Exception("FK"))
+
+    with pytest.raises(ConstraintViolationError):
+        search_repo.upsert_many(mock_session, results)
+
+    mock_session.execute.side_effect = SQLAlchemyError("DB error")
+
+    with pytest.raises(RepositoryError, match="DB error"):
+        search_repo.upsert_many(mock_session, results)
+
+
+def test_screening_job_repo_claim_next_skips_locked_jobs(
+    mock_session: MagicMock,
+) -> None:
+    """Test claim_next claims the oldest queued job in one UPDATE ... RETURNING."""
+    job = MagicMock()
+    mock_session.execute.return_value.scalar_one_or_none.return_value = job
+
+    claimed = ScreeningJobRepository().claim_next(
+        mock_session, "host:1", kinds=[ScreeningJobKind.BENCHMARK]
+    )
+
+    assert claimed is job
+    stmt = mock_session.execute.call_args.args[0]
+    query_str = str(stmt.compile(dialect=postgresql.dialect()))
+    assert query_str.startswith("UPDATE screening_jobs SET")
+    assert "attempts=(screening_jobs.attempts +" in query_str
+    assert "WHERE screening_jobs.id = (SELECT screening_jobs.id" in query_str
+    assert "ORDER BY screening_jobs.created_at" in query_str
+    assert "FOR UPDATE SKIP LOCKED)" in query_str
+    assert "RETURNING screening_jobs.id" in query_str
+    params = stmt.compile().params
+    assert params["status"] == ScreeningJobStatus.RUNNING
+    assert params["status_1"] == ScreeningJobStatus.QUEUED
+    assert params["worker_id"] == "host:1"
+
+
+def test_screening_job_repo_progress_only_while_owned(
+    mock_session: MagicMock,
+) -> None:
+    """Test progress, heartbeats and release are conditional on owning the job."""
+    repo = ScreeningJobRepository()
+    job_id = uuid.uuid4()
+    mock_session.execute.return_value.first.return_value = None
+
+    assert not repo.update_progress(
+        mock_session, job_id, "host:1", processed_items=3, stats={"resolved": 1}
+    )
+    stmt = mock_session.execute.call_args.args[0]
+    query_str = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "heartbeat_at=now()" in query_str
+    assert "total_items" not in query_str
+    assert "screening_jobs.worker_id = %(worker_id_1)s" in query_str
+    assert stmt.compile().params["status_1"] == ScreeningJobStatus.RUNNING
+
+    mock_session.execute.return_value.first.return_value = (job_id,)
+    assert repo.heartbeat(mock_session, job_id, "host:1")
+    query_str = str(
+        mock_session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+    )
+    assert "heartbeat_at=now()" in query_str
+    assert "processed_items" not in query_str
+
+    assert repo.release(mock_session, job_id, "host:1")
+    params = mock_session.execute.call_args.args[0].compile().params
+    assert params["status"] == ScreeningJobStatus.QUEUED
+    assert params["worker_id"] is None
+    assert params["worker_id_1"] == "host:1"
+
+
+def test_screening_job_repo_requeue_stale(mock_session: MagicMock) -> None:
+    """Test stale jobs out of attempts are failed, the others requeued."""
+    mock_session.execute.side_effect = [MagicMock(rowcount=1), MagicMock(rowcount=2)]
+
+    requeued, failed = ScreeningJobRepository().requeue_stale(
+        mock_session, heartbeat_before=datetime.now(timezone.utc), max_attempts=3
+    )
+
+    assert (requeued, failed) == (2, 1)
+    fail_stmt, requeue_stmt = (
+        call.args[0] for call in mock_session.execute.call_args_list
+    )
+    assert "screening_jobs.attempts >=" in str(fail_stmt)
+    assert fail_stmt.compile().params["status"] == ScreeningJobStatus.FAILED
+    assert requeue_stmt.compile().params["status"] == ScreeningJobStatus.QUEUED
+
+
+def test_screening_job_repo_error_handling(mock_session: MagicMock) -> None:
+    """Test SQLAlchemy errors are wrapped in RepositoryError."""
+    mock_session.execute.side_effect = SQLAlchemyError("DB claim error")
+
+    with pytest.raises(RepositoryError, match="DB claim error"):
+        ScreeningJobRepository().claim_next(mock_session, "host:1")
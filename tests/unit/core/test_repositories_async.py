@@ -0,0 +1,112 @@
+"""Unit tests for the async repository classes."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, create_autospec
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session as SQLModelSession
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from sr_assistant.core.models import LogRecord, SearchResult, SystematicReview
+from sr_assistant.core.repositories import (
+    LogRepository,
+    RecordNotFoundError,
+    RepositoryError,
+    SearchResultRepository,
+    UpsertResult,
+)
+from sr_assistant.core.repositories_async import (
+    AsyncBaseRepository,
+    AsyncSearchResultRepository,
+    AsyncSystematicReviewRepository,
+)
+from sr_assistant.core.types import SearchDatabaseSource
+
+
+@pytest.fixture
+def mock_session() -> MagicMock:
+    session = create_autospec(SQLModelSession, instance=True)
+    mock_exec_result = MagicMock()
+    session.exec.return_value = mock_exec_result
+    mock_exec_result.first.return_value = None
+    mock_exec_result.all.return_value = []
+    return session
+
+
+@pytest.fixture
+def mock_asession(mock_session: MagicMock) -> MagicMock:
+    """Async session running ``run_sync`` functions on ``mock_session``."""
+    asession = create_autospec(AsyncSession, instance=True)
+    asession.run_sync = AsyncMock(
+        side_effect=lambda fn, *args, **kwargs: fn(mock_session, *args, **kwargs)
+    )
+    return asession
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_runs_sync_query(
+    mock_asession: MagicMock, mock_session: MagicMock
+) -> None:
+    review = SystematicReview(research_question="Q", exclusion_criteria="E")
+    mock_session.exec.return_value.first.return_value = review
+    repo = AsyncSystematicReviewRepository()
+
+    assert await repo.get_by_id(mock_asession, review.id) is review
+    assert repo.model_cls is SystematicReview
+    mock_session.exec.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_base_repository_wraps_any_repository(
+    mock_asession: MagicMock, mock_session: MagicMock
+) -> None:
+    repo = AsyncBaseRepository(LogRepository())
+    records = [LogRecord(message="a"), LogRecord(message="b")]
+
+    assert await repo.add_all(mock_asession, records) == records
+    assert repo.model_cls is LogRecord
+    mock_session.add_all.assert_called_once_with(records)
+    mock_session.flush.assert_called_once_with(records)
+
+
+@pytest.mark.asyncio
+async def test_errors_are_raised_as_in_sync_repository(
+    mock_asession: MagicMock, mock_session: MagicMock
+) -> None:
+    repo = AsyncSystematicReviewRepository()
+
+    with pytest.raises(RecordNotFoundError):
+        await repo.delete(mock_asession, uuid.uuid4())
+
+    mock_session.exec.side_effect = SQLAlchemyError("connection lost")
+    with pytest.raises(RepositoryError, match="connection lost"):
+        await repo.get_all(mock_asession)
+
+
+@pytest.mark.asyncio
+async def test_search_result_methods_delegate(mock_asession: MagicMock) -> None:
+    sync_repo = create_autospec(SearchResultRepository, instance=True)
+    review_id = uuid.uuid4()
+    result = SearchResult(
+        review_id=review_id,
+        source_db=SearchDatabaseSource.PUBMED,
+        source_id="1",
+        title="T",
+    )
+    sync_repo.upsert_many.return_value = UpsertResult([result], [], 0)
+    sync_repo.get_existing_source_ids.return_value = {"1"}
+    repo = AsyncSearchResultRepository(sync_repo)
+
+    upserted = await repo.upsert_many(mock_asession, [result], update_existing=True)
+    existing = await repo.get_existing_source_ids(
+        mock_asession, review_id, SearchDatabaseSource.PUBMED, ["1", "2"]
+    )
+
+    assert upserted.inserted == [result]
+    assert existing == {"1"}
+    sync_repo.upsert_many.assert_called_once()
+    assert sync_repo.upsert_many.call_args.kwargs == {
+        "update_existing": True,
+        "chunk_size": 500,
+    }
@@ -0,0 +1,214 @@
+"""Microbenchmark of mapping PubMed efetch XML to SearchResult models.
+
+Compares the ``Entrez.read`` -> ``SearchService._recursive_clean`` ->
+``SearchService._map_pubmed_to_search_result`` path with the streaming
+``sr_assistant.app.pubmed_xml`` mapper on the recorded efetch payload in
+``tests/unit/app/data/pubmed_efetch.xml``, repeated to ``--articles`` articles with
+unique PMIDs.
+
+CPU time is the best of ``--repeat`` runs (``time.process_time``), peak memory is
+measured with ``tracemalloc`` in a separate run.
+
+Usage:
+    uv run python tools/bench_pubmed_parser.py --articles 1000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import io
+import re
+import time
+import tracemalloc
+import typing as t
+import uuid
+from pathlib import Path
+
+from Bio import Entrez
+
+from sr_assistant.app.pubmed_xml import (
+    iter_pubmed_articles,
+    map_pubmed_article,
+    pubmed_article_fields,
+)
+from sr_assistant.app.services import SearchService
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sr_assistant.core import models
+
+PAYLOAD_PATH = (
+    Path(__file__).parent.parent
+    / "tests"
+    / "unit"
+    / "app"
+    / "data"
+    / "pubmed_efetch.xml"
+)
+
+_ARTICLE_RE = re.compile(r"<PubmedArticle>.*?</PubmedArticle>", re.DOTALL)
+_PMID_RE = re.compile(r'(<PMID Version="1">)\d+(</PMID>)')
+
+
+class BenchResult(t.NamedTuple):
+    """Measurements of one mapping path."""
+
+    name: str
+    articles: int
+    """Articles mapped to search results."""
+    cpu_seconds: float
+    peak_bytes: int
+
+
+def build_payload(articles: int, path: Path = PAYLOAD_PATH) -> bytes:
+    """Efetch response with ``articles`` copies of the recorded articles."""
+    text = path.read_text(encoding="utf-8")
+    templates = _ARTICLE_RE.findall(text)
+    body = "\n".join(
+        _PMID_RE.sub(rf"\g<1>{90000000 + i}\g<2>", templates[i % len(templates)], 1)
+        for i in range(articles)
+    )
+    header = text[: text.index("<PubmedArticleSet>")]
+    return f"{header}<PubmedArticleSet>\n{body}\n</PubmedArticleSet>\n".encode()
+
+
+def fields_with_entrez_read(payload: bytes) -> list[dict[str, t.Any]]:
+    """Previous path, a whole ``Entrez.read`` tree, cleaned and walked per record.
+
+    Same steps as ``SearchService._map_pubmed_to_search_result`` without building the
+    model.
+    """
+    service = SearchService()
+    records = Entrez.read(io.BytesIO(payload))
+    fields = []
+    for record in records["PubmedArticle"]:
+        cleaned = service._recursive_clean(record)  # noqa: SLF001
+        pmid, doi, pmc = service._parse_pubmed_ids(cleaned)  # noqa: SLF001
+        title, abstract = service._parse_pubmed_title_abstract(cleaned)  # noqa: SLF001
+        journal, year = service._parse_pubmed_journal_year(cleaned)  # noqa: SLF001
+        fields.append(
+            {
+                "source_id": pmid,
+                "doi": doi,
+                "title": title,
+                "abstract": abstract,
+                "journal": journal,
+                "year": year,
+                "authors": service._parse_pubmed_authors(cleaned),  # noqa: SLF001
+                "keywords": service._parse_pubmed_keywords(cleaned),  # noqa: SLF001
+                "raw_data": cleaned,
+                "source_metadata": {
+                    "pmc": pmc,
+                    "publication_status": service._extract_text_from_element(  # noqa: SLF001
+                        cleaned.get("PubmedData", {}).get("PublicationStatus")
+                    ),
+                    "mesh_headings": cleaned.get("MedlineCitation", {}).get(
+                        "MeshHeadingList", []
+                    ),
+                },
+            }
+        )
+    return fields
+
+
+def fields_with_streaming(payload: bytes) -> list[dict[str, t.Any]]:
+    """Streaming path, see ``sr_assistant.app.pubmed_xml``."""
+    return [
+        fields
+        for article in iter_pubmed_articles(io.BytesIO(payload))
+        if (fields := pubmed_article_fields(article)) is not None
+    ]
+
+
+def models_with_entrez_read(payload: bytes) -> list[models.SearchResult]:
+    """Previous path including the models, as ``search_pubmed_and_store_results`` did."""
+    service = SearchService()
+    review_id = uuid.uuid4()
+    records = Entrez.read(io.BytesIO(payload))
+    return [
+        result
+        for record in records["PubmedArticle"]
+        if (
+            result := service._map_pubmed_to_search_result(  # noqa: SLF001
+                review_id,
+                service._recursive_clean(record),  # noqa: SLF001
+            )
+        )
+        is not None
+    ]
+
+
+def models_with_streaming(payload: bytes) -> list[models.SearchResult]:
+    """Streaming path including the models."""
+    review_id = uuid.uuid4()
+    return [
+        result
+        for article in iter_pubmed_articles(io.BytesIO(payload))
+        if (result := map_pubmed_article(article, review_id)) is not None
+    ]
+
+
+def measure(
+    name: str, mapper: Callable[[bytes], list[t.Any]], payload: bytes, repeat: int
+) -> BenchResult:
+    """Best CPU time of ``repeat`` runs and the peak memory of one more."""
+    cpu_times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.process_time()
+        results = mapper(payload)
+        cpu_times.append(time.process_time() - start)
+    del results
+    gc.collect()
+    tracemalloc.start()
+    try:
+        articles = len(mapper(payload))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchResult(name, articles, min(cpu_times), peak)
+
+
+def run(articles: int = 1000, repeat: int = 5) -> list[tuple[BenchResult, BenchResult]]:
+    """Measure both paths on a payload of ``articles`` articles.
+
+    Returns:
+        list[tuple[BenchResult, BenchResult]]: Previous and streaming path, for
+            parsing to field values and for building the models too.
+    """
+    payload = build_payload(articles)
+    return [
+        (
+            measure("Entrez.read fields", fields_with_entrez_read, payload, repeat),
+            measure("streaming fields", fields_with_streaming, payload, repeat),
+        ),
+        (
+            measure("Entrez.read models", models_with_entrez_read, payload, repeat),
+            measure("streaming models", models_with_streaming, payload, repeat),
+        ),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for baseline, streaming in run(args.articles, args.repeat):
+        for result in (baseline, streaming):
+            print(
+                f"{result.name:20} {result.articles:6} articles "
+                + f"{result.cpu_seconds * 1000:8.1f} ms CPU "
+                + f"{result.peak_bytes / 2**20:7.1f} MiB peak"
+            )
+        print(
+            f"{'':20} {baseline.cpu_seconds / streaming.cpu_seconds:6.1f}x CPU, "
+            + f"{baseline.peak_bytes / streaming.peak_bytes:.1f}x peak memory\n"
+        )
+
+
+if __name__ == "__main__":
+    main()